@@ -2,6 +2,7 @@
 Claude AI 分析器
 集成 Claude API 进行智能交易决策分析
 """
+import importlib.util
 import json
 import asyncio
 from typing import Dict, Optional, Tuple
@@ -9,11 +10,9 @@ from datetime import datetime
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# anthropic 体积较大（导入约 1s），只检查是否安装，启用分析时才真正导入
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+if not ANTHROPIC_AVAILABLE:
     print("警告: anthropic 库未安装，Claude 分析功能将被禁用")
     print("安装命令: pip install anthropic")
 
@@ -55,6 +54,8 @@ class ClaudeAnalyzer:
 
         if self.enabled:
             try:
+                import anthropic
+
                 # 如果配置了自定义base_url，使用自定义端点
                 if self.base_url:
                     self.client = anthropic.Anthropic(
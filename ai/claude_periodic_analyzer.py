@@ -2,16 +2,15 @@
 Claude AI 定时分析器
 定期分析市场状态并通过飞书推送分析结果
 """
+import importlib.util
 import json
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
 import pandas as pd
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# 只检查是否安装，启用定时分析时才导入 anthropic
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+if not ANTHROPIC_AVAILABLE:
     print("警告: anthropic 库未安装，Claude 定时分析功能将被禁用")
 
 from config.settings import settings as config
@@ -75,6 +74,8 @@ class ClaudePeriodicAnalyzer:
 
         if self.enabled:
             try:
+                import anthropic
+
                 # 初始化 Claude 客户端
                 if self.base_url:
                     self.client = anthropic.Anthropic(
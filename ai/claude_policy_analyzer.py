@@ -11,16 +11,13 @@ Claude Policy Analyzer - 策略治理分析器
 3. 基于历史交易 + 当前持仓 + 实时行情进行策略层治理
 """
 
+import importlib.util
 import json
 from typing import Dict, Optional
 from datetime import datetime
 import pandas as pd
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None  # 创建客户端时才导入
 
 from config.settings import settings as config
 from utils.logger_utils import get_logger
@@ -54,6 +51,8 @@ class ClaudePolicyAnalyzer:
 
         if self.enabled:
             try:
+                import anthropic
+
                 if self.base_url:
                     self.client = anthropic.Anthropic(
                         api_key=self.api_key,
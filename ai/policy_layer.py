@@ -13,11 +13,12 @@ Policy Layer - Claude AI 策略治理层
 - 参数只能在合理区间内变化
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 import json
+import threading
 
 from config.settings import settings as config
 from utils.logger_utils import get_logger
@@ -236,6 +237,8 @@ class PolicyLayer:
         """初始化 Policy Layer"""
         self.current_params = PolicyParameters()
         self.decision_history: List[PolicyDecision] = []
+        # 决策可能由后台分析线程应用：修改在副本上进行，持锁后整体替换 current_params
+        self._lock = threading.RLock()
 
         # 参数边界约束
         self.param_bounds = {
@@ -292,11 +295,22 @@ class PolicyLayer:
         if decision.confidence < 0.3:
             return False, f"置信度过低: {decision.confidence:.2f}", []
 
+        with self._lock:
+            return self._apply_decision(decision, context)
+
+    def _apply_decision(
+        self,
+        decision: PolicyDecision,
+        context: TradingContext
+    ) -> Tuple[bool, str, List[PolicyAction]]:
+        """在参数副本上应用决策，完成后整体替换当前参数（读取方不会看到半更新的参数）"""
+        params = replace(self.current_params, enabled_strategies=list(self.current_params.enabled_strategies))
         applied_actions = []
 
         # 1. 验证并应用止损调整
         if decision.suggested_stop_loss_pct is not None:
             success, action = self._apply_stop_loss_adjustment(
+                params,
                 decision.suggested_stop_loss_pct,
                 context
             )
@@ -306,6 +320,7 @@ class PolicyLayer:
         # 2. 验证并应用止盈调整
         if decision.suggested_take_profit_pct is not None:
             success, action = self._apply_take_profit_adjustment(
+                params,
                 decision.suggested_take_profit_pct,
                 context
             )
@@ -315,6 +330,7 @@ class PolicyLayer:
         # 3. 验证并应用移动止损调整
         if decision.suggested_trailing_stop_pct is not None:
             success, action = self._apply_trailing_stop_adjustment(
+                params,
                 decision.suggested_trailing_stop_pct,
                 decision.enable_trailing_stop,
                 context
@@ -325,6 +341,7 @@ class PolicyLayer:
         # 4. 验证并应用仓位调整
         if decision.suggested_position_multiplier is not None:
             success, action = self._apply_position_adjustment(
+                params,
                 decision.suggested_position_multiplier,
                 context
             )
@@ -334,6 +351,7 @@ class PolicyLayer:
         # 5. 验证并应用风控模式切换
         if decision.suggested_risk_mode is not None:
             success, action = self._apply_risk_mode_switch(
+                params,
                 decision.suggested_risk_mode,
                 context
             )
@@ -343,6 +361,7 @@ class PolicyLayer:
         # 6. 验证并应用策略启停
         if decision.strategies_to_enable or decision.strategies_to_disable:
             success, actions = self._apply_strategy_control(
+                params,
                 decision.strategies_to_enable,
                 decision.strategies_to_disable,
                 context
@@ -350,9 +369,10 @@ class PolicyLayer:
             if success:
                 applied_actions.extend(actions)
 
-        # 记录决策
-        self.current_params.last_decision = decision
-        self.current_params.last_update_time = datetime.now()
+        # 记录决策并整体替换
+        params.last_decision = decision
+        params.last_update_time = datetime.now()
+        self.current_params = params
         self.decision_history.append(decision)
 
         # 限制历史记录长度
@@ -370,6 +390,7 @@ class PolicyLayer:
 
     def _apply_stop_loss_adjustment(
         self,
+        params: PolicyParameters,
         suggested_pct: float,
         context: TradingContext
     ) -> Tuple[bool, Optional[PolicyAction]]:
@@ -382,7 +403,7 @@ class PolicyLayer:
             suggested_pct = max(min_sl, min(max_sl, suggested_pct))
 
         # 变化幅度检查（单次调整不超过 50%）
-        current_sl = self.current_params.stop_loss_pct
+        current_sl = params.stop_loss_pct
         max_change = current_sl * 0.5
         if abs(suggested_pct - current_sl) > max_change:
             logger.warning(f"止损调整幅度过大，限制在 ±50%")
@@ -392,14 +413,15 @@ class PolicyLayer:
                 suggested_pct = current_sl - max_change
 
         # 应用调整
-        old_value = self.current_params.stop_loss_pct
-        self.current_params.stop_loss_pct = suggested_pct
+        old_value = params.stop_loss_pct
+        params.stop_loss_pct = suggested_pct
 
         logger.info(f"📊 止损调整: {old_value:.2%} → {suggested_pct:.2%}")
         return True, PolicyAction.ADJUST_STOP_LOSS
 
     def _apply_take_profit_adjustment(
         self,
+        params: PolicyParameters,
         suggested_pct: float,
         context: TradingContext
     ) -> Tuple[bool, Optional[PolicyAction]]:
@@ -412,19 +434,20 @@ class PolicyLayer:
             suggested_pct = max(min_tp, min(max_tp, suggested_pct))
 
         # 确保止盈 > 止损
-        if suggested_pct <= self.current_params.stop_loss_pct:
-            logger.warning(f"止盈 {suggested_pct:.2%} 必须大于止损 {self.current_params.stop_loss_pct:.2%}")
-            suggested_pct = self.current_params.stop_loss_pct * 1.5
+        if suggested_pct <= params.stop_loss_pct:
+            logger.warning(f"止盈 {suggested_pct:.2%} 必须大于止损 {params.stop_loss_pct:.2%}")
+            suggested_pct = params.stop_loss_pct * 1.5
 
         # 应用调整
-        old_value = self.current_params.take_profit_pct
-        self.current_params.take_profit_pct = suggested_pct
+        old_value = params.take_profit_pct
+        params.take_profit_pct = suggested_pct
 
         logger.info(f"📊 止盈调整: {old_value:.2%} → {suggested_pct:.2%}")
         return True, PolicyAction.ADJUST_TAKE_PROFIT
 
     def _apply_trailing_stop_adjustment(
         self,
+        params: PolicyParameters,
         suggested_pct: Optional[float],
         enable: Optional[bool],
         context: TradingContext
@@ -440,15 +463,15 @@ class PolicyLayer:
                 logger.warning(f"移动止损建议 {suggested_pct:.2%} 超出边界 [{min_ts:.2%}, {max_ts:.2%}]")
                 suggested_pct = max(min_ts, min(max_ts, suggested_pct))
 
-            old_value = self.current_params.trailing_stop_pct
-            self.current_params.trailing_stop_pct = suggested_pct
+            old_value = params.trailing_stop_pct
+            params.trailing_stop_pct = suggested_pct
             logger.info(f"📊 移动止损调整: {old_value:.2%} → {suggested_pct:.2%}")
             action = PolicyAction.ADJUST_STOP_LOSS
 
         # 启用/禁用移动止损
         if enable is not None:
-            old_state = self.current_params.trailing_stop_enabled
-            self.current_params.trailing_stop_enabled = enable
+            old_state = params.trailing_stop_enabled
+            params.trailing_stop_enabled = enable
 
             if enable != old_state:
                 logger.info(f"📊 移动止损: {'启用' if enable else '禁用'}")
@@ -458,6 +481,7 @@ class PolicyLayer:
 
     def _apply_position_adjustment(
         self,
+        params: PolicyParameters,
         suggested_multiplier: float,
         context: TradingContext
     ) -> Tuple[bool, Optional[PolicyAction]]:
@@ -470,49 +494,51 @@ class PolicyLayer:
             suggested_multiplier = max(min_mult, min(max_mult, suggested_multiplier))
 
         # 应用调整
-        old_value = self.current_params.position_size_multiplier
-        self.current_params.position_size_multiplier = suggested_multiplier
+        old_value = params.position_size_multiplier
+        params.position_size_multiplier = suggested_multiplier
 
         logger.info(f"📊 仓位倍数调整: {old_value:.2f}x → {suggested_multiplier:.2f}x")
         return True, PolicyAction.ADJUST_POSITION_SIZE
 
     def _apply_risk_mode_switch(
         self,
+        params: PolicyParameters,
         suggested_mode: RiskMode,
         context: TradingContext
     ) -> Tuple[bool, Optional[PolicyAction]]:
         """应用风控模式切换"""
-        old_mode = self.current_params.risk_mode
+        old_mode = params.risk_mode
 
         if old_mode == suggested_mode:
             return False, None
 
         # 应用风控模式
-        self.current_params.risk_mode = suggested_mode
+        params.risk_mode = suggested_mode
 
         # 根据风控模式调整参数
         mode_params = self.risk_mode_params[suggested_mode]
 
         # 调整止损
         base_sl = config.STOP_LOSS_PERCENT
-        self.current_params.stop_loss_pct = base_sl * mode_params['stop_loss_multiplier']
+        params.stop_loss_pct = base_sl * mode_params['stop_loss_multiplier']
 
         # 调整止盈
         base_tp = config.TAKE_PROFIT_PERCENT
-        self.current_params.take_profit_pct = base_tp * mode_params['take_profit_multiplier']
+        params.take_profit_pct = base_tp * mode_params['take_profit_multiplier']
 
         # 调整仓位
-        self.current_params.position_size_multiplier = mode_params['position_multiplier']
+        params.position_size_multiplier = mode_params['position_multiplier']
 
         logger.info(f"🔄 风控模式切换: {old_mode.value} → {suggested_mode.value}")
-        logger.info(f"   止损: {self.current_params.stop_loss_pct:.2%}")
-        logger.info(f"   止盈: {self.current_params.take_profit_pct:.2%}")
-        logger.info(f"   仓位: {self.current_params.position_size_multiplier:.2f}x")
+        logger.info(f"   止损: {params.stop_loss_pct:.2%}")
+        logger.info(f"   止盈: {params.take_profit_pct:.2%}")
+        logger.info(f"   仓位: {params.position_size_multiplier:.2f}x")
 
         return True, PolicyAction.SWITCH_RISK_MODE
 
     def _apply_strategy_control(
         self,
+        params: PolicyParameters,
         to_enable: List[str],
         to_disable: List[str],
         context: TradingContext
@@ -522,22 +548,22 @@ class PolicyLayer:
 
         # 启用策略
         for strategy in to_enable:
-            if strategy not in self.current_params.enabled_strategies:
-                self.current_params.enabled_strategies.append(strategy)
+            if strategy not in params.enabled_strategies:
+                params.enabled_strategies.append(strategy)
                 logger.info(f"✅ 启用策略: {strategy}")
                 actions.append(PolicyAction.ENABLE_STRATEGY)
 
         # 禁用策略
         for strategy in to_disable:
-            if strategy in self.current_params.enabled_strategies:
-                self.current_params.enabled_strategies.remove(strategy)
+            if strategy in params.enabled_strategies:
+                params.enabled_strategies.remove(strategy)
                 logger.info(f"❌ 禁用策略: {strategy}")
                 actions.append(PolicyAction.DISABLE_STRATEGY)
 
         # 确保至少有一个策略启用
-        if not self.current_params.enabled_strategies:
+        if not params.enabled_strategies:
             logger.warning("⚠️ 所有策略被禁用，恢复默认策略")
-            self.current_params.enabled_strategies = config.ENABLE_STRATEGIES.copy()
+            params.enabled_strategies = config.ENABLE_STRATEGIES.copy()
             return False, []
 
         return len(actions) > 0, actions
@@ -545,11 +571,17 @@ class PolicyLayer:
     def get_current_parameters(self) -> PolicyParameters:
         """获取当前生效的策略参数"""
         # 检查决策是否过期
-        if self.current_params.last_decision and self.current_params.last_decision.is_expired():
-            logger.info("⏰ Policy 决策已过期，重置为默认参数")
-            self.current_params.reset_to_default()
-
-        return self.current_params
+        params = self.current_params
+        if params.last_decision and params.last_decision.is_expired():
+            with self._lock:
+                if self.current_params is params:
+                    logger.info("⏰ Policy 决策已过期，重置为默认参数")
+                    params = replace(params)
+                    params.reset_to_default()
+                    self.current_params = params
+                params = self.current_params
+
+        return params
 
     def get_stop_loss_percent(self) -> float:
         """获取当前止损百分比"""
@@ -581,7 +613,10 @@ class PolicyLayer:
 
     def force_reset(self):
         """强制重置为默认参数"""
-        self.current_params.reset_to_default()
+        with self._lock:
+            params = replace(self.current_params)
+            params.reset_to_default()
+            self.current_params = params
         logger.warning("🔄 Policy Layer 已强制重置")
 
     def get_status_report(self) -> Dict:
@@ -12,7 +12,7 @@ import matplotlib.pyplot as plt
 from config.settings import settings as config
 from strategies.strategies import (
     Signal, TradeSignal, get_strategy, 
-    analyze_all_strategies, STRATEGY_MAP
+    analyze_all_strategies, STRATEGY_MAP, get_required_warmup
 )
 from strategies.indicators import IndicatorCalculator
 from utils.logger_utils import get_logger
@@ -123,8 +123,8 @@ class Backtester:
             logger.info(f"策略: {strategies}")
             logger.info(f"初始资金: {self.initial_balance}")
         
-        # 需要足够的历史数据
-        warmup = 100
+        # 需要足够的历史数据（由策略声明的指标依赖推导）
+        warmup = get_required_warmup(strategies)
         
         for i in range(warmup, len(self.df)):
             # 获取到当前为止的数据
@@ -3,9 +3,10 @@ Trading Dashboard API - 主入口文件
 """
 import asyncio
 import os
+import time
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from apps.api.routes import ai as ai_routes
@@ -17,6 +18,7 @@ from apps.api.routes import change_requests as change_requests_routes
 from apps.api.routes import decisions as decisions_routes
 from apps.api.routes import history as history_routes
 from apps.api.routes import indicators as indicators_routes
+from apps.api.routes import metrics as metrics_routes
 from apps.api.routes import optimization as optimization_routes
 from apps.api.routes import positions as positions_routes
 from apps.api.routes import statistics as statistics_routes
@@ -24,6 +26,7 @@ from apps.api.routes import stream as stream_routes
 from apps.api.routes import trades as trades_routes
 from apps.api.routes import trends as trends_routes
 from apps.api.services.ticker_service import ticker_service
+from utils.logger_utils import get_metrics_logger
 
 # 加载环境变量
 load_dotenv()  # 加载 .env
@@ -64,6 +67,21 @@ app.include_router(statistics_routes.router)
 app.include_router(ai_routes.router)
 app.include_router(decisions_routes.router)
 app.include_router(stream_routes.router)
+app.include_router(metrics_routes.router)
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """记录每个路由的请求耗时（api.METHOD /path 模板）"""
+    start = time.perf_counter()
+    try:
+        return await call_next(request)
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        get_metrics_logger().record_latency(
+            f"api.{request.method} {path}", (time.perf_counter() - start) * 1000
+        )
 
 
 @app.on_event("startup")
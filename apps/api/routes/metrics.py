@@ -0,0 +1,33 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from apps.api.auth import get_current_user
+from utils.logger_utils import get_metrics_logger, load_metrics_snapshot
+from utils.metrics import render_prometheus
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+def _collect_snapshots():
+    """API 进程自身指标 + 交易机器人写入的快照文件"""
+    return [
+        ("api", get_metrics_logger().snapshot()),
+        ("bot", load_metrics_snapshot()),
+    ]
+
+
+@router.get("", response_model=Dict[str, Any])
+async def get_metrics(_: dict = Depends(get_current_user)) -> Dict[str, Any]:
+    """获取性能指标（各操作 p50/p95/p99/max、速率、内存/GC）"""
+    return {process: snapshot for process, snapshot in _collect_snapshots()}
+
+
+@router.get("/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics(_: dict = Depends(get_current_user)) -> PlainTextResponse:
+    """Prometheus 文本格式的性能指标"""
+    return PlainTextResponse(
+        render_prometheus(_collect_snapshots()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
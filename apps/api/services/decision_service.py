@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional
 
 from config.settings import settings as config
 from core.trader import BitgetTrader
+from exchange.rate_limiter import Priority, request_priority
 from risk.execution_filter import get_execution_filter
 from strategies.indicators import IndicatorCalculator
 from strategies.strategies import Signal, analyze_all_strategies, get_consensus_signal
@@ -23,6 +24,12 @@ class DecisionStatusService:
                 self._trader = await asyncio.to_thread(BitgetTrader)
         return self._trader
 
+    @staticmethod
+    async def _read(func):
+        """在线程中执行行情读取（状态展示请求走 ANALYTICS 限流通道，不挤占交易请求）"""
+        with request_priority(Priority.ANALYTICS):
+            return await asyncio.to_thread(func)
+
     async def get_status(self) -> Dict[str, Any]:
         status = self._build_base_status()
 
@@ -52,8 +59,8 @@ class DecisionStatusService:
         if not drawdown_allowed and drawdown_reason:
             status["blocking_reasons"].append(drawdown_reason)
 
-        df = await asyncio.to_thread(trader.fetch_ohlcv)
-        ticker = await asyncio.to_thread(trader.get_ticker)
+        df = await self._read(trader.fetch_ohlcv)
+        ticker = await self._read(trader.get_ticker)
 
         if df is None or df.empty:
             status["blocking_reasons"].append("ohlcv_unavailable")
@@ -71,7 +78,7 @@ class DecisionStatusService:
         signal = None
         if df is not None and not df.empty:
             if getattr(config, "MULTI_TIMEFRAME_ENABLED", False):
-                await asyncio.to_thread(trader.fetch_multi_timeframe_data)
+                await self._read(trader.fetch_multi_timeframe_data)
             signal = self._build_signal(df, market_state)
 
         if signal:
@@ -1,5 +1,7 @@
 """
 Ticker 服务 - 获取和缓存实时行情数据
+
+启用 MARKET_STREAM_ENABLED 时订阅行情推送事件更新缓存，推送中断时回退到 REST 轮询
 """
 import asyncio
 from datetime import datetime, timedelta
@@ -7,6 +9,8 @@ from typing import Optional
 from utils.logger_utils import get_logger
 from apps.api.models.ticker import Ticker
 from exchange.async_manager import AsyncExchangeManager
+from exchange.rate_limiter import Priority, request_priority
+from market_data import TICKER, TickerEvent, get_market_bus, start_market_stream
 
 logger = get_logger("ticker_service")
 
@@ -25,6 +29,7 @@ class TickerService:
         self._stale_threshold = 10.0  # 数据过期阈值（秒）- 从3秒优化为10秒
         self._exchange_manager: Optional[AsyncExchangeManager] = None
         self._symbol: Optional[str] = None
+        self._stream_enabled = False
 
     async def initialize(self):
         """初始化服务"""
@@ -39,7 +44,18 @@ class TickerService:
             # 获取交易对符号
             self._symbol = config.SYMBOL
 
-            logger.info(f"Ticker服务初始化成功 (交易对: {self._symbol})")
+            # 订阅行情推送
+            if getattr(config, 'MARKET_STREAM_ENABLED', False):
+                try:
+                    start_market_stream(config.ACTIVE_EXCHANGE, [self._symbol])
+                    self._stream_enabled = True
+                except Exception as e:
+                    logger.warning(f"行情推送启动失败，使用REST轮询: {e}")
+
+            logger.info(
+                f"Ticker服务初始化成功 (交易对: {self._symbol}, "
+                f"{'推送' if self._stream_enabled else '轮询'}模式)"
+            )
 
             # 立即刷新一次数据
             await self._refresh_ticker()
@@ -93,8 +109,9 @@ class TickerService:
             # 转换交易对格式
             exchange_symbol = self._convert_symbol_format(self._symbol)
 
-            # 获取行情数据
-            ticker_data = await self._exchange_manager.fetch_ticker_async(exchange_symbol)
+            # 获取行情数据（展示用途，走 ANALYTICS 限流通道）
+            with request_priority(Priority.ANALYTICS):
+                ticker_data = await self._exchange_manager.fetch_ticker_async(exchange_symbol)
 
             if not ticker_data:
                 logger.warning("获取行情数据失败")
@@ -118,11 +135,7 @@ class TickerService:
                 stale=False
             )
 
-            # 更新缓存
-            async with self._cache_lock:
-                self._cache = ticker
-                self._last_refresh = datetime.now()
-
+            await self._update_cache(ticker)
             logger.debug(f"Ticker数据已刷新: {ticker.symbol} @ {ticker.last}")
             return ticker
 
@@ -134,8 +147,35 @@ class TickerService:
                     self._cache.stale = True
             return None
 
+    async def _update_cache(self, ticker: Ticker):
+        """更新缓存"""
+        async with self._cache_lock:
+            self._cache = ticker
+            self._last_refresh = datetime.now()
+
+    async def _apply_event(self, event: TickerEvent) -> Ticker:
+        """用推送的行情事件更新缓存"""
+        ticker = Ticker(
+            symbol=self._symbol,
+            last=event.last,
+            bid=event.bid,
+            ask=event.ask,
+            volume=event.volume,
+            change_24h=event.change_pct,
+            high_24h=event.high,
+            low_24h=event.low,
+            timestamp=datetime.now(),
+            stale=False
+        )
+        await self._update_cache(ticker)
+        return ticker
+
     async def start_background_refresh(self):
         """启动后台刷新任务"""
+        if self._stream_enabled:
+            await self._consume_stream()
+            return
+
         logger.info(f"启动Ticker后台刷新任务 (间隔: {self._refresh_interval}秒)")
 
         while True:
@@ -150,5 +190,29 @@ class TickerService:
                 await asyncio.sleep(5)  # 出错后等待5秒再重试
 
 
+    async def _consume_stream(self):
+        """推送模式：每条行情事件立即更新缓存，刷新间隔内无事件时用 REST 补一次"""
+        logger.info("启动Ticker行情推送订阅")
+        subscription = get_market_bus().subscribe_async([TICKER], symbol=self._symbol)
+        try:
+            while True:
+                try:
+                    event = await subscription.get(timeout=self._refresh_interval)
+                    if event is None:
+                        await self._refresh_ticker()
+                        continue
+                    # 只保留最新一条，跳过积压的事件
+                    backlog = subscription.drain()
+                    await self._apply_event(backlog[-1] if backlog else event)
+                except asyncio.CancelledError:
+                    logger.info("Ticker行情推送订阅已取消")
+                    break
+                except Exception as e:
+                    logger.error(f"Ticker行情推送处理异常: {e}")
+                    await asyncio.sleep(1)
+        finally:
+            subscription.close()
+
+
 # 全局单例
 ticker_service = TickerService()
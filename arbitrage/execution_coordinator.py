@@ -8,6 +8,7 @@ from datetime import datetime
 from utils.logger_utils import get_logger
 from exchange.manager import ExchangeManager
 from exchange.interface import OrderResult
+from exchange.order_tracker import TIMEOUT, get_order_tracker
 from .models import ArbitrageOpportunity, ArbitrageTrade, TradeStatus
 
 logger = get_logger("execution_coordinator")
@@ -269,6 +270,8 @@ class ExecutionCoordinator:
         """
         监控订单执行状态
 
+        订单交给该交易所客户端的订单跟踪器批量轮询，这里只等待订单 Future。
+
         Args:
             exchange: 交易所实例
             order_id: 订单ID
@@ -276,40 +279,30 @@ class ExecutionCoordinator:
             timeout: 超时时间（秒）
 
         Returns:
-            最终订单结果
+            最终订单结果（超时返回 None）
         """
         if timeout is None:
             timeout = self.max_execution_time_per_leg
 
         start_time = time.time()
-        check_interval = 0.5  # 每0.5秒检查一次
-
         try:
-            while time.time() - start_time < timeout:
-                # 查询订单状态
-                order_status = exchange.get_order_status(order_id, symbol)
-
-                if not order_status:
-                    logger.warning(f"无法获取订单状态: {order_id}")
-                    time.sleep(check_interval)
-                    continue
-
-                # 检查订单是否完成
-                if order_status.success and order_status.filled_quantity > 0:
-                    elapsed = time.time() - start_time
-                    logger.info(f"订单执行完成: {order_id}, elapsed={elapsed:.2f}s")
-                    return order_status
-
-                # 检查订单是否失败
-                if order_status.error:
-                    logger.error(f"订单执行失败: {order_id}, error={order_status.error}")
-                    return order_status
-
-                time.sleep(check_interval)
-
-            # 超时
-            logger.error(f"订单监控超时: {order_id}, timeout={timeout}s")
-            return None
+            tracker = get_order_tracker(exchange.exchange, params=exchange._order_params())
+            order = tracker.track(order_id, symbol, timeout).result(timeout + 5)
+
+            if order.get('status') == TIMEOUT:
+                logger.error(f"订单监控超时: {order_id}, timeout={timeout}s")
+                return None
+
+            order_status = exchange._parse_order(order)
+            if not order_status.filled_quantity:
+                order_status.success = False
+                order_status.error = f"订单未成交: status={order.get('status')}"
+                logger.error(f"订单执行失败: {order_id}, error={order_status.error}")
+                return order_status
+
+            elapsed = time.time() - start_time
+            logger.info(f"订单执行完成: {order_id}, elapsed={elapsed:.2f}s")
+            return order_status
 
         except Exception as e:
             logger.error(f"订单监控异常: {e}", exc_info=True)
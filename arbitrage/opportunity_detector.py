@@ -4,6 +4,7 @@
 from typing import List, Dict, Optional, Tuple
 from utils.logger_utils import get_logger
 from exchange.manager import ExchangeManager
+from market_data.orderbook import OrderBook, BID, ASK, get_order_book
 from .models import SpreadData, ArbitrageOpportunity
 
 logger = get_logger("opportunity_detector")
@@ -104,8 +105,8 @@ class OpportunityDetector:
             sell_fee_rate = self._get_fee_rate(spread.exchange_b, "taker")
 
             # 估算滑点
-            buy_slippage = self._estimate_slippage(spread.exchange_a, amount)
-            sell_slippage = self._estimate_slippage(spread.exchange_b, amount)
+            buy_slippage = self._estimate_slippage(spread.exchange_a, amount, "buy")
+            sell_slippage = self._estimate_slippage(spread.exchange_b, amount, "sell")
 
             # 计算毛利润 (每USDT)
             gross_profit_per_unit = spread.sell_price - spread.buy_price
@@ -210,19 +211,26 @@ class OpportunityDetector:
         exchange_fees = self.fee_rates.get(exchange_name.lower(), {})
         return exchange_fees.get(order_type, 0.0006)  # 默认0.06%
 
-    def _estimate_slippage(self, exchange_name: str, amount: float) -> float:
+    def _estimate_slippage(self, exchange_name: str, amount: float, side: str = "buy") -> float:
         """
         估算滑点
 
         Args:
             exchange_name: 交易所名称
             amount: 交易金额
+            side: 'buy'（吃卖盘）或 'sell'（吃买盘）
 
         Returns:
             滑点率
         """
-        # 简化估算: 基于交易金额
-        # 实际应该基于订单簿深度动态计算
+        # 优先按共享订单簿计算成交 amount 的 VWAP 相对最优价的偏离
+        book = self._get_order_book(exchange_name)
+        if book is not None:
+            slippage = book.slippage(side, amount, quote=True)
+            if slippage is not None:
+                return slippage
+
+        # 订单簿不可用或深度不足: 基于交易金额的保守估算
         if amount < 100:
             return 0.0001  # 0.01%
         elif amount < 500:
@@ -242,22 +250,31 @@ class OpportunityDetector:
         Returns:
             订单簿深度(USDT)
         """
-        try:
-            exchange = self.exchange_manager.get_exchange(exchange_name)
-            orderbook = exchange.get_orderbook(self.symbol, limit=20)
+        book = self._get_order_book(exchange_name)
+        if book is None:
+            return None
 
-            if not orderbook:
-                return None
+        # 买卖盘前 20 档深度，返回较小的深度
+        bid_depth = book.depth(BID, levels=20)
+        ask_depth = book.depth(ASK, levels=20)
+        return min(bid_depth, ask_depth) if bid_depth > 0 and ask_depth > 0 else None
 
-            # 计算买卖盘深度
-            bids = orderbook.get('bids', [])
-            asks = orderbook.get('asks', [])
+    def _get_order_book(self, exchange_name: str) -> Optional[OrderBook]:
+        """
+        获取共享订单簿（快照过期时才重新拉取，同一轮检测中的深度和滑点计算共用一次请求）
 
-            bid_depth = sum(price * amount for price, amount in bids) if bids else 0
-            ask_depth = sum(price * amount for price, amount in asks) if asks else 0
+        Args:
+            exchange_name: 交易所名称
 
-            # 返回较小的深度
-            return min(bid_depth, ask_depth) if bid_depth > 0 and ask_depth > 0 else None
+        Returns:
+            订单簿；拉取失败或为空时返回 None
+        """
+        try:
+            exchange = self.exchange_manager.get_exchange(exchange_name)
+            book = get_order_book(exchange_name, self.symbol).refresh(
+                lambda: exchange.get_orderbook(self.symbol, limit=20)
+            )
+            return book if len(book) else None
 
         except Exception as e:
             logger.debug(f"获取订单簿深度失败 ({exchange_name}): {e}")
@@ -1,5 +1,8 @@
 """
 价差监控器 - 并行监控多个交易所价格并计算价差
+
+use_stream=True 时订阅各交易所的行情推送，任一交易所报价变化即重算价差（事件驱动）；
+否则按 monitor_interval 轮询 REST 行情。
 """
 import time
 import threading
@@ -11,6 +14,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils.logger_utils import get_logger
 from exchange.manager import ExchangeManager
 from exchange.interface import TickerData
+from market_data import TICKER, TickerEvent, get_market_bus, start_market_stream
 from .models import SpreadData
 
 logger = get_logger("spread_monitor")
@@ -35,6 +39,7 @@ class SpreadMonitor:
         self.exchanges = config.get("exchanges", ["bitget", "binance", "okx"])
         self.monitor_interval = config.get("monitor_interval", 1)  # 秒
         self.history_size = config.get("history_size", 100)
+        self.use_stream = config.get("use_stream", False)
 
         # 价差历史记录
         self.spread_history: deque = deque(maxlen=self.history_size)
@@ -45,6 +50,10 @@ class SpreadMonitor:
         # 监控控制
         self.running = False
         self.monitor_thread: Optional[threading.Thread] = None
+        self._stream_token: Optional[int] = None
+        self._stream_events: Dict[str, TickerEvent] = {}
+        self.stale_seconds = config.get("stream_stale_seconds", 10)
+        self._stream_lock = threading.Lock()
 
         logger.info(f"价差监控器初始化: symbol={self.symbol}, exchanges={self.exchanges}")
 
@@ -164,7 +173,10 @@ class SpreadMonitor:
         """
         # 获取价格
         prices = self.fetch_prices()
+        return self._process_prices(prices)
 
+    def _process_prices(self, prices: Dict[str, TickerData]) -> List[SpreadData]:
+        """根据各交易所价格计算价差并写入历史"""
         if len(prices) < 2:
             logger.warning(f"获取到的价格不足2个: {len(prices)}")
             return []
@@ -217,6 +229,10 @@ class SpreadMonitor:
             return
 
         self.running = True
+        if self.use_stream and self._start_stream():
+            logger.info("价差监控器已启动（行情推送模式）")
+            return
+
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
         logger.info("价差监控器已启动")
@@ -224,10 +240,49 @@ class SpreadMonitor:
     def stop(self):
         """停止监控"""
         self.running = False
+        if self._stream_token is not None:
+            get_market_bus().unsubscribe(self._stream_token)
+            self._stream_token = None
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
         logger.info("价差监控器已停止")
 
+    def _start_stream(self) -> bool:
+        """订阅各交易所行情推送，失败返回 False（回退轮询）"""
+        try:
+            self._stream_token = get_market_bus().subscribe(
+                TICKER, self._on_ticker_event, symbol=self.symbol
+            )
+            for exchange_name in self.exchanges:
+                start_market_stream(exchange_name, [self.symbol])
+            return True
+        except Exception as e:
+            logger.error(f"行情推送启动失败，改为轮询: {e}")
+            if self._stream_token is not None:
+                get_market_bus().unsubscribe(self._stream_token)
+                self._stream_token = None
+            return False
+
+    def _on_ticker_event(self, event: TickerEvent):
+        """行情事件回调：更新该交易所报价并重算价差"""
+        if event.exchange not in self.exchanges:
+            return
+        with self._stream_lock:
+            self._stream_events[event.exchange] = event
+            # 忽略长时间未更新的交易所（推送中断时不使用过期报价）
+            now = time.time()
+            prices = {
+                name: e.to_ticker_data() for name, e in self._stream_events.items()
+                if now - e.received_at <= self.stale_seconds
+            }
+            self.latest_prices = prices
+            spreads = self._process_prices(prices) if len(prices) >= 2 else []
+
+        if spreads:
+            max_spread = max(spreads, key=lambda s: s.spread_pct)
+            if max_spread.spread_pct > 0.1:  # 价差 > 0.1%
+                logger.info(f"最大价差: {max_spread}")
+
     def _monitor_loop(self):
         """监控循环"""
         logger.info("价差监控循环开始")
@@ -0,0 +1,390 @@
+"""
+Band-Limited 对冲策略回测快速路径
+
+与 BandLimitedHedgingStrategy.analyze() 逐根K线的决策逻辑完全一致，区别在于：
+- 状态保存在标量字段中，不再读写 state 字典
+- sigma_eff2 使用滑动窗口的增量和/平方和维护，不再每根K线做 pct_change().var()
+- 动作写入预分配的结构化数组（ACTION_DTYPE），不再构建 dict 再由引擎解析
+
+只用于回测；实盘仍走 BandLimitedHedgingStrategy.analyze()。
+两条路径的一致性由 tests/unit/test_band_limited_fast.py 逐根K线比对；策略新增了快速路径未覆盖的
+状态字段时 supports() 返回 False，引擎退回逐根K线路径。
+"""
+from typing import Optional
+
+import numpy as np
+
+# 动作结构化数组
+ACTION_DTYPE = np.dtype([
+    ('bar', np.int64),      # K线位置
+    ('side', np.int8),      # 1=long, -1=short
+    ('action', np.int8),    # 0=open, 1=close
+    ('qty', np.float64),
+    ('price', np.float64),
+    ('fee', np.float64),
+    ('pnl', np.float64),    # 毛盈亏（平仓）
+    ('reason', np.int8),    # ACTION_REASONS 下标
+])
+
+SIDE_LONG = 1
+SIDE_SHORT = -1
+ACTION_OPEN = 0
+ACTION_CLOSE = 1
+
+ACTION_REASONS = (
+    "初始化双向持仓",
+    "本金维持补仓",
+    "盈利侧平仓",
+    "利润迁移减仓",
+    "结构重建",
+    "退出减仓",
+)
+_R_INIT, _R_MAINTAIN, _R_TAKE_PROFIT, _R_MIGRATE, _R_REBUILD, _R_EXIT = range(len(ACTION_REASONS))
+
+# 单根K线最多产生的动作数（盈利侧平仓 + 利润迁移 + 结构重建x2 + 本金维持x2）
+_MAX_ACTIONS_PER_BAR = 6
+
+# 滑动方差每隔多少步做一次精确重算，避免累计误差
+_SIGMA_RESYNC_STEPS = 1024
+
+
+class BandLimitedFastPath:
+    """
+    Band-Limited 对冲策略的批量模拟器
+
+    用法:
+        strategy = get_strategy("band_limited_hedging", klines.iloc[0:51], **params)
+        fast = BandLimitedFastPath(strategy)
+        actions = fast.run(close, ts_seconds, start=50, window=51)
+    """
+
+    def __init__(self, strategy):
+        """
+        Args:
+            strategy: 已完成参数校验的 BandLimitedHedgingStrategy 实例（复用其参数与初始状态）
+        """
+        self.strategy = strategy
+
+        self.mes = strategy.mes
+        self.alpha = strategy.alpha
+        self.e_max = strategy.e_max
+        self.fee_rate = strategy.fee_rate
+        self.base_position_ratio = strategy.base_position_ratio
+        self.exit_eta = strategy.exit_eta
+        self.exit_mes_ratio = strategy.exit_mes_ratio
+        self.exit_epsilon = strategy.exit_epsilon
+        self.sigma_window = strategy.sigma_window
+        self.tau_max = strategy.tau_max
+        self.initial_capital = strategy.initial_capital
+        self.leverage = strategy.leverage
+        self.min_rebalance_profit = strategy.min_rebalance_profit
+        self.min_rebalance_profit_ratio = strategy.min_rebalance_profit_ratio
+        self.min_trade_qty = strategy.min_trade_qty
+        self.min_trade_notional = strategy.min_trade_notional
+        self.exit_sigma_k = float(strategy.params.get("exit_sigma_k", 0.01))
+        self.exit_sigma_consecutive = int(strategy.params.get("exit_sigma_consecutive", 10))
+
+        state = strategy.state
+        self.p_ref: Optional[float] = state["p_ref"]
+        self.long_qty = float(state["long_qty"])
+        self.long_avg = float(state["long_avg"])
+        self.short_qty = float(state["short_qty"])
+        self.short_avg = float(state["short_avg"])
+        self.mode = state["mode"]
+        self.rebalance_count = int(state["rebalance_count"])
+        self.low_sigma_streak = int(state["low_sigma_streak"])
+        self.last_rebalance_ts: Optional[float] = state["last_rebalance_ts"]
+        self.exit_ref: Optional[float] = state["exit_ref"]
+
+        self._actions = np.empty(0, dtype=ACTION_DTYPE)
+        self._count = 0
+        self._bar = 0
+
+    # ==================== 状态 ====================
+
+    # 快速路径镜像的策略状态字段
+    STATE_KEYS = frozenset({
+        "p_ref", "long_qty", "long_avg", "short_qty", "short_avg", "mode",
+        "rebalance_count", "low_sigma_streak", "last_rebalance_ts", "exit_ref",
+    })
+
+    @classmethod
+    def supports(cls, strategy) -> bool:
+        """策略状态是否完全由快速路径覆盖（策略新增状态字段后需同步快速路径）"""
+        return set(strategy.state) <= cls.STATE_KEYS
+
+    def state_dict(self) -> dict:
+        """以 BandLimitedHedgingStrategy.state 的格式导出当前状态"""
+        return {
+            "p_ref": self.p_ref,
+            "long_qty": self.long_qty,
+            "long_avg": self.long_avg,
+            "short_qty": self.short_qty,
+            "short_avg": self.short_avg,
+            "mode": self.mode,
+            "rebalance_count": self.rebalance_count,
+            "low_sigma_streak": self.low_sigma_streak,
+            "last_rebalance_ts": self.last_rebalance_ts,
+            "exit_ref": self.exit_ref,
+        }
+
+    def sync_strategy(self):
+        """把模拟结束时的状态写回策略实例"""
+        self.strategy.state.update(self.state_dict())
+
+    # ==================== 动作记录 ====================
+
+    def _emit(self, side: int, action: int, qty: float, price: float, pnl: float, reason: int):
+        if self._count >= len(self._actions):
+            grown = np.empty(max(64, len(self._actions) * 2), dtype=ACTION_DTYPE)
+            grown[:self._count] = self._actions[:self._count]
+            self._actions = grown
+        self._actions[self._count] = (
+            self._bar, side, action, qty, price, max(qty, 0.0) * price * self.fee_rate, pnl, reason
+        )
+        self._count += 1
+
+    # ==================== 仓位操作 ====================
+
+    def _is_dust(self, qty: float, price: float) -> bool:
+        return qty <= 0 or qty < self.min_trade_qty or (qty * price) < self.min_trade_notional
+
+    def _base_target_qty(self, price: float) -> float:
+        if price <= 0:
+            return 0.0
+        base_notional = self.initial_capital * self.leverage * max(self.base_position_ratio, 0.0) / 2
+        if base_notional <= 0:
+            return 0.0
+        return base_notional / price
+
+    def _open(self, side: int, qty: float, price: float, reason: int) -> bool:
+        if self._is_dust(qty, price):
+            return False
+        if side == SIDE_LONG:
+            new_qty = self.long_qty + qty
+            self.long_avg = (self.long_avg * self.long_qty + price * qty) / new_qty
+            self.long_qty = new_qty
+        else:
+            new_qty = self.short_qty + qty
+            self.short_avg = (self.short_avg * self.short_qty + price * qty) / new_qty
+            self.short_qty = new_qty
+        self._emit(side, ACTION_OPEN, qty, price, 0.0, reason)
+        return True
+
+    def _close(self, side: int, qty: float, price: float, reason: int) -> Optional[float]:
+        """平仓，返回净盈亏；数量过小时清零该侧仓位并返回 None"""
+        if self._is_dust(qty, price):
+            if side == SIDE_LONG:
+                self.long_qty = 0.0
+                self.long_avg = 0.0
+            else:
+                self.short_qty = 0.0
+                self.short_avg = 0.0
+            return None
+
+        if side == SIDE_LONG:
+            entry_price = self.long_avg
+            self.long_qty = max(self.long_qty - qty, 0.0)
+            if self.long_qty <= self.exit_epsilon:
+                self.long_qty = 0.0
+                self.long_avg = 0.0
+            gross_pnl = (price - entry_price) * qty
+        else:
+            entry_price = self.short_avg
+            self.short_qty = max(self.short_qty - qty, 0.0)
+            if self.short_qty <= self.exit_epsilon:
+                self.short_qty = 0.0
+                self.short_avg = 0.0
+            gross_pnl = (entry_price - price) * qty
+
+        self._emit(side, ACTION_CLOSE, qty, price, gross_pnl, reason)
+        return gross_pnl - max(qty, 0.0) * price * self.fee_rate
+
+    def _maintain_base_position(self, price: float):
+        target_qty = self._base_target_qty(price)
+        if target_qty <= 0:
+            return
+        if self.long_qty < target_qty:
+            self._open(SIDE_LONG, target_qty - self.long_qty, price, _R_MAINTAIN)
+        if self.short_qty < target_qty:
+            self._open(SIDE_SHORT, target_qty - self.short_qty, price, _R_MAINTAIN)
+
+    def _rebalance(self, side: int, price: float, ts: Optional[float]):
+        """side 为盈利侧（上破为 long，下破为 short）"""
+        profit_qty = self.long_qty if side == SIDE_LONG else self.short_qty
+        if profit_qty <= 0:
+            return
+
+        entry_price = self.long_avg if side == SIDE_LONG else self.short_avg
+        gross = (price - entry_price) * profit_qty if side == SIDE_LONG else (entry_price - price) * profit_qty
+        estimated_profit = gross - profit_qty * price * self.fee_rate
+        min_profit = max(
+            self.min_rebalance_profit,
+            profit_qty * price * self.fee_rate * self.min_rebalance_profit_ratio
+        )
+        if estimated_profit < min_profit:
+            return
+
+        net_profit = 0.0
+        closed = self._close(side, profit_qty, price, _R_TAKE_PROFIT)
+        if closed is not None:
+            net_profit = max(closed, 0.0)
+
+        loss_part = self.alpha * net_profit
+        rebuild_part = max(net_profit - loss_part, 0.0)
+
+        other = -side
+        other_qty = self.short_qty if other == SIDE_SHORT else self.long_qty
+        if other_qty > 0 and loss_part > 0:
+            self._close(other, min(other_qty, loss_part / price), price, _R_MIGRATE)
+
+        if rebuild_part > 0:
+            add_qty = rebuild_part / (2 * price)
+            self._open(SIDE_LONG, add_qty, price, _R_REBUILD)
+            self._open(SIDE_SHORT, add_qty, price, _R_REBUILD)
+
+        self._maintain_base_position(price)
+        self.p_ref = price
+        self.rebalance_count += 1
+        self.low_sigma_streak = 0
+        self.last_rebalance_ts = ts
+
+    def _exit_reduce(self, price: float):
+        if self.exit_ref is None:
+            self.exit_ref = price
+        exit_ref = self.exit_ref
+        rel_move = abs(price - exit_ref) / exit_ref if exit_ref else 0.0
+        if rel_move < self.exit_mes_ratio * self.mes:
+            return
+
+        if self.long_qty + self.short_qty <= self.exit_epsilon:
+            self.mode = "pause"
+            return
+
+        long_qty = 0.0 if self.long_qty <= self.exit_epsilon else self.long_qty * self.exit_eta
+        short_qty = 0.0 if self.short_qty <= self.exit_epsilon else self.short_qty * self.exit_eta
+
+        if long_qty > 0:
+            self._close(SIDE_LONG, long_qty, price, _R_EXIT)
+        if short_qty > 0:
+            self._close(SIDE_SHORT, short_qty, price, _R_EXIT)
+
+        if self.long_qty + self.short_qty <= self.exit_epsilon:
+            self.mode = "pause"
+            self.exit_ref = None
+        else:
+            self.exit_ref = price
+
+    def _check_exit_conditions(self, price: float, sigma_eff2: Optional[float]):
+        """净敞口与低波动退出判断（对应 analyze() 中 active/pause 分支的公共部分）"""
+        net_exposure = abs(self.long_qty - self.short_qty) * price
+        if self.e_max > 0 and net_exposure > self.e_max:
+            self.mode = "exit"
+        elif sigma_eff2 is not None:
+            if sigma_eff2 < self.exit_sigma_k * self.mes * self.fee_rate:
+                self.low_sigma_streak += 1
+            else:
+                self.low_sigma_streak = 0
+            if self.rebalance_count > 0 and self.low_sigma_streak >= self.exit_sigma_consecutive:
+                self.mode = "exit"
+
+    def step(self, price: float, ts: Optional[float], sigma_eff2: Optional[float]):
+        """处理一根K线（与 BandLimitedHedgingStrategy.analyze() 一致）"""
+        if self.p_ref is None:
+            self.p_ref = price
+            self.last_rebalance_ts = ts
+            init_qty = self._base_target_qty(price)
+            self._open(SIDE_LONG, init_qty, price, _R_INIT)
+            self._open(SIDE_SHORT, init_qty, price, _R_INIT)
+            return
+
+        if self.mode == "active":
+            if self.tau_max > 0 and self.last_rebalance_ts is not None and ts is not None:
+                if (ts - self.last_rebalance_ts) > self.tau_max:
+                    self.mode = "pause"
+            self._check_exit_conditions(price, sigma_eff2)
+
+        if self.mode == "pause":
+            self._check_exit_conditions(price, sigma_eff2)
+            if self.mode != "exit" and abs(price - self.p_ref) / self.p_ref >= self.mes:
+                self.mode = "active"
+
+        if self.mode == "exit":
+            self._exit_reduce(price)
+            return
+
+        if abs(price - self.p_ref) / self.p_ref < self.mes:
+            return
+
+        if price >= self.p_ref:
+            self._rebalance(SIDE_LONG, price, ts)
+        else:
+            self._rebalance(SIDE_SHORT, price, ts)
+
+    # ==================== 批量运行 ====================
+
+    def run(
+        self,
+        close: np.ndarray,
+        ts: Optional[np.ndarray] = None,
+        start: int = 50,
+        window: int = 51
+    ) -> np.ndarray:
+        """
+        对 close[start:] 逐根K线运行策略
+
+        Args:
+            close: 收盘价数组
+            ts: 每根K线的时间戳（秒），用于 tau_max 判断
+            start: 第一根参与决策的K线位置
+            window: 引擎传给策略的窗口长度（决定 sigma_eff2 的可用性和样本数）
+
+        Returns:
+            ACTION_DTYPE 结构化数组（按产生顺序）
+        """
+        close = np.asarray(close, dtype=np.float64)
+        n = len(close)
+        self._actions = np.empty(max(64, 2 * _MAX_ACTIONS_PER_BAR + (n - start)), dtype=ACTION_DTYPE)
+        self._count = 0
+
+        # sigma_eff2: 窗口内最近 k 个收益率的样本方差
+        sigma_enabled = window >= self.sigma_window + 1
+        k = min(self.sigma_window, window - 1)
+        returns = np.empty(n, dtype=np.float64)
+        returns[0] = np.nan
+        if n > 1:
+            returns[1:] = close[1:] / close[:-1] - 1.0
+
+        r_sum = 0.0
+        r_sq = 0.0
+        r_lo = 0        # 当前窗口内第一个收益率的位置
+        r_hi = -1       # 当前窗口内最后一个收益率的位置
+
+        for i in range(start, n):
+            self._bar = i
+
+            sigma_eff2 = None
+            if sigma_enabled and k > 0:
+                lo = max(i - k + 1, max(i - window + 1, 0) + 1)
+                if r_hi < 0 or (i - start) % _SIGMA_RESYNC_STEPS == 0:
+                    segment = returns[lo:i + 1]
+                    r_sum = float(segment.sum())
+                    r_sq = float(np.dot(segment, segment))
+                else:
+                    for j in range(r_hi + 1, i + 1):
+                        r_sum += returns[j]
+                        r_sq += returns[j] * returns[j]
+                    for j in range(r_lo, lo):
+                        r_sum -= returns[j]
+                        r_sq -= returns[j] * returns[j]
+                r_lo, r_hi = lo, i
+
+                count = i + 1 - lo
+                if count >= 2:
+                    sigma_eff2 = max((r_sq - r_sum * r_sum / count) / (count - 1), 0.0)
+                elif count == 1:
+                    sigma_eff2 = float('nan')
+
+            self.step(float(close[i]), None if ts is None else float(ts[i]), sigma_eff2)
+
+        return self._actions[:self._count]
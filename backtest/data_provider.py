@@ -4,7 +4,9 @@ Historical Data Provider - Fetch klines from Bitget
 import pandas as pd
 from datetime import datetime
 from exchange.adapters.bitget_adapter import BitgetAdapter
+from exchange.rate_limiter import Priority, request_priority
 from config.settings import settings as config
+from market_data.klines import parse_ohlcv
 
 
 class HistoricalDataProvider:
@@ -44,13 +46,15 @@ class HistoricalDataProvider:
 
         try:
             while current_start < end_ms:
-                klines = self.adapter.exchange.fetch_ohlcv(
-                    symbol,
-                    timeframe,
-                    since=current_start,
-                    limit=1000,
-                    params={"productType": "USDT-FUTURES"}
-                )
+                # 回测拉取走 ANALYTICS 限流通道，不挤占实盘下单
+                with request_priority(Priority.ANALYTICS):
+                    klines = self.adapter.exchange.fetch_ohlcv(
+                        symbol,
+                        timeframe,
+                        since=current_start,
+                        limit=1000,
+                        params={"productType": "USDT-FUTURES"}
+                    )
 
                 if not klines:
                     break
@@ -64,14 +68,8 @@ class HistoricalDataProvider:
             if not all_klines:
                 return pd.DataFrame()
 
-            df = pd.DataFrame(
-                all_klines,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-
-            return df[df.index <= pd.to_datetime(end_ms, unit='ms')]
+            df = parse_ohlcv(all_klines)
+            return df[df.index <= pd.Timestamp(end_ms, unit='ms')]
         finally:
             # 清理中间数据
             all_klines.clear()
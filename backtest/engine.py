@@ -1,9 +1,11 @@
 """
 Backtest Engine - Core backtesting logic
 """
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional
 from datetime import datetime
+from config.settings import settings as config
 from backtest.repository import BacktestRepository
 from backtest.repository_factory import get_summary_repository
 
@@ -26,7 +28,9 @@ class BacktestEngine:
             initial_capital: Starting capital
             strategy_params: Strategy parameters (支持多策略配置)
         """
-        from strategies.strategies import get_strategy, get_weighted_signal
+        from strategies.strategies import (
+            get_strategy, get_weighted_signal, get_required_warmup, get_backtest_window
+        )
 
         try:
             self.repo.update_session_status(session_id, "running")
@@ -64,8 +68,17 @@ class BacktestEngine:
                     print(f"Warning: Failed to update summary for session {session_id}: {e}")
                 return
 
-            for i in range(50, len(klines)):
-                window = klines.iloc[i-50:i+1]
+            # 起始位置由策略声明的指标依赖推导，窗口长度固定
+            if is_multi_strategy:
+                warmup = max((
+                    get_required_warmup([item.get("name")], **(item.get("params") or {}))
+                    for item in strategy_params["strategies"]
+                ), default=1)
+            else:
+                warmup = get_required_warmup([strategy_name], **(strategy_params or {}))
+
+            for i in range(warmup, len(klines)):
+                window = get_backtest_window(klines, i)
                 current_bar = klines.iloc[i]
 
                 try:
@@ -205,10 +218,13 @@ class BacktestEngine:
         strategy_params: Optional[Dict],
         initial_capital: float
     ) -> Dict:
-        from strategies.strategies import get_strategy
+        from strategies.strategies import get_strategy, get_required_warmup
+        from backtest.band_limited_fast import BandLimitedFastPath
 
         params = dict(strategy_params or {})
+        window_bars = int(getattr(config, "BACKTEST_WINDOW_BARS", 50))
         params.setdefault("initial_capital", initial_capital)
+        warmup = get_required_warmup(["band_limited_hedging"], **params)
 
         trade_count = 0
         win_count = 0
@@ -216,10 +232,20 @@ class BacktestEngine:
         total_pnl = 0.0
 
         open_trade_ids: Dict[str, List[int]] = {"long": [], "short": []}
-        strategy = get_strategy("band_limited_hedging", klines.iloc[0:51], **params)
+        strategy = get_strategy("band_limited_hedging", klines.iloc[0:window_bars + 1], **params)
 
-        for i in range(50, len(klines)):
-            window = klines.iloc[i-50:i+1]
+        use_fast_path = getattr(config, "BACKTEST_BAND_LIMITED_FAST_PATH", True)
+        if use_fast_path and not BandLimitedFastPath.supports(strategy):
+            print("Warning: Band-Limited 快速路径未覆盖当前策略状态，使用逐根K线路径")
+            use_fast_path = False
+
+        if use_fast_path:
+            return self._run_band_limited_fast(
+                session_id, klines, strategy, initial_capital, warmup, window_bars
+            )
+
+        for i in range(warmup, len(klines)):
+            window = klines.iloc[max(i - window_bars, 0):i + 1]
             current_bar = klines.iloc[i]
 
             try:
@@ -291,3 +317,95 @@ class BacktestEngine:
             "start_ts": int(klines.index[0].timestamp()),
             "end_ts": int(klines.index[-1].timestamp())
         }
+
+    def _run_band_limited_fast(
+        self,
+        session_id: str,
+        klines: pd.DataFrame,
+        strategy,
+        initial_capital: float,
+        warmup: int = 50,
+        window_bars: int = 50
+    ) -> Dict:
+        """
+        Band-Limited 回测快速路径：策略逻辑由 BandLimitedFastPath 批量运行，
+        动作以结构化数组返回，这里只负责落库与统计
+        """
+        from backtest.band_limited_fast import (
+            BandLimitedFastPath, ACTION_REASONS, ACTION_OPEN, SIDE_LONG
+        )
+
+        close = klines["close"].to_numpy(dtype=np.float64)
+        ts_seconds = klines.index.values.astype("datetime64[ns]").astype(np.int64) / 1e9
+
+        fast = BandLimitedFastPath(strategy)
+        actions = fast.run(close, ts_seconds, start=warmup, window=window_bars + 1)
+        fast.sync_strategy()
+
+        trade_count = 0
+        win_count = 0
+        win_pnl_sum = 0.0
+        total_pnl = 0.0
+        open_trade_ids: Dict[str, List[int]] = {"long": [], "short": []}
+
+        bars = actions["bar"].tolist()
+        sides = actions["side"].tolist()
+        kinds = actions["action"].tolist()
+        qtys = actions["qty"].tolist()
+        prices = actions["price"].tolist()
+        fees = actions["fee"].tolist()
+        pnls = actions["pnl"].tolist()
+        reasons = actions["reason"].tolist()
+
+        for bar, side_code, kind, qty, price, fee, gross_pnl, reason in zip(
+            bars, sides, kinds, qtys, prices, fees, pnls, reasons
+        ):
+            if qty <= 0:
+                continue
+
+            side = "long" if side_code == SIDE_LONG else "short"
+            trade = {
+                "ts": int(ts_seconds[bar]),
+                "symbol": "BTC/USDT:USDT",
+                "side": side,
+                "action": "open" if kind == ACTION_OPEN else "close",
+                "qty": qty,
+                "price": price,
+                "fee": fee,
+                "strategy_name": "band_limited_hedging",
+                "reason": ACTION_REASONS[reason]
+            }
+
+            if kind == ACTION_OPEN:
+                trade_id = self.repo.append_trade(session_id, trade)
+                open_trade_ids[side].append(trade_id)
+                total_pnl -= fee
+            else:
+                net_pnl = gross_pnl - fee
+                trade["pnl"] = net_pnl
+                trade["pnl_pct"] = (net_pnl / initial_capital) * 100
+                open_list = open_trade_ids[side]
+                trade["open_trade_id"] = open_list.pop(0) if open_list else None
+                self.repo.append_trade(session_id, trade)
+
+                total_pnl += net_pnl
+                if net_pnl > 0:
+                    win_count += 1
+                    win_pnl_sum += net_pnl
+
+            trade_count += 1
+
+        return {
+            "total_trades": trade_count,
+            "win_rate": win_count / trade_count if trade_count else 0,
+            "total_pnl": total_pnl,
+            "total_return": (total_pnl / initial_capital) * 100,
+            "max_drawdown": 0,
+            "sharpe": 0,
+            "profit_factor": 1.0,
+            "expectancy": total_pnl / trade_count if trade_count else 0,
+            "avg_win": win_pnl_sum / win_count if win_count else 0,
+            "avg_loss": 0,
+            "start_ts": int(klines.index[0].timestamp()),
+            "end_ts": int(klines.index[-1].timestamp())
+        }
@@ -42,7 +42,7 @@ class BacktestService:
         Returns:
             回测结果（包含指标和权益曲线）
         """
-        from strategies.strategies import get_strategy
+        from strategies.strategies import get_strategy, get_required_warmup, get_backtest_window
 
         try:
             await self.repo.update_run_status(run_id, "running")
@@ -53,8 +53,9 @@ class BacktestService:
             equity_curve = [initial_capital]
 
             # 回测循环
-            for i in range(50, len(klines)):
-                window = klines.iloc[i-50:i+1]
+            warmup = get_required_warmup([strategy_name], **(strategy_params or {}))
+            for i in range(warmup, len(klines)):
+                window = get_backtest_window(klines, i)
                 current_bar = klines.iloc[i]
 
                 # 生成信号（传递策略参数）
@@ -40,7 +40,7 @@ class ReplayEngine:
         Returns:
             回放结果
         """
-        from strategies.strategies import get_strategy
+        from strategies.strategies import get_strategy, get_required_warmup, get_backtest_window
 
         self.is_running = True
         cash = initial_capital
@@ -49,7 +49,8 @@ class ReplayEngine:
         equity_curve = [initial_capital]
 
         try:
-            for i in range(50, len(klines)):
+            warmup = get_required_warmup([strategy_name])
+            for i in range(warmup, len(klines)):
                 if not self.is_running:
                     break
 
@@ -57,7 +58,7 @@ class ReplayEngine:
                 while self.is_paused and self.is_running:
                     await asyncio.sleep(0.1)
 
-                window = klines.iloc[i-50:i+1]
+                window = get_backtest_window(klines, i)
                 current_bar = klines.iloc[i]
 
                 # 触发tick回调
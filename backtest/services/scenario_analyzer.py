@@ -3,12 +3,40 @@
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from strategies.market_regime import MarketRegimeDetector, MarketRegime, regime_lookback
 
 
 class ScenarioAnalyzer:
     """场景分析器"""
 
+    @staticmethod
+    def classify_states(klines: pd.DataFrame, period: int = 20) -> pd.Series:
+        """
+        一次性计算每根K线的市场状态
+
+        复用 MarketRegimeDetector.detect_series 的市场状态列：
+        趋势市直接判定为 trending，其余按收益率波动率区分 volatile / ranging。
+
+        Args:
+            klines: K线数据
+            period: 波动率计算周期
+
+        Returns:
+            与 klines 索引对齐的状态序列，指标预热期为 'unknown'
+        """
+        regimes = MarketRegimeDetector.detect_series(klines)['regime']
+        volatility = klines['close'].pct_change().rolling(period).std()
+
+        states = np.where(
+            regimes == MarketRegime.TRENDING.value, 'trending',
+            np.where(volatility > 0.03, 'volatile', 'ranging')
+        )
+        states = np.where(regimes.isna(), 'unknown', states)
+
+        return pd.Series(states, index=klines.index)
+
     @staticmethod
     def detect_market_state(klines: pd.DataFrame) -> str:
         """
@@ -23,25 +51,13 @@ class ScenarioAnalyzer:
         if len(klines) < 20:
             return 'unknown'
 
-        # 计算ADX（平均趋向指标）
-        adx = ScenarioAnalyzer._calculate_adx(klines)
-
-        # 计算波动率
-        volatility = ScenarioAnalyzer._calculate_volatility(klines)
-
-        # 判断市场状态
-        if adx > 25:
-            return 'trending'  # 趋势市
-        elif volatility > 0.03:
-            return 'volatile'  # 高波动
-        else:
-            return 'ranging'   # 震荡市
+        return str(ScenarioAnalyzer.classify_states(klines).iloc[-1])
 
     @staticmethod
     def analyze_by_scenario(
         trades: List[Dict[str, Any]],
         klines: pd.DataFrame,
-        window_size: int = 100
+        window_size: Optional[int] = None
     ) -> Dict[str, Dict[str, Any]]:
         """
         按场景分析回测结果
@@ -49,13 +65,19 @@ class ScenarioAnalyzer:
         Args:
             trades: 交易记录
             klines: K线数据
-            window_size: 场景窗口大小
+            window_size: 场景窗口大小，None 时取市场状态指标所需的预热长度
 
         Returns:
             各场景的指标统计
         """
         scenarios = {'trending': [], 'ranging': [], 'volatile': []}
 
+        if window_size is None:
+            window_size = regime_lookback()
+
+        # 市场状态只计算一次，交易按所在位置查表
+        states = ScenarioAnalyzer.classify_states(klines)
+
         # 将交易按场景分类
         for trade in trades:
             if trade.get('action') != 'close':
@@ -68,9 +90,10 @@ class ScenarioAnalyzer:
             if idx < window_size:
                 continue
 
-            # 获取交易前的窗口数据
-            window = klines.iloc[idx - window_size:idx]
-            state = ScenarioAnalyzer.detect_market_state(window)
+            # 交易前最后一根K线的市场状态
+            state = states.iloc[idx - 1]
+            if state not in scenarios:
+                continue
 
             scenarios[state].append(trade)
 
@@ -97,41 +120,3 @@ class ScenarioAnalyzer:
             }
 
         return results
-
-    @staticmethod
-    def _calculate_adx(klines: pd.DataFrame, period: int = 14) -> float:
-        """计算ADX指标"""
-        high = klines['high'].values
-        low = klines['low'].values
-        close = klines['close'].values
-
-        # 计算+DM和-DM
-        plus_dm = np.maximum(high[1:] - high[:-1], 0)
-        minus_dm = np.maximum(low[:-1] - low[1:], 0)
-
-        # 计算TR
-        tr1 = high[1:] - low[1:]
-        tr2 = np.abs(high[1:] - close[:-1])
-        tr3 = np.abs(low[1:] - close[:-1])
-        tr = np.maximum(tr1, np.maximum(tr2, tr3))
-
-        # 平滑
-        if len(tr) < period:
-            return 0
-
-        atr = np.mean(tr[-period:])
-        plus_di = 100 * np.mean(plus_dm[-period:]) / atr if atr > 0 else 0
-        minus_di = 100 * np.mean(minus_dm[-period:]) / atr if atr > 0 else 0
-
-        # 计算ADX
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di) if (plus_di + minus_di) > 0 else 0
-
-        return dx
-
-    @staticmethod
-    def _calculate_volatility(klines: pd.DataFrame, period: int = 20) -> float:
-        """计算波动率"""
-        returns = klines['close'].pct_change().dropna()
-        if len(returns) < period:
-            return 0
-        return float(returns.tail(period).std())
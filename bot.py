@@ -1,6 +1,7 @@
 import time
 import asyncio
 import signal
+import threading
 import sys
 import json
 import os
@@ -13,36 +14,47 @@ from config.settings import settings as config
 from config.validator import validate_config
 from exchange.manager import ExchangeManager
 from exchange.legacy_adapter import LegacyAdapter
-from risk.risk_manager import RiskManager
+from exchange.decorators import get_retry_stats
+from exchange.market_cache import get_market_cache
+from exchange.rate_limiter import get_rate_limiter
+from risk.risk_manager import RiskManager, StopLossResult
+from risk.stop_watcher import StopLossWatcher
 from strategies.strategies import (
     Signal, TradeSignal,
     get_strategy, analyze_all_strategies, STRATEGY_MAP,
     BandLimitedHedgingStrategy
 )
-from strategies.market_regime import MarketRegimeDetector
-from utils.logger_utils import get_logger, db, notifier, MetricsLogger
-from monitoring.status_monitor import StatusMonitorScheduler
+from strategies.market_regime import MarketRegimeDetector, RegimeTracker
+from utils.logger_utils import get_logger, db, notifier, get_metrics_logger
+from utils.startup_profiler import get_startup_profiler
 from ai.claude_analyzer import get_claude_analyzer
 from ai.claude_periodic_analyzer import get_claude_periodic_analyzer
 from strategies.trend_filter import get_trend_filter
 from strategies.direction_filter import get_direction_filter
 from strategies.indicators import IndicatorCalculator
 from core.shadow_mode import get_shadow_tracker
+from core.cycle_scheduler import CycleScheduler, EVALUATE, PRICE
+from core.background_analysis import BackgroundAnalysisWorker
 from ai.claude_guardrails import get_guardrails
-from ai.policy_layer import get_policy_layer
-from ai.claude_policy_analyzer import get_claude_policy_analyzer
-from core.trading_context_builder import get_context_builder
-from ai.ml_predictor import get_ml_predictor  # 原版ML预测器
-from ai.ml_predictor_lite import get_ml_predictor_lite  # 优化版ML预测器
 from risk.execution_filter import ExecutionFilter  # 执行层风控
 from monitoring.order_health_monitor import get_order_health_monitor  # 订单健康监控
+from market_data import (  # 行情推送
+    TICKER, CANDLE_CLOSE, get_market_bus, start_market_stream, stop_market_streams
+)
 
-# 套利引擎（可选）
-if getattr(config, 'ENABLE_ARBITRAGE', False):
-    from arbitrage.engine import ArbitrageEngine
+# 可选子系统（状态监控、Policy Layer、ML 过滤器、套利引擎）在 TradingBot.__init__ 中按配置启用时才导入，
+# 未启用的模块不再拖慢启动
 
 logger = get_logger("bot")
 
+# 主循环 trader.get_klines() 使用的K线周期（适配器默认值），未配置 CYCLE_TIMEFRAMES 时按该周期收盘评估
+MAIN_LOOP_KLINE_TIMEFRAME = "5m"
+
+# 主循环低频定时任务
+STATUS_TASK = "status"
+CLAUDE_TASK = "claude"
+POLICY_TASK = "policy"
+
 
 class TradingBot:
     """量化交易机器人"""
@@ -93,6 +105,7 @@ class TradingBot:
 
         # 初始化状态监控调度器
         if hasattr(config, 'ENABLE_STATUS_MONITOR') and config.ENABLE_STATUS_MONITOR:
+            from monitoring.status_monitor import StatusMonitorScheduler
             self.status_monitor = StatusMonitorScheduler(
                 interval_minutes=config.STATUS_MONITOR_INTERVAL,
                 enabled=True
@@ -115,11 +128,38 @@ class TradingBot:
         self.guardrails = get_guardrails()
 
         # 初始化性能指标记录器（Phase 0）
-        self.metrics_logger = MetricsLogger()
+        self.metrics_logger = get_metrics_logger()
         self.cycle_count = 0  # Phase 4: 循环计数器，用于定期内存监控
 
+        # 快速止损通道（STOP_WATCHER_ENABLED）：收到价格即检查止损，不等待主循环
+        self._close_lock = threading.RLock()
+        if getattr(config, 'STOP_WATCHER_ENABLED', False):
+            self.stop_watcher = StopLossWatcher(
+                self.risk_manager, self._on_fast_stop, metrics_logger=self.metrics_logger
+            )
+        else:
+            self.stop_watcher = None
+
+        # 行情推送（MARKET_STREAM_ENABLED）：事件唤醒主循环，行情优先取推送数据
+        self.market_bus = get_market_bus()
+        self.market_stream = None
+        self._stream_subscription = None
+
+        # 主循环调度（CYCLE_SCHEDULER_ENABLED）：K线收盘评估策略，持仓时按价格更新检查止损
+        self.cycle_timeframes = list(getattr(config, 'CYCLE_TIMEFRAMES', [MAIN_LOOP_KLINE_TIMEFRAME]))
+        self.scheduler = self._create_scheduler()
+        self._last_df = None
+
+        # 后台分析（BACKGROUND_ANALYSIS_ENABLED）：Claude 定时分析和 Policy 更新不阻塞主循环
+        self.background_worker = BackgroundAnalysisWorker(
+            inline=not getattr(config, 'BACKGROUND_ANALYSIS_ENABLED', True)
+        )
+
         # 初始化 Policy Layer（策略治理层）
         if getattr(config, 'ENABLE_POLICY_LAYER', False):
+            from ai.policy_layer import get_policy_layer
+            from ai.claude_policy_analyzer import get_claude_policy_analyzer
+            from core.trading_context_builder import get_context_builder
             self.policy_layer = get_policy_layer()
             self.policy_analyzer = get_claude_policy_analyzer()
             self.context_builder = get_context_builder(self.risk_manager)
@@ -138,6 +178,9 @@ class TradingBot:
             force_lite = getattr(config, 'ML_FORCE_LITE', False)
             use_lite = getattr(config, 'ML_USE_LITE_VERSION', True)
 
+            from ai.ml_predictor import get_ml_predictor  # 原版ML预测器
+            from ai.ml_predictor_lite import get_ml_predictor_lite  # 优化版ML预测器
+
             if force_lite:
                 self.ml_predictor = get_ml_predictor_lite()
                 version = "优化版（强制）"
@@ -174,6 +217,8 @@ class TradingBot:
                 "symbol": getattr(config, 'ARBITRAGE_SYMBOL', 'BTCUSDT'),
                 "exchanges": getattr(config, 'ARBITRAGE_EXCHANGES', ['bitget', 'binance', 'okx']),
                 "monitor_interval": getattr(config, 'SPREAD_MONITOR_INTERVAL', 1),
+                "use_stream": getattr(config, 'MARKET_STREAM_ENABLED', False),
+                "stream_stale_seconds": getattr(config, 'MARKET_STREAM_STALE_SECONDS', 10),
                 "history_size": getattr(config, 'SPREAD_HISTORY_SIZE', 100),
                 "min_spread_threshold": getattr(config, 'MIN_SPREAD_THRESHOLD', 0.3),
                 "min_net_profit_threshold": getattr(config, 'MIN_NET_PROFIT_THRESHOLD', 1.0),
@@ -199,6 +244,8 @@ class TradingBot:
                     "okx": {"maker": 0.0002, "taker": 0.0005},
                 }),
             }
+            from arbitrage.engine import ArbitrageEngine
+
             # 为套利引擎创建独立的 ExchangeManager 实例（避免线程安全问题）
             arbitrage_exchange_manager = ExchangeManager()
             arbitrage_exchange_manager.initialize()
@@ -216,6 +263,11 @@ class TradingBot:
         self.heartbeat_count = 0  # 心跳计数器
         self.HEARTBEAT_INTERVAL = 60  # 每60次循环（约5分钟）打印一次心跳
 
+        # 市场状态跟踪器：同一批K线只计算一次，新K线增量计算
+        self.regime_tracker = RegimeTracker(
+            hysteresis=getattr(config, 'REGIME_HYSTERESIS_ENABLED', False)
+        )
+
         # 初始化 Band-Limited Hedging 模式
         self._init_band_limited_mode()
 
@@ -286,12 +338,25 @@ class TradingBot:
         
         # 检查现有持仓
         self._check_existing_positions()
-        
+
+        # 行情推送
+        if self._start_market_stream():
+            self._stream_subscription = self.market_bus.subscribe_queue(
+                [CANDLE_CLOSE, TICKER], symbol=config.SYMBOL, exchange=self.market_stream.exchange
+            )
+        self._start_stop_watcher()
+
         # 主循环
         self.running = True
-        logger.info(f"开始监控，默认检查间隔: {config.DEFAULT_CHECK_INTERVAL} 秒")
-        if config.ENABLE_DYNAMIC_CHECK_INTERVAL:
-            logger.info(f"动态价格更新已启用，持仓时检查间隔: {config.POSITION_CHECK_INTERVAL} 秒")
+        if self.scheduler:
+            logger.info(
+                f"开始监控，策略评估对齐 {'/'.join(self.cycle_timeframes)} K线收盘，"
+                f"持仓时止损检查间隔: {self.scheduler.price_interval} 秒"
+            )
+        else:
+            logger.info(f"开始监控，默认检查间隔: {config.DEFAULT_CHECK_INTERVAL} 秒")
+            if config.ENABLE_DYNAMIC_CHECK_INTERVAL:
+                logger.info(f"动态价格更新已启用，持仓时检查间隔: {config.POSITION_CHECK_INTERVAL} 秒")
 
         # 启动套利引擎（如果启用）
         if self.arbitrage_engine:
@@ -303,8 +368,11 @@ class TradingBot:
         error_backoff_seconds = getattr(config, 'ERROR_BACKOFF_SECONDS', 10)
 
         while self.running:
+            tasks = set()
             try:
-                self._main_loop()
+                tasks = self._poll_scheduler()
+                if tasks is None or tasks:
+                    self._main_loop(tasks)
                 consecutive_errors = 0  # 成功执行，重置错误计数
             except KeyboardInterrupt:
                 logger.info("收到中断信号，正在停止...")
@@ -314,6 +382,8 @@ class TradingBot:
                 consecutive_errors += 1
                 logger.error(f"主循环异常 (连续错误: {consecutive_errors}/{max_consecutive_errors}): {e}")
                 logger.error(traceback.format_exc())
+                # poll() 已消费收盘评估标记，本轮异常时重新登记，避免该根K线被跳过
+                self._retry_evaluation(self._task_due(tasks, EVALUATE))
 
                 # 通知错误
                 try:
@@ -335,23 +405,32 @@ class TradingBot:
 
 
             # 刷新数据库缓冲区
-            try:
-                db.flush_buffers()
-            except Exception as e:
-                logger.error(f"刷新数据库缓冲区失败: {e}")
+            self._persist("main_loop")
             # 等待下一次检查 - 动态调整检查间隔
             if self.running:
-                # 根据是否有持仓动态调整检查间隔
-                if config.ENABLE_DYNAMIC_CHECK_INTERVAL and self.risk_manager.has_position():
-                    check_interval = config.POSITION_CHECK_INTERVAL
-                else:
-                    check_interval = config.DEFAULT_CHECK_INTERVAL
+                self._wait_next_cycle(self._next_check_interval())
 
-                time.sleep(check_interval)
-        
+        self._stop_stop_watcher()
+        self._stop_market_stream()
         logger.info("机器人已停止")
     
 
+    def _record_first_decision(self):
+        """
+        记录启动到首次完成决策的耗时（--startup-report 时同时输出启动耗时报告）
+
+        在策略 / 风控完成一次评估后调用（无论是否产生开平仓信号）；K线获取失败或本轮只跑
+        定时任务不算决策。
+        """
+        profiler = get_startup_profiler()
+        elapsed = profiler.mark("首次决策")
+        if elapsed is None:
+            return
+        logger.info(f"🚀 启动到首次决策耗时 {elapsed:.2f}s")
+        if profiler.report_enabled:
+            profiler.uninstall_import_hook()
+            logger.info("\n" + profiler.report())
+
     async def start_async(self):
         """启动机器人（异步版本）"""
         logger.info("=" * 50)
@@ -371,12 +450,25 @@ class TradingBot:
         
         # 检查现有持仓
         self._check_existing_positions()
-        
+
+        # 行情推送
+        if self._start_market_stream():
+            self._stream_subscription = self.market_bus.subscribe_async(
+                [CANDLE_CLOSE, TICKER], symbol=config.SYMBOL, exchange=self.market_stream.exchange
+            )
+        self._start_stop_watcher()
+
         # 主循环
         self.running = True
-        logger.info(f"开始监控，默认检查间隔: {config.DEFAULT_CHECK_INTERVAL} 秒")
-        if config.ENABLE_DYNAMIC_CHECK_INTERVAL:
-            logger.info(f"动态价格更新已启用，持仓时检查间隔: {config.POSITION_CHECK_INTERVAL} 秒")
+        if self.scheduler:
+            logger.info(
+                f"开始监控，策略评估对齐 {'/'.join(self.cycle_timeframes)} K线收盘，"
+                f"持仓时止损检查间隔: {self.scheduler.price_interval} 秒"
+            )
+        else:
+            logger.info(f"开始监控，默认检查间隔: {config.DEFAULT_CHECK_INTERVAL} 秒")
+            if config.ENABLE_DYNAMIC_CHECK_INTERVAL:
+                logger.info(f"动态价格更新已启用，持仓时检查间隔: {config.POSITION_CHECK_INTERVAL} 秒")
 
         # 启动套利引擎（如果启用）
         if self.arbitrage_engine:
@@ -387,41 +479,47 @@ class TradingBot:
         async_start_time = time.time()
 
         while self.running:
+            tasks = set()
             try:
-                await self._main_loop_async()
+                tasks = self._poll_scheduler()
+                if tasks is None or tasks:
+                    await self._main_loop_async(tasks)
             except Exception as e:
                 import traceback
                 logger.error(f"主循环异常: {e}")
                 logger.error(traceback.format_exc())
+                self._retry_evaluation(self._task_due(tasks, EVALUATE))
                 notifier.notify_error(str(e))
 
             
             # 刷新数据库缓冲区
-            try:
-                db.flush_buffers()
-            except Exception as e:
-                logger.error(f"刷新数据库缓冲区失败: {e}")
+            self._persist("main_loop_async")
             
             # 等待下一次检查 - 动态调整检查间隔（使用异步sleep）
             if self.running:
-                # 根据是否有持仓动态调整检查间隔
-                if config.ENABLE_DYNAMIC_CHECK_INTERVAL and self.risk_manager.has_position():
-                    check_interval = config.POSITION_CHECK_INTERVAL
-                else:
-                    check_interval = config.DEFAULT_CHECK_INTERVAL
-
-                await asyncio.sleep(check_interval)
+                await self._wait_next_cycle_async(self._next_check_interval())
         
+        self._stop_stop_watcher()
+        self._stop_market_stream()
+
+        # 关闭持久异步客户端
+        try:
+            await self.trader.close_async()
+        except Exception as e:
+            logger.debug(f"关闭异步客户端失败: {e}")
+
         # 记录异步模式运行时长
         async_duration = time.time() - async_start_time
         logger.info(f"异步模式运行时长: {async_duration:.2f}秒")
         logger.info("机器人已停止")
 
 
-    async def _main_loop_async(self):
-        """主循环逻辑（异步版本）"""
+    async def _main_loop_async(self, tasks=None):
+        """主循环逻辑（异步版本），tasks 含义同 _main_loop"""
         # Phase 0: 记录循环开始时间
         loop_start = time.time()
+        evaluate = self._task_due(tasks, EVALUATE)
+        phase_prefix = "main_loop_async"
 
         # Phase 4: 增加循环计数器
         self.cycle_count += 1
@@ -434,103 +532,136 @@ class TradingBot:
             except Exception as e:
                 logger.debug(f"获取内存使用失败: {e}")
         
-        # 获取K线数据
-        df = self.trader.get_klines()
+        # 并发获取K线、行情和持仓（持久异步客户端，每个请求单独超时）
+        # 只做价格检查/定时任务时复用上次收盘评估的K线
+        fetch_timeout = getattr(config, 'ASYNC_FETCH_TIMEOUT', 5.0)
+        if not evaluate and self._last_df is not None:
+            klines_task = asyncio.create_task(self._cached_klines())
+        else:
+            klines_task = asyncio.create_task(self._timed_fetch(
+                "klines", self.trader.get_klines_async(timeout=fetch_timeout)
+            ))
+        ticker_task = asyncio.create_task(self._timed_fetch(
+            "ticker", self._get_ticker_async(fetch_timeout)
+        ))
+        positions_task = asyncio.create_task(self._timed_fetch(
+            "positions", self.trader.get_positions_async(timeout=fetch_timeout)
+        ))
+        pending = [klines_task, ticker_task, positions_task]
+
+        df, ticker = await asyncio.gather(klines_task, ticker_task)
+        self.metrics_logger.record_latency("main_loop_async.fetch", (time.time() - loop_start) * 1000)
         if df is None or df.empty:
             logger.warning("获取K线数据失败")
+            self._retry_evaluation(evaluate)
+            self._cancel_tasks(pending)
             return
+        self._last_df = df
 
-        # 获取当前价格
-        ticker = self.trader.get_ticker()
         if not ticker:
             logger.warning("获取行情失败")
+            self._retry_evaluation(evaluate)
+            self._cancel_tasks(pending)
             return
 
         current_price = ticker.last
 
+        # 快速止损通道：主循环取得的价格也立即检查
+        if self.stop_watcher:
+            self.stop_watcher.on_price(current_price)
+
         # 更新状态监控的价格历史
         if self.status_monitor:
             self.status_monitor.update_price(current_price)
 
-        # 检查并推送状态监控
-        if self.status_monitor:
-            try:
-                self.status_monitor.check_and_push(self.trader, self.risk_manager)
-            except Exception as e:
-                logger.error(f"状态监控推送失败: {e}")
-
         # 获取当前持仓
-        positions = self.trader.get_positions()
-        has_position = len(positions) > 0
-
-        # 检查并执行Claude定时分析
-        if self.claude_periodic_analyzer:
-            try:
-                # 计算技术指标
-                indicator_calc = IndicatorCalculator(df)
-                indicators = indicator_calc.calculate_all()
-
-                # 准备持仓信息
-                position_info = None
-                if has_position:
-                    pos = positions[0]
-                    pnl_percent = (pos['unrealized_pnl'] / (pos['entry_price'] * pos['amount'])) * 100 if pos['amount'] > 0 else 0
-                    position_info = {
-                        'side': pos['side'],
-                        'amount': pos['amount'],
-                        'entry_price': pos['entry_price'],
-                        'unrealized_pnl': pos['unrealized_pnl'],
-                        'pnl_percent': pnl_percent
-                    }
-
-                # 场景2：执行30分钟定时分析
-                self.claude_periodic_analyzer.check_and_analyze(
-                    df, current_price, indicators, position_info
-                )
-
-                # 场景3：检查是否需要生成每日报告（每天早上8点）
-                if self.claude_periodic_analyzer.should_generate_daily_report():
-                    # 获取昨日交易历史
-                    trades_history = self._get_yesterday_trades()
-
-                    # 生成每日报告
-                    self.claude_periodic_analyzer.generate_daily_report(
-                        df, current_price, indicators, position_info, trades_history
-                    )
+        positions = await positions_task
+        if positions is None:
+            logger.warning("获取持仓失败")
+            self._retry_evaluation(evaluate)
+            self._cancel_tasks(pending)
+            return
 
-            except Exception as e:
-                logger.error(f"Claude定时分析失败: {e}")
+        # 检查并推送状态监控（线程中执行，与本轮评估并行）
+        # 推送线程只读本轮数据的快照，不与策略评估并发使用同步客户端和 RiskManager；
+            # 余额只读，不持平仓锁读取，避免带重试的慢请求拖住快速止损平仓
+        if self.status_monitor and self._task_due(tasks, STATUS_TASK):
+            from monitoring.status_monitor import TraderSnapshot
+
+            snapshot = TraderSnapshot(df, positions, ticker, balance_reader=self.trader.get_balance)
+            risk_snapshot = TraderSnapshot.snapshot_risk(self.risk_manager)
+            pending.append(asyncio.create_task(self._timed_fetch(
+                "status_push",
+                asyncio.to_thread(self.status_monitor.check_and_push, snapshot, risk_snapshot),
+                error_message="状态监控推送失败"
+            )))
+        has_position = len(positions) > 0
+        evaluate_start = time.time()
 
-        # Policy Layer 定期更新（新增）
-        if self.policy_layer and self._should_update_policy():
-            try:
-                # 计算技术指标（如果还没有计算）
-                if 'indicators' not in locals():
-                    indicator_calc = IndicatorCalculator(df)
-                    indicators = indicator_calc.calculate_all()
+        # Claude 定时分析 / Policy Layer 更新：后台执行，本轮只提交快照并应用已完成的结果
+        self._run_periodic_analysis(tasks, df, current_price, positions, phase_prefix)
 
-                self._update_policy_layer(df, current_price, indicators)
-            except Exception as e:
-                logger.error(f"Policy Layer 更新失败: {e}")
-                import traceback
-                logger.debug(traceback.format_exc())
+        if not (evaluate or self._task_due(tasks, PRICE)):
+            await self._finish_async_cycle(loop_start, evaluate_start, pending, "[异步模式]")
+            return
 
+        # 决策与下单走同步交易接口（带阻塞重试），放到线程中执行，不占用事件循环
         # Band-Limited Hedging 模式：使用专门的循环逻辑
         if self.is_band_limited_mode:
-            self._run_band_limited_cycle(df, current_price)
-            # Phase 0: 记录循环总延迟
-            loop_duration = (time.time() - loop_start) * 1000
-            self.metrics_logger.record_latency("main_loop_async", loop_duration)
-            if self.cycle_count % 50 == 0:
-                logger.info(f"[异步模式-Band-Limited] 第 {self.cycle_count} 次循环完成，耗时: {loop_duration:.2f}ms")
+            await asyncio.to_thread(self._run_band_limited_cycle, df, current_price)
+            await self._finish_async_cycle(loop_start, evaluate_start, pending, "[异步模式-Band-Limited]")
             return
 
         if has_position:
-            # 有持仓：检查风控和退出信号
-            self._check_exit_conditions(df, current_price, positions[0])
-        else:
+            # 有持仓：检查风控和退出信号（策略退出只在收盘评估时检查）
+            await asyncio.to_thread(
+                self._check_exit_conditions, df, current_price, positions[0], check_strategy=evaluate
+            )
+        elif evaluate:
             # 无持仓：检查开仓信号
-            self._check_entry_conditions(df, current_price)
+            await asyncio.to_thread(self._check_entry_conditions, df, current_price)
+
+        await self._finish_async_cycle(loop_start, evaluate_start, pending, "[异步模式]")
+
+    def _persist(self, prefix: str):
+        """刷新数据库缓冲区并定期写入指标快照（计入 {prefix}.persistence）"""
+        with self.metrics_logger.timer(f"{prefix}.persistence"):
+            try:
+                db.flush_buffers()
+            except Exception as e:
+                logger.error(f"刷新数据库缓冲区失败: {e}")
+            self.metrics_logger.maybe_write_snapshot()
+
+    async def _timed_fetch(self, phase: str, awaitable, error_message: str = None):
+        """
+        等待一个异步请求并记录耗时到 main_loop_async.{phase}
+
+        失败时记录日志并返回 None，不影响同一轮的其他请求
+        """
+        start = time.time()
+        try:
+            return await awaitable
+        except Exception as e:
+            logger.warning(f"{error_message or f'异步获取 {phase} 失败'}: {e}")
+            return None
+        finally:
+            self.metrics_logger.record_latency(f"main_loop_async.{phase}", (time.time() - start) * 1000)
+
+    async def _cached_klines(self):
+        """返回上次收盘评估的K线（与其他异步请求并发时占位）"""
+        return self._last_df
+
+    @staticmethod
+    def _cancel_tasks(tasks):
+        """取消本轮未完成的异步任务"""
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    async def _finish_async_cycle(self, loop_start: float, evaluate_start: float, pending, label: str):
+        """等待本轮后台任务（状态推送）并记录各阶段耗时"""
+        self.metrics_logger.record_latency("main_loop_async.evaluate", (time.time() - evaluate_start) * 1000)
+        await asyncio.gather(*pending, return_exceptions=True)
 
         # Phase 0: 记录循环总延迟
         loop_duration = (time.time() - loop_start) * 1000  # 转换为毫秒
@@ -538,7 +669,214 @@ class TradingBot:
 
         # 记录性能对比日志
         if self.cycle_count % 50 == 0:
-            logger.info(f"[异步模式] 第 {self.cycle_count} 次循环完成，耗时: {loop_duration:.2f}ms")
+            logger.info(
+                f"{label} 第 {self.cycle_count} 次循环完成，耗时: {loop_duration:.2f}ms "
+                f"({self.metrics_logger.format_breakdown('main_loop_async')})"
+            )
+
+    # ==================== 主循环调度 ====================
+
+    def _create_scheduler(self) -> Optional[CycleScheduler]:
+        """创建K线收盘对齐的主循环调度器（CYCLE_SCHEDULER_ENABLED）"""
+        if not getattr(config, 'CYCLE_SCHEDULER_ENABLED', False):
+            return None
+        if config.ENABLE_DYNAMIC_CHECK_INTERVAL:
+            price_interval = config.POSITION_CHECK_INTERVAL
+        else:
+            price_interval = config.DEFAULT_CHECK_INTERVAL
+        return CycleScheduler(
+            self.cycle_timeframes,
+            price_interval=price_interval,
+            close_delay=getattr(config, 'CYCLE_CANDLE_CLOSE_DELAY', 1.0),
+            max_wait=getattr(config, 'CYCLE_MAX_WAIT', 5),
+            timers={
+                STATUS_TASK: getattr(config, 'CYCLE_STATUS_INTERVAL', 30),
+                CLAUDE_TASK: getattr(config, 'CYCLE_AI_INTERVAL', 60),
+                POLICY_TASK: getattr(config, 'CYCLE_POLICY_INTERVAL', 60),
+            },
+        )
+
+    def _poll_scheduler(self):
+        """本轮到期的任务；未启用调度器时返回 None（执行全部任务）"""
+        if not self.scheduler:
+            return None
+        return self.scheduler.poll(self.risk_manager.has_position())
+
+    @staticmethod
+    def _task_due(tasks, name: str) -> bool:
+        return tasks is None or name in tasks
+
+    def _retry_evaluation(self, evaluate: bool):
+        """收盘评估未完成（K线获取失败）时稍后重试，不等到下一个收盘"""
+        if evaluate and self.scheduler:
+            self.scheduler.request_evaluation(delay=getattr(config, 'DEFAULT_CHECK_INTERVAL', 1))
+
+    def _next_check_interval(self) -> float:
+        """距离下一轮的最长等待时间"""
+        has_position = self.risk_manager.has_position()
+        if self.scheduler:
+            return self.scheduler.seconds_until_next(has_position)
+        # 根据是否有持仓动态调整检查间隔
+        if config.ENABLE_DYNAMIC_CHECK_INTERVAL and has_position:
+            return config.POSITION_CHECK_INTERVAL
+        return config.DEFAULT_CHECK_INTERVAL
+
+    def _on_stream_event(self, event, has_position: bool) -> bool:
+        """把推送事件交给调度器，返回是否应立即开始下一轮"""
+        if self.scheduler is None:
+            return event.topic == CANDLE_CLOSE or has_position
+        if event.topic == CANDLE_CLOSE:
+            self.scheduler.on_candle_close(event.timeframe, event.timestamp)
+        else:
+            self.scheduler.on_price_update()
+        return self.scheduler.seconds_until_next(has_position) == 0
+
+    # ==================== 快速止损通道 ====================
+
+    def _start_stop_watcher(self):
+        """启动快速止损通道：有行情推送时订阅推送，否则独立线程轮询价格"""
+        if not self.stop_watcher:
+            return
+        if self.market_stream:
+            self.stop_watcher.attach_stream(self.market_bus, config.SYMBOL, exchange=self.market_stream.exchange)
+        else:
+            self.stop_watcher.start_polling(
+                self._fetch_last_price, getattr(config, 'STOP_WATCHER_POLL_INTERVAL', 0.5)
+            )
+
+    def _stop_stop_watcher(self):
+        """停止快速止损通道（输出止损延迟报告）"""
+        if self.stop_watcher:
+            self.stop_watcher.stop()
+
+    def _fetch_last_price(self) -> Optional[float]:
+        """快速止损通道的轮询价格来源"""
+        ticker = self.trader.get_ticker()
+        return ticker.last if ticker else None
+
+    def _on_fast_stop(self, result: StopLossResult) -> bool:
+        """快速止损通道触发：立即平仓（在推送/轮询线程中执行）"""
+        with self._close_lock:
+            position = self.risk_manager.position
+            if position is None:
+                return False
+            position_data = {
+                'side': position.side,
+                'amount': position.amount,
+                'entry_price': position.entry_price,
+            }
+            success = self._execute_close_position(position_data, result.reason, "risk", result.current_price)
+            if success:
+                # 主循环下一轮不再对同一持仓做止损检查
+                self.risk_manager.clear_position()
+            return success
+
+    # ==================== 行情推送 ====================
+
+    def _start_market_stream(self) -> bool:
+        """启动行情推送（MARKET_STREAM_ENABLED），失败时保持轮询"""
+        if not getattr(config, 'MARKET_STREAM_ENABLED', False):
+            return False
+        try:
+            self.market_stream = start_market_stream(
+                self.trader.get_exchange_name(), [config.SYMBOL], self.cycle_timeframes
+            )
+        except Exception as e:
+            logger.warning(f"行情推送启动失败，使用轮询: {e}")
+            self.market_stream = None
+            return False
+
+        if self.status_monitor:
+            self.status_monitor.attach_stream(self.market_bus, config.SYMBOL)
+        logger.info(
+            f"✅ 行情推送已启用 ({self.market_stream.transport}): "
+            f"{'/'.join(self.cycle_timeframes)} 收盘及持仓时行情变化立即触发检查"
+        )
+        return True
+
+    def _stop_market_stream(self):
+        """停止行情推送"""
+        if self._stream_subscription:
+            self._stream_subscription.close()
+            self._stream_subscription = None
+        if self.market_stream:
+            if self.status_monitor:
+                self.status_monitor.detach_stream()
+            stop_market_streams()
+            self.market_stream = None
+
+    def _get_stream_ticker(self):
+        """推送行情（未过期时）转换为 TickerData，否则返回 None"""
+        if not self.market_stream:
+            return None
+        event = self.market_bus.latest(
+            TICKER, config.SYMBOL, exchange=self.market_stream.exchange,
+            max_age=getattr(config, 'MARKET_STREAM_STALE_SECONDS', 10)
+        )
+        return event.to_ticker_data() if event else None
+
+    async def _get_ticker_async(self, timeout: float):
+        """优先使用推送行情，过期时异步请求REST"""
+        ticker = self._get_stream_ticker()
+        if ticker:
+            return ticker
+        return await self.trader.get_ticker_async(timeout=timeout)
+
+    def _wait_next_cycle(self, timeout: float):
+        """
+        等待下一轮检查
+
+        推送模式下K线收盘（持仓时任一行情变化）立即返回，最短间隔
+        MARKET_STREAM_MIN_CYCLE_INTERVAL，最长等待 timeout；未启用推送时等同 time.sleep(timeout)。
+        启用调度器时收盘/行情事件转交调度器，由调度器判断是否有任务到期。
+        """
+        subscription = self._stream_subscription
+        if subscription is None:
+            time.sleep(timeout)
+            return
+
+        wait_start = time.time()
+        deadline = wait_start + timeout
+        has_position = self.risk_manager.has_position()
+        while self.running:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            event = subscription.get(timeout=remaining)
+            if event is None or self._on_stream_event(event, has_position):
+                break
+        for event in subscription.drain():
+            self._on_stream_event(event, has_position)
+
+        min_interval = getattr(config, 'MARKET_STREAM_MIN_CYCLE_INTERVAL', 0.2)
+        elapsed = time.time() - wait_start
+        if elapsed < min_interval:
+            time.sleep(min_interval - elapsed)
+
+    async def _wait_next_cycle_async(self, timeout: float):
+        """_wait_next_cycle 的异步版本"""
+        subscription = self._stream_subscription
+        if subscription is None:
+            await asyncio.sleep(timeout)
+            return
+
+        wait_start = time.time()
+        deadline = wait_start + timeout
+        has_position = self.risk_manager.has_position()
+        while self.running:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            event = await subscription.get(timeout=remaining)
+            if event is None or self._on_stream_event(event, has_position):
+                break
+        for event in subscription.drain():
+            self._on_stream_event(event, has_position)
+
+        min_interval = getattr(config, 'MARKET_STREAM_MIN_CYCLE_INTERVAL', 0.2)
+        elapsed = time.time() - wait_start
+        if elapsed < min_interval:
+            await asyncio.sleep(min_interval - elapsed)
 
     def _show_config(self):
         """显示配置信息"""
@@ -617,11 +955,17 @@ class TradingBot:
         else:
             logger.info("\n📊 [Band-Limited] 当前无持仓 - 将初始化双向持仓")
     
-    def _main_loop(self):
-        """主循环逻辑"""
+    def _main_loop(self, tasks=None):
+        """
+        主循环逻辑
+
+        Args:
+            tasks: 调度器给出的本轮任务（None 表示执行全部任务）
+        """
         # Phase 0: 记录循环开始时间
         loop_start = time.time()
-
+        evaluate = self._task_due(tasks, EVALUATE)
+        phase_prefix = "main_loop"
 
         # Phase 4: 增加循环计数器
         self.cycle_count += 1
@@ -633,26 +977,34 @@ class TradingBot:
                 logger.debug(f"内存使用: RSS={mem_usage.get('rss', 0):.1f}MB")
             except Exception as e:
                 logger.debug(f"获取内存使用失败: {e}")
-        # 获取K线数据
-        df = self.trader.get_klines()
+        # 获取K线数据（只做价格检查/定时任务时复用上次收盘评估的K线）
+        fetch_start = time.time()
+        df = self._last_df if not evaluate and self._last_df is not None else self.trader.get_klines()
         if df is None or df.empty:
             logger.warning("获取K线数据失败")
+            self._retry_evaluation(evaluate)
             return
+        self._last_df = df
 
-        # 获取当前价格
-        ticker = self.trader.get_ticker()
+        # 获取当前价格（推送行情未过期时不请求REST）
+        ticker = self._get_stream_ticker() or self.trader.get_ticker()
         if not ticker:
             logger.warning("获取行情失败")
+            self._retry_evaluation(evaluate)
             return
 
         current_price = ticker.last
 
+        # 快速止损通道：主循环取得的价格也立即检查
+        if self.stop_watcher:
+            self.stop_watcher.on_price(current_price)
+
         # 更新状态监控的价格历史
         if self.status_monitor:
             self.status_monitor.update_price(current_price)
 
         # 检查并推送状态监控
-        if self.status_monitor:
+        if self.status_monitor and self._task_due(tasks, STATUS_TASK):
             try:
                 self.status_monitor.check_and_push(self.trader, self.risk_manager)
             except Exception as e:
@@ -661,58 +1013,13 @@ class TradingBot:
         # 获取当前持仓
         positions = self.trader.get_positions()
         has_position = len(positions) > 0
+        self.metrics_logger.record_latency("main_loop.fetch", (time.time() - fetch_start) * 1000)
 
-        # 检查并执行Claude定时分析
-        if self.claude_periodic_analyzer:
-            try:
-                # 计算技术指标
-                indicator_calc = IndicatorCalculator(df)
-                indicators = indicator_calc.calculate_all()
-
-                # 准备持仓信息
-                position_info = None
-                if has_position:
-                    pos = positions[0]
-                    pnl_percent = (pos['unrealized_pnl'] / (pos['entry_price'] * pos['amount'])) * 100 if pos['amount'] > 0 else 0
-                    position_info = {
-                        'side': pos['side'],
-                        'amount': pos['amount'],
-                        'entry_price': pos['entry_price'],
-                        'unrealized_pnl': pos['unrealized_pnl'],
-                        'pnl_percent': pnl_percent
-                    }
-
-                # 场景2：执行30分钟定时分析
-                self.claude_periodic_analyzer.check_and_analyze(
-                    df, current_price, indicators, position_info
-                )
-
-                # 场景3：检查是否需要生成每日报告（每天早上8点）
-                if self.claude_periodic_analyzer.should_generate_daily_report():
-                    # 获取昨日交易历史
-                    trades_history = self._get_yesterday_trades()
-
-                    # 生成每日报告
-                    self.claude_periodic_analyzer.generate_daily_report(
-                        df, current_price, indicators, position_info, trades_history
-                    )
-
-            except Exception as e:
-                logger.error(f"Claude定时分析失败: {e}")
-
-        # Policy Layer 定期更新（新增）
-        if self.policy_layer and self._should_update_policy():
-            try:
-                # 计算技术指标（如果还没有计算）
-                if 'indicators' not in locals():
-                    indicator_calc = IndicatorCalculator(df)
-                    indicators = indicator_calc.calculate_all()
+        # Claude 定时分析 / Policy Layer 更新：后台执行，本轮只提交快照并应用已完成的结果
+        self._run_periodic_analysis(tasks, df, current_price, positions, phase_prefix)
 
-                self._update_policy_layer(df, current_price, indicators)
-            except Exception as e:
-                logger.error(f"Policy Layer 更新失败: {e}")
-                import traceback
-                logger.debug(traceback.format_exc())
+        if not (evaluate or self._task_due(tasks, PRICE)):
+            return
 
         # Band-Limited Hedging 模式：使用专门的循环逻辑
         if self.is_band_limited_mode:
@@ -723,9 +1030,9 @@ class TradingBot:
             return
 
         if has_position:
-            # 有持仓：检查风控和退出信号
-            self._check_exit_conditions(df, current_price, positions[0])
-        else:
+            # 有持仓：检查风控和退出信号（策略退出只在收盘评估时检查）
+            self._check_exit_conditions(df, current_price, positions[0], check_strategy=evaluate)
+        elif evaluate:
             # 无持仓：检查开仓信号
             self._check_entry_conditions(df, current_price)
 
@@ -733,6 +1040,82 @@ class TradingBot:
         loop_duration = (time.time() - loop_start) * 1000  # 转换为毫秒
         self.metrics_logger.record_latency("main_loop", loop_duration)
 
+    @staticmethod
+    def _position_info(positions: List[Dict]) -> Optional[Dict]:
+        """供 Claude 分析使用的持仓信息"""
+        if not positions:
+            return None
+        pos = positions[0]
+        pnl_percent = (pos['unrealized_pnl'] / (pos['entry_price'] * pos['amount'])) * 100 if pos['amount'] > 0 else 0
+        return {
+            'side': pos['side'],
+            'amount': pos['amount'],
+            'entry_price': pos['entry_price'],
+            'unrealized_pnl': pos['unrealized_pnl'],
+            'pnl_percent': pnl_percent
+        }
+
+    def _run_periodic_analysis(self, tasks, df, current_price, positions, phase_prefix: str):
+        """
+        提交 Claude 定时分析和 Policy Layer 更新到后台线程，并应用已完成的结果
+
+        主循环只付出拍摄快照的开销；指标计算和 LLM 调用都在后台线程完成。
+        """
+        snapshot = None
+
+        if self.claude_periodic_analyzer and self._task_due(tasks, CLAUDE_TASK):
+            claude_start = time.time()
+            snapshot = self.background_worker.snapshot(df, current_price, self._position_info(positions))
+            self.background_worker.submit(CLAUDE_TASK, snapshot, self._claude_analysis_job)
+            self.metrics_logger.record_latency(f"{phase_prefix}.claude", (time.time() - claude_start) * 1000)
+
+        if (self.policy_layer and self._task_due(tasks, POLICY_TASK)
+                and not self.background_worker.is_busy(POLICY_TASK) and self._should_update_policy()):
+            policy_start = time.time()
+            if snapshot is None:
+                snapshot = self.background_worker.snapshot(df, current_price, self._position_info(positions))
+            self.background_worker.submit(POLICY_TASK, snapshot, self._policy_analysis_job)
+            self.metrics_logger.record_latency(f"{phase_prefix}.policy", (time.time() - policy_start) * 1000)
+
+        self._apply_background_results(positions)
+
+    def _claude_analysis_job(self, snapshot):
+        """后台任务：Claude 定时分析（场景2）和每日报告（场景3）"""
+        position_info = dict(snapshot.position_info) if snapshot.position_info else None
+
+        # 场景2：执行30分钟定时分析
+        self.claude_periodic_analyzer.check_and_analyze(
+            snapshot.df, snapshot.current_price, snapshot.indicators, position_info
+        )
+
+        # 场景3：检查是否需要生成每日报告（每天早上8点）
+        if self.claude_periodic_analyzer.should_generate_daily_report():
+            trades_history = self._get_yesterday_trades()
+            self.claude_periodic_analyzer.generate_daily_report(
+                snapshot.df, snapshot.current_price, snapshot.indicators, position_info, trades_history
+            )
+
+    def _policy_analysis_job(self, snapshot):
+        """后台任务：构建交易上下文并调用 Claude 进行策略治理分析"""
+        logger.info("🔄 开始 Policy Layer 更新...")
+        context = self.context_builder.build_context(snapshot.df, snapshot.current_price, snapshot.indicators)
+        decision = self.policy_analyzer.analyze_for_policy(context, snapshot.df, snapshot.indicators)
+        return context, decision
+
+    def _apply_background_results(self, positions: List[Dict]):
+        """在交易线程上应用后台任务结果；持仓已变化的 Policy 决策视为过期丢弃"""
+        current_side = positions[0]['side'] if positions else None
+        for result in self.background_worker.drain():
+            if result.name != POLICY_TASK:
+                continue
+            if result.snapshot.position_side != current_side:
+                logger.info(
+                    f"持仓已变化（{result.snapshot.position_side} → {current_side}），丢弃基于旧快照的 Policy 决策"
+                )
+                continue
+            context, decision = result.value
+            self._apply_policy_decision(decision, context)
+
     def _get_yesterday_trades(self) -> List[Dict]:
         """
         获取昨日交易历史
@@ -771,8 +1154,7 @@ class TradingBot:
         self.heartbeat_count += 1
         if self.heartbeat_count >= self.HEARTBEAT_INTERVAL:
             # 快速检测市场状态用于心跳日志
-            detector_temp = MarketRegimeDetector(df)
-            regime_temp = detector_temp.detect()
+            regime_temp = self.regime_tracker.detect(df)
             logger.info(f"💓 系统运行中 | 价格: {current_price:.2f} | 市场: {regime_temp.regime.value.upper()} | 无持仓")
             self.heartbeat_count = 0
 
@@ -782,9 +1164,9 @@ class TradingBot:
             logger.debug(f"风控限制: {reason}")
             return
 
-        # 市场状态检测
+        # 市场状态检测（与心跳日志共用跟踪器缓存）
         detector = MarketRegimeDetector(df)
-        regime_info = detector.detect()
+        regime_info = self.regime_tracker.detect(df)
 
         # 检查是否适合交易
         can_trade, trade_reason = detector.should_trade(regime_info)
@@ -816,14 +1198,19 @@ class TradingBot:
             selected_strategies = [s for s in selected_strategies if s != "band_limited_hedging"]
 
         # 运行选定的策略（如果有）
+        # 策略与下方的过滤指标共享同一个计算器，相同指标只计算一次
+        ind = IndicatorCalculator(df)
         signals = []
         if selected_strategies:
-            signals = analyze_all_strategies(df, selected_strategies)
+            with self.metrics_logger.timer("evaluate.strategies"):
+                signals = analyze_all_strategies(df, selected_strategies, indicator_calc=ind)
+            self._record_first_decision()
 
         # ML信号过滤（如果启用）
         if self.ml_predictor is not None and signals:
             try:
-                filtered_signals, predictions = self.ml_predictor.filter_signals(signals, df)
+                with self.metrics_logger.timer("evaluate.filters"):
+                    filtered_signals, predictions = self.ml_predictor.filter_signals(signals, df)
 
                 # 记录过滤结果
                 if config.ML_LOG_PREDICTIONS and predictions:
@@ -853,7 +1240,7 @@ class TradingBot:
                 strategy_agreement = max(long_signals, short_signals) / total_signals
 
         # 计算技术指标（用于趋势过滤和 Claude 分析）
-        ind = IndicatorCalculator(df)
+        indicators_start = time.time()
         indicators = {
             'rsi': ind.rsi().iloc[-1] if len(df) >= 14 else 50,
             'macd': ind.macd()['macd'].iloc[-1] if len(df) >= 26 else 0,
@@ -872,6 +1259,7 @@ class TradingBot:
             'trend_direction': ind.trend_direction().iloc[-1] if len(df) >= 21 else 0,
             'trend_strength': ind.trend_strength().iloc[-1] if len(df) >= 21 else 0,
         }
+        self.metrics_logger.record_latency("evaluate.indicators", (time.time() - indicators_start) * 1000)
 
         # 找到第一个有效的开仓信号
         for trade_signal in signals:
@@ -881,7 +1269,8 @@ class TradingBot:
                 trade_id = f"{trade_signal.strategy}_{datetime.now().isoformat()}"
 
                 # 趋势过滤检查
-                trend_pass, trend_reason = self.trend_filter.check_signal(df, trade_signal, indicators)
+                with self.metrics_logger.timer("evaluate.filters"):
+                    trend_pass, trend_reason = self.trend_filter.check_signal(df, trade_signal, indicators)
                 if not trend_pass:
                     logger.warning(f"❌ 趋势过滤拒绝: {trend_reason}")
                     # 影子模式：记录被趋势过滤拒绝的信号
@@ -903,9 +1292,10 @@ class TradingBot:
                     continue
 
                 # 方向过滤检查（对做多信号要求更严格）
-                direction_pass, direction_reason = self.direction_filter.filter_signal(
-                    trade_signal, df, strategy_agreement
-                )
+                with self.metrics_logger.timer("evaluate.filters"):
+                    direction_pass, direction_reason = self.direction_filter.filter_signal(
+                        trade_signal, df, strategy_agreement
+                    )
                 if not direction_pass:
                     logger.warning(f"❌ 方向过滤拒绝: {direction_reason}")
                     # 影子模式：记录被方向过滤拒绝的信号
@@ -949,9 +1339,10 @@ class TradingBot:
                     continue
 
                 # Claude AI 分析
-                claude_pass, claude_reason, claude_details = self.claude_analyzer.analyze_signal(
-                    df, current_price, trade_signal, indicators
-                )
+                with self.metrics_logger.timer("evaluate.claude"):
+                    claude_pass, claude_reason, claude_details = self.claude_analyzer.analyze_signal(
+                        df, current_price, trade_signal, indicators
+                    )
                 if not claude_pass:
                     logger.warning(f"❌ Claude 分析拒绝: {claude_reason}")
                     if claude_details.get('warnings'):
@@ -997,7 +1388,8 @@ class TradingBot:
                     actually_executed=True,
                     actual_entry_price=current_price
                 )
-                self._execute_open_long(trade_signal, current_price, df)
+                with self.metrics_logger.timer("evaluate.execution"):
+                    self._execute_open_long(trade_signal, current_price, df)
                 return
 
             elif trade_signal.signal == Signal.SHORT:
@@ -1006,7 +1398,8 @@ class TradingBot:
                 trade_id = f"{trade_signal.strategy}_{datetime.now().isoformat()}"
 
                 # 趋势过滤检查
-                trend_pass, trend_reason = self.trend_filter.check_signal(df, trade_signal, indicators)
+                with self.metrics_logger.timer("evaluate.filters"):
+                    trend_pass, trend_reason = self.trend_filter.check_signal(df, trade_signal, indicators)
                 if not trend_pass:
                     logger.warning(f"❌ 趋势过滤拒绝: {trend_reason}")
                     # 影子模式：记录被趋势过滤拒绝的信号
@@ -1028,9 +1421,10 @@ class TradingBot:
                     continue
 
                 # 方向过滤检查（对做空信号使用正常标准）
-                direction_pass, direction_reason = self.direction_filter.filter_signal(
-                    trade_signal, df, strategy_agreement
-                )
+                with self.metrics_logger.timer("evaluate.filters"):
+                    direction_pass, direction_reason = self.direction_filter.filter_signal(
+                        trade_signal, df, strategy_agreement
+                    )
                 if not direction_pass:
                     logger.warning(f"❌ 方向过滤拒绝: {direction_reason}")
                     # 影子模式：记录被方向过滤拒绝的信号
@@ -1074,9 +1468,10 @@ class TradingBot:
                     continue
 
                 # Claude AI 分析
-                claude_pass, claude_reason, claude_details = self.claude_analyzer.analyze_signal(
-                    df, current_price, trade_signal, indicators
-                )
+                with self.metrics_logger.timer("evaluate.claude"):
+                    claude_pass, claude_reason, claude_details = self.claude_analyzer.analyze_signal(
+                        df, current_price, trade_signal, indicators
+                    )
                 if not claude_pass:
                     logger.warning(f"❌ Claude 分析拒绝: {claude_reason}")
                     if claude_details.get('warnings'):
@@ -1122,7 +1517,8 @@ class TradingBot:
                     actually_executed=True,
                     actual_entry_price=current_price
                 )
-                self._execute_open_short(trade_signal, current_price, df)
+                with self.metrics_logger.timer("evaluate.execution"):
+                    self._execute_open_short(trade_signal, current_price, df)
                 return
 
         # 无信号或所有信号被过滤 - 使用计数器减少日志冗余
@@ -1131,8 +1527,13 @@ class TradingBot:
             logger.debug(f"当前价格: {current_price:.2f} - 无有效开仓信号 (已检查{self.no_signal_count}次)")
             self.no_signal_count = 0
     
-    def _check_exit_conditions(self, df, current_price: float, position):
-        """检查退出条件"""
+    def _check_exit_conditions(self, df, current_price: float, position, check_strategy: bool = True):
+        """
+        检查退出条件
+
+        Args:
+            check_strategy: 是否检查策略退出信号并显示持仓状态（只做价格检查时为 False）
+        """
 
         # 使用 RiskManager 的 position 对象进行风控检查
         if not self.risk_manager.position:
@@ -1141,17 +1542,25 @@ class TradingBot:
             logger.warning("建议手动平仓或重启机器人以同步状态")
             return
 
-        # 1. 检查风控止损止盈
-        result = self.risk_manager.check_stop_loss(current_price, self.risk_manager.position, df)
-        if result.should_stop:
-            logger.warning(f"风控触发: {result.reason}")
-            self._execute_close_position(position, result.reason, "risk", current_price)
+        # 1. 检查风控止损止盈（与快速止损通道互斥，避免重复平仓；策略退出的平仓同样在锁内重新确认持仓）
+        with self._close_lock:
+            if not self.risk_manager.position:
+                return
+            result = self.risk_manager.check_stop_loss(current_price, self.risk_manager.position, df)
+            self._record_first_decision()
+            if result.should_stop:
+                logger.warning(f"风控触发: {result.reason}")
+                self._execute_close_position(position, result.reason, "risk", current_price)
+                return
+
+        if not check_strategy:
             return
 
         # 2. 检查策略退出信号
         if self.current_strategy and self.current_strategy in STRATEGY_MAP:
-            strategy = get_strategy(self.current_strategy, df)
-            exit_signal = strategy.check_exit(position['side'])
+            with self.metrics_logger.timer("evaluate.strategies"):
+                strategy = get_strategy(self.current_strategy, df)
+                exit_signal = strategy.check_exit(position['side'])
 
             if exit_signal.signal in [Signal.CLOSE_LONG, Signal.CLOSE_SHORT]:
                 logger.info(f"策略退出信号: {exit_signal.reason}")
@@ -1311,8 +1720,21 @@ class TradingBot:
             logger.error(f"❌ 开空失败")
             notifier.notify_error(f"开空失败")
     
-    def _execute_close_position(self, position, reason: str, trigger_type: str, current_price: float):
-        """执行平仓"""
+    def _execute_close_position(self, position, reason: str, trigger_type: str, current_price: float) -> bool:
+        """
+        执行平仓，返回是否成功
+
+        所有平仓路径都在平仓锁内执行，并在锁内重新确认风控持仓：
+        快速止损通道已平掉的持仓不会被主循环再平一次。
+        """
+        with self._close_lock:
+            if self.risk_manager.position is None:
+                logger.info(f"持仓已由其他通道平仓，跳过 [{trigger_type}]: {reason}")
+                return False
+            return self._close_position_locked(position, reason, trigger_type, current_price)
+
+    def _close_position_locked(self, position, reason: str, trigger_type: str, current_price: float) -> bool:
+        """平仓锁内执行平仓"""
         logger.info(f"📤 平仓触发 [{trigger_type}]: {reason}")
 
         # 计算盈亏
@@ -1325,7 +1747,8 @@ class TradingBot:
             pnl = (entry_price - current_price) * amount
 
         # 执行平仓（使用统一的 close_position 方法，传递持仓数据）
-        success = self.trader.close_position(reason, position_data=position)
+        with self.metrics_logger.timer("evaluate.execution"):
+            success = self.trader.close_position(reason, position_data=position)
 
         # 计算盈亏百分比
         pnl_percent = (pnl / (entry_price * amount)) * 100 * config.LEVERAGE
@@ -1375,6 +1798,7 @@ class TradingBot:
                 self.current_trade_id = None  # 重置trade_id
                 self.current_strategy = None
             notifier.notify_error(f"平仓失败")
+        return success
 
     def _execute_band_limited_actions(self, actions: List[Dict], current_price: float) -> bool:
         """
@@ -1555,7 +1979,8 @@ class TradingBot:
                 'entry_price': entry_price,
             }
 
-            result = self.trader.close_position(reason=reason, position_data=position_data)
+            with self._close_lock:
+                result = self.trader.close_position(reason=reason, position_data=position_data)
 
             if result:
                 notifier.notify_trade('close', config.SYMBOL, side, qty, price, pnl=net_pnl, reason=reason)
@@ -1603,6 +2028,8 @@ class TradingBot:
             # 只有在没有现有持仓时才执行初始化建仓
             if self.band_limited_strategy.state["p_ref"] is None:
                 signal = self.band_limited_strategy.analyze()
+                if signal:
+                    self._record_first_decision()
                 if signal and isinstance(signal.indicators, dict):
                     actions = signal.indicators.get("actions", []) or []
                     if actions:
@@ -1618,6 +2045,8 @@ class TradingBot:
 
         # 获取信号 (与 backtest/engine.py:230 一致)
         signal = self.band_limited_strategy.analyze()
+        if signal:
+            self._record_first_decision()
 
         # 提取 actions (与 backtest/engine.py:232-233 一致)
         actions = []
@@ -1806,6 +2235,12 @@ class TradingBot:
             ],
             'risk': risk_status,
             'current_strategy': self.current_strategy,
+            'stop_watcher': self.stop_watcher.get_stats() if self.stop_watcher else None,
+            'notifications': notifier.get_stats(),
+            'background_analysis': self.background_worker.get_stats(),
+            'rate_limits': get_rate_limiter().get_stats(),
+            'retries': get_retry_stats(),
+            'market_cache': get_market_cache().get_stats(),
         }
     
     def stop(self):
@@ -1813,6 +2248,16 @@ class TradingBot:
         self.running = False
         logger.info("机器人停止中...")
 
+        # 停止快速止损通道和行情推送
+        try:
+            self._stop_stop_watcher()
+            self._stop_market_stream()
+        except Exception as e:
+            logger.warning(f"停止行情推送失败: {e}")
+
+        # 停止后台分析（不等待进行中的 LLM 调用）
+        self.background_worker.shutdown(wait=False)
+
         # 停止套利引擎（如果启用）
         if self.arbitrage_engine:
             self.arbitrage_engine.stop()
@@ -1825,6 +2270,13 @@ class TradingBot:
         except Exception as e:
             logger.error(f"刷新数据库缓冲区失败: {e}")
 
+        # 发送队列中剩余的通知
+        try:
+            if notifier.shutdown():
+                logger.info("✅ 通知队列已发送完毕")
+        except Exception as e:
+            logger.error(f"关闭通知队列失败: {e}")
+
     def close_all(self):
         """紧急平仓"""
         logger.warning("执行紧急平仓")
@@ -1853,23 +2305,15 @@ class TradingBot:
         elapsed = (datetime.now() - self.last_policy_update).total_seconds()
         return elapsed >= interval
 
-    def _update_policy_layer(self, df, current_price, indicators):
-        """更新 Policy Layer"""
+    def _apply_policy_decision(self, decision, context):
+        """应用后台 Policy 分析的决策（交易线程调用）"""
         try:
-            logger.info("🔄 开始 Policy Layer 更新...")
-
-            # 1. 构建交易上下文
-            context = self.context_builder.build_context(df, current_price, indicators)
-
-            # 2. 调用 Claude 进行策略治理分析
-            decision = self.policy_analyzer.analyze_for_policy(context, df, indicators)
-
             if not decision:
                 logger.warning("Policy 分析失败，保持当前参数")
                 self.last_policy_update = datetime.now()
                 return
 
-            # 3. 验证并应用决策
+            # 验证并应用决策
             mode = getattr(config, 'POLICY_LAYER_MODE', 'active')
 
             if mode == 'shadow':
@@ -1931,8 +2375,8 @@ class TradingBot:
             message += f"\n• 仓位倍数: {params.position_size_multiplier:.2f}x"
             message += f"\n• 风控模式: {params.risk_mode.value}"
 
-            notifier.feishu.send_message(message)
-            logger.debug("Policy 更新通知已发送到飞书")
+            notifier.dispatch('send_message', message, channels=('feishu',))
+            logger.debug("Policy 更新通知已加入飞书发送队列")
 
         except Exception as e:
             logger.error(f"发送 Policy 更新通知失败: {e}")
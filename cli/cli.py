@@ -8,7 +8,6 @@ from datetime import datetime
 
 from config.settings import settings as config
 from core.trader import BitgetTrader
-from bot import TradingBot
 from utils.logger_utils import db, notifier, get_logger
 # from backtest import run_backtest_from_exchange  # 暂时注释，函数不存在
 # from monitor import run_monitor  # 暂时注释，函数不存在
@@ -175,6 +174,8 @@ def cmd_monitor():
 
 def cmd_run():
     """运行机器人"""
+    from bot import TradingBot  # 只有 run 命令需要完整的机器人，其余命令不为此付出导入开销
+
     bot = TradingBot()
     bot.start()
 
@@ -49,7 +49,32 @@ EXCHANGES_CONFIG = {
         "maker_fee": 0.0002,
         "taker_fee": 0.0005,
         "min_amount": 0.01,  # ETH 最小下单量
-    }
+    },
+    # 本地模拟交易所（ACTIVE_EXCHANGE=simulated）：不访问网络，用于压测和延迟测试
+    "simulated": {
+        "name": "simulated",
+        "symbol": "ETHUSDT",
+        "leverage": 50,
+        "margin_mode": "crossed",
+        "maker_fee": 0.0002,
+        "taker_fee": 0.0006,
+        "min_amount": 0.01,
+        "initial_balance": float(os.getenv("SIM_INITIAL_BALANCE", "10000")),
+        "speed": float(os.getenv("SIM_SPEED", "1")),           # 虚拟时钟倍速（100 = 100 倍实时）
+        "klines_file": os.getenv("SIM_KLINES_FILE", ""),       # 录制K线 CSV（为空时生成合成K线）
+        "timeframe": "1m",                                     # 基础K线周期（其他周期由此聚合）
+        "history_bars": 3000,                                  # 回放起点之前的历史K线数量
+        "start_price": 3000.0,                                 # 合成K线起始价格
+        "volatility": 0.002,                                   # 合成K线每根对数收益率标准差
+        "seed": None,                                          # 随机种子（固定后行情可复现）
+        "latency_ms": float(os.getenv("SIM_LATENCY_MS", "50")),  # 请求延迟（虚拟时间）
+        "latency_jitter_ms": 20,
+        "book_levels": 20,                                     # 订单簿档位数
+        "spread_bps": 1.0,                                     # 买一卖一价差（基点）
+        "level_step_bps": 1.0,                                 # 相邻档位间距（基点）
+        "level_size": 5.0,                                     # 第一档数量（逐档递增 50%）
+        "partial_fill_ratio": 1.0,                             # 挂单被触及时每次撮合成交的比例
+    },
 }
 
 # 向后兼容：保持EXCHANGE_CONFIG指向当前激活的交易所
@@ -59,6 +84,7 @@ SYMBOL = "ETHUSDT"  # 切换到ETH
 PRODUCT_TYPE = "USDT-FUTURES"  # USDT 合约
 TIMEFRAME = "15m"              # 主时间周期
 KLINE_LIMIT = 200              # K线数量
+KLINE_FLOAT_DTYPE = "float64"  # KlineArray 默认精度（float32 可减半长历史/多品种内存占用）
 
 # ==================== 多时间周期配置（新增）====================
 
@@ -69,10 +95,31 @@ TIMEFRAME_WEIGHTS = {
     "1h": 0.55,
 }
 
+# 多时间周期重采样配置
+MTF_RESAMPLE_ENABLED = True     # 只拉取最小周期K线，高周期本地增量重采样
+MTF_MAX_BASE_BARS = 1000        # 基础周期最多缓存的K线数量（超出需求的周期改为直接请求）
+MTF_INCREMENTAL_LIMIT = 5       # 增量刷新时拉取的基础K线数量
+MTF_INCLUDE_PARTIAL_BAR = True  # 是否保留未走完的最后一根高周期K线（与交易所返回一致）
+
+# 实时K线增量缓冲配置
+KLINE_BUFFER_ENABLED = True       # 主循环K线使用增量缓冲区（启动时全量拉取一次，之后只拉取最新几根）
+KLINE_BUFFER_MAX_INCREMENTAL = 20  # 单次增量拉取的最大K线数，落后更多时全量重新同步
+
+# 实时行情推送配置（事件驱动，替代行情轮询）
+MARKET_STREAM_ENABLED = False            # 启用行情推送（主循环、Ticker服务、价差监控、状态监控订阅行情事件）
+MARKET_STREAM_TRANSPORT = "websocket"    # websocket: 交易所WebSocket; simulated: 本地模拟/录制回放
+MARKET_STREAM_RECORDING = ""             # simulated 模式启动时回放的录制文件（JSONL）
+MARKET_STREAM_REPLAY_SPEED = 1.0         # 回放速度倍数（0 表示不等待）
+MARKET_STREAM_WATCH_TRADES = False       # 是否订阅逐笔成交
+MARKET_STREAM_STALE_SECONDS = 10         # 推送行情超过该时间未更新则回退到REST
+MARKET_STREAM_MIN_CYCLE_INTERVAL = 0.2   # 事件触发主循环的最小间隔（秒）
+MARKET_STREAM_RECONNECT_MAX_DELAY = 30   # WebSocket 重连最大退避时间（秒）
+
 
 # 异步数据获取配置
 USE_ASYNC_DATA_FETCH = True  # 启用异步并发获取多时间周期数据
 USE_ASYNC_MAIN_LOOP = False  # 启用异步主循环（实验性功能）
+ASYNC_FETCH_TIMEOUT = 5.0    # 异步主循环中单个行情/持仓请求的超时时间（秒）
 # ==================== 杠杆和保证金 ====================
 
 LEVERAGE = 50
@@ -117,6 +164,12 @@ ATR_STOP_MULTIPLIER = 4.0      # ATR 倍数 (优化：从3.5提高到4.0，减
 # 分批止盈（新增）
 USE_PARTIAL_TAKE_PROFIT = True # 是否分批止盈
 
+# 快速止损通道（独立于主循环，收到价格即按预计算触发价检查固定/ATR/移动止损和固定止盈）
+STOP_WATCHER_ENABLED = True
+STOP_WATCHER_POLL_INTERVAL = 0.5   # 未启用行情推送时的价格轮询间隔（秒），仅持仓时请求
+STOP_WATCHER_RETRY_BACKOFF = 1.0   # 快速止损平仓失败后重新触发前的退避时间（秒）
+STOP_CHECK_LOG_INTERVAL = 60       # check_stop_loss 详细 DEBUG 日志采样间隔（秒），0 表示每次输出
+
 # ==================== 策略级差异化止损配置（新增）====================
 
 # 是否启用策略级差异化止损
@@ -182,6 +235,10 @@ MAKER_PRICE_OFFSET = 0.0001  # 0.01%的价格偏移，确保成为Maker
 # Maker订单检查间隔（秒）
 MAKER_ORDER_CHECK_INTERVAL = 0.5  # 每0.5秒检查一次订单状态
 
+# 订单跟踪器轮询间隔（秒）
+# 所有待成交订单共用一个后台轮询：每轮每个交易对一次 fetch_open_orders
+ORDER_TRACKER_POLL_INTERVAL = MAKER_ORDER_CHECK_INTERVAL
+
 # 是否在Maker订单失败时自动降级为市价单
 MAKER_AUTO_FALLBACK_TO_MARKET = True  # 建议开启，避免错过交易机会
 
@@ -222,6 +279,68 @@ DEFAULT_CHECK_INTERVAL = 1  # 极高频模式：1秒
 # 持仓时检查间隔（秒）- 有持仓时提高频率
 POSITION_CHECK_INTERVAL = 0.5  # 极高频模式：0.5秒
 
+# ==================== 主循环调度配置（K线收盘对齐） ====================
+
+# 启用后策略评估只在K线收盘时执行，持仓时按 POSITION_CHECK_INTERVAL（或推送行情）执行止损检查，
+# Claude 分析、Policy Layer、状态推送按各自间隔执行；关闭时每轮执行全部任务（旧行为）
+CYCLE_SCHEDULER_ENABLED = True
+
+# 触发策略评估的K线周期（与主循环 trader.get_klines() 的周期一致）
+CYCLE_TIMEFRAMES = ["5m"]
+
+# 收盘后延迟（秒），等待交易所生成最终K线；推送模式收到收盘事件时立即评估
+CYCLE_CANDLE_CLOSE_DELAY = 1.0
+
+# 低频任务间隔（秒）
+CYCLE_STATUS_INTERVAL = 30   # 状态监控推送检查
+CYCLE_AI_INTERVAL = 60       # Claude 定时分析/每日报告检查（分析器内部仍按自身间隔调用API）
+CYCLE_POLICY_INTERVAL = 60   # Policy Layer 更新检查（仍受 POLICY_UPDATE_INTERVAL 限制）
+
+# 单次等待上限（秒）
+CYCLE_MAX_WAIT = 5
+
+# Claude 定时分析 / 每日报告 / Policy Layer 更新在后台线程执行，主循环不等待 LLM 调用
+BACKGROUND_ANALYSIS_ENABLED = True
+BACKGROUND_RESULT_MAX_AGE = 300   # 后台结果有效期（秒，从拍摄快照算起），超过后丢弃不应用
+
+# ==================== 交易所请求限流（进程级令牌桶） ====================
+# 所有 ccxt 客户端（同步适配器、BitgetTrader、异步客户端池）共用按 (交易所, 端点类别) 划分的令牌桶，
+# 请求权重取 ccxt 端点成本；下单/止损优先于行情和分析请求
+RATE_LIMIT_ENABLED = True
+# 各端点类别（market / account / trade）的速率：{"交易所": {"类别": {"rate": 权重/秒, "burst": 桶容量}}}
+# 未配置的类别使用 ccxt 的 rateLimit（1000 / rateLimit 权重/秒，桶容量为 1 秒的量）
+RATE_LIMITS = {}
+RATE_LIMIT_ANALYTICS_RESERVE = 0.3   # 分析类请求不能使用的桶容量比例（为下单/止损预留）
+RATE_LIMIT_MAX_WAIT = 30             # 单次请求在本地排队的最长时间（秒），超时抛出 RateLimitError
+RATE_LIMIT_SHARED_DIR = ""           # 非空时令牌状态存放在该目录（文件锁），多个进程共享同一额度
+
+# ==================== 行情读取缓存（短 TTL + 请求合并） ====================
+# ccxt 客户端的行情读取（ticker / 订单簿 / K线 / 资金费率）经过进程级缓存：
+# TTL 内的重复请求直接返回缓存，同时发起的相同请求只发出一次；止损平仓（CRITICAL）始终读取最新数据
+MARKET_CACHE_ENABLED = True
+# 各 ccxt 方法的 TTL（秒），覆盖默认值；设为 0 表示该方法不缓存
+MARKET_CACHE_TTL = {
+    "fetch_ticker": 1.0,
+    "fetch_order_book": 0.5,
+    "fetch_ohlcv": 2.0,
+    "fetch_funding_rate": 30.0,
+}
+MARKET_CACHE_MAX_ENTRIES = 1024      # 最多缓存的条目数（超出时淘汰最早写入的条目）
+
+# ==================== L2 订单簿（共享深度 / VWAP 查询） ====================
+# 每个 (交易所, 交易对) 一份共享订单簿，深度 / VWAP / 滑点查询都基于它
+ORDERBOOK_MAX_AGE = 1.0              # 快照有效期（秒），过期后才重新拉取
+ORDERBOOK_MAX_LEVELS = None          # 每侧最多保留的档位数（None 不限制）
+
+# ==================== 多品种运行时（python main.py multi） ====================
+# 单进程、单事件循环驱动多个交易对：共享交易所客户端、限流器、行情缓冲、数据库和通知器，
+# 持仓和行情每轮各一次批量请求；每个交易对有独立的策略/风控状态
+TRADING_SYMBOLS: List[str] = [
+    s.strip() for s in os.getenv("TRADING_SYMBOLS", "").split(",") if s.strip()
+] or [SYMBOL]
+MULTI_SYMBOL_KLINE_CONCURRENCY = 4   # 同时拉取K线的交易对数量上限
+MULTI_SYMBOL_MAX_POSITIONS = 3       # 同时持仓的交易对数量上限
+
 # ==================== 错误退避控制器配置 (Error Backoff Controller) ====================
 
 # 是否启用错误退避控制器
@@ -239,6 +358,12 @@ ERROR_BACKOFF_MULTIPLIER = 2.0
 # 错误重置时间（秒）- 超过此时间后重置错误计数
 ERROR_RESET_SECONDS = 1800  # 30分钟
 
+# 交易所请求重试预算（按交易所共享）：每次请求存入 RATIO 个令牌，另按 MIN_PER_SECOND 匀速补充，
+# 每次重试消耗 1 个令牌，不足时放弃重试（CRITICAL 优先级的止损平仓不受限制）
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MIN_PER_SECOND = 0.5
+RETRY_BUDGET_CAPACITY = 10
+
 # ==================== 价格稳定性检测配置 (Price Stability Detection) ====================
 
 # 是否启用价格稳定性检测
@@ -373,6 +498,8 @@ STRONG_TREND_BB = 2.0             # 强趋势时的布林带宽度阈值（%）
 TREND_EXIT_ADX = 27.0             # 趋势退出ADX阈值（滞回机制）
 TREND_EXIT_BB = 2.5               # 趋势退出布林带宽度阈值（%）
 TRANSITIONING_CONFIDENCE_THRESHOLD = 0.25  # 过渡市置信度阈值（降低以允许更多交易）
+REGIME_HYSTERESIS_ENABLED = False  # 实盘市场状态跟踪是否启用滞回机制（沿用上一根K线的状态）
+REGIME_CACHE_BARS = 1000           # 市场状态跟踪器最多缓存的K线数量
 
 # ATR
 ATR_PERIOD = 14
@@ -407,6 +534,12 @@ SAVE_EQUITY_CURVE = True
 DB_BATCH_SIZE = 50                 # 从20优化为50，减少写入频率
 DB_BATCH_FLUSH_INTERVAL = 10.0     # 从5秒优化为10秒，减少刷新频率
 
+# 性能指标配置（MetricsLogger，固定内存直方图）
+METRICS_RATE_WINDOW = 60                       # 速率统计窗口（秒）
+METRICS_TRACK_GC = True                        # 记录垃圾回收停顿（gc.pause.genN）
+METRICS_SNAPSHOT_FILE = "logs/metrics.json"    # 机器人指标快照文件（API /api/metrics 读取导出）
+METRICS_SNAPSHOT_INTERVAL = 15                 # 快照写入间隔（秒），0 表示不写入
+
 # ==================== Supabase 实时交易数据库配置 ====================
 
 # 是否使用 Supabase 存储实时交易数据（默认关闭，使用 SQLite）
@@ -462,6 +595,23 @@ EMAIL_SENDER = os.getenv("EMAIL_SENDER", "")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD", "")
 EMAIL_RECEIVER = os.getenv("EMAIL_RECEIVER", "")
 
+# ==================== 异步通知分发 ====================
+
+# 交易主循环只负责入队，由后台线程按渠道并发发送（False 时恢复同步逐个发送）
+NOTIFY_ASYNC_ENABLED = True
+NOTIFY_QUEUE_SIZE = 500                 # 待发送队列上限
+NOTIFY_DROP_POLICY = "drop_oldest"      # 队列满时: drop_oldest（优先丢弃低优先级旧消息）/ drop_new / block
+NOTIFY_ENQUEUE_TIMEOUT = 0.05           # block 策略下入队最长等待（秒）
+NOTIFY_COALESCE_DELAY = 2.0             # 错误/信号类消息延迟合并窗口（秒），窗口内相同消息只发一次
+NOTIFY_CHANNEL_CONCURRENCY = 2          # 每个渠道的并发发送数
+NOTIFY_CHANNEL_BACKLOG = 50             # 每个渠道的待发送队列上限（渠道并发已满时排队，超出丢弃）
+NOTIFY_CHANNEL_TIMEOUT = {              # 每个渠道的发送超时（秒）
+    "telegram": 10,
+    "feishu": 10,
+    "email": 20,
+}
+NOTIFY_SHUTDOWN_TIMEOUT = 10            # 停止时等待队列发送完毕的最长时间（秒）
+
 # ==================== 定期市场报告配置（新增）====================
 
 # 是否启用定期市场报告
@@ -727,6 +877,8 @@ BACKTEST_END_DATE = "2024-12-01"
 BACKTEST_INITIAL_BALANCE = 10000
 BACKTEST_COMMISSION = 0.0006   # 手续费率
 BACKTEST_SLIPPAGE = 0.0001     # 滑点
+BACKTEST_WINDOW_BARS = 50     # 回测逐根K线传给策略的回看窗口（当前K线之前的根数），与预热长度无关
+BACKTEST_BAND_LIMITED_FAST_PATH = True  # Band-Limited 回测使用批量快速路径（结构化数组动作，增量 sigma）
 
 # ==================== ML信号过滤器配置（新增）====================
 
@@ -854,7 +1006,7 @@ def validate_config():
     """验证配置有效性"""
     errors = []
 
-    if not EXCHANGE_CONFIG.get("api_key"):
+    if ACTIVE_EXCHANGE != "simulated" and not EXCHANGE_CONFIG.get("api_key"):
         errors.append("缺少 API Key")
     
     if LEVERAGE < 1 or LEVERAGE > 125:
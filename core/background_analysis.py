@@ -0,0 +1,169 @@
+"""
+后台分析执行器
+
+Claude 定时分析、每日报告和 Policy Layer 更新都要等待一次完整的 LLM 往返，
+放在主循环里会让整轮交易周期停顿数秒到数十秒。本模块把这些任务移到单个后台线程：
+
+- 主循环只负责拍摄不可变快照（K线、价格、持仓）并提交，不等待任何结果
+- 指标在后台线程按快照计算（每个快照最多计算一次）
+- 同名任务同一时间只运行一个，运行期间的新提交直接跳过
+- 结果由主循环通过 drain() 取回并在交易线程上应用；超过有效期的结果直接丢弃
+"""
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import pandas as pd
+
+from config.settings import settings as config
+from utils.logger_utils import get_logger, get_metrics_logger
+
+logger = get_logger("background_analysis")
+
+
+@dataclass(frozen=True)
+class AnalysisSnapshot:
+    """提交给后台任务的不可变市场快照"""
+    seq: int
+    df: pd.DataFrame
+    current_price: float
+    position_info: Optional[Mapping[str, Any]] = None
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def position_side(self) -> Optional[str]:
+        return self.position_info.get('side') if self.position_info else None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    @cached_property
+    def indicators(self):
+        """技术指标（在后台线程首次访问时计算）"""
+        from strategies.indicators import IndicatorCalculator
+        return IndicatorCalculator(self.df).calculate_all()
+
+
+@dataclass
+class AnalysisResult:
+    """后台任务结果"""
+    name: str
+    snapshot: AnalysisSnapshot
+    value: Any
+    duration: float
+
+
+class BackgroundAnalysisWorker:
+    """单线程后台分析执行器"""
+
+    def __init__(self, max_result_age: float = None, inline: bool = False):
+        """
+        Args:
+            max_result_age: 结果有效期（秒，从拍摄快照算起），超过后丢弃
+            inline: 在提交线程上同步执行（关闭后台执行时使用，结果同样经 drain() 取回）
+        """
+        self.inline = inline
+        self.max_result_age = (
+            getattr(config, 'BACKGROUND_RESULT_MAX_AGE', 300) if max_result_age is None else max_result_age
+        )
+        self.metrics_logger = get_metrics_logger()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self._running: Dict[str, int] = {}
+        self._results: deque = deque()
+        self.stats = {'submitted': 0, 'skipped': 0, 'completed': 0, 'failed': 0, 'stale': 0}
+
+    def snapshot(self, df: pd.DataFrame, current_price: float,
+                 position_info: Optional[Dict[str, Any]] = None) -> AnalysisSnapshot:
+        """拍摄快照：复制K线，持仓信息只读"""
+        return AnalysisSnapshot(
+            seq=next(self._seq),
+            df=df.copy(),
+            current_price=current_price,
+            position_info=MappingProxyType(dict(position_info)) if position_info else None,
+        )
+
+    def is_busy(self, name: str) -> bool:
+        with self._lock:
+            return name in self._running
+
+    def submit(self, name: str, snapshot: AnalysisSnapshot,
+               job: Callable[[AnalysisSnapshot], Any]) -> bool:
+        """
+        提交后台任务
+
+        Returns:
+            是否已提交（同名任务仍在运行时返回 False）
+        """
+        with self._lock:
+            if name in self._running:
+                self.stats['skipped'] += 1
+                return False
+            self._running[name] = snapshot.seq
+            self.stats['submitted'] += 1
+            if not self.inline and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background-analysis")
+        if self.inline:
+            self._run(name, snapshot, job)
+        else:
+            self._executor.submit(self._run, name, snapshot, job)
+        return True
+
+    def _run(self, name: str, snapshot: AnalysisSnapshot, job: Callable[[AnalysisSnapshot], Any]):
+        start = time.time()
+        try:
+            value = job(snapshot)
+            duration = time.time() - start
+            with self._lock:
+                self.stats['completed'] += 1
+                self._results.append(AnalysisResult(name, snapshot, value, duration))
+        except Exception as e:
+            duration = time.time() - start
+            with self._lock:
+                self.stats['failed'] += 1
+            logger.error(f"后台任务 {name} 执行失败: {e}")
+        finally:
+            with self._lock:
+                self._running.pop(name, None)
+        self.metrics_logger.record_latency(f"background.{name}", duration * 1000)
+
+    def drain(self) -> List[AnalysisResult]:
+        """取回已完成的结果（主循环调用），丢弃超过有效期的结果"""
+        with self._lock:
+            if not self._results:
+                return []
+            results = list(self._results)
+            self._results.clear()
+
+        fresh = []
+        for result in results:
+            if result.snapshot.age > self.max_result_age:
+                with self._lock:
+                    self.stats['stale'] += 1
+                logger.warning(
+                    f"丢弃过期的后台结果 {result.name}: 快照已过去 {result.snapshot.age:.0f}s"
+                )
+                continue
+            fresh.append(result)
+        return fresh
+
+    def shutdown(self, wait: bool = False):
+        """停止执行器（默认不等待正在进行的 LLM 调用）"""
+        if self._executor:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['running'] = sorted(self._running)
+            stats['pending_results'] = len(self._results)
+        return stats
@@ -0,0 +1,172 @@
+"""
+主循环调度器（K线收盘对齐）
+
+把主循环拆成三类任务，各自按需触发，替代固定间隔轮询：
+- evaluate: 策略评估，只在配置周期的K线收盘时触发（时钟对齐，或收到推送的收盘事件）
+- price: 持仓止损/止盈等轻量价格检查，持仓时按价格更新（推送事件或 price_interval 轮询）触发
+- 定时任务: Claude 分析、Policy Layer、状态推送等重任务，按各自的低频间隔触发
+
+调度器本身不执行任何任务，只回答“现在该做什么”和“最多还能等多久”。
+"""
+import math
+import time
+from typing import Dict, Iterable, Optional, Set
+
+from market_data.aggregator import timeframe_to_ms
+
+EVALUATE = "evaluate"
+PRICE = "price"
+
+
+class CycleScheduler:
+    """K线收盘对齐的主循环调度器"""
+
+    def __init__(
+        self,
+        timeframes: Iterable[str],
+        price_interval: float,
+        close_delay: float = 1.0,
+        max_wait: float = 5.0,
+        timers: Dict[str, float] = None,
+        now: float = None
+    ):
+        """
+        Args:
+            timeframes: 触发策略评估的K线周期
+            price_interval: 持仓时价格检查的轮询间隔（秒）
+            close_delay: 收盘后延迟（秒），等待交易所生成最终K线；收到推送的收盘事件时不等待
+            max_wait: 单次等待上限（秒），保证停止信号和缓冲区刷新能及时处理
+            timers: 定时任务 {名称: 间隔秒数}
+            now: 当前时间（测试用）
+        """
+        now = time.time() if now is None else now
+        self.timeframe_seconds = {tf: timeframe_to_ms(tf) / 1000 for tf in timeframes}
+        if not self.timeframe_seconds:
+            raise ValueError("至少需要一个K线周期")
+        self.price_interval = price_interval
+        self.close_delay = close_delay
+        self.max_wait = max_wait
+
+        # 启动后立即评估一次；之后只在新的收盘边界评估
+        self._last_boundary = self._latest_boundary(now)
+        self._evaluate_due: Optional[float] = now
+        self._price_pending = False
+        self._last_price_check = 0.0
+        self._timers: Dict[str, list] = {}
+        for name, interval in (timers or {}).items():
+            self.add_timer(name, interval, now=now)
+
+        # 统计
+        self.evaluations = 0
+        self.price_checks = 0
+        self.timer_runs = 0
+        self.candle_events = 0
+
+    # ==================== 配置 ====================
+
+    def add_timer(self, name: str, interval: float, run_immediately: bool = True, now: float = None):
+        """添加定时任务（默认启动后第一轮执行一次）"""
+        now = time.time() if now is None else now
+        self._timers[name] = [interval, now if run_immediately else now + interval]
+
+    # ==================== 事件 ====================
+
+    def on_candle_close(self, timeframe: str, open_time_ms: int):
+        """收到推送的K线收盘事件：立即触发评估，时钟到达同一边界时不再重复触发"""
+        seconds = self.timeframe_seconds.get(timeframe)
+        if seconds is None:
+            return
+        self.candle_events += 1
+        boundary = open_time_ms / 1000 + seconds
+        if boundary > self._last_boundary:
+            self._last_boundary = boundary
+            self._evaluate_due = 0.0
+
+    def on_price_update(self):
+        """收到价格更新：持仓时下一轮执行价格检查"""
+        self._price_pending = True
+
+    def request_evaluation(self, delay: float = 0.0, now: float = None):
+        """要求在 delay 秒后执行策略评估（如收盘评估失败后重试）"""
+        now = time.time() if now is None else now
+        due = now + delay
+        if self._evaluate_due is None or due < self._evaluate_due:
+            self._evaluate_due = due
+
+    # ==================== 调度 ====================
+
+    def _latest_boundary(self, now: float) -> float:
+        """已过收盘延迟的最近收盘边界"""
+        return max(
+            math.floor((now - self.close_delay) / seconds) * seconds
+            for seconds in self.timeframe_seconds.values()
+        )
+
+    def _next_boundary(self, now: float) -> float:
+        """下一个收盘触发时间（边界 + 收盘延迟）"""
+        return min(
+            (math.floor((now - self.close_delay) / seconds) + 1) * seconds + self.close_delay
+            for seconds in self.timeframe_seconds.values()
+        )
+
+    def poll(self, has_position: bool, now: float = None) -> Set[str]:
+        """
+        返回当前到期的任务并标记为已调度
+
+        Args:
+            has_position: 是否持仓（决定是否执行价格检查）
+        """
+        now = time.time() if now is None else now
+        tasks = set()
+
+        boundary = self._latest_boundary(now)
+        if boundary > self._last_boundary:
+            self._last_boundary = boundary
+            self._evaluate_due = now
+        if self._evaluate_due is not None and now >= self._evaluate_due:
+            self._evaluate_due = None
+            tasks.add(EVALUATE)
+            self.evaluations += 1
+
+        if has_position and (self._price_pending or now - self._last_price_check >= self.price_interval):
+            tasks.add(PRICE)
+            self.price_checks += 1
+        if PRICE in tasks or EVALUATE in tasks:
+            self._last_price_check = now
+            self._price_pending = False
+
+        for name, timer in self._timers.items():
+            interval, due = timer
+            if now >= due:
+                tasks.add(name)
+                timer[1] = now + interval
+                self.timer_runs += 1
+
+        return tasks
+
+    def seconds_until_next(self, has_position: bool, now: float = None) -> float:
+        """距离下一个到期任务的秒数（不超过 max_wait）"""
+        now = time.time() if now is None else now
+        deadlines = [self._next_boundary(now), now + self.max_wait]
+        if self._evaluate_due is not None:
+            deadlines.append(self._evaluate_due)
+        deadlines.extend(due for _, due in self._timers.values())
+        if has_position:
+            if self._price_pending:
+                return 0.0
+            deadlines.append(self._last_price_check + self.price_interval)
+        return max(min(deadlines) - now, 0.0)
+
+    def next_candle_close(self, now: float = None) -> float:
+        """下一次策略评估的时间戳（秒）"""
+        return self._next_boundary(time.time() if now is None else now)
+
+    def get_stats(self) -> Dict:
+        """获取调度统计信息"""
+        return {
+            'timeframes': list(self.timeframe_seconds),
+            'evaluations': self.evaluations,
+            'price_checks': self.price_checks,
+            'timer_runs': self.timer_runs,
+            'candle_events': self.candle_events,
+        }
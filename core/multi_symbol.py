@@ -0,0 +1,385 @@
+"""
+多品种运行时
+
+单进程、单事件循环驱动多个交易对，替代“每个交易对一个进程”：
+- 共享：交易所适配器（ccxt 客户端、限流器、行情缓存）、K线缓冲、数据库写入和通知器、
+  账户级风控（历史风险指标和连续亏损、日内亏损和交易次数上限）
+- 独立：每个交易对一个 SymbolState（RiskManager 持仓/冷却 + 最近评估的K线）
+- 批量：每轮持仓和行情各一次请求（get_positions_batch / get_tickers），K线并发拉取（有并发上限）
+
+每轮流程：
+    批量持仓 + 批量行情 → 并发拉取K线 → 逐个交易对执行状态机：
+    同步交易所持仓 → 持仓中检查止损止盈 → 空仓且出现新K线时评估策略并开仓
+
+用法:
+    runtime = MultiSymbolRuntime(exchange, ["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+    runtime.start()          # 阻塞运行，Ctrl+C 停止
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from config.settings import settings as config
+from exchange.interface import ExchangeInterface, PositionData
+from risk.risk_manager import DailyStats, RiskManager, RiskMetrics
+from strategies.strategies import Signal, TradeSignal, analyze_all_strategies
+from utils.logger_utils import get_logger, db, notifier
+
+logger = get_logger("multi_symbol")
+
+# 单个交易对一轮的动作
+HOLD = "hold"
+OPEN = "open"
+CLOSE = "close"
+ERROR = "error"
+
+# 批量持仓连续几轮缺失某交易对后才清除本地持仓（刚开仓时的短暂空窗、符号不匹配不会误清）
+POSITION_MISSING_LIMIT = 2
+
+
+@dataclass
+class SymbolState:
+    """单个交易对的策略/风控状态"""
+    symbol: str
+    risk_manager: RiskManager
+    strategy: str = ""
+    last_bar: Optional[pd.Timestamp] = None   # 最近一次评估策略时的最新K线时间
+    last_price: float = 0.0
+    last_signal: str = HOLD
+    last_action: str = HOLD
+    missing_snapshots: int = 0                # 本地有持仓但批量持仓中连续缺失的轮数
+    errors: int = 0
+    stats: Dict[str, int] = field(default_factory=lambda: {"evaluations": 0, "opens": 0, "closes": 0})
+
+    @property
+    def side(self) -> Optional[str]:
+        position = self.risk_manager.position
+        return position.side if position else None
+
+    def to_dict(self) -> Dict:
+        return {
+            "side": self.side,
+            "strategy": self.strategy,
+            "last_bar": str(self.last_bar) if self.last_bar is not None else None,
+            "last_price": self.last_price,
+            "last_signal": self.last_signal,
+            "last_action": self.last_action,
+            "errors": self.errors,
+            **self.stats,
+        }
+
+
+class MultiSymbolRuntime:
+    """多品种运行时"""
+
+    def __init__(
+        self,
+        exchange: ExchangeInterface,
+        symbols: List[str] = None,
+        strategies: List[str] = None,
+        timeframe: str = None,
+        kline_limit: int = None,
+        interval: float = None,
+        kline_concurrency: int = None,
+        max_positions: int = None,
+    ):
+        """
+        Args:
+            exchange: 已连接的交易所适配器（所有交易对共用）
+            symbols: 交易对列表，默认 TRADING_SYMBOLS
+            strategies: 策略列表，默认 ENABLE_STRATEGIES
+            timeframe: 策略评估的K线周期，默认 TIMEFRAME
+            kline_limit: K线数量，默认 KLINE_LIMIT
+            interval: 每轮间隔（秒），默认 CHECK_INTERVAL
+            kline_concurrency: 同时拉取K线的交易对数量上限
+            max_positions: 同时持仓的交易对数量上限
+        """
+        self.exchange = exchange
+        self.symbols = list(dict.fromkeys(symbols or config.TRADING_SYMBOLS))
+        if not self.symbols:
+            raise ValueError("至少需要一个交易对")
+        self.strategies = list(strategies or config.ENABLE_STRATEGIES)
+        self.timeframe = timeframe or config.TIMEFRAME
+        self.kline_limit = kline_limit or config.KLINE_LIMIT
+        self.interval = interval if interval is not None else config.CHECK_INTERVAL
+        self.kline_concurrency = max(int(
+            kline_concurrency or getattr(config, 'MULTI_SYMBOL_KLINE_CONCURRENCY', 4)
+        ), 1)
+        self.max_positions = int(
+            max_positions or getattr(config, 'MULTI_SYMBOL_MAX_POSITIONS', len(self.symbols))
+        )
+
+        # 历史交易指标只由第一个交易对加载一次，其余交易对的风控共享同一份；
+        # 日内统计按账户共享：N 个交易对合计受同一个日内亏损和交易次数上限约束
+        self.states: Dict[str, SymbolState] = {}
+        self.daily = DailyStats()
+        shared_metrics: Optional[RiskMetrics] = None
+        for symbol in self.symbols:
+            risk_manager = RiskManager(exchange, symbol=symbol, metrics=shared_metrics, daily=self.daily)
+            shared_metrics = risk_manager.metrics
+            self.states[symbol] = SymbolState(symbol, risk_manager)
+
+        self.running = False
+        self.stats = {"cycles": 0, "batch_requests": 0, "kline_requests": 0, "errors": 0}
+
+    # ==================== 数据获取 ====================
+
+    async def _fetch_klines(self) -> Dict[str, Optional[pd.DataFrame]]:
+        """并发拉取所有交易对的K线（启用 KLINE_BUFFER_ENABLED 时走共享增量缓冲）"""
+        semaphore = asyncio.Semaphore(self.kline_concurrency)
+
+        async def fetch(symbol: str):
+            async with semaphore:
+                try:
+                    return await self.exchange.get_klines_async(symbol, self.timeframe, self.kline_limit)
+                except Exception as e:
+                    logger.warning(f"[{symbol}] 获取K线失败: {e}")
+                    return None
+
+        frames = await asyncio.gather(*(fetch(symbol) for symbol in self.symbols))
+        self.stats["kline_requests"] += len(self.symbols)
+        return dict(zip(self.symbols, frames))
+
+    async def _fetch_snapshot(self):
+        """一次批量请求获取所有交易对的持仓和行情"""
+        positions, tickers = await asyncio.gather(
+            asyncio.to_thread(self.exchange.get_positions_batch, self.symbols),
+            asyncio.to_thread(self.exchange.get_tickers, self.symbols),
+        )
+        self.stats["batch_requests"] += 2
+        return positions, tickers
+
+    # ==================== 主循环 ====================
+
+    async def run_cycle(self) -> Dict[str, str]:
+        """
+        执行一轮：批量读取行情和持仓，逐个交易对执行状态机
+
+        Returns:
+            {symbol: 本轮动作（hold / open / close / error）}
+        """
+        self.stats["cycles"] += 1
+        (positions, tickers), frames = await asyncio.gather(self._fetch_snapshot(), self._fetch_klines())
+        # 下单在工作线程中按交易对顺序执行，不阻塞事件循环
+        return await asyncio.to_thread(self._step_all, positions, tickers, frames)
+
+    def _step_all(self, positions: Dict[str, List[PositionData]], tickers: Dict,
+                  frames: Dict[str, Optional[pd.DataFrame]]) -> Dict[str, str]:
+        balance: Dict[str, float] = {}
+
+        def get_balance() -> float:
+            # 同一轮只查询一次余额，且只在需要开仓时查询
+            if "value" not in balance:
+                balance["value"] = self.exchange.get_balance()
+            return balance["value"]
+
+        actions = {}
+        for symbol, state in self.states.items():
+            ticker = tickers.get(symbol)
+            df = frames.get(symbol)
+            price = ticker.last if ticker else (float(df['close'].iloc[-1]) if df is not None and len(df) else 0.0)
+            try:
+                action = self._step(state, df, price, positions.get(symbol), get_balance)
+            except Exception as e:
+                state.errors += 1
+                self.stats["errors"] += 1
+                logger.error(f"[{symbol}] 处理失败: {e}")
+                action = ERROR
+            state.last_action = action
+            actions[symbol] = action
+        return actions
+
+    def _step(self, state: SymbolState, df: Optional[pd.DataFrame], price: float,
+              positions: Optional[List[PositionData]], get_balance: Callable[[], float]) -> str:
+        """单个交易对的状态机（positions 为 None 表示本轮持仓读取失败）"""
+        if price <= 0:
+            return HOLD
+        state.last_price = price
+        rm = state.risk_manager
+        self._sync_position(state, positions, df)
+
+        if rm.position is not None:
+            result = rm.check_stop_loss(price, rm.position, df)
+            if result.should_stop:
+                return CLOSE if self._close(state, price, result.reason) else HOLD
+            return HOLD
+
+        if positions is None:
+            # 交易所持仓未知时不开仓，避免与未同步的持仓叠加
+            return HOLD
+        if df is None or df.empty:
+            return HOLD
+        bar = df.index[-1]
+        if bar == state.last_bar:
+            return HOLD
+        state.last_bar = bar
+        state.stats["evaluations"] += 1
+
+        signals = [
+            s for s in analyze_all_strategies(df, self.strategies)
+            if s.signal in (Signal.LONG, Signal.SHORT)
+        ]
+        if not signals:
+            state.last_signal = HOLD
+            return HOLD
+        signal = max(signals, key=lambda s: s.strength * s.confidence)
+        state.last_signal = signal.signal.value
+
+        if self.open_positions() >= self.max_positions:
+            logger.info(f"[{state.symbol}] 持仓交易对已达上限 {self.max_positions}，忽略 {signal.signal.value} 信号")
+            return HOLD
+        allowed, reason = rm.can_open_position()
+        if not allowed:
+            logger.info(f"[{state.symbol}] 不开仓: {reason}")
+            return HOLD
+        return OPEN if self._open(state, signal, price, df, get_balance()) else HOLD
+
+    def _sync_position(self, state: SymbolState, positions: Optional[List[PositionData]],
+                       df: Optional[pd.DataFrame]):
+        """
+        以交易所持仓为准同步本地风控持仓
+
+        批量结果中缺失持仓要连续 POSITION_MISSING_LIMIT 轮才清除本地持仓，只有成功读取到的
+        空持仓才计为缺失（None 表示读取失败，持仓未知）；清除时保留 state.strategy，
+        之后恢复同一持仓时仍按原策略计算止损止盈。
+        """
+        rm = state.risk_manager
+        if positions is None:
+            logger.warning(f"[{state.symbol}] 本轮持仓读取失败，保持本地持仓不变")
+            return
+        if positions:
+            state.missing_snapshots = 0
+            if rm.position is None:
+                position = max(positions, key=lambda p: p.amount)
+                logger.info(f"[{state.symbol}] 恢复交易所持仓: {position.side} {position.amount} @ {position.entry_price}")
+                rm.set_position(position.side, position.amount, position.entry_price, df, strategy=state.strategy)
+        elif rm.position is not None:
+            state.missing_snapshots += 1
+            if state.missing_snapshots < POSITION_MISSING_LIMIT:
+                logger.debug(f"[{state.symbol}] 批量持仓中暂未出现本地持仓 ({state.missing_snapshots}/{POSITION_MISSING_LIMIT})")
+                return
+            logger.info(f"[{state.symbol}] 交易所已无持仓，清除本地持仓")
+            rm.clear_position()
+            state.missing_snapshots = 0
+
+    # ==================== 执行 ====================
+
+    def _open(self, state: SymbolState, signal: TradeSignal, price: float,
+              df: pd.DataFrame, balance: float) -> bool:
+        symbol = state.symbol
+        side = signal.signal.value
+        rm = state.risk_manager
+        amount = rm.calculate_position_size(balance, price, df, signal.strength)
+        if amount <= 0:
+            logger.warning(f"[{symbol}] 计算的仓位大小无效: {amount}")
+            return False
+
+        open_order = self.exchange.open_long if side == "long" else self.exchange.open_short
+        result = open_order(amount, df, symbol=symbol, strategy=signal.strategy, reason=signal.reason)
+        if not result.success:
+            logger.error(f"[{symbol}] 开仓失败: {result.error}")
+            notifier.notify_error(f"{symbol} 开仓失败: {result.error}")
+            return False
+
+        entry_price = float(result.avg_price or price)
+        rm.set_position(side, amount, entry_price, df, strategy=signal.strategy)
+        state.strategy = signal.strategy
+        state.stats["opens"] += 1
+        db.log_trade_buffered(
+            symbol, side, "open", amount, entry_price, order_id=result.order_id or "",
+            value_usdt=amount * entry_price, strategy=signal.strategy, reason=signal.reason,
+        )
+        notifier.notify_trade("open", symbol, side, amount, entry_price, reason=signal.reason)
+        logger.info(f"[{symbol}] ✅ 开仓成功 [{signal.strategy}]: {side} {amount} @ {entry_price:.4f}")
+        return True
+
+    def _close(self, state: SymbolState, price: float, reason: str) -> bool:
+        symbol = state.symbol
+        rm = state.risk_manager
+        position = rm.position
+        success = self.exchange.close_position(
+            reason, {"symbol": symbol, "side": position.side, "amount": position.amount}
+        )
+        if not success:
+            logger.error(f"[{symbol}] 平仓失败: {reason}")
+            return False
+
+        pnl = position.calculate_net_profit(price)
+        pnl_percent = pnl / (position.entry_price * position.amount) * 100 if position.amount else 0.0
+        rm.record_trade_result(pnl)
+        db.log_trade_buffered(
+            symbol, position.side, "close", position.amount, price,
+            value_usdt=position.amount * price, pnl=pnl, pnl_percent=pnl_percent,
+            strategy=state.strategy, reason=reason,
+        )
+        notifier.notify_trade("close", symbol, position.side, position.amount, price, pnl=pnl, reason=reason)
+        logger.info(f"[{symbol}] ✅ 平仓成功: {position.side} @ {price:.4f}, 盈亏 {pnl:+.2f} USDT ({reason})")
+        rm.clear_position()
+        state.strategy = ""
+        state.stats["closes"] += 1
+        return True
+
+    # ==================== 运行控制 ====================
+
+    def open_positions(self) -> int:
+        """当前持仓的交易对数量"""
+        return sum(1 for state in self.states.values() if state.risk_manager.position is not None)
+
+    def _setup(self):
+        """为每个交易对设置杠杆（失败只记录日志）"""
+        for symbol in self.symbols:
+            try:
+                self.exchange.set_leverage(config.LEVERAGE, symbol)
+            except Exception as e:
+                logger.warning(f"[{symbol}] 设置杠杆失败: {e}")
+
+    async def run(self, max_cycles: int = None):
+        """运行主循环（max_cycles 为空时一直运行到 stop()）"""
+        self.running = True
+        await asyncio.to_thread(self._setup)
+        logger.info(f"多品种运行时启动: {', '.join(self.symbols)} ({self.timeframe}, 间隔 {self.interval}s)")
+        cycles = 0
+        while self.running:
+            started = time.monotonic()
+            try:
+                actions = await self.run_cycle()
+                logger.debug(f"第 {self.stats['cycles']} 轮: {actions}")
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"多品种运行时本轮失败: {e}")
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+            await asyncio.sleep(max(self.interval - (time.monotonic() - started), 0.0))
+        self.running = False
+
+    def start(self):
+        """阻塞运行（Ctrl+C 停止）"""
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            logger.info("用户中断")
+        finally:
+            self.stop()
+
+    def stop(self):
+        """停止主循环并刷新缓冲的交易记录"""
+        self.running = False
+        try:
+            db.flush_buffers(force=True)
+        except Exception as e:
+            logger.error(f"刷新交易记录失败: {e}")
+
+    def get_status(self) -> Dict:
+        """运行状态（各交易对状态 + 汇总统计）"""
+        return {
+            "symbols": {symbol: state.to_dict() for symbol, state in self.states.items()},
+            "open_positions": self.open_positions(),
+            "max_positions": self.max_positions,
+            "daily_trades": self.daily.trades,
+            "daily_loss": self.daily.loss,
+            **self.stats,
+        }
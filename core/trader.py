@@ -3,6 +3,7 @@
 """
 import ccxt
 import asyncio
+import concurrent.futures
 import ccxt.async_support as ccxt_async
 import time
 from datetime import datetime
@@ -22,6 +23,11 @@ from risk.risk_manager import (
 from strategies.indicators import IndicatorCalculator
 from risk.error_backoff_controller import get_backoff_controller
 from risk.liquidity_validator import get_liquidity_validator
+from market_data import MultiTimeframeAggregator, get_kline_buffer, parse_ohlcv
+from exchange.async_pool import get_async_client_pool
+from exchange.market_cache import install_market_cache
+from exchange.order_tracker import OrderTracker, TIMEOUT, get_order_tracker, is_filled
+from exchange.rate_limiter import install_rate_limiter
 
 logger = get_logger("trader")
 
@@ -140,6 +146,9 @@ class BitgetTrader:
         # 多时间周期数据缓存
         self.timeframe_data: Dict[str, pd.DataFrame] = {}
 
+        # 多时间周期聚合器（首次使用时创建）
+        self.mtf_aggregator: Optional[MultiTimeframeAggregator] = None
+
         # 初始化
         self._init_exchange()
     
@@ -155,6 +164,8 @@ class BitgetTrader:
                     "defaultType": "swap",
                 }
             })
+            install_rate_limiter(self.exchange)
+            install_market_cache(self.exchange)
             
             # 设置杠杆和保证金模式
             self._setup_trading_params()
@@ -216,17 +227,12 @@ class BitgetTrader:
         limit = limit or config.KLINE_LIMIT
 
         try:
-            ohlcv = self.exchange.fetch_ohlcv(
-                symbol, timeframe, limit=limit,
-                params={"productType": config.PRODUCT_TYPE}
-            )
-
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            if getattr(config, 'KLINE_BUFFER_ENABLED', False):
+                # 增量缓冲：只拉取上次以来的K线，返回最新 limit 根K线的副本
+                buffer = get_kline_buffer('bitget', symbol, timeframe, limit)
+                df = buffer.refresh(lambda n: self._fetch_ohlcv_raw(symbol, timeframe, n), limit=limit)
+            else:
+                df = parse_ohlcv(self._fetch_ohlcv_raw(symbol, timeframe, limit))
 
             self.health_monitor.record_success()
 
@@ -237,6 +243,13 @@ class BitgetTrader:
             logger.error(f"获取K线失败: {e}")
             return None
 
+    def _fetch_ohlcv_raw(self, symbol: str, timeframe: str, limit: int) -> List[list]:
+        """获取原始K线列表（不转换为DataFrame）"""
+        return self.exchange.fetch_ohlcv(
+            symbol, timeframe, limit=limit,
+            params={"productType": config.PRODUCT_TYPE}
+        )
+
     def get_klines(self, symbol: str = None, timeframe: str = None, limit: int = None) -> Optional[pd.DataFrame]:
         """获取K线数据（兼容bot.py）"""
         return self.fetch_ohlcv(symbol, timeframe, limit)
@@ -245,7 +258,8 @@ class BitgetTrader:
         """
         获取多时间周期数据
         
-        根据配置 USE_ASYNC_DATA_FETCH 自动选择同步或异步方式：
+        根据配置自动选择获取方式：
+        - 重采样模式（MTF_RESAMPLE_ENABLED）：只增量拉取最小周期K线，高周期本地聚合
         - 异步模式：并发获取，速度快（3-5倍提升）
         - 同步模式：顺序获取，兼容性好
         
@@ -256,7 +270,9 @@ class BitgetTrader:
             return {}
         
         # 根据配置选择同步或异步方式
-        if config.USE_ASYNC_DATA_FETCH:
+        if getattr(config, 'MTF_RESAMPLE_ENABLED', False):
+            data = self._fetch_multi_timeframe_resampled()
+        elif config.USE_ASYNC_DATA_FETCH:
             logger.info("使用异步模式获取多时间周期数据")
             data = self._run_async(self.fetch_multi_timeframe_data_async())
         else:
@@ -279,6 +295,31 @@ class BitgetTrader:
         
         self.timeframe_data = data
         return data
+
+    def _fetch_multi_timeframe_resampled(self) -> Dict[str, pd.DataFrame]:
+        """通过基础周期K线增量重采样获取多时间周期数据"""
+        if self.mtf_aggregator is None:
+            self.mtf_aggregator = MultiTimeframeAggregator(config.TIMEFRAMES)
+
+        start_time = time.time()
+        try:
+            data = self.mtf_aggregator.refresh(
+                lambda tf, limit: self._fetch_ohlcv_raw(config.SYMBOL, tf, limit)
+            )
+            self.health_monitor.record_success()
+        except Exception as e:
+            self.health_monitor.record_error(e)
+            logger.error(f"重采样获取多时间周期数据失败: {e}")
+            self.mtf_aggregator.reset()
+            return {}
+
+        elapsed = time.time() - start_time
+        logger.debug(
+            f"重采样获取多时间周期数据完成: "
+            f"{len(data)}/{len(config.TIMEFRAMES)} 个周期, "
+            f"耗时 {elapsed:.2f}s"
+        )
+        return data
     
 
     # ==================== 异步数据获取方法 ====================
@@ -287,33 +328,27 @@ class BitgetTrader:
         """
         运行异步协程的辅助方法
 
+        协程提交到进程级异步客户端池的后台事件循环执行，当前线程阻塞等待结果，
+        不创建或嵌套事件循环。
+
         Args:
             coro: 异步协程对象
 
         Returns:
             协程的返回值
         """
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # 如果事件循环已在运行，创建新的事件循环
-                import nest_asyncio
-                nest_asyncio.apply()
-                return loop.run_until_complete(coro)
-            else:
-                return loop.run_until_complete(coro)
-        except RuntimeError:
-            # 如果没有事件循环或事件循环已关闭，创建新的
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(coro)
-            finally:
-                # 不要关闭事件循环，让它可以被后续操作复用
-                # loop.close()  # 注释掉这行，避免关闭事件循环
-                pass
+        return get_async_client_pool().run(coro)
+
+    def _get_async_exchange(self) -> ccxt_async.Exchange:
+        """获取共享的异步交易所客户端（长期存活，不需要关闭）"""
+        return get_async_client_pool().get_client(
+            getattr(config, 'ACTIVE_EXCHANGE', 'bitget').lower(),
+            api_key=getattr(config, 'API_KEY', ''),
+            secret=getattr(config, 'API_SECRET', ''),
+            password=getattr(config, 'EXCHANGE_CONFIG', {}).get("api_password", ""),
+            options={"defaultType": "swap"}
+        )
 
-    
     async def fetch_ohlcv_async(
         self,
         symbol: str = None,
@@ -328,7 +363,7 @@ class BitgetTrader:
             symbol: 交易对符号
             timeframe: 时间周期
             limit: K线数量
-            exchange_async: 异步交易所实例（可选）
+            exchange_async: 异步交易所实例（可选，默认使用共享客户端）
             
         Returns:
             DataFrame: K线数据
@@ -337,40 +372,22 @@ class BitgetTrader:
         timeframe = timeframe or config.TIMEFRAME
         limit = limit or config.KLINE_LIMIT
         
-        # 如果没有提供异步交易所实例，创建临时实例
-        close_exchange = False
+        # 如果没有提供异步交易所实例，使用客户端池中的共享客户端（在池的事件循环中请求）
+        pool = get_async_client_pool()
         if exchange_async is None:
-            exchange_class = getattr(ccxt_async, config.ACTIVE_EXCHANGE.lower())
-            exchange_async = exchange_class({
-                "apiKey": config.API_KEY,
-                "secret": config.API_SECRET,
-                "password": config.EXCHANGE_CONFIG.get("api_password", ""),
-                "enableRateLimit": True,
-                "options": {"defaultType": "swap"}
-            })
-            close_exchange = True
+            exchange_async = self._get_async_exchange()
         
         try:
-            ohlcv = await exchange_async.fetch_ohlcv(
+            ohlcv = await pool.call(exchange_async.fetch_ohlcv(
                 symbol, timeframe, limit=limit,
                 params={"productType": config.PRODUCT_TYPE}
-            )
-            
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+            ))
             
-            return df
+            return parse_ohlcv(ohlcv)
             
         except Exception as e:
             logger.error(f"异步获取K线失败 [{timeframe}]: {e}")
             return None
-        finally:
-            if close_exchange:
-                await exchange_async.close()
     
     async def fetch_multi_timeframe_data_async(self) -> Dict[str, pd.DataFrame]:
         """
@@ -387,15 +404,8 @@ class BitgetTrader:
         
         start_time = time.time()
         
-        # 创建异步交易所实例
-        exchange_class = getattr(ccxt_async, getattr(config, 'ACTIVE_EXCHANGE', 'bitget').lower())
-        exchange_async = exchange_class({
-            "apiKey": getattr(config, 'API_KEY', ''),
-            "secret": getattr(config, 'API_SECRET', ''),
-            "password": getattr(config, 'EXCHANGE_CONFIG', {}).get("api_password", ""),
-            "enableRateLimit": True,
-            "options": {"defaultType": "swap"}
-        })
+        # 共享异步客户端（连接和市场信息跨调用复用）
+        exchange_async = self._get_async_exchange()
         
         try:
             # 并发获取所有时间周期的数据
@@ -429,8 +439,6 @@ class BitgetTrader:
         except Exception as e:
             logger.error(f"异步获取多时间周期数据失败: {e}")
             return {}
-        finally:
-            await exchange_async.close()
 
     def get_balance(self) -> float:
         """获取可用余额"""
@@ -696,44 +704,58 @@ class BitgetTrader:
             logger.error(f"限价单创建失败: {e}")
             return None
 
-    def wait_for_order_fill(self, order_id: str, timeout: float = None) -> Tuple[bool, Optional[Dict]]:
+    @property
+    def order_tracker(self) -> OrderTracker:
+        """当前 ccxt 客户端的订单跟踪器（所有等待中的订单共用一个批量轮询线程）"""
+        return get_order_tracker(self.exchange, params={"productType": config.PRODUCT_TYPE})
+
+    def wait_for_order_fill(self, order_id: str, timeout: float = None,
+                            cancel_on_timeout: bool = False) -> Tuple[bool, Optional[Dict]]:
         """等待订单成交
 
+        订单交给订单跟踪器批量轮询，当前线程只等待 Future，不再逐个 fetch_order + sleep。
+
         Args:
             order_id: 订单ID
             timeout: 超时时间（秒），默认使用配置中的值
+            cancel_on_timeout: 超时时是否撤单（撤单前已成交则按成交返回）
 
         Returns:
-            (是否成交, 订单详情)
+            (是否成交, 订单详情)，超时返回 (False, None)
         """
         if timeout is None:
             timeout = config.MAKER_ORDER_TIMEOUT
 
-        start_time = time.time()
-        check_interval = config.MAKER_ORDER_CHECK_INTERVAL
-
         logger.info(f"等待订单成交: {order_id}, 超时时间: {timeout}秒")
 
-        while time.time() - start_time < timeout:
-            try:
-                order = self.exchange.fetch_order(order_id, config.SYMBOL)
-                status = order.get('status', '')
-
-                if status == 'closed' or status == 'filled':
-                    logger.info(f"订单已成交: {order_id}")
-                    return True, order
-                elif status == 'canceled':
-                    logger.warning(f"订单已取消: {order_id}")
-                    return False, order
-
-                time.sleep(check_interval)
-
-            except Exception as e:
-                logger.error(f"查询订单状态失败: {e}")
-                time.sleep(check_interval)
-
-        logger.warning(f"订单等待超时: {order_id}")
-        return False, None
+        tracker = self.order_tracker
+        future = tracker.track(order_id, config.SYMBOL, timeout, cancel_on_timeout=cancel_on_timeout)
+        try:
+            # 跟踪器负责超时；这里的上限只防止跟踪线程异常时永久阻塞
+            order = future.result(timeout + max(tracker.poll_interval * 4, 5.0))
+        except concurrent.futures.TimeoutError:
+            tracker.untrack(order_id)
+            order = {"status": TIMEOUT}
+
+        status = order.get('status', '')
+        if is_filled(order):
+            logger.info(f"订单已成交: {order_id}")
+            return True, order
+        if status == TIMEOUT:
+            logger.warning(f"订单等待超时: {order_id}")
+            return False, None
+        logger.warning(f"订单已取消: {order_id}")
+        return False, order
+
+    async def wait_for_order_fill_async(self, order_id: str, timeout: float = None,
+                                        cancel_on_timeout: bool = False) -> Tuple[bool, Optional[Dict]]:
+        """wait_for_order_fill 的异步版本（await 订单 Future，不阻塞事件循环）"""
+        if timeout is None:
+            timeout = config.MAKER_ORDER_TIMEOUT
+        order = await self.order_tracker.wait(order_id, config.SYMBOL, timeout, cancel_on_timeout)
+        if is_filled(order):
+            return True, order
+        return False, None if order.get('status') == TIMEOUT else order
 
     def cancel_order(self, order_id: str) -> bool:
         """取消订单
@@ -889,16 +911,14 @@ class BitgetTrader:
             logger.warning("无法获取订单ID，降级为市价单")
             return self.create_market_order(side, amount, reduce_only)
 
-        # 等待订单成交（使用动态超时时间）
-        filled, order_detail = self.wait_for_order_fill(order_id, timeout)
+        # 等待订单成交（使用动态超时时间，超时由订单跟踪器撤单）
+        filled, order_detail = self.wait_for_order_fill(order_id, timeout, cancel_on_timeout=True)
 
         if filled:
             logger.info(f"✅ Maker订单成交，节省手续费67%")
             return order_detail
 
-        # 超时未成交，取消订单
         logger.warning("Maker订单超时未成交")
-        self.cancel_order(order_id)
 
         # 根据配置决定是否降级为市价单
         if config.MAKER_AUTO_FALLBACK_TO_MARKET:
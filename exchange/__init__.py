@@ -4,6 +4,7 @@
 """
 
 from .interface import ExchangeInterface, TickerData, PositionData, OrderResult
+from .async_interface import AsyncExchangeInterface, CcxtAsyncAdapter
 from .factory import ExchangeFactory
 from .manager import ExchangeManager
 from .errors import (
@@ -14,16 +15,32 @@ from .errors import (
     InsufficientBalanceError
 )
 
+from .rate_limiter import Priority, request_priority, get_rate_limiter
+from .market_cache import get_market_cache
+from .recording import ExchangeRecorder, ExchangeReplayer
+from .order_tracker import OrderTracker, get_order_tracker
+
 # 导入适配器
-from .adapters import BitgetAdapter, BinanceAdapter, OKXAdapter
+from .adapters import (
+    BitgetAdapter, BinanceAdapter, OKXAdapter,
+    BitgetAsyncAdapter, BinanceAsyncAdapter, OKXAsyncAdapter,
+    SimulatedExchangeAdapter, SimulatedAsyncAdapter,
+)
 
 # 注册适配器到工厂
 ExchangeFactory.register('bitget', BitgetAdapter)
 ExchangeFactory.register('binance', BinanceAdapter)
 ExchangeFactory.register('okx', OKXAdapter)
+ExchangeFactory.register_async('bitget', BitgetAsyncAdapter)
+ExchangeFactory.register_async('binance', BinanceAsyncAdapter)
+ExchangeFactory.register_async('okx', OKXAsyncAdapter)
+ExchangeFactory.register('simulated', SimulatedExchangeAdapter)
+ExchangeFactory.register_async('simulated', SimulatedAsyncAdapter)
 
 __all__ = [
     'ExchangeInterface',
+    'AsyncExchangeInterface',
+    'CcxtAsyncAdapter',
     'TickerData',
     'PositionData',
     'OrderResult',
@@ -34,7 +51,20 @@ __all__ = [
     'AuthenticationError',
     'RateLimitError',
     'InsufficientBalanceError',
+    'Priority',
+    'request_priority',
+    'get_rate_limiter',
+    'get_market_cache',
+    'ExchangeRecorder',
+    'ExchangeReplayer',
+    'OrderTracker',
+    'get_order_tracker',
     'BitgetAdapter',
     'BinanceAdapter',
     'OKXAdapter',
+    'BitgetAsyncAdapter',
+    'BinanceAsyncAdapter',
+    'OKXAsyncAdapter',
+    'SimulatedExchangeAdapter',
+    'SimulatedAsyncAdapter',
 ]
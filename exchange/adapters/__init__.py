@@ -2,12 +2,18 @@
 交易所适配器模块
 """
 
-from .bitget_adapter import BitgetAdapter
-from .binance_adapter import BinanceAdapter
-from .okx_adapter import OKXAdapter
+from .bitget_adapter import BitgetAdapter, BitgetAsyncAdapter
+from .binance_adapter import BinanceAdapter, BinanceAsyncAdapter
+from .okx_adapter import OKXAdapter, OKXAsyncAdapter
+from .simulated_adapter import SimulatedExchangeAdapter, SimulatedAsyncAdapter
 
 __all__ = [
     'BitgetAdapter',
     'BinanceAdapter',
     'OKXAdapter',
+    'BitgetAsyncAdapter',
+    'BinanceAsyncAdapter',
+    'OKXAsyncAdapter',
+    'SimulatedExchangeAdapter',
+    'SimulatedAsyncAdapter',
 ]
@@ -9,11 +9,14 @@ from datetime import datetime
 
 from utils.logger_utils import get_logger
 from ..interface import ExchangeInterface, TickerData, PositionData, OrderResult
+from ..async_interface import CcxtAsyncAdapter
 from ..errors import (
     ExchangeError, NetworkError, AuthenticationError,
     RateLimitError, InsufficientBalanceError, OrderError
 )
 from ..decorators import retry_on_error
+from ..market_cache import install_market_cache
+from ..rate_limiter import install_rate_limiter
 
 logger = get_logger("binance_adapter")
 
@@ -41,6 +44,8 @@ class BinanceAdapter(ExchangeInterface):
                     "defaultType": "future",  # Binance使用future而不是swap
                 }
             })
+            install_rate_limiter(self.exchange)
+            install_market_cache(self.exchange)
 
             # 设置交易参数
             self._setup_trading_params()
@@ -106,16 +111,7 @@ class BinanceAdapter(ExchangeInterface):
 
         try:
             ticker = self.exchange.fetch_ticker(symbol)
-
-            return TickerData(
-                symbol=symbol,
-                last=float(ticker.get('last', 0)),
-                bid=float(ticker.get('bid', 0)) if ticker.get('bid') else None,
-                ask=float(ticker.get('ask', 0)) if ticker.get('ask') else None,
-                volume=float(ticker.get('baseVolume', 0)) if ticker.get('baseVolume') else None,
-                timestamp=int(ticker.get('timestamp', 0)),
-                raw_data=ticker
-            )
+            return self._parse_ticker(symbol, ticker)
 
         except ccxt.NetworkError as e:
             logger.error(f"Binance获取行情网络错误: {e}")
@@ -141,14 +137,7 @@ class BinanceAdapter(ExchangeInterface):
         try:
             ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
 
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-
-            return df
+            return self._parse_klines(ohlcv)
 
         except ccxt.NetworkError as e:
             logger.error(f"Binance获取K线网络错误: {e}")
@@ -167,13 +156,7 @@ class BinanceAdapter(ExchangeInterface):
 
         try:
             orderbook = self.exchange.fetch_order_book(symbol, limit)
-
-            return {
-                'bids': orderbook.get('bids', []),
-                'asks': orderbook.get('asks', []),
-                'timestamp': orderbook.get('timestamp', 0),
-                'datetime': orderbook.get('datetime', ''),
-            }
+            return self._parse_orderbook(orderbook)
 
         except Exception as e:
             logger.error(f"Binance获取订单簿失败: {e}")
@@ -189,9 +172,7 @@ class BinanceAdapter(ExchangeInterface):
 
         try:
             balance = self.exchange.fetch_balance()
-            usdt_balance = balance.get('USDT', {}).get('free', 0)
-
-            return float(usdt_balance)
+            return self._parse_balance(balance)
 
         except ccxt.InsufficientFunds as e:
             logger.error(f"Binance余额不足: {e}")
@@ -210,25 +191,7 @@ class BinanceAdapter(ExchangeInterface):
 
         try:
             positions = self.exchange.fetch_positions([symbol])
-
-            result = []
-            for pos in positions:
-                amount = abs(float(pos.get('contracts', 0)))
-                if amount > 0:
-                    # Binance使用positionSide来区分多空
-                    position_side = pos.get('side', '').lower()
-
-                    result.append(PositionData(
-                        side=position_side,
-                        amount=amount,
-                        entry_price=float(pos.get('entryPrice', 0)),
-                        unrealized_pnl=float(pos.get('unrealizedPnl', 0)),
-                        leverage=int(pos.get('leverage', self.leverage)),
-                        margin_mode=pos.get('marginMode', self.margin_mode),
-                        raw_data=pos
-                    ))
-
-            return result
+            return self._parse_positions(positions)
 
         except Exception as e:
             logger.error(f"Binance获取持仓失败: {e}")
@@ -246,8 +209,8 @@ class BinanceAdapter(ExchangeInterface):
 
     @retry_on_error(max_retries=3, backoff_base=1.0)
     def _create_order(self, side: str, amount: float, position_side: str = None,
-                      reduce_only: bool = False, **kwargs) -> OrderResult:
-        """创建订单（内部方法）"""
+                      reduce_only: bool = False, symbol: str = None, **kwargs) -> OrderResult:
+        """创建订单（内部方法，symbol 为空时使用适配器默认交易对）"""
         if not self.is_connected():
             return OrderResult(success=False, error="交易所未连接")
 
@@ -262,7 +225,7 @@ class BinanceAdapter(ExchangeInterface):
                 params['reduceOnly'] = True
 
             order = self.exchange.create_order(
-                symbol=self.symbol,
+                symbol=symbol or self.symbol,
                 type="market",
                 side=side,
                 amount=amount,
@@ -296,12 +259,13 @@ class BinanceAdapter(ExchangeInterface):
             logger.error("交易所未连接")
             return False
 
-        # 获取持仓信息
+        # 获取持仓信息（position_data 可指定 symbol，多品种运行时使用）
+        symbol = (position_data or {}).get('symbol') or self.symbol
         if position_data:
             position_side = position_data.get('side')
             position_amount = position_data.get('amount')
         else:
-            positions = self.get_positions()
+            positions = self.get_positions(symbol)
             if not positions:
                 logger.warning("无持仓可平")
                 return False
@@ -317,7 +281,8 @@ class BinanceAdapter(ExchangeInterface):
                 close_side,
                 position_amount,
                 position_side=binance_position_side,
-                reduce_only=True
+                reduce_only=True,
+                symbol=symbol
             )
 
             if result.success:
@@ -418,17 +383,7 @@ class BinanceAdapter(ExchangeInterface):
                 price=price
             )
 
-            return OrderResult(
-                success=True,
-                order_id=order.get('id'),
-                price=order.get('price'),
-                amount=order.get('amount'),
-                side=side,
-                filled_quantity=order.get('filled', 0),
-                avg_price=order.get('average'),
-                status=order.get('status'),
-                raw_data=order
-            )
+            return self._parse_order(order, side)
 
         except Exception as e:
             logger.error(f"Binance下单失败: {e}")
@@ -443,17 +398,7 @@ class BinanceAdapter(ExchangeInterface):
         try:
             order = self.exchange.fetch_order(order_id, symbol)
 
-            return OrderResult(
-                success=True,
-                order_id=order.get('id'),
-                price=order.get('price'),
-                amount=order.get('amount'),
-                side=order.get('side'),
-                filled_quantity=order.get('filled', 0),
-                avg_price=order.get('average'),
-                status=order.get('status'),
-                raw_data=order
-            )
+            return self._parse_order(order)
 
         except Exception as e:
             logger.error(f"Binance查询订单失败: {e}")
@@ -464,3 +409,11 @@ class BinanceAdapter(ExchangeInterface):
     def get_exchange_name(self) -> str:
         """获取交易所名称"""
         return self.exchange_name
+
+
+class BinanceAsyncAdapter(CcxtAsyncAdapter):
+    """Binance异步适配器（ccxt.async_support）"""
+
+    ccxt_id = "binance"
+    ccxt_options = {"defaultType": "future"}
+    sync_adapter_class = BinanceAdapter
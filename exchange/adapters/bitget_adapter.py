@@ -9,11 +9,14 @@ from datetime import datetime
 
 from utils.logger_utils import get_logger
 from ..interface import ExchangeInterface, TickerData, PositionData, OrderResult
+from ..async_interface import CcxtAsyncAdapter
 from ..errors import (
     ExchangeError, NetworkError, AuthenticationError,
     RateLimitError, InsufficientBalanceError, OrderError
 )
 from ..decorators import retry_on_error
+from ..market_cache import install_market_cache
+from ..rate_limiter import install_rate_limiter
 
 logger = get_logger("bitget_adapter")
 
@@ -43,6 +46,8 @@ class BitgetAdapter(ExchangeInterface):
                     "defaultType": "swap",
                 }
             })
+            install_rate_limiter(self.exchange)
+            install_market_cache(self.exchange)
 
             # 设置交易参数
             self._setup_trading_params()
@@ -108,6 +113,35 @@ class BitgetAdapter(ExchangeInterface):
         """检查连接状态"""
         return self.exchange is not None
 
+    # ========== 响应解析 ==========
+
+    def _market_params(self) -> Dict:
+        """K线/持仓请求需要携带 productType"""
+        return {"productType": self.product_type}
+
+    def _balance_params(self) -> Dict:
+        return {"productType": self.product_type}
+
+    def _order_params(self) -> Dict:
+        return {"productType": self.product_type}
+
+    def _parse_positions(self, positions: List[Dict]) -> List[PositionData]:
+        """Bitget 双向持仓：contracts 恒为正，side 为 long/short"""
+        result = []
+        for pos in positions:
+            amount = float(pos.get('contracts', 0))
+            if amount > 0:
+                result.append(PositionData(
+                    side=pos.get('side', ''),
+                    amount=amount,
+                    entry_price=float(pos.get('entryPrice', 0)),
+                    unrealized_pnl=float(pos.get('unrealizedPnl', 0)),
+                    leverage=int(pos.get('leverage', self.leverage)),
+                    margin_mode=pos.get('marginMode', self.margin_mode),
+                    raw_data=pos
+                ))
+        return result
+
     # ========== 市场数据接口 ==========
 
     @retry_on_error(max_retries=3, backoff_base=1.0)
@@ -120,16 +154,7 @@ class BitgetAdapter(ExchangeInterface):
 
         try:
             ticker = self.exchange.fetch_ticker(symbol)
-
-            return TickerData(
-                symbol=symbol,
-                last=float(ticker.get('last', 0)),
-                bid=float(ticker.get('bid', 0)) if ticker.get('bid') else None,
-                ask=float(ticker.get('ask', 0)) if ticker.get('ask') else None,
-                volume=float(ticker.get('baseVolume', 0)) if ticker.get('baseVolume') else None,
-                timestamp=int(ticker.get('timestamp', 0)),
-                raw_data=ticker
-            )
+            return self._parse_ticker(symbol, ticker)
 
         except ccxt.NetworkError as e:
             logger.error(f"Bitget获取行情网络错误: {e}")
@@ -155,17 +180,10 @@ class BitgetAdapter(ExchangeInterface):
         try:
             ohlcv = self.exchange.fetch_ohlcv(
                 symbol, timeframe, limit=limit,
-                params={"productType": self.product_type}
-            )
-
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+                params=self._market_params()
             )
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
 
-            return df
+            return self._parse_klines(ohlcv)
 
         except ccxt.NetworkError as e:
             logger.error(f"Bitget获取K线网络错误: {e}")
@@ -184,13 +202,7 @@ class BitgetAdapter(ExchangeInterface):
 
         try:
             orderbook = self.exchange.fetch_order_book(symbol, limit)
-
-            return {
-                'bids': orderbook.get('bids', []),
-                'asks': orderbook.get('asks', []),
-                'timestamp': orderbook.get('timestamp', 0),
-                'datetime': orderbook.get('datetime', ''),
-            }
+            return self._parse_orderbook(orderbook)
 
         except Exception as e:
             logger.error(f"Bitget获取订单簿失败: {e}")
@@ -205,12 +217,8 @@ class BitgetAdapter(ExchangeInterface):
             raise ExchangeError("交易所未连接")
 
         try:
-            balance = self.exchange.fetch_balance(
-                params={"productType": self.product_type}
-            )
-            usdt_balance = balance.get('USDT', {}).get('free', 0)
-
-            return float(usdt_balance)
+            balance = self.exchange.fetch_balance(params=self._balance_params())
+            return self._parse_balance(balance)
 
         except ccxt.InsufficientFunds as e:
             logger.error(f"Bitget余额不足: {e}")
@@ -230,24 +238,9 @@ class BitgetAdapter(ExchangeInterface):
         try:
             positions = self.exchange.fetch_positions(
                 symbols=[symbol],
-                params={"productType": self.product_type}
+                params=self._market_params()
             )
-
-            result = []
-            for pos in positions:
-                amount = float(pos.get('contracts', 0))
-                if amount > 0:
-                    result.append(PositionData(
-                        side=pos.get('side', ''),
-                        amount=amount,
-                        entry_price=float(pos.get('entryPrice', 0)),
-                        unrealized_pnl=float(pos.get('unrealizedPnl', 0)),
-                        leverage=int(pos.get('leverage', self.leverage)),
-                        margin_mode=pos.get('marginMode', self.margin_mode),
-                        raw_data=pos
-                    ))
-
-            return result
+            return self._parse_positions(positions)
 
         except Exception as e:
             logger.error(f"Bitget获取持仓失败: {e}")
@@ -265,8 +258,8 @@ class BitgetAdapter(ExchangeInterface):
 
     @retry_on_error(max_retries=3, backoff_base=1.0)
     def _create_order(self, side: str, amount: float, reduce_only: bool = False,
-                      **kwargs) -> OrderResult:
-        """创建订单（内部方法）"""
+                      symbol: str = None, **kwargs) -> OrderResult:
+        """创建订单（内部方法，symbol 为空时使用适配器默认交易对）"""
         if not self.is_connected():
             return OrderResult(success=False, error="交易所未连接")
 
@@ -278,7 +271,7 @@ class BitgetAdapter(ExchangeInterface):
             }
 
             order = self.exchange.create_order(
-                symbol=self.symbol,
+                symbol=symbol or self.symbol,
                 type="market",
                 side=side,
                 amount=amount,
@@ -312,11 +305,12 @@ class BitgetAdapter(ExchangeInterface):
             logger.error("交易所未连接")
             return False
 
-        # 获取持仓信息
+        # 获取持仓信息（position_data 可指定 symbol，多品种运行时使用）
+        symbol = (position_data or {}).get('symbol') or self.symbol
         if position_data:
             position_side = position_data.get('side')
         else:
-            positions = self.get_positions()
+            positions = self.get_positions(symbol)
             if not positions:
                 logger.warning("无持仓可平")
                 return False
@@ -325,7 +319,7 @@ class BitgetAdapter(ExchangeInterface):
         try:
             # 使用Bitget一键平仓API
             result = self.exchange.private_mix_post_v2_mix_order_close_positions({
-                'symbol': self.symbol,
+                'symbol': symbol,
                 'productType': self.product_type,
                 'holdSide': position_side
             })
@@ -342,10 +336,10 @@ class BitgetAdapter(ExchangeInterface):
             # 回退到传统方法
             try:
                 close_side = "sell" if position_side == 'long' else "buy"
-                positions = self.get_positions()
+                positions = [p for p in self.get_positions(symbol) if p.side == position_side]
                 if positions:
                     amount = positions[0].amount
-                    result = self._create_order(close_side, amount, reduce_only=True)
+                    result = self._create_order(close_side, amount, reduce_only=True, symbol=symbol)
                     return result.success
             except Exception as e2:
                 logger.error(f"Bitget回退平仓方法也失败: {e2}")
@@ -437,20 +431,10 @@ class BitgetAdapter(ExchangeInterface):
                 side=side,
                 amount=amount,
                 price=price,
-                params={"productType": self.product_type}
+                params=self._order_params()
             )
 
-            return OrderResult(
-                success=True,
-                order_id=order.get('id'),
-                price=order.get('price'),
-                amount=order.get('amount'),
-                side=side,
-                filled_quantity=order.get('filled', 0),
-                avg_price=order.get('average'),
-                status=order.get('status'),
-                raw_data=order
-            )
+            return self._parse_order(order, side)
 
         except Exception as e:
             logger.error(f"Bitget下单失败: {e}")
@@ -466,20 +450,10 @@ class BitgetAdapter(ExchangeInterface):
             order = self.exchange.fetch_order(
                 order_id,
                 symbol,
-                params={"productType": self.product_type}
+                params=self._market_params()
             )
 
-            return OrderResult(
-                success=True,
-                order_id=order.get('id'),
-                price=order.get('price'),
-                amount=order.get('amount'),
-                side=order.get('side'),
-                filled_quantity=order.get('filled', 0),
-                avg_price=order.get('average'),
-                status=order.get('status'),
-                raw_data=order
-            )
+            return self._parse_order(order)
 
         except Exception as e:
             logger.error(f"Bitget查询订单失败: {e}")
@@ -490,3 +464,10 @@ class BitgetAdapter(ExchangeInterface):
     def get_exchange_name(self) -> str:
         """获取交易所名称"""
         return self.exchange_name
+
+
+class BitgetAsyncAdapter(CcxtAsyncAdapter):
+    """Bitget异步适配器（ccxt.async_support）"""
+
+    ccxt_id = "bitget"
+    sync_adapter_class = BitgetAdapter
@@ -9,11 +9,14 @@ from datetime import datetime
 
 from utils.logger_utils import get_logger
 from ..interface import ExchangeInterface, TickerData, PositionData, OrderResult
+from ..async_interface import CcxtAsyncAdapter
 from ..errors import (
     ExchangeError, NetworkError, AuthenticationError,
     RateLimitError, InsufficientBalanceError, OrderError
 )
 from ..decorators import retry_on_error
+from ..market_cache import install_market_cache
+from ..rate_limiter import install_rate_limiter
 
 logger = get_logger("okx_adapter")
 
@@ -43,6 +46,8 @@ class OKXAdapter(ExchangeInterface):
                     "defaultType": "swap",
                 }
             })
+            install_rate_limiter(self.exchange)
+            install_market_cache(self.exchange)
 
             # 设置交易参数
             self._setup_trading_params()
@@ -106,6 +111,12 @@ class OKXAdapter(ExchangeInterface):
         """检查连接状态"""
         return self.exchange is not None
 
+    # ========== 请求参数 ==========
+
+    def _order_params(self) -> Dict:
+        """通用下单使用全仓模式"""
+        return {"tdMode": "cross"}
+
     # ========== 市场数据接口 ==========
 
     @retry_on_error(max_retries=3, backoff_base=1.0)
@@ -118,16 +129,7 @@ class OKXAdapter(ExchangeInterface):
 
         try:
             ticker = self.exchange.fetch_ticker(symbol)
-
-            return TickerData(
-                symbol=symbol,
-                last=float(ticker.get('last', 0)),
-                bid=float(ticker.get('bid', 0)) if ticker.get('bid') else None,
-                ask=float(ticker.get('ask', 0)) if ticker.get('ask') else None,
-                volume=float(ticker.get('baseVolume', 0)) if ticker.get('baseVolume') else None,
-                timestamp=int(ticker.get('timestamp', 0)),
-                raw_data=ticker
-            )
+            return self._parse_ticker(symbol, ticker)
 
         except ccxt.NetworkError as e:
             logger.error(f"OKX获取行情网络错误: {e}")
@@ -153,14 +155,7 @@ class OKXAdapter(ExchangeInterface):
         try:
             ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
 
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-
-            return df
+            return self._parse_klines(ohlcv)
 
         except ccxt.NetworkError as e:
             logger.error(f"OKX获取K线网络错误: {e}")
@@ -179,13 +174,7 @@ class OKXAdapter(ExchangeInterface):
 
         try:
             orderbook = self.exchange.fetch_order_book(symbol, limit)
-
-            return {
-                'bids': orderbook.get('bids', []),
-                'asks': orderbook.get('asks', []),
-                'timestamp': orderbook.get('timestamp', 0),
-                'datetime': orderbook.get('datetime', ''),
-            }
+            return self._parse_orderbook(orderbook)
 
         except Exception as e:
             logger.error(f"OKX获取订单簿失败: {e}")
@@ -201,9 +190,7 @@ class OKXAdapter(ExchangeInterface):
 
         try:
             balance = self.exchange.fetch_balance()
-            usdt_balance = balance.get('USDT', {}).get('free', 0)
-
-            return float(usdt_balance)
+            return self._parse_balance(balance)
 
         except ccxt.InsufficientFunds as e:
             logger.error(f"OKX余额不足: {e}")
@@ -222,25 +209,7 @@ class OKXAdapter(ExchangeInterface):
 
         try:
             positions = self.exchange.fetch_positions([symbol])
-
-            result = []
-            for pos in positions:
-                amount = abs(float(pos.get('contracts', 0)))
-                if amount > 0:
-                    # OKX使用posSide来区分多空
-                    position_side = pos.get('side', '').lower()
-
-                    result.append(PositionData(
-                        side=position_side,
-                        amount=amount,
-                        entry_price=float(pos.get('entryPrice', 0)),
-                        unrealized_pnl=float(pos.get('unrealizedPnl', 0)),
-                        leverage=int(pos.get('leverage', self.leverage)),
-                        margin_mode=pos.get('marginMode', self.margin_mode),
-                        raw_data=pos
-                    ))
-
-            return result
+            return self._parse_positions(positions)
 
         except Exception as e:
             logger.error(f"OKX获取持仓失败: {e}")
@@ -258,8 +227,8 @@ class OKXAdapter(ExchangeInterface):
 
     @retry_on_error(max_retries=3, backoff_base=1.0)
     def _create_order(self, side: str, amount: float, pos_side: str = None,
-                      reduce_only: bool = False, **kwargs) -> OrderResult:
-        """创建订单（内部方法）"""
+                      reduce_only: bool = False, symbol: str = None, **kwargs) -> OrderResult:
+        """创建订单（内部方法，symbol 为空时使用适配器默认交易对）"""
         if not self.is_connected():
             return OrderResult(success=False, error="交易所未连接")
 
@@ -278,7 +247,7 @@ class OKXAdapter(ExchangeInterface):
                 params['reduceOnly'] = True
 
             order = self.exchange.create_order(
-                symbol=self.symbol,
+                symbol=symbol or self.symbol,
                 type="market",
                 side=side,
                 amount=amount,
@@ -312,12 +281,13 @@ class OKXAdapter(ExchangeInterface):
             logger.error("交易所未连接")
             return False
 
-        # 获取持仓信息
+        # 获取持仓信息（position_data 可指定 symbol，多品种运行时使用）
+        symbol = (position_data or {}).get('symbol') or self.symbol
         if position_data:
             position_side = position_data.get('side')
             position_amount = position_data.get('amount')
         else:
-            positions = self.get_positions()
+            positions = self.get_positions(symbol)
             if not positions:
                 logger.warning("无持仓可平")
                 return False
@@ -332,7 +302,8 @@ class OKXAdapter(ExchangeInterface):
                 close_side,
                 position_amount,
                 pos_side=position_side,
-                reduce_only=True
+                reduce_only=True,
+                symbol=symbol
             )
 
             if result.success:
@@ -447,20 +418,10 @@ class OKXAdapter(ExchangeInterface):
                 side=side,
                 amount=amount,
                 price=price,
-                params={"tdMode": "cross"}
+                params=self._order_params()
             )
 
-            return OrderResult(
-                success=True,
-                order_id=order.get('id'),
-                price=order.get('price'),
-                amount=order.get('amount'),
-                side=side,
-                filled_quantity=order.get('filled', 0),
-                avg_price=order.get('average'),
-                status=order.get('status'),
-                raw_data=order
-            )
+            return self._parse_order(order, side)
 
         except Exception as e:
             logger.error(f"OKX下单失败: {e}")
@@ -475,17 +436,7 @@ class OKXAdapter(ExchangeInterface):
         try:
             order = self.exchange.fetch_order(order_id, symbol)
 
-            return OrderResult(
-                success=True,
-                order_id=order.get('id'),
-                price=order.get('price'),
-                amount=order.get('amount'),
-                side=order.get('side'),
-                filled_quantity=order.get('filled', 0),
-                avg_price=order.get('average'),
-                status=order.get('status'),
-                raw_data=order
-            )
+            return self._parse_order(order)
 
         except Exception as e:
             logger.error(f"OKX查询订单失败: {e}")
@@ -496,3 +447,10 @@ class OKXAdapter(ExchangeInterface):
     def get_exchange_name(self) -> str:
         """获取交易所名称"""
         return self.exchange_name
+
+
+class OKXAsyncAdapter(CcxtAsyncAdapter):
+    """OKX异步适配器（ccxt.async_support）"""
+
+    ccxt_id = "okx"
+    sync_adapter_class = OKXAdapter
@@ -0,0 +1,851 @@
+"""
+模拟交易所适配器（本地撮合，不访问网络）
+
+用于压测和延迟测试：TradingBot 主循环、套利引擎和 API 服务都可以在本机以任意倍速运行。
+
+- 行情：回放录制的K线（CSV / 列表 / DataFrame）或按随机游走生成合成K线；当前K线内价格按
+  O→L→H→C（阳线）或 O→H→L→C（阴线）路径插值，其他周期由基础周期聚合
+- 订单簿：围绕当前价格生成 L2 档位（价差、档位间距、每档数量可配置），每次查询按当前价格重建
+- 撮合：市价单按档位逐级成交（深度不足时剩余部分撤销，即部分成交）；限价单先按可成交档位
+  吃单，剩余挂单，价格触及时按 partial_fill_ratio 分批成交；post-only 单会立即成交时拒绝
+- 账户：手续费（maker / taker）、双向持仓、均价、已实现/未实现盈亏、保证金检查
+- 时钟：speed 倍速推进的虚拟时钟；请求延迟（latency_ms ± latency_jitter_ms）按虚拟时间计
+- 同名模拟交易所在进程内共享一个账户（同步适配器、异步适配器、API 服务看到同一状态）
+
+错误以 ccxt 异常抛出（余额不足、订单无效、订单不存在），与真实交易所经过同样的错误转换。
+"""
+import asyncio
+import itertools
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Optional, List, Dict
+
+import ccxt
+import numpy as np
+import pandas as pd
+
+from utils.logger_utils import get_logger
+from ..interface import ExchangeInterface, TickerData, PositionData, OrderResult
+from ..async_interface import AsyncExchangeInterface
+from ..errors import ExchangeError, NetworkError, translate_ccxt_error
+
+logger = get_logger("simulated_adapter")
+
+_EPSILON = 1e-12
+
+
+def _timeframe_ms(timeframe: str) -> int:
+    return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+
+
+def _iso(timestamp_ms: int) -> str:
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).isoformat()
+
+
+def load_klines(source) -> np.ndarray:
+    """
+    加载录制的K线
+
+    Args:
+        source: CSV 路径、DataFrame（timestamp 列或时间索引）或 [[ts, o, h, l, c, v], ...]
+
+    Returns:
+        (n, 6) 数组，timestamp 为毫秒
+    """
+    if isinstance(source, str):
+        source = pd.read_csv(source)
+    if isinstance(source, pd.DataFrame):
+        df = source if "timestamp" in source.columns else source.reset_index()
+        ts = df["timestamp"] if "timestamp" in df.columns else df.iloc[:, 0]
+        if not pd.api.types.is_numeric_dtype(ts):
+            ts = pd.to_datetime(ts).astype("int64") // 1_000_000
+        data = np.column_stack([
+            np.asarray(ts, dtype=np.float64),
+            df[["open", "high", "low", "close", "volume"]].to_numpy(dtype=np.float64),
+        ])
+    else:
+        data = np.asarray(source, dtype=np.float64)
+    if data.ndim != 2 or data.shape[1] < 6 or len(data) == 0:
+        raise ValueError("录制K线格式应为 [[timestamp, open, high, low, close, volume], ...]")
+    return data[:, :6]
+
+
+class SimulatedClock:
+    """倍速虚拟时钟（毫秒）"""
+
+    def __init__(self, start_ms: Optional[int] = None, speed: float = 1.0):
+        self.start_ms = int(time.time() * 1000) if start_ms is None else int(start_ms)
+        self.speed = max(float(speed), _EPSILON)
+        self._origin = time.monotonic()
+
+    def now_ms(self) -> int:
+        return self.start_ms + int((time.monotonic() - self._origin) * 1000 * self.speed)
+
+    def sleep(self, seconds: float):
+        """按虚拟时间睡眠（实际睡眠 seconds / speed）"""
+        if seconds > 0:
+            time.sleep(seconds / self.speed)
+
+
+class SimulatedMarket:
+    """单个交易对的K线回放与价格路径"""
+
+    def __init__(self, symbol: str, timeframe: str, start_ms: int, klines=None,
+                 start_price: float = 3000.0, volatility: float = 0.002,
+                 history_bars: int = 3000, seed: Optional[int] = None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.tf_ms = _timeframe_ms(timeframe)
+        self.volatility = volatility
+        self.recorded = klines is not None
+        self._rng = np.random.default_rng(seed)
+        self._ended = False
+
+        if self.recorded:
+            data = load_klines(klines)
+            self.ts = data[:, 0].astype(np.int64)
+            self.bars = data[:, 1:6].copy()
+        else:
+            self.ts = np.empty(0, dtype=np.int64)
+            self.bars = np.empty((0, 5))
+            self._next_ts = (start_ms // self.tf_ms - history_bars) * self.tf_ms
+            self._last_close = float(start_price)
+            self._extend(history_bars + 1)
+
+    def _extend(self, count: int):
+        """生成 count 根合成K线（对数收益率服从正态分布）"""
+        returns = self._rng.normal(0.0, self.volatility, count)
+        closes = self._last_close * np.exp(np.cumsum(returns))
+        opens = np.concatenate(([self._last_close], closes[:-1]))
+        wicks = np.abs(self._rng.normal(0.0, self.volatility / 2, (2, count)))
+        highs = np.maximum(opens, closes) * (1 + wicks[0])
+        lows = np.minimum(opens, closes) * (1 - wicks[1])
+        volumes = self._rng.lognormal(3.0, 0.5, count)
+
+        ts = self._next_ts + np.arange(count, dtype=np.int64) * self.tf_ms
+        self.ts = np.concatenate((self.ts, ts))
+        self.bars = np.vstack((self.bars, np.column_stack((opens, highs, lows, closes, volumes))))
+        self._next_ts = int(ts[-1]) + self.tf_ms
+        self._last_close = float(closes[-1])
+
+    def _index(self, now_ms: int) -> int:
+        idx = int((now_ms - self.ts[0]) // self.tf_ms)
+        if self.recorded:
+            if idx >= len(self.ts):
+                if not self._ended:
+                    self._ended = True
+                    logger.warning(f"{self.symbol} 录制K线已回放完毕，价格保持在最后收盘价")
+                return len(self.ts) - 1
+            return max(idx, 0)
+        if idx >= len(self.ts):
+            self._extend(max(idx - len(self.ts) + 1, 500))
+        return max(idx, 0)
+
+    def _progress(self, idx: int, now_ms: int) -> float:
+        if self._ended:
+            return 1.0
+        return min(max((now_ms - int(self.ts[idx])) / self.tf_ms, 0.0), 1.0)
+
+    def _path(self, idx: int) -> np.ndarray:
+        o, h, l, c = self.bars[idx, :4]
+        return np.array([o, l, h, c] if c >= o else [o, h, l, c])
+
+    def price(self, now_ms: int) -> float:
+        """当前价格（当前K线内按价格路径插值）"""
+        idx = self._index(now_ms)
+        return float(np.interp(self._progress(idx, now_ms), [0, 1 / 3, 2 / 3, 1], self._path(idx)))
+
+    def ohlcv(self, now_ms: int, timeframe: str = None, since: Optional[int] = None,
+              limit: Optional[int] = None) -> List[List]:
+        """截至当前时间的K线（最后一根为未完成K线）；timeframe 大于基础周期时聚合"""
+        idx = self._index(now_ms)
+        tf_ms = max(_timeframe_ms(timeframe or self.timeframe), self.tf_ms)
+        ratio = tf_ms // self.tf_ms
+        limit = limit or 500
+
+        if since is not None:
+            first = max(int(np.searchsorted(self.ts, since // tf_ms * tf_ms)), 0)
+        else:
+            first = max(idx + 1 - (limit + 1) * ratio, 0)
+        ts = self.ts[first:idx + 1]
+        bars = self.bars[first:idx + 1].copy()
+        if len(bars) == 0:
+            return []
+
+        # 未完成K线：只包含已经走过的价格路径
+        progress = self._progress(idx, now_ms)
+        if progress < 1.0:
+            path = self._path(idx)
+            price = float(np.interp(progress, [0, 1 / 3, 2 / 3, 1], path))
+            seen = np.append(path[:int(progress * 3) + 1], price)
+            bars[-1] = [path[0], seen.max(), seen.min(), price, bars[-1, 4] * progress]
+
+        if ratio > 1:
+            groups = ts // tf_ms
+            starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+            ends = np.r_[starts[1:], len(groups)] - 1
+            ts = groups[starts] * tf_ms
+            bars = np.column_stack((
+                bars[starts, 0],
+                np.maximum.reduceat(bars[:, 1], starts),
+                np.minimum.reduceat(bars[:, 2], starts),
+                bars[ends, 3],
+                np.add.reduceat(bars[:, 4], starts),
+            ))
+
+        rows = [[int(t)] + row for t, row in zip(ts, bars.tolist())]
+        if since is not None:
+            return rows[:limit]
+        return rows[-limit:]
+
+
+class SimulatedClient:
+    """
+    模拟 ccxt 客户端（方法签名与 ccxt 一致）
+
+    ExchangeInterface 的通用逻辑（响应解析、增量K线、异步接口的线程回退）直接复用。
+    """
+
+    id = "simulated"
+    has = {"fetchPositions": True, "fetchTickers": True}
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.name = config.get("name", "simulated")
+        self.maker_fee = float(config.get("maker_fee", 0.0002))
+        self.taker_fee = float(config.get("taker_fee", 0.0006))
+        self.default_leverage = int(config.get("leverage", 10))
+        self.margin_mode = config.get("margin_mode", "crossed")
+        self.latency_ms = float(config.get("latency_ms", 0))
+        self.latency_jitter_ms = float(config.get("latency_jitter_ms", 0))
+        self.partial_fill_ratio = min(max(float(config.get("partial_fill_ratio", 1.0)), _EPSILON), 1.0)
+        self.book_levels = int(config.get("book_levels", 20))
+        self.spread_bps = float(config.get("spread_bps", 1.0))
+        self.level_step_bps = float(config.get("level_step_bps", 1.0))
+        self.level_size = float(config.get("level_size", 5.0))
+
+        self.balance = float(config.get("initial_balance", 10000.0))
+        self.leverages: Dict[str, int] = {}
+        self.positions: Dict[tuple, Dict] = {}   # (symbol, 'long'/'short') → 持仓
+        self.orders: Dict[str, Dict] = {}
+        self._order_ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._random = random.Random(config.get("seed"))
+        self.stats = {"requests": 0, "orders": 0, "fills": 0, "volume": 0.0,
+                      "fees": 0.0, "realized_pnl": 0.0, "rejected": 0}
+
+        self.timeframe = config.get("timeframe", "1m")
+        self.history_bars = int(config.get("history_bars", 3000))
+        klines = config.get("klines") if config.get("klines") is not None else (config.get("klines_file") or None)
+        self.markets: Dict[str, SimulatedMarket] = {}
+        self.symbol = config.get("symbol", "BTC/USDT:USDT")
+
+        start_ms = None
+        if klines is not None:
+            market = SimulatedMarket(self.symbol, self.timeframe, 0, klines=klines)
+            start_ms = int(market.ts[min(self.history_bars, len(market.ts) - 1)])
+            self.markets[self.symbol] = market
+        self.clock = SimulatedClock(start_ms, config.get("speed", 1.0))
+
+    # ========== 内部工具 ==========
+
+    def _latency(self):
+        """模拟请求延迟（虚拟时间）"""
+        delay = self.latency_ms + self._random.uniform(-1, 1) * self.latency_jitter_ms
+        self.clock.sleep(max(delay, 0.0) / 1000)
+
+    def _market(self, symbol: str) -> SimulatedMarket:
+        market = self.markets.get(symbol)
+        if market is None:
+            seed = self.config.get("seed")
+            market = SimulatedMarket(
+                symbol, self.timeframe, self.clock.start_ms,
+                start_price=self.config.get("start_price", 3000.0),
+                volatility=self.config.get("volatility", 0.002),
+                history_bars=self.history_bars,
+                seed=None if seed is None else zlib.crc32(f"{seed}:{symbol}".encode()),
+            )
+            self.markets[symbol] = market
+        return market
+
+    def _begin(self) -> int:
+        """每次请求先撮合到期挂单，返回当前虚拟时间（调用方须持有锁，延迟已在加锁前模拟）"""
+        now = self.clock.now_ms()
+        self.stats["requests"] += 1
+        self._match_resting(now)
+        return now
+
+    def _book(self, symbol: str, now: int, limit: Optional[int] = None):
+        mid = self._market(symbol).price(now)
+        half = mid * self.spread_bps / 20000
+        step = mid * self.level_step_bps / 10000
+        levels = min(limit or self.book_levels, self.book_levels)
+        sizes = [self.level_size * (1 + 0.5 * i) for i in range(levels)]
+        bids = [[mid - half - i * step, size] for i, size in enumerate(sizes)]
+        asks = [[mid + half + i * step, size] for i, size in enumerate(sizes)]
+        return bids, asks
+
+    def _leverage(self, symbol: str) -> int:
+        return self.leverages.get(symbol, self.default_leverage)
+
+    def _unrealized(self, now: int) -> float:
+        total = 0.0
+        for (symbol, side), pos in self.positions.items():
+            price = self._market(symbol).price(now)
+            sign = 1 if side == "long" else -1
+            total += sign * (price - pos["entryPrice"]) * pos["contracts"]
+        return total
+
+    def _used_margin(self) -> float:
+        used = sum(pos["contracts"] * pos["entryPrice"] / self._leverage(symbol)
+                   for (symbol, _), pos in self.positions.items())
+        for order in self.orders.values():
+            if order["status"] == "open" and not order["reduceOnly"]:
+                used += order["remaining"] * order["price"] / self._leverage(order["symbol"])
+        return used
+
+    # ========== 撮合 ==========
+
+    @staticmethod
+    def _position_side(side: str, params: Dict) -> tuple:
+        """按下单参数推断 (持仓方向, 是否只减仓)，兼容 Bitget / Binance / OKX 的参数写法"""
+        reduce_only = bool(params.get("reduceOnly")) or params.get("tradeSide") == "close"
+        pos_side = (params.get("posSide") or params.get("positionSide")
+                    or params.get("holdSide") or "").lower()
+        if pos_side not in ("long", "short"):
+            if reduce_only:
+                pos_side = "short" if side == "buy" else "long"
+            else:
+                pos_side = "long" if side == "buy" else "short"
+        return pos_side, reduce_only
+
+    def _apply_fill(self, order: Dict, amount: float, price: float, maker: bool, now: int):
+        """成交：更新订单、手续费和持仓"""
+        key = (order["symbol"], order["posSide"])
+        position = self.positions.get(key)
+        if order["reduceOnly"]:
+            amount = min(amount, position["contracts"] if position else 0.0)
+        if amount <= _EPSILON:
+            return
+
+        fee = amount * price * (self.maker_fee if maker else self.taker_fee)
+        self.balance -= fee
+        if order["reduceOnly"]:
+            sign = 1 if order["posSide"] == "long" else -1
+            pnl = sign * (price - position["entryPrice"]) * amount
+            self.balance += pnl
+            self.stats["realized_pnl"] += pnl
+            position["contracts"] -= amount
+            if position["contracts"] <= _EPSILON:
+                del self.positions[key]
+        elif position is None:
+            self.positions[key] = {"contracts": amount, "entryPrice": price, "timestamp": now}
+        else:
+            total = position["contracts"] + amount
+            position["entryPrice"] = (position["entryPrice"] * position["contracts"] + price * amount) / total
+            position["contracts"] = total
+
+        order["cost"] += amount * price
+        order["filled"] += amount
+        order["remaining"] = max(order["amount"] - order["filled"], 0.0)
+        order["average"] = order["cost"] / order["filled"]
+        order["fee"]["cost"] += fee
+        order["lastTradeTimestamp"] = now
+        order["trades"].append({"timestamp": now, "price": price, "amount": amount,
+                                "fee": fee, "takerOrMaker": "maker" if maker else "taker"})
+        if order["remaining"] <= _EPSILON:
+            order["status"] = "closed"
+        self.stats["fills"] += 1
+        self.stats["volume"] += amount * price
+        self.stats["fees"] += fee
+
+    def _sweep(self, order: Dict, levels: List[List], limit_price: Optional[float], now: int):
+        """按订单簿档位逐级吃单（taker）"""
+        for price, size in levels:
+            if order["remaining"] <= _EPSILON:
+                break
+            if limit_price is not None and (price > limit_price if order["side"] == "buy" else price < limit_price):
+                break
+            self._apply_fill(order, min(size, order["remaining"]), price, maker=False, now=now)
+            if order["reduceOnly"] and (order["symbol"], order["posSide"]) not in self.positions:
+                break
+
+    def _match_resting(self, now: int):
+        """价格触及挂单价时，按 partial_fill_ratio 分批成交"""
+        for order in self.orders.values():
+            if order["status"] != "open":
+                continue
+            price = self._market(order["symbol"]).price(now)
+            touched = price <= order["price"] if order["side"] == "buy" else price >= order["price"]
+            if not touched:
+                continue
+            amount = min(order["remaining"], order["amount"] * self.partial_fill_ratio)
+            self._apply_fill(order, amount, order["price"], maker=True, now=now)
+            if order["reduceOnly"] and order["status"] == "open" \
+                    and (order["symbol"], order["posSide"]) not in self.positions:
+                order["status"] = "canceled"
+
+    # ========== 行情接口（ccxt 签名）==========
+
+    def load_markets(self, reload: bool = False, params: Dict = {}) -> Dict:
+        return {symbol: {"symbol": symbol} for symbol in self.markets}
+
+    def _ticker(self, symbol: str, now: int) -> Dict:
+        market = self._market(symbol)
+        bids, asks = self._book(symbol, now, 1)
+        bar = market.ohlcv(now, limit=1)[-1]
+        return {
+            "symbol": symbol, "timestamp": now, "datetime": _iso(now),
+            "last": market.price(now), "close": market.price(now),
+            "bid": bids[0][0], "bidVolume": bids[0][1],
+            "ask": asks[0][0], "askVolume": asks[0][1],
+            "open": bar[1], "high": bar[2], "low": bar[3], "baseVolume": bar[5],
+            "info": {},
+        }
+
+    def fetch_ticker(self, symbol: str, params: Dict = {}) -> Dict:
+        self._latency()
+        with self._lock:
+            return self._ticker(symbol, self._begin())
+
+    def fetch_tickers(self, symbols: Optional[List[str]] = None, params: Dict = {}) -> Dict[str, Dict]:
+        self._latency()
+        with self._lock:
+            now = self._begin()
+            return {symbol: self._ticker(symbol, now) for symbol in symbols or list(self.markets)}
+
+    def fetch_order_book(self, symbol: str, limit: Optional[int] = None, params: Dict = {}) -> Dict:
+        self._latency()
+        with self._lock:
+            now = self._begin()
+            bids, asks = self._book(symbol, now, limit)
+            return {"symbol": symbol, "bids": bids, "asks": asks,
+                    "timestamp": now, "datetime": _iso(now), "nonce": None}
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1m", since: Optional[int] = None,
+                    limit: Optional[int] = None, params: Dict = {}) -> List[List]:
+        self._latency()
+        with self._lock:
+            now = self._begin()
+            return self._market(symbol).ohlcv(now, timeframe, since, limit)
+
+    # ========== 账户接口（ccxt 签名）==========
+
+    def fetch_balance(self, params: Dict = {}) -> Dict:
+        self._latency()
+        with self._lock:
+            now = self._begin()
+            total = self.balance + self._unrealized(now)
+            used = self._used_margin()
+            usdt = {"free": max(total - used, 0.0), "used": used, "total": total}
+            return {"USDT": usdt, "free": {"USDT": usdt["free"]}, "used": {"USDT": used},
+                    "total": {"USDT": total}, "info": {}}
+
+    def fetch_positions(self, symbols: Optional[List[str]] = None, params: Dict = {}) -> List[Dict]:
+        self._latency()
+        with self._lock:
+            now = self._begin()
+            result = []
+            for (symbol, side), pos in self.positions.items():
+                if symbols and symbol not in symbols:
+                    continue
+                mark = self._market(symbol).price(now)
+                sign = 1 if side == "long" else -1
+                leverage = self._leverage(symbol)
+                result.append({
+                    "symbol": symbol, "side": side, "contracts": pos["contracts"],
+                    "entryPrice": pos["entryPrice"], "markPrice": mark,
+                    "notional": pos["contracts"] * mark,
+                    "unrealizedPnl": sign * (mark - pos["entryPrice"]) * pos["contracts"],
+                    "leverage": leverage, "marginMode": self.margin_mode,
+                    "initialMargin": pos["contracts"] * pos["entryPrice"] / leverage,
+                    "timestamp": pos["timestamp"], "info": {},
+                })
+            return result
+
+    def set_leverage(self, leverage: int, symbol: Optional[str] = None, params: Dict = {}) -> Dict:
+        with self._lock:
+            self.leverages[symbol or self.symbol] = int(leverage)
+        return {"leverage": int(leverage)}
+
+    def set_margin_mode(self, marginMode: str, symbol: Optional[str] = None, params: Dict = {}) -> Dict:
+        with self._lock:
+            self.margin_mode = marginMode
+        return {"marginMode": marginMode}
+
+    # ========== 交易接口（ccxt 签名）==========
+
+    def create_order(self, symbol: str, type: str, side: str, amount: float,
+                     price: Optional[float] = None, params: Dict = {}) -> Dict:
+        self._latency()
+        with self._lock:
+            now = self._begin()
+            side, type = side.lower(), type.lower()
+            amount = float(amount)
+            post_only = bool(params.get("postOnly")) or params.get("timeInForce") in ("PO", "GTX")
+            ioc = params.get("timeInForce") in ("IOC", "FOK")
+
+            if amount <= 0:
+                raise ccxt.InvalidOrder(f"{self.name} 下单数量无效: {amount}")
+            if type not in ("market", "limit") or (type == "limit" and not price):
+                raise ccxt.InvalidOrder(f"{self.name} 不支持的订单类型或缺少价格: {type} {price}")
+            if type == "market" and post_only:
+                raise ccxt.InvalidOrder(f"{self.name} 市价单不能设置 post-only")
+
+            pos_side, reduce_only = self._position_side(side, params)
+            bids, asks = self._book(symbol, now)
+            levels = asks if side == "buy" else bids
+
+            if reduce_only and (symbol, pos_side) not in self.positions:
+                self.stats["rejected"] += 1
+                raise ccxt.InvalidOrder(f"{self.name} 无 {pos_side} 持仓可减")
+            if post_only and (price >= asks[0][0] if side == "buy" else price <= bids[0][0]):
+                self.stats["rejected"] += 1
+                raise ccxt.OrderImmediatelyFillable(f"{self.name} post-only 订单会立即成交: {price}")
+            if not reduce_only:
+                reference = price or levels[0][0]
+                required = amount * reference * (1 / self._leverage(symbol) + self.taker_fee)
+                free = self.balance + self._unrealized(now) - self._used_margin()
+                if required > free:
+                    self.stats["rejected"] += 1
+                    raise ccxt.InsufficientFunds(
+                        f"{self.name} 可用保证金不足: 需要 {required:.2f}, 可用 {free:.2f}"
+                    )
+
+            order_id = f"sim-{next(self._order_ids)}"
+            order = {
+                "id": order_id, "clientOrderId": params.get("clientOrderId"),
+                "timestamp": now, "datetime": _iso(now), "lastTradeTimestamp": None,
+                "symbol": symbol, "type": type, "side": side,
+                "price": float(price) if price else None, "amount": amount,
+                "filled": 0.0, "remaining": amount, "cost": 0.0, "average": None,
+                "status": "open", "fee": {"cost": 0.0, "currency": "USDT"}, "trades": [],
+                "reduceOnly": reduce_only, "postOnly": post_only, "posSide": pos_side,
+                "info": {"simulated": True},
+            }
+            self.orders[order_id] = order
+            self.stats["orders"] += 1
+
+            if not post_only:
+                self._sweep(order, levels, order["price"] if type == "limit" else None, now)
+            if order["status"] == "open" and (type == "market" or ioc
+                                              or (reduce_only and (symbol, pos_side) not in self.positions)):
+                # 市价单深度不足 / IOC / 持仓已平完：剩余部分撤销
+                order["status"] = "canceled"
+            if order["price"] is None:
+                order["price"] = order["average"]
+            return dict(order, fee=dict(order["fee"]), trades=list(order["trades"]))
+
+    def cancel_order(self, id: str, symbol: Optional[str] = None, params: Dict = {}) -> Dict:
+        self._latency()
+        with self._lock:
+            self._begin()
+            order = self.orders.get(id)
+            if order is None:
+                raise ccxt.OrderNotFound(f"{self.name} 订单不存在: {id}")
+            if order["status"] == "open":
+                order["status"] = "canceled"
+            return dict(order, fee=dict(order["fee"]), trades=list(order["trades"]))
+
+    def fetch_order(self, id: str, symbol: Optional[str] = None, params: Dict = {}) -> Dict:
+        self._latency()
+        with self._lock:
+            self._begin()
+            order = self.orders.get(id)
+            if order is None:
+                raise ccxt.OrderNotFound(f"{self.name} 订单不存在: {id}")
+            return dict(order, fee=dict(order["fee"]), trades=list(order["trades"]))
+
+    def fetch_open_orders(self, symbol: Optional[str] = None, since: Optional[int] = None,
+                          limit: Optional[int] = None, params: Dict = {}) -> List[Dict]:
+        self._latency()
+        with self._lock:
+            self._begin()
+            return [dict(order, fee=dict(order["fee"]), trades=list(order["trades"]))
+                    for order in self.orders.values()
+                    if order["status"] == "open" and (symbol is None or order["symbol"] == symbol)]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            now = self.clock.now_ms()
+            return dict(self.stats, balance=self.balance, equity=self.balance + self._unrealized(now),
+                        positions=len(self.positions), virtual_time=_iso(now))
+
+
+# 同名模拟交易所共享一个账户
+_clients: Dict[str, SimulatedClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_simulated_client(config: Dict) -> SimulatedClient:
+    """获取（或创建）进程级共享的模拟客户端，按 config['name'] 区分"""
+    name = config.get("name", "simulated")
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = SimulatedClient(config)
+            _clients[name] = client
+            logger.info(f"创建模拟交易所: {name} (倍速 {client.clock.speed:g}x)")
+        return client
+
+
+def reset_simulated_exchanges():
+    """丢弃所有模拟账户（测试用）"""
+    with _clients_lock:
+        _clients.clear()
+
+
+class SimulatedExchangeAdapter(ExchangeInterface):
+    """模拟交易所适配器"""
+
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        self.exchange_name = config.get("name", "simulated")
+        self.symbol = config.get("symbol", "BTC/USDT:USDT")
+        self.leverage = config.get("leverage", 10)
+        self.margin_mode = config.get("margin_mode", "crossed")
+
+    # ========== 生命周期管理 ==========
+
+    def connect(self) -> bool:
+        """连接模拟交易所（不访问网络，不经过限流器和行情缓存）"""
+        self.exchange = get_simulated_client(self.config)
+        self.exchange.set_leverage(self.leverage, self.symbol)
+        logger.info(f"模拟交易所连接成功: {self.exchange_name}")
+        return True
+
+    def disconnect(self):
+        """断开连接（模拟账户保留，重连后继续使用）"""
+        self.exchange = None
+        logger.info(f"模拟交易所连接已断开: {self.exchange_name}")
+
+    def is_connected(self) -> bool:
+        """检查连接状态"""
+        return self.exchange is not None
+
+    def _get_async_client(self):
+        """模拟交易所没有 ccxt 异步客户端，异步接口在线程中执行同步方法"""
+        return None
+
+    def _call(self, action: str, func):
+        if not self.is_connected():
+            raise ExchangeError("交易所未连接")
+        try:
+            return func()
+        except Exception as e:
+            raise translate_ccxt_error(action, e)
+
+    # ========== 市场数据接口 ==========
+
+    def get_ticker(self, symbol: str = None) -> Optional[TickerData]:
+        """获取行情"""
+        symbol = symbol or self.symbol
+        return self._parse_ticker(symbol, self._call("获取行情", lambda: self.exchange.fetch_ticker(symbol)))
+
+    def get_klines(self, symbol: str = None, timeframe: str = None,
+                   limit: int = None) -> Optional[pd.DataFrame]:
+        """获取K线数据"""
+        symbol = symbol or self.symbol
+        timeframe = timeframe or "5m"
+        limit = limit or 100
+        ohlcv = self._call("获取K线", lambda: self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit))
+        return self._parse_klines(ohlcv)
+
+    def get_orderbook(self, symbol: str = None, limit: int = 20) -> Optional[Dict]:
+        """获取订单簿"""
+        symbol = symbol or self.symbol
+        return self._parse_orderbook(
+            self._call("获取订单簿", lambda: self.exchange.fetch_order_book(symbol, limit))
+        )
+
+    # ========== 账户接口 ==========
+
+    def get_balance(self) -> float:
+        """获取账户余额（USDT）"""
+        return self._parse_balance(self._call("获取余额", lambda: self.exchange.fetch_balance()))
+
+    def get_positions(self, symbol: str = None) -> List[PositionData]:
+        """获取持仓列表"""
+        symbol = symbol or self.symbol
+        return self._parse_positions(
+            self._call("获取持仓", lambda: self.exchange.fetch_positions([symbol]))
+        )
+
+    # ========== 交易接口 ==========
+
+    def open_long(self, amount: float, df: pd.DataFrame = None, **kwargs) -> OrderResult:
+        """开多单"""
+        return self._create_order("buy", amount, pos_side="long", symbol=kwargs.get("symbol"))
+
+    def open_short(self, amount: float, df: pd.DataFrame = None, **kwargs) -> OrderResult:
+        """开空单"""
+        return self._create_order("sell", amount, pos_side="short", symbol=kwargs.get("symbol"))
+
+    def _create_order(self, side: str, amount: float, pos_side: str,
+                      reduce_only: bool = False, symbol: str = None) -> OrderResult:
+        """创建市价单（内部方法，symbol 为空时使用适配器默认交易对）"""
+        params = {"posSide": pos_side, "reduceOnly": reduce_only}
+        try:
+            order = self._call("下单", lambda: self.exchange.create_order(
+                symbol or self.symbol, "market", side, amount, params=params
+            ))
+        except ExchangeError as e:
+            logger.error(f"模拟交易所下单失败: {e}")
+            return OrderResult(success=False, error=str(e))
+        logger.info(f"模拟交易所订单成交: {side} {order['filled']}/{amount} @ {order['average']}")
+        return self._parse_order(order, side)
+
+    def close_position(self, reason: str = "", position_data: Dict = None) -> bool:
+        """平仓"""
+        if not self.is_connected():
+            logger.error("交易所未连接")
+            return False
+
+        symbol = (position_data or {}).get('symbol') or self.symbol
+        if position_data:
+            position_side = position_data.get('side')
+            position_amount = position_data.get('amount')
+        else:
+            positions = self.get_positions(symbol)
+            if not positions:
+                logger.warning("无持仓可平")
+                return False
+            position_side = positions[0].side
+            position_amount = positions[0].amount
+
+        close_side = "sell" if position_side == 'long' else "buy"
+        result = self._create_order(close_side, position_amount, pos_side=position_side,
+                                    reduce_only=True, symbol=symbol)
+        if result.success:
+            logger.info(f"模拟交易所平仓成功: {position_side}, 原因: {reason}")
+        return result.success
+
+    def close_all_positions(self) -> List[OrderResult]:
+        """一键平仓所有持仓"""
+        results = []
+        for position in self.get_positions():
+            success = self.close_position(
+                reason="一键平仓",
+                position_data={'side': position.side, 'amount': position.amount}
+            )
+            results.append(OrderResult(success=success, side=position.side, amount=position.amount))
+        return results
+
+    def place_order(self, symbol: str, side: str, amount: float,
+                    price: Optional[float] = None, order_type: str = "market") -> OrderResult:
+        """通用下单接口（order_type 额外支持 'post_only'：只做 maker 的限价单）"""
+        params = {}
+        if order_type == "post_only":
+            order_type, params = "limit", {"postOnly": True}
+        try:
+            order = self._call("下单", lambda: self.exchange.create_order(
+                symbol, order_type, side, amount, price, params=params
+            ))
+        except ExchangeError as e:
+            return OrderResult(success=False, error=str(e))
+        return self._parse_order(order, side)
+
+    def cancel_order(self, order_id: str, symbol: str) -> OrderResult:
+        """撤销订单"""
+        try:
+            order = self._call("撤单", lambda: self.exchange.cancel_order(order_id, symbol))
+        except ExchangeError as e:
+            return OrderResult(success=False, order_id=order_id, error=str(e))
+        return self._parse_order(order)
+
+    def get_order_status(self, order_id: str, symbol: str) -> OrderResult:
+        """查询订单状态"""
+        try:
+            order = self._call("查询订单", lambda: self.exchange.fetch_order(order_id, symbol))
+        except ExchangeError as e:
+            return OrderResult(success=False, order_id=order_id, error=str(e))
+        return self._parse_order(order)
+
+    # ========== 交易参数设置 ==========
+
+    def set_leverage(self, leverage: int, symbol: str = None) -> bool:
+        """设置杠杆"""
+        if not self.is_connected():
+            return False
+        self.exchange.set_leverage(leverage, symbol or self.symbol)
+        self.leverage = leverage
+        return True
+
+    def set_margin_mode(self, mode: str, symbol: str = None) -> bool:
+        """设置保证金模式"""
+        if not self.is_connected():
+            return False
+        self.exchange.set_margin_mode(mode, symbol or self.symbol)
+        self.margin_mode = mode
+        return True
+
+    # ========== 辅助方法 ==========
+
+    def get_exchange_name(self) -> str:
+        """获取交易所名称"""
+        return self.exchange_name
+
+    def get_stats(self) -> Dict:
+        """模拟账户统计（成交量、手续费、已实现盈亏、虚拟时间）"""
+        return self.exchange.get_stats() if self.is_connected() else {}
+
+
+class SimulatedAsyncAdapter(AsyncExchangeInterface):
+    """模拟交易所异步适配器（在线程中执行同步适配器，与其共享同一模拟账户）"""
+
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        self._sync = SimulatedExchangeAdapter(config)
+        self.exchange_name = self._sync.exchange_name
+        self.symbol = self._sync.symbol
+
+    async def connect(self) -> bool:
+        return await asyncio.to_thread(self._sync.connect)
+
+    async def disconnect(self):
+        self._sync.disconnect()
+
+    def is_connected(self) -> bool:
+        return self._sync.is_connected()
+
+    async def _run(self, name: str, func, *args, timeout: Optional[float] = None):
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(func, *args), timeout)
+        except asyncio.TimeoutError as e:
+            raise NetworkError(f"{name}超时 ({timeout}s)", e)
+
+    async def get_ticker(self, symbol: str = None,
+                         timeout: Optional[float] = None) -> Optional[TickerData]:
+        return await self._run("获取行情", self._sync.get_ticker, symbol, timeout=timeout)
+
+    async def get_klines(self, symbol: str = None, timeframe: str = None, limit: int = None,
+                         timeout: Optional[float] = None) -> Optional[pd.DataFrame]:
+        return await self._run("获取K线", self._sync.get_klines, symbol, timeframe, limit, timeout=timeout)
+
+    async def get_orderbook(self, symbol: str = None, limit: int = 20,
+                            timeout: Optional[float] = None) -> Optional[Dict]:
+        return await self._run("获取订单簿", self._sync.get_orderbook, symbol, limit, timeout=timeout)
+
+    async def get_balance(self, timeout: Optional[float] = None) -> float:
+        return await self._run("获取余额", self._sync.get_balance, timeout=timeout)
+
+    async def get_positions(self, symbol: str = None,
+                            timeout: Optional[float] = None) -> List[PositionData]:
+        return await self._run("获取持仓", self._sync.get_positions, symbol, timeout=timeout)
+
+    async def place_order(self, symbol: str, side: str, amount: float,
+                          price: Optional[float] = None, order_type: str = "market",
+                          timeout: Optional[float] = None) -> OrderResult:
+        return await self._run("下单", self._sync.place_order, symbol, side, amount, price, order_type,
+                               timeout=timeout)
+
+    async def cancel_order(self, order_id: str, symbol: str,
+                           timeout: Optional[float] = None) -> OrderResult:
+        return await self._run("撤单", self._sync.cancel_order, order_id, symbol, timeout=timeout)
+
+    async def get_order_status(self, order_id: str, symbol: str,
+                               timeout: Optional[float] = None) -> OrderResult:
+        return await self._run("查询订单", self._sync.get_order_status, order_id, symbol, timeout=timeout)
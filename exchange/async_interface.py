@@ -0,0 +1,323 @@
+"""
+交易所统一异步接口定义
+
+AsyncExchangeInterface 是 ExchangeInterface 的协程版本，覆盖行情、K线、订单簿、余额、
+持仓和下单/撤单/查单。各适配器基于 ccxt.async_support 实现：
+
+- 客户端来自进程级客户端池（exchange.async_pool），同一交易所与凭证共享一条连接，
+  load_markets 只执行一次
+- 请求参数与响应解析复用同步适配器（_market_params / _order_params / _parse_*），
+  同步与异步接口返回完全相同的数据结构
+- 不使用线程池：调用方可以在自己的事件循环中 asyncio.gather 任意多个请求
+
+交易参数（杠杆、保证金模式、双向持仓）仍由同步适配器在 connect() 时设置，
+异步适配器只负责 I/O。
+"""
+import asyncio
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+
+import pandas as pd
+
+from .decorators import retry_on_error
+from .errors import ExchangeError, NetworkError, translate_ccxt_error
+from .interface import ORDER_STATUS_UNKNOWN, ExchangeInterface, OrderResult, PositionData, TickerData
+
+
+class AsyncExchangeInterface(ABC):
+    """交易所统一异步接口"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+
+    # ========== 生命周期管理 ==========
+
+    @abstractmethod
+    async def connect(self) -> bool:
+        """连接交易所"""
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        """断开连接"""
+        pass
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """检查连接状态"""
+        pass
+
+    # ========== 市场数据接口 ==========
+
+    @abstractmethod
+    async def get_ticker(self, symbol: str = None,
+                         timeout: Optional[float] = None) -> Optional[TickerData]:
+        """获取行情"""
+        pass
+
+    @abstractmethod
+    async def get_klines(self, symbol: str = None, timeframe: str = None, limit: int = None,
+                         timeout: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """获取K线数据"""
+        pass
+
+    @abstractmethod
+    async def get_orderbook(self, symbol: str = None, limit: int = 20,
+                            timeout: Optional[float] = None) -> Optional[Dict]:
+        """获取订单簿"""
+        pass
+
+    # ========== 账户接口 ==========
+
+    @abstractmethod
+    async def get_balance(self, timeout: Optional[float] = None) -> float:
+        """获取账户余额（USDT）"""
+        pass
+
+    @abstractmethod
+    async def get_positions(self, symbol: str = None,
+                            timeout: Optional[float] = None) -> List[PositionData]:
+        """获取持仓列表"""
+        pass
+
+    # ========== 交易接口 ==========
+
+    @abstractmethod
+    async def place_order(self, symbol: str, side: str, amount: float,
+                          price: Optional[float] = None, order_type: str = "market",
+                          timeout: Optional[float] = None) -> OrderResult:
+        """
+        通用下单接口（失败时返回 success=False 的 OrderResult，与同步接口一致）
+
+        请求超时且无法确认订单是否已提交时返回 status='unknown'，调用方不能直接重试下单。
+        """
+        pass
+
+    @abstractmethod
+    async def cancel_order(self, order_id: str, symbol: str,
+                           timeout: Optional[float] = None) -> OrderResult:
+        """撤销订单"""
+        pass
+
+    @abstractmethod
+    async def get_order_status(self, order_id: str, symbol: str,
+                               timeout: Optional[float] = None) -> OrderResult:
+        """查询订单状态"""
+        pass
+
+    # ========== 辅助方法 ==========
+
+    def get_exchange_name(self) -> str:
+        """获取交易所名称"""
+        return getattr(self, 'exchange_name', 'unknown')
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
+
+
+class CcxtAsyncAdapter(AsyncExchangeInterface):
+    """
+    基于 ccxt.async_support 的异步适配器基类
+
+    子类只需声明 ccxt_id、ccxt_options 和对应的同步适配器类。
+    """
+
+    ccxt_id: str = ""
+    ccxt_options: Dict = {"defaultType": "swap"}
+    sync_adapter_class: Type[ExchangeInterface] = None
+
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        # 未连接的同步适配器：只用于请求参数与响应解析
+        self._codec = self.sync_adapter_class(config)
+        self.exchange_name = self._codec.get_exchange_name()
+        self.symbol = self._codec.symbol
+        self.client = None
+
+    # ========== 生命周期管理 ==========
+
+    async def connect(self) -> bool:
+        """从客户端池获取共享异步客户端并加载市场信息"""
+        from utils.logger_utils import get_logger
+        from .async_pool import get_async_client_pool
+
+        try:
+            self.client = await get_async_client_pool().acquire(
+                self.ccxt_id,
+                api_key=self.config.get("api_key", ""),
+                secret=self.config.get("api_secret", ""),
+                password=self.config.get("api_password", ""),
+                options=dict(self.ccxt_options),
+            )
+        except Exception as e:
+            self.client = None
+            raise translate_ccxt_error(f"{self.exchange_name}异步连接", e)
+
+        get_logger("async_exchange").info(f"{self.exchange_name} 异步接口连接成功")
+        return True
+
+    async def disconnect(self):
+        """归还共享客户端（最后一个使用者归还时客户端池关闭其会话）"""
+        from .async_pool import get_async_client_pool
+
+        client, self.client = self.client, None
+        if client is not None:
+            await get_async_client_pool().release(client)
+
+    def is_connected(self) -> bool:
+        return self.client is not None
+
+    async def _request(self, name: str, coro_factory, timeout: Optional[float]):
+        """
+        在客户端池的事件循环中执行一次请求（带超时），并转换 ccxt 异常
+
+        Args:
+            name: 操作名称（用于错误信息）
+            coro_factory: 接收异步客户端、返回协程的函数
+            timeout: 超时时间（秒），None 表示不限制
+        """
+        from .async_pool import get_async_client_pool
+
+        if not self.is_connected():
+            raise ExchangeError("交易所未连接")
+        try:
+            return await asyncio.wait_for(
+                get_async_client_pool().call(coro_factory(self.client)), timeout
+            )
+        except asyncio.TimeoutError as e:
+            raise NetworkError(f"{name}超时 ({timeout}s)", e)
+        except Exception as e:
+            raise translate_ccxt_error(name, e)
+
+    # ========== 市场数据接口 ==========
+
+    @retry_on_error(max_retries=3, backoff_base=1.0)
+    async def get_ticker(self, symbol: str = None,
+                         timeout: Optional[float] = None) -> Optional[TickerData]:
+        symbol = symbol or self.symbol
+        ticker = await self._request(
+            "获取行情", lambda client: client.fetch_ticker(symbol), timeout
+        )
+        return self._codec._parse_ticker(symbol, ticker)
+
+    @retry_on_error(max_retries=3, backoff_base=1.0)
+    async def get_klines(self, symbol: str = None, timeframe: str = None, limit: int = None,
+                         timeout: Optional[float] = None) -> Optional[pd.DataFrame]:
+        symbol = symbol or self.symbol
+        timeframe = timeframe or "5m"
+        limit = limit or 100
+        params = self._codec._market_params()
+        ohlcv = await self._request(
+            "获取K线",
+            lambda client: client.fetch_ohlcv(symbol, timeframe, limit=limit, params=params),
+            timeout
+        )
+        return self._codec._parse_klines(ohlcv)
+
+    @retry_on_error(max_retries=3, backoff_base=1.0)
+    async def get_orderbook(self, symbol: str = None, limit: int = 20,
+                            timeout: Optional[float] = None) -> Optional[Dict]:
+        symbol = symbol or self.symbol
+        orderbook = await self._request(
+            "获取订单簿", lambda client: client.fetch_order_book(symbol, limit), timeout
+        )
+        return self._codec._parse_orderbook(orderbook)
+
+    # ========== 账户接口 ==========
+
+    @retry_on_error(max_retries=3, backoff_base=1.0)
+    async def get_balance(self, timeout: Optional[float] = None) -> float:
+        params = self._codec._balance_params()
+        balance = await self._request(
+            "获取余额", lambda client: client.fetch_balance(params=params), timeout
+        )
+        return self._codec._parse_balance(balance)
+
+    @retry_on_error(max_retries=3, backoff_base=1.0)
+    async def get_positions(self, symbol: str = None,
+                            timeout: Optional[float] = None) -> List[PositionData]:
+        symbol = symbol or self.symbol
+        params = self._codec._market_params()
+        positions = await self._request(
+            "获取持仓", lambda client: client.fetch_positions([symbol], params=params), timeout
+        )
+        return self._codec._parse_positions(positions)
+
+    # ========== 交易接口 ==========
+
+    async def place_order(self, symbol: str, side: str, amount: float,
+                          price: Optional[float] = None, order_type: str = "market",
+                          timeout: Optional[float] = None) -> OrderResult:
+        # 客户端订单ID：请求超时后据此确认订单是否已在交易所生效
+        client_order_id = uuid.uuid4().hex
+        params = dict(self._codec._order_params(), clientOrderId=client_order_id)
+        try:
+            order = await self._request(
+                "下单",
+                lambda client: client.create_order(
+                    symbol, order_type, side, amount, price, params=params
+                ),
+                timeout
+            )
+        except NetworkError as e:
+            # 超时 / 网络错误时请求可能已到达交易所，不能当作下单失败
+            return await self._confirm_order(symbol, side, client_order_id, e, timeout)
+        except ExchangeError as e:
+            return OrderResult(success=False, error=str(e))
+        return self._codec._parse_order(order, side)
+
+    async def _confirm_order(self, symbol: str, side: str, client_order_id: str,
+                             error: Exception, timeout: Optional[float]) -> OrderResult:
+        """下单请求失败后按 clientOrderId 查询挂单和最近成交订单，确认订单是否已生效"""
+        from utils.logger_utils import get_logger
+
+        logger = get_logger("async_exchange")
+        params = self._codec._market_params()
+        queries = [("查询挂单", lambda client: client.fetch_open_orders(symbol, params=params))]
+        if getattr(self.client, "has", {}).get("fetchClosedOrders"):
+            queries.append(("查询历史订单", lambda client: client.fetch_closed_orders(symbol, params=params)))
+
+        try:
+            for name, query in queries:
+                for order in await self._request(name, query, timeout) or []:
+                    if order.get("clientOrderId") == client_order_id:
+                        logger.warning(f"下单请求失败但订单已生效: {order.get('id')} ({error})")
+                        return self._codec._parse_order(order, side)
+        except ExchangeError as e:
+            logger.error(f"下单状态确认失败 clientOrderId={client_order_id}: {e}")
+        else:
+            # 挂单和历史订单中都没有：请求仍可能在途
+            logger.warning(f"下单请求失败且未查到订单 clientOrderId={client_order_id}: {error}")
+
+        # 状态未知：调用方需按 clientOrderId 再次确认后才能决定是否重新下单
+        return OrderResult(
+            success=False, side=side, status=ORDER_STATUS_UNKNOWN,
+            error=f"{error}（订单状态未知）", raw_data={"clientOrderId": client_order_id},
+        )
+
+    async def cancel_order(self, order_id: str, symbol: str,
+                           timeout: Optional[float] = None) -> OrderResult:
+        params = self._codec._market_params()
+        try:
+            order = await self._request(
+                "撤单", lambda client: client.cancel_order(order_id, symbol, params=params), timeout
+            )
+        except ExchangeError as e:
+            return OrderResult(success=False, order_id=order_id, error=str(e))
+        return self._codec._parse_order(order or {'id': order_id})
+
+    async def get_order_status(self, order_id: str, symbol: str,
+                               timeout: Optional[float] = None) -> OrderResult:
+        params = self._codec._market_params()
+        try:
+            order = await self._request(
+                "查询订单", lambda client: client.fetch_order(order_id, symbol, params=params), timeout
+            )
+        except ExchangeError as e:
+            return OrderResult(success=False, order_id=order_id, error=str(e))
+        return self._codec._parse_order(order)
@@ -1,9 +1,11 @@
 """
 异步交易所管理器
-支持 ccxt async_support 模块，提供高性能的异步交易所操作
+
+保留给旧调用方（API 行情服务等）的便捷封装。所有请求委托给
+ExchangeManager.get_async_exchange() 返回的统一异步适配器（exchange.async_interface）：
+客户端来自进程级客户端池，重试、超时、限流和下单确认都只有这一条异步路径。
 """
 
-import ccxt.async_support as ccxt_async
 import asyncio
 from typing import Dict, List, Optional, Any
 import pandas as pd
@@ -15,6 +17,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import settings as config
+from exchange.async_interface import AsyncExchangeInterface
+from exchange.interface import OrderResult, PositionData
+from exchange.manager import ExchangeManager
 
 logger = logging.getLogger(__name__)
 
@@ -22,147 +27,103 @@ logger = logging.getLogger(__name__)
 class AsyncExchangeManager:
     """
     异步交易所管理器
-    
+
     功能:
-    - 异步初始化交易所连接
+    - 获取统一异步适配器（与交易主程序共享同一实例和连接）
     - 并发获取多个交易对数据
     - 并发获取多时间周期数据
-    - 自动重试和错误处理
-    - 资源管理和连接池
     """
-    
+
     def __init__(self, exchange_name: str = None):
         """
         初始化异步交易所管理器
-        
+
         Args:
             exchange_name: 交易所名称，默认使用配置中的 ACTIVE_EXCHANGE
         """
         self.exchange_name = exchange_name or getattr(config, 'ACTIVE_EXCHANGE', 'bitget')
-        self.exchange: Optional[ccxt_async.Exchange] = None
+        self.exchange: Optional[AsyncExchangeInterface] = None
         self.initialized = False
-        self.max_retries = 3
-        self.retry_delay = 1.0  # 秒
-        
+
         logger.info(f"AsyncExchangeManager 初始化: {self.exchange_name}")
-    
+
     async def initialize(self) -> bool:
         """
-        初始化异步交易所连接
-        
+        获取统一异步适配器
+
         Returns:
             bool: 初始化是否成功
         """
         if self.initialized:
             logger.warning("交易所已经初始化")
             return True
-        
+
         try:
-            # 根据交易所名称创建实例
-            exchange_class = getattr(ccxt_async, self.exchange_name.lower())
-
-            # 配置参数
-            exchange_config = {
-                'apiKey': getattr(config, 'API_KEY', ''),
-                'secret': getattr(config, 'API_SECRET', ''),
-                'enableRateLimit': True,
-                'options': {
-                    'defaultType': 'swap',  # 合约交易
-                }
-            }
-
-            # Bitget 需要 passphrase
-            if self.exchange_name.lower() == 'bitget':
-                exchange_config['password'] = getattr(config, 'API_PASSPHRASE', '')
-
-            # 创建交易所实例
-            self.exchange = exchange_class(exchange_config)
-            
-            # 加载市场数据
-            await self.exchange.load_markets()
-            
+            self.exchange = await ExchangeManager().get_async_exchange(self.exchange_name)
             self.initialized = True
             logger.info(f"✓ {self.exchange_name} 异步交易所初始化成功")
-            logger.info(f"  支持的市场数量: {len(self.exchange.markets)}")
-            
             return True
-            
+
         except Exception as e:
             logger.error(f"✗ 交易所初始化失败: {e}")
             self.initialized = False
             return False
-    
+
     async def fetch_ticker_async(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
         异步获取 ticker 数据
-        
+
         Args:
             symbol: 交易对符号，如 'BTC/USDT:USDT'
-            
+
         Returns:
-            Dict: ticker 数据，包含 last, bid, ask, volume 等
+            Dict: ccxt ticker 数据，包含 last, bid, ask, volume 等
         """
         if not self.initialized:
             logger.error("交易所未初始化")
             return None
-        
-        for attempt in range(self.max_retries):
-            try:
-                ticker = await self.exchange.fetch_ticker(symbol)
-                logger.debug(f"获取 {symbol} ticker: {ticker['last']}")
-                return ticker
-                
-            except Exception as e:
-                logger.warning(f"获取 ticker 失败 (尝试 {attempt + 1}/{self.max_retries}): {e}")
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay)
-                else:
-                    logger.error(f"获取 ticker 最终失败: {symbol}")
-                    return None
-    
+
+        try:
+            ticker = await self.exchange.get_ticker(symbol)
+        except Exception as e:
+            logger.error(f"获取 ticker 失败: {symbol}: {e}")
+            return None
+        return ticker.raw_data if ticker else None
+
     async def fetch_ohlcv_async(
-        self, 
-        symbol: str, 
-        timeframe: str = '15m', 
+        self,
+        symbol: str,
+        timeframe: str = '15m',
         limit: int = 100
     ) -> Optional[pd.DataFrame]:
         """
         异步获取 OHLCV K线数据
-        
+
         Args:
             symbol: 交易对符号
             timeframe: 时间周期，如 '1m', '5m', '15m', '1h', '4h', '1d'
             limit: 获取的K线数量
-            
+
         Returns:
             DataFrame: 包含 timestamp, open, high, low, close, volume 列
         """
         if not self.initialized:
             logger.error("交易所未初始化")
             return None
-        
-        for attempt in range(self.max_retries):
-            try:
-                ohlcv = await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-                
-                # 转换为 DataFrame
-                df = pd.DataFrame(
-                    ohlcv, 
-                    columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                )
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                
-                logger.debug(f"获取 {symbol} {timeframe} K线: {len(df)} 条")
-                return df
-                
-            except Exception as e:
-                logger.warning(f"获取 OHLCV 失败 (尝试 {attempt + 1}/{self.max_retries}): {e}")
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay)
-                else:
-                    logger.error(f"获取 OHLCV 最终失败: {symbol} {timeframe}")
-                    return None
-    
+
+        try:
+            df = await self.exchange.get_klines(symbol, timeframe, limit)
+        except Exception as e:
+            logger.error(f"获取 OHLCV 失败: {symbol} {timeframe}: {e}")
+            return None
+        if df is None:
+            return None
+
+        # timestamp 保持为普通列
+        df = df.reset_index()
+        logger.debug(f"获取 {symbol} {timeframe} K线: {len(df)} 条")
+        return df
+
     async def fetch_multiple_timeframes(
         self, 
         symbol: str, 
@@ -253,106 +214,91 @@ class AsyncExchangeManager:
         logger.info(f"✓ 并发获取完成: {len(data_dict)}/{len(symbols)} 成功, 耗时 {elapsed:.2f}s")
         return data_dict
     
-    async def fetch_balance_async(self) -> Optional[Dict[str, Any]]:
+    async def fetch_balance_async(self) -> Optional[float]:
         """
         异步获取账户余额
-        
+
         Returns:
-            Dict: 账户余额信息
+            float: USDT 可用余额
         """
         if not self.initialized:
             logger.error("交易所未初始化")
             return None
-        
+
         try:
-            balance = await self.exchange.fetch_balance()
-            logger.debug(f"获取账户余额成功")
-            return balance
-            
+            return await self.exchange.get_balance()
         except Exception as e:
             logger.error(f"获取账户余额失败: {e}")
             return None
-    
-    async def fetch_positions_async(self, symbols: List[str] = None) -> Optional[List[Dict]]:
+
+    async def fetch_positions_async(self, symbol: str = None) -> Optional[List[PositionData]]:
         """
         异步获取持仓信息
-        
+
         Args:
-            symbols: 交易对列表，None 表示获取所有持仓
-            
+            symbol: 交易对，None 表示配置中的交易对
+
         Returns:
-            List[Dict]: 持仓信息列表
+            List[PositionData]: 持仓信息列表
         """
         if not self.initialized:
             logger.error("交易所未初始化")
             return None
-        
+
         try:
-            positions = await self.exchange.fetch_positions(symbols)
+            positions = await self.exchange.get_positions(symbol)
             logger.debug(f"获取持仓信息: {len(positions)} 个")
             return positions
-            
         except Exception as e:
             logger.error(f"获取持仓信息失败: {e}")
             return None
-    
+
     async def create_order_async(
         self,
         symbol: str,
         order_type: str,
         side: str,
         amount: float,
-        price: float = None,
-        params: Dict = None
-    ) -> Optional[Dict]:
+        price: float = None
+    ) -> Optional[OrderResult]:
         """
-        异步创建订单
-        
+        异步创建订单（下单超时时由适配器按 clientOrderId 确认，状态未知时 status='unknown'）
+
         Args:
             symbol: 交易对
             order_type: 订单类型 'market' 或 'limit'
             side: 'buy' 或 'sell'
             amount: 数量
             price: 价格（限价单需要）
-            params: 额外参数
-            
+
         Returns:
-            Dict: 订单信息
+            OrderResult: 订单结果
         """
         if not self.initialized:
             logger.error("交易所未初始化")
             return None
-        
-        try:
-            order = await self.exchange.create_order(
-                symbol, order_type, side, amount, price, params
-            )
+
+        result = await self.exchange.place_order(symbol, side, amount, price, order_type)
+        if result.success:
             logger.info(f"✓ 创建订单成功: {side} {amount} {symbol} @ {price or 'market'}")
-            return order
-            
-        except Exception as e:
-            logger.error(f"✗ 创建订单失败: {e}")
-            return None
-    
+        else:
+            logger.error(f"✗ 创建订单失败: {result.error}")
+        return result
+
     async def close(self):
         """
-        关闭交易所连接，释放资源
+        释放引用（适配器由 ExchangeFactory 共享，连接归客户端池所有，不在这里断开）
         """
         if self.exchange:
-            try:
-                await self.exchange.close()
-                logger.info(f"✓ {self.exchange_name} 连接已关闭")
-            except Exception as e:
-                logger.error(f"关闭连接时出错: {e}")
-            finally:
-                self.exchange = None
-                self.initialized = False
-    
+            self.exchange = None
+            self.initialized = False
+            logger.info(f"✓ {self.exchange_name} 已释放异步适配器")
+
     async def __aenter__(self):
         """支持 async with 语法"""
         await self.initialize()
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """支持 async with 语法"""
         await self.close()
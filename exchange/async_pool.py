@@ -0,0 +1,254 @@
+"""
+进程级异步交易所客户端池
+
+- 每个 (交易所, API Key, options) 只创建一个长期存活的 ccxt.async_support 客户端，
+  复用 aiohttp 会话（keep-alive 连接、TLS 握手只发生一次），load_markets 只执行一次
+- 客户端按使用者计数：get_client / acquire 各占一次引用，release() 归还，最后一个使用者
+  归还时关闭客户端的会话；进程退出时 shutdown() 关闭剩余客户端
+- 所有客户端归属同一个后台事件循环线程；aiohttp 会话绑定事件循环，因此客户端的请求
+  必须在该循环内执行
+- 同步代码通过 run() / submit() 把协程提交到后台循环（线程安全 Future），
+  其他事件循环中的协程通过 call() 桥接，不再临时创建或嵌套事件循环
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import json
+import threading
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+from utils.logger_utils import get_logger
+from .market_cache import install_market_cache
+from .rate_limiter import current_priority, install_rate_limiter, with_priority
+
+logger = get_logger("async_client_pool")
+
+ClientKey = Tuple[str, str, str]
+
+
+def _freeze_options(options: Dict) -> str:
+    """options 的稳定表示（作为客户端池的键，任何选项不同都使用不同的客户端）"""
+    return json.dumps(options, sort_keys=True, default=str)
+
+
+class AsyncClientPool:
+    """异步 ccxt 客户端池（后台事件循环线程 + 线程安全 Future 桥接）"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._clients: Dict[ClientKey, Any] = {}
+        self._refs: Dict[ClientKey, int] = {}
+        self._markets: Dict[ClientKey, asyncio.Future] = {}
+        self.clients_created = 0
+        self.markets_loaded = 0
+
+    # ==================== 事件循环 ====================
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """后台事件循环（首次访问时启动线程）"""
+        if self._loop is None or self._loop.is_closed():
+            with self._lock:
+                if self._loop is None or self._loop.is_closed():
+                    self._start_loop()
+        return self._loop
+
+    def _start_loop(self):
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="async-client-pool", daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+        logger.debug("异步客户端池事件循环已启动")
+
+    def in_pool_loop(self) -> bool:
+        """当前线程是否为后台事件循环线程"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """把协程提交到后台事件循环，返回线程安全的 Future（保留调用方的限流优先级）"""
+        priority = current_priority()
+        if priority is not None:
+            coro = with_priority(coro, priority)
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None):
+        """
+        在后台事件循环中执行协程并阻塞等待结果（供同步代码调用）
+
+        Args:
+            timeout: 等待超时（秒），超时后取消协程并抛出 TimeoutError
+        """
+        if self.in_pool_loop():
+            coro.close()
+            raise RuntimeError("不能在客户端池事件循环内同步等待协程（会死锁），请使用 await call()")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    async def call(self, coro: Awaitable):
+        """在后台事件循环中执行协程并在当前事件循环中等待结果（已在后台循环中则直接执行）"""
+        if self.in_pool_loop():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    # ==================== 客户端 ====================
+
+    def get_client(self, exchange_id: str, api_key: str = "", secret: str = "",
+                   password: str = "", options: Dict = None):
+        """
+        获取（首次调用时创建）共享的异步客户端，占用一次引用（用完调用 release）
+
+        返回的客户端只能在后台事件循环中使用（通过 run / call 提交协程）。
+        """
+        options = dict(options or {})
+        key = (exchange_id, api_key or "", _freeze_options(options))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                import ccxt.async_support as ccxt_async
+
+                exchange_class = getattr(ccxt_async, exchange_id)
+                client = exchange_class({
+                    "apiKey": api_key,
+                    "secret": secret,
+                    "password": password,
+                    "enableRateLimit": True,
+                    "options": options,
+                })
+                install_rate_limiter(client)
+                install_market_cache(client)
+                self._clients[key] = client
+                self.clients_created += 1
+                logger.info(f"创建共享异步客户端: {exchange_id} ({options.get('defaultType') or 'default'})")
+            self._refs[key] = self._refs.get(key, 0) + 1
+        return client
+
+    async def release(self, client):
+        """归还一次引用；最后一个使用者归还时关闭客户端（可在任意事件循环中 await）"""
+        with self._lock:
+            key = next((k for k, c in self._clients.items() if c is client), None)
+            if key is None:
+                return
+            self._refs[key] = self._refs.get(key, 1) - 1
+            if self._refs[key] > 0:
+                return
+            del self._clients[key]
+            self._refs.pop(key, None)
+            self._markets.pop(key, None)
+        try:
+            await self.call(client.close())
+            logger.info(f"共享异步客户端已关闭: {key[0]}")
+        except Exception as e:
+            logger.debug(f"关闭异步客户端失败: {e}")
+
+    def get_client_like(self, exchange):
+        """按同步 ccxt 客户端的交易所、凭证和 options 获取共享异步客户端"""
+        return self.get_client(
+            exchange.id,
+            api_key=exchange.apiKey or "",
+            secret=exchange.secret or "",
+            password=exchange.password or "",
+            options=exchange.options,
+        )
+
+    async def load_markets(self, client) -> Dict:
+        """
+        加载市场信息（每个客户端只请求一次，并发调用共享同一次请求）
+
+        须在后台事件循环中执行。
+        """
+        key = next((k for k, c in self._clients.items() if c is client), None)
+        if key is None:
+            return await client.load_markets()
+
+        future = self._markets.get(key)
+        if future is None:
+            future = asyncio.ensure_future(client.load_markets())
+            self._markets[key] = future
+            future.add_done_callback(lambda f, key=key: self._on_markets_loaded(key, f))
+        return await asyncio.shield(future)
+
+    def _on_markets_loaded(self, key: ClientKey, future: asyncio.Future):
+        if future.cancelled() or future.exception() is not None:
+            # 失败不缓存，下次重试
+            self._markets.pop(key, None)
+        else:
+            self.markets_loaded += 1
+
+    async def acquire(self, exchange_id: str, api_key: str = "", secret: str = "",
+                      password: str = "", options: Dict = None):
+        """获取共享客户端并确保市场信息已加载（可在任意事件循环中 await）"""
+        client = self.get_client(exchange_id, api_key, secret, password, options)
+        try:
+            await self.call(self.load_markets(client))
+        except BaseException:
+            await self.release(client)
+            raise
+        return client
+
+    # ==================== 关闭 ====================
+
+    async def _close_clients(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._refs.clear()
+            self._markets.clear()
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.debug(f"关闭异步客户端失败: {e}")
+
+    def shutdown(self, timeout: float = 5.0):
+        """关闭所有客户端并停止后台事件循环"""
+        loop = self._loop
+        if loop is None or loop.is_closed() or not loop.is_running():
+            return
+        try:
+            self.run(self._close_clients(), timeout=timeout)
+        except Exception as e:
+            logger.debug(f"关闭异步客户端池失败: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._loop = None
+        self._thread = None
+
+    def get_stats(self) -> Dict:
+        """获取客户端池统计信息"""
+        return {
+            "clients": len(self._clients),
+            "clients_created": self.clients_created,
+            "markets_loaded": self.markets_loaded,
+            "loop_running": self._loop is not None and self._loop.is_running(),
+        }
+
+
+# 全局单例
+_pool: Optional[AsyncClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_async_client_pool() -> AsyncClientPool:
+    """获取全局异步客户端池"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = AsyncClientPool()
+                atexit.register(_pool.shutdown)
+    return _pool
@@ -1,42 +1,278 @@
 """
 交易所装饰器 - 错误重试机制
+
+- 同步函数用 time.sleep，协程用 asyncio.sleep；同步函数在事件循环线程上被调用时仍然重试
+  （下单、平仓不能丢掉重试），但会告警：异步调用方应通过 asyncio.to_thread 调用同步接口
+- 退避使用去相关抖动（decorrelated jitter）：sleep = min(cap, uniform(base, 上次 sleep × 3))，
+  多个调用方同时失败时不会在同一时刻集中重试
+- 按 exchange/errors.py 的异常类别决定是否重试及退避参数：余额不足、认证失败、订单无效等
+  不可重试的错误立即抛出；限流错误使用更长的退避
+- 重试预算：每个交易所共享一个预算（首次请求按比例存入，重试消耗），错误集中爆发时重试
+  总量受限；CRITICAL 优先级的请求（止损平仓）不受预算限制
+- 与错误退避控制器联动：交易所已处于退避暂停时不再重试；限流重试耗尽后登记到退避控制器
 """
-import time
+import asyncio
 import functools
+import inspect
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Type
+
+from config.settings import settings as config
 from utils.logger_utils import get_logger
 
+from .errors import (
+    AuthenticationError, ExchangeError, InsufficientBalanceError, NetworkError,
+    OrderError, PositionError, RateLimitError, translate_ccxt_error,
+)
+
 logger = get_logger("exchange_decorators")
 
 
+@dataclass(frozen=True)
+class RetryRule:
+    """单类错误的重试规则"""
+    retryable: bool
+    base: float = 1.0   # 首次退避时间（秒），实际值为 base × backoff_base
+    cap: float = 10.0   # 单次退避上限（秒）
+
+
+# 按异常类别匹配（沿 MRO 查找，越具体越优先）
+RETRY_RULES: Dict[Type[Exception], RetryRule] = {
+    RateLimitError: RetryRule(True, base=2.0, cap=30.0),
+    NetworkError: RetryRule(True, base=0.5, cap=10.0),
+    AuthenticationError: RetryRule(False),
+    InsufficientBalanceError: RetryRule(False),
+    OrderError: RetryRule(False),
+    PositionError: RetryRule(False),
+    ExchangeError: RetryRule(True, base=1.0, cap=10.0),
+}
+
+# 非交易所异常（编程错误等）不重试
+NON_RETRYABLE = RetryRule(False)
+
+
+def classify_error(error: Exception) -> ExchangeError:
+    """
+    把异常归入 errors.py 的类别
+
+    适配器常把 ccxt 异常包装成通用 ExchangeError，此时按 raw_error 重新归类。
+    """
+    if type(error) is ExchangeError and error.raw_error is not None:
+        return translate_ccxt_error("", error.raw_error)
+    return translate_ccxt_error("", error) if _is_ccxt_error(error) else error
+
+
+def _is_ccxt_error(error: Exception) -> bool:
+    return type(error).__module__.startswith("ccxt")
+
+
+def get_retry_rule(error: Exception) -> RetryRule:
+    """获取异常对应的重试规则"""
+    classified = classify_error(error)
+    if type(classified) is ExchangeError and classified.raw_error is None:
+        # 本地产生的错误（如“交易所未连接”），重试无意义
+        return NON_RETRYABLE
+    for cls in type(classified).__mro__:
+        rule = RETRY_RULES.get(cls)
+        if rule is not None:
+            return rule
+    return NON_RETRYABLE
+
+
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """去相关抖动退避：在 [base, previous × 3] 内随机取值，不超过 cap"""
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
+class RetryBudget:
+    """
+    重试预算（按交易所共享）
+
+    每次首次请求存入 ratio 个令牌，另按 min_per_second 匀速补充，容量上限 capacity；
+    每次重试消耗 1 个令牌，不足时放弃重试。
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 0.5, capacity: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "exhausted": 0}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def record_request(self):
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+            self.stats["requests"] += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.stats["retries"] += 1
+                return True
+            self.stats["exhausted"] += 1
+            return False
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            self._refill()
+            return dict(self.stats, tokens=round(self._tokens, 2))
+
+
+_budgets: Dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_retry_budget(exchange: str) -> RetryBudget:
+    """获取交易所共享的重试预算"""
+    budget = _budgets.get(exchange)
+    if budget is None:
+        with _budgets_lock:
+            budget = _budgets.get(exchange)
+            if budget is None:
+                budget = RetryBudget(
+                    ratio=getattr(config, "RETRY_BUDGET_RATIO", 0.2),
+                    min_per_second=getattr(config, "RETRY_BUDGET_MIN_PER_SECOND", 0.5),
+                    capacity=getattr(config, "RETRY_BUDGET_CAPACITY", 10),
+                )
+                _budgets[exchange] = budget
+    return budget
+
+
+def get_retry_stats() -> Dict[str, Dict]:
+    """各交易所重试预算统计"""
+    with _budgets_lock:
+        budgets = dict(_budgets)
+    return {name: budget.get_stats() for name, budget in budgets.items()}
+
+
+def _exchange_name(args) -> str:
+    owner = args[0] if args else None
+    name = getattr(owner, "exchange_name", None)
+    return name if isinstance(name, str) else "default"
+
+
+def _backoff_controller():
+    if not getattr(config, "ENABLE_ERROR_BACKOFF", False):
+        return None
+    from risk.error_backoff_controller import get_backoff_controller
+    return get_backoff_controller()
+
+
+def _is_critical() -> bool:
+    from .rate_limiter import Priority, current_priority
+    priority = current_priority()
+    return priority is not None and priority <= Priority.CRITICAL
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _next_delay(func_name: str, exchange: str, error: Exception, attempt: int, max_retries: int,
+                previous: float, backoff_base: float) -> Optional[float]:
+    """
+    判断是否重试
+
+    Returns:
+        本次退避秒数；None 表示不再重试（调用方抛出原异常）
+    """
+    rule = get_retry_rule(error)
+    classified = classify_error(error)
+    controller = _backoff_controller()
+
+    if not rule.retryable:
+        logger.warning(f"{func_name} 失败（{type(classified).__name__}，不重试）: {error}")
+        return None
+
+    if attempt >= max_retries - 1:
+        logger.error(f"{func_name} 重试{max_retries}次后仍失败: {error}")
+    elif controller is not None and controller.is_paused(exchange):
+        logger.warning(f"{func_name} 失败，{exchange} 处于退避暂停中，不再重试: {error}")
+        return None
+    elif not _is_critical() and not get_retry_budget(exchange).try_spend():
+        logger.warning(f"{func_name} 失败，{exchange} 重试预算已耗尽，不再重试: {error}")
+    else:
+        delay = decorrelated_jitter(previous, rule.base * backoff_base, rule.cap)
+        logger.warning(
+            f"{func_name} 失败，{delay:.1f}秒后重试 ({attempt + 1}/{max_retries}): {error}"
+        )
+        return delay
+
+    # 限流重试耗尽：登记到退避控制器，暂停对该交易所的请求
+    if isinstance(classified, RateLimitError) and controller is not None:
+        controller.register_error(exchange, "429", str(error))
+    return None
+
+
 def retry_on_error(max_retries=3, backoff_base=1.0):
     """
-    错误重试装饰器
+    错误重试装饰器（同步函数与协程均可）
+
+    可以直接使用 @retry_on_error，也可以带参数 @retry_on_error(max_retries=3)。
 
     Args:
-        max_retries: 最大重试次数
-        backoff_base: 退避基础时间（秒）
+        max_retries: 最大尝试次数
+        backoff_base: 退避时间倍数（乘以各错误类别的基础退避时间）
 
     Returns:
         装饰器函数
     """
+    if callable(max_retries):
+        return retry_on_error()(max_retries)
+
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                exchange = _exchange_name(args)
+                get_retry_budget(exchange).record_request()
+                previous = 0.0
+                for attempt in range(max_retries):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        delay = _next_delay(func.__name__, exchange, e, attempt, max_retries,
+                                            previous, backoff_base)
+                        if delay is None:
+                            raise
+                        previous = delay
+                    await asyncio.sleep(previous)
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            exchange = _exchange_name(args)
+            get_retry_budget(exchange).record_request()
+            previous = 0.0
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
-                    if attempt < max_retries - 1:
-                        delay = backoff_base * (2 ** attempt)
-                        logger.warning(
-                            f"{func.__name__} 失败，{delay:.1f}秒后重试 "
-                            f"({attempt+1}/{max_retries}): {e}"
-                        )
-                        time.sleep(delay)
-                    else:
-                        logger.error(
-                            f"{func.__name__} 重试{max_retries}次后仍失败: {e}"
-                        )
+                    delay = _next_delay(func.__name__, exchange, e, attempt, max_retries,
+                                        previous, backoff_base)
+                    if delay is None:
                         raise
+                    previous = delay
+                if _in_event_loop():
+                    # 退避期间事件循环被阻塞，但交易请求不能因此丢掉重试
+                    logger.warning(f"{func.__name__} 在事件循环线程上阻塞重试，应通过 asyncio.to_thread 调用")
+                time.sleep(previous)
         return wrapper
     return decorator
@@ -39,3 +39,29 @@ class OrderError(ExchangeError):
 class PositionError(ExchangeError):
     """持仓错误"""
     pass
+
+
+def translate_ccxt_error(action: str, error: Exception) -> ExchangeError:
+    """
+    把 ccxt 异常转换为统一异常（同步/异步接口共用）
+
+    Args:
+        action: 操作名称（用于错误信息，如 "获取行情"）
+        error: 原始异常
+    """
+    if isinstance(error, ExchangeError):
+        return error
+
+    import ccxt
+
+    if isinstance(error, ccxt.AuthenticationError):
+        return AuthenticationError(f"{action}认证失败: {error}", error)
+    if isinstance(error, ccxt.InsufficientFunds):
+        return InsufficientBalanceError(f"余额不足: {error}", error)
+    if isinstance(error, ccxt.InvalidOrder):
+        return OrderError(f"订单无效: {error}", error)
+    if isinstance(error, ccxt.RateLimitExceeded):
+        return RateLimitError(f"限流: {error}", error)
+    if isinstance(error, ccxt.NetworkError):
+        return NetworkError(f"{action}网络错误: {error}", error)
+    return ExchangeError(f"{action}失败: {error}", error)
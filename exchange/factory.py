@@ -4,6 +4,7 @@
 from typing import Dict, Type, Optional
 from utils.logger_utils import get_logger
 from .interface import ExchangeInterface
+from .async_interface import AsyncExchangeInterface
 from .errors import ExchangeError
 
 logger = get_logger("exchange_factory")
@@ -18,6 +19,10 @@ class ExchangeFactory:
     # 单例缓存
     _instances: Dict[str, ExchangeInterface] = {}
 
+    # 注册的异步适配器类与单例缓存
+    _async_adapters: Dict[str, Type[AsyncExchangeInterface]] = {}
+    _async_instances: Dict[str, AsyncExchangeInterface] = {}
+
     @classmethod
     def register(cls, name: str, adapter_class: Type[ExchangeInterface]):
         """注册适配器类
@@ -29,6 +34,17 @@ class ExchangeFactory:
         cls._adapters[name.lower()] = adapter_class
         logger.info(f"注册交易所适配器: {name}")
 
+    @classmethod
+    def register_async(cls, name: str, adapter_class: Type[AsyncExchangeInterface]):
+        """注册异步适配器类
+
+        Args:
+            name: 交易所名称（与同步适配器一致）
+            adapter_class: 异步适配器类
+        """
+        cls._async_adapters[name.lower()] = adapter_class
+        logger.info(f"注册交易所异步适配器: {name}")
+
     @classmethod
     def create(cls, exchange_name: str, config: Dict) -> ExchangeInterface:
         """创建交易所适配器实例
@@ -80,6 +96,47 @@ class ExchangeFactory:
 
         return cls._instances[name]
 
+    @classmethod
+    async def create_async(cls, exchange_name: str, config: Dict) -> AsyncExchangeInterface:
+        """创建并连接异步适配器实例
+
+        Raises:
+            ExchangeError: 不支持的交易所或创建失败
+        """
+        name = exchange_name.lower()
+
+        if name not in cls._async_adapters:
+            raise ExchangeError(
+                f"不支持异步接口的交易所: {exchange_name}. "
+                f"支持的交易所: {', '.join(cls._async_adapters.keys())}"
+            )
+
+        logger.info(f"创建交易所异步适配器: {exchange_name}")
+
+        try:
+            instance = cls._async_adapters[name](config)
+            await instance.connect()
+            return instance
+        except Exception as e:
+            logger.error(f"创建交易所异步适配器失败: {exchange_name}, 错误: {e}")
+            raise ExchangeError(f"创建交易所异步适配器失败: {exchange_name}", e)
+
+    @classmethod
+    async def get_or_create_async(cls, exchange_name: str, config: Dict) -> AsyncExchangeInterface:
+        """获取或创建异步适配器实例（单例模式）"""
+        name = exchange_name.lower()
+
+        instance = cls._async_instances.get(name)
+        if instance is None or not instance.is_connected():
+            created = await cls.create_async(exchange_name, config)
+            # 并发创建时保留先完成的实例（底层客户端本就由客户端池共享）
+            current = cls._async_instances.get(name)
+            if current is None or not current.is_connected():
+                cls._async_instances[name] = created
+            instance = cls._async_instances[name]
+
+        return instance
+
     @classmethod
     def clear_instances(cls):
         """清除所有实例缓存"""
@@ -91,6 +148,8 @@ class ExchangeFactory:
                 logger.warning(f"断开交易所连接失败: {name}, 错误: {e}")
 
         cls._instances.clear()
+        # 异步适配器的客户端归客户端池所有，这里只丢弃引用
+        cls._async_instances.clear()
         logger.info("清除所有交易所实例缓存")
 
     @classmethod
@@ -1,6 +1,7 @@
 """
 交易所统一接口定义
 """
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Optional, List, Dict
 from dataclasses import dataclass
@@ -44,7 +45,20 @@ class OrderResult:
     # 套利引擎需要的字段
     filled_quantity: Optional[float] = None  # 已成交数量
     avg_price: Optional[float] = None  # 平均成交价格
-    status: Optional[str] = None  # 订单状态：'open', 'closed', 'canceled'
+    status: Optional[str] = None  # 订单状态：'open', 'closed', 'canceled'，下单超时未能确认时为 'unknown'
+
+
+# 下单请求超时且无法确认订单是否已提交：调用方不能直接重试，需先按 clientOrderId 查询
+ORDER_STATUS_UNKNOWN = "unknown"
+
+
+def symbol_key(symbol: str) -> str:
+    """
+    交易对归一化键，用于匹配配置中的交易对和 ccxt 返回的统一符号
+
+    例: "ETH/USDT:USDT" / "ETHUSDT" / "eth-usdt" → "ETHUSDT"
+    """
+    return ''.join(ch for ch in symbol.split(':')[0].upper() if ch.isalnum())
 
 
 class ExchangeInterface(ABC):
@@ -53,6 +67,8 @@ class ExchangeInterface(ABC):
     def __init__(self, config: Dict):
         self.config = config
         self.exchange = None
+        # 持久异步客户端（异步读取接口首次使用时创建）
+        self._async_client = None
 
     # ========== 生命周期管理 ==========
 
@@ -170,7 +186,23 @@ class ExchangeInterface(ABC):
     # ========== 辅助方法（可选实现）==========
 
     def fetch_multi_timeframe_data(self, timeframes: List[str]) -> Dict[str, pd.DataFrame]:
-        """获取多时间周期数据（默认实现）"""
+        """
+        获取多时间周期数据（默认实现）
+
+        启用 MTF_RESAMPLE_ENABLED 时只增量拉取最小周期K线，高周期本地重采样
+        """
+        from config.settings import settings as global_config
+        if getattr(global_config, 'MTF_RESAMPLE_ENABLED', False):
+            from market_data import MultiTimeframeAggregator
+
+            aggregator = getattr(self, '_mtf_aggregator', None)
+            if aggregator is None or aggregator.timeframes != list(timeframes):
+                aggregator = MultiTimeframeAggregator(timeframes)
+                self._mtf_aggregator = aggregator
+            return aggregator.refresh(
+                lambda tf, limit: self.get_klines(timeframe=tf, limit=limit)
+            )
+
         result = {}
         for tf in timeframes:
             df = self.get_klines(timeframe=tf)
@@ -181,3 +213,286 @@ class ExchangeInterface(ABC):
     def get_exchange_name(self) -> str:
         """获取交易所名称"""
         return getattr(self, 'exchange_name', 'unknown')
+
+    # ========== 批量接口（多品种共用一次请求）==========
+
+    def _supports(self, capability: str) -> bool:
+        """ccxt 客户端是否支持某个接口（如 fetchPositions / fetchTickers）"""
+        has = getattr(self.exchange, 'has', None)
+        return isinstance(has, dict) and bool(has.get(capability))
+
+    def get_positions_batch(self, symbols: List[str]) -> Dict[str, Optional[List[PositionData]]]:
+        """
+        批量获取多个品种的持仓
+
+        交易所支持 fetchPositions 时只发一次请求，否则逐个调用 get_positions。
+
+        Returns:
+            {symbol: 持仓列表}，无持仓的品种为空列表；逐个读取失败的品种为 None（持仓未知，
+            不能当作无持仓）
+        """
+        result = {symbol: [] for symbol in symbols}
+        if not self._supports('fetchPositions'):
+            for symbol in symbols:
+                try:
+                    result[symbol] = self.get_positions(symbol)
+                except Exception:
+                    result[symbol] = None
+            return result
+
+        from .errors import ExchangeError, translate_ccxt_error
+
+        if not self.is_connected():
+            raise ExchangeError("交易所未连接")
+        try:
+            positions = self.exchange.fetch_positions(list(symbols), params=self._market_params())
+        except Exception as e:
+            raise translate_ccxt_error("批量获取持仓", e)
+
+        keys = {symbol_key(symbol): symbol for symbol in symbols}
+        for position in self._parse_positions(positions):
+            symbol = keys.get(symbol_key(position.raw_data.get('symbol', '')))
+            if symbol is not None:
+                result[symbol].append(position)
+        return result
+
+    def get_tickers(self, symbols: List[str]) -> Dict[str, TickerData]:
+        """
+        批量获取多个品种的行情
+
+        交易所支持 fetchTickers 时只发一次请求，否则逐个调用 get_ticker。
+
+        Returns:
+            {symbol: TickerData}，交易所未返回的品种不在结果中
+        """
+        if not self._supports('fetchTickers'):
+            return {symbol: self.get_ticker(symbol) for symbol in symbols}
+
+        from .errors import ExchangeError, translate_ccxt_error
+
+        if not self.is_connected():
+            raise ExchangeError("交易所未连接")
+        try:
+            tickers = self.exchange.fetch_tickers(list(symbols), params=self._market_params())
+        except Exception as e:
+            raise translate_ccxt_error("批量获取行情", e)
+
+        keys = {symbol_key(symbol): symbol for symbol in symbols}
+        result = {}
+        for name, ticker in tickers.items():
+            symbol = keys.get(symbol_key(ticker.get('symbol') or name))
+            if symbol is not None:
+                result[symbol] = self._parse_ticker(symbol, ticker)
+        return result
+
+    # ========== 响应解析（同步/异步接口共用）==========
+
+    def _market_params(self) -> Dict:
+        """K线/持仓请求的额外参数（子类按需覆盖）"""
+        return {}
+
+    def _balance_params(self) -> Dict:
+        """余额请求的额外参数（子类按需覆盖）"""
+        return {}
+
+    def _order_params(self) -> Dict:
+        """通用下单请求的额外参数（子类按需覆盖）"""
+        return {}
+
+    def _parse_ticker(self, symbol: str, ticker: Dict) -> TickerData:
+        """ccxt ticker → TickerData"""
+        return TickerData(
+            symbol=symbol,
+            last=float(ticker.get('last', 0)),
+            bid=float(ticker.get('bid', 0)) if ticker.get('bid') else None,
+            ask=float(ticker.get('ask', 0)) if ticker.get('ask') else None,
+            volume=float(ticker.get('baseVolume', 0)) if ticker.get('baseVolume') else None,
+            timestamp=int(ticker.get('timestamp', 0)),
+            raw_data=ticker
+        )
+
+    def _parse_klines(self, ohlcv: List, as_array: bool = False):
+        """ccxt ohlcv → timestamp 索引的 DataFrame（as_array=True 时返回 KlineArray）"""
+        from market_data.klines import parse_ohlcv
+
+        return parse_ohlcv(ohlcv, as_array=as_array)
+
+    def _parse_positions(self, positions: List[Dict]) -> List[PositionData]:
+        """ccxt positions → PositionData 列表（只保留有仓位的记录）"""
+        result = []
+        for pos in positions:
+            amount = abs(float(pos.get('contracts', 0)))
+            if amount > 0:
+                result.append(PositionData(
+                    side=pos.get('side', '').lower(),
+                    amount=amount,
+                    entry_price=float(pos.get('entryPrice', 0)),
+                    unrealized_pnl=float(pos.get('unrealizedPnl', 0)),
+                    leverage=int(pos.get('leverage', getattr(self, 'leverage', 1))),
+                    margin_mode=pos.get('marginMode', getattr(self, 'margin_mode', '')),
+                    raw_data=pos
+                ))
+        return result
+
+    def _parse_orderbook(self, orderbook: Dict) -> Dict:
+        """ccxt order book → bids/asks/timestamp 字典"""
+        return {
+            'bids': orderbook.get('bids', []),
+            'asks': orderbook.get('asks', []),
+            'timestamp': orderbook.get('timestamp', 0),
+            'datetime': orderbook.get('datetime', ''),
+        }
+
+    def _parse_balance(self, balance: Dict) -> float:
+        """ccxt balance → USDT 可用余额"""
+        return float(balance.get('USDT', {}).get('free', 0) or 0)
+
+    def _parse_order(self, order: Dict, side: Optional[str] = None) -> OrderResult:
+        """ccxt order → OrderResult（side 为空时使用订单自身的方向）"""
+        return OrderResult(
+            success=True,
+            order_id=order.get('id'),
+            price=order.get('price'),
+            amount=order.get('amount'),
+            side=side or order.get('side'),
+            filled_quantity=order.get('filled', 0),
+            avg_price=order.get('average'),
+            status=order.get('status'),
+            raw_data=order
+        )
+
+    # ========== 异步读取接口（可选）==========
+
+    def _get_async_client(self):
+        """
+        获取共享的 ccxt 异步客户端
+
+        与同步客户端使用同一交易所、凭证和 options，由进程级客户端池持有并在其后台
+        事件循环中执行请求。无法创建时返回 None（调用方退回线程执行同步接口）。
+        """
+        if self._async_client is not None:
+            return self._async_client
+
+        if not isinstance(getattr(self.exchange, 'id', None), str):
+            return None
+
+        try:
+            from .async_pool import get_async_client_pool
+
+            self._async_client = get_async_client_pool().get_client_like(self.exchange)
+        except Exception as e:
+            from utils.logger_utils import get_logger
+            get_logger("exchange_interface").warning(f"创建异步客户端失败，使用线程执行同步接口: {e}")
+            self._async_client = None
+        return self._async_client
+
+    async def _call_async(self, name: str, fetch, fallback, timeout: Optional[float]):
+        """
+        在异步客户端上执行一次请求（带超时），客户端不可用时在线程中执行同步接口
+
+        Args:
+            name: 操作名称（用于错误信息）
+            fetch: 接收异步客户端、返回协程的函数
+            fallback: 无异步客户端时执行的同步函数
+            timeout: 超时时间（秒），None 表示不限制
+        """
+        from .errors import ExchangeError, NetworkError, translate_ccxt_error
+
+        if not self.is_connected():
+            raise ExchangeError("交易所未连接")
+
+        from .async_pool import get_async_client_pool
+
+        client = self._get_async_client()
+        if client is not None:
+            coro = get_async_client_pool().call(fetch(client))
+        else:
+            coro = asyncio.to_thread(fallback)
+        try:
+            return await asyncio.wait_for(coro, timeout)
+        except asyncio.TimeoutError as e:
+            raise NetworkError(f"{name}超时 ({timeout}s)", e)
+        except Exception as e:
+            raise translate_ccxt_error(name, e)
+
+    async def get_ticker_async(self, symbol: str = None,
+                               timeout: Optional[float] = None) -> Optional[TickerData]:
+        """异步获取行情"""
+        symbol = symbol or self.symbol
+        ticker = await self._call_async(
+            "获取行情",
+            lambda client: client.fetch_ticker(symbol),
+            lambda: self.exchange.fetch_ticker(symbol),
+            timeout
+        )
+        return self._parse_ticker(symbol, ticker)
+
+    def get_klines_buffered(self, symbol: str = None, timeframe: str = None,
+                            limit: int = None) -> Optional[pd.DataFrame]:
+        """
+        通过增量K线缓冲区获取K线（默认参数与 get_klines 一致）
+
+        首次调用全量拉取，之后只拉取最新几根K线；返回最新 limit 根K线的副本。
+        """
+        from market_data import get_kline_buffer
+
+        symbol = symbol or self.symbol
+        timeframe = timeframe or "5m"
+        limit = limit or 100
+        params = self._market_params()
+        buffer = get_kline_buffer(self.get_exchange_name(), symbol, timeframe, limit)
+        return buffer.refresh(
+            lambda n: self.exchange.fetch_ohlcv(symbol, timeframe, limit=n, params=params),
+            limit=limit
+        )
+
+    async def get_klines_async(self, symbol: str = None, timeframe: str = None,
+                               limit: int = None,
+                               timeout: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """
+        异步获取K线数据（默认参数与 get_klines 一致）
+
+        启用 KLINE_BUFFER_ENABLED 时走增量K线缓冲区
+        """
+        from config.settings import settings as global_config
+
+        symbol = symbol or self.symbol
+        timeframe = timeframe or "5m"
+        limit = limit or 100
+        params = self._market_params()
+
+        def fetch(n: int):
+            return self._call_async(
+                "获取K线",
+                lambda client: client.fetch_ohlcv(symbol, timeframe, limit=n, params=params),
+                lambda: self.exchange.fetch_ohlcv(symbol, timeframe, limit=n, params=params),
+                timeout
+            )
+
+        if getattr(global_config, 'KLINE_BUFFER_ENABLED', False):
+            from market_data import get_kline_buffer
+
+            buffer = get_kline_buffer(self.get_exchange_name(), symbol, timeframe, limit)
+            return await buffer.refresh_async(fetch, limit=limit)
+        return self._parse_klines(await fetch(limit))
+
+    async def get_positions_async(self, symbol: str = None,
+                                  timeout: Optional[float] = None) -> List[PositionData]:
+        """异步获取持仓列表"""
+        symbol = symbol or self.symbol
+        params = self._market_params()
+        positions = await self._call_async(
+            "获取持仓",
+            lambda client: client.fetch_positions([symbol], params=params),
+            lambda: self.exchange.fetch_positions([symbol], params=params),
+            timeout
+        )
+        return self._parse_positions(positions)
+
+    async def close_async(self):
+        """归还异步客户端（最后一个使用者归还时客户端池关闭其会话）"""
+        client, self._async_client = self._async_client, None
+        if client is not None:
+            from .async_pool import get_async_client_pool
+
+            await get_async_client_pool().release(client)
@@ -4,8 +4,13 @@
 """
 from typing import Optional, List, Dict
 import pandas as pd
+
+from config.settings import settings as config
+from utils.logger_utils import get_logger
 from .interface import ExchangeInterface, TickerData, PositionData, OrderResult
 
+logger = get_logger("legacy_adapter")
+
 
 class LegacyAdapter:
     """
@@ -49,7 +54,12 @@ class LegacyAdapter:
 
     def get_klines(self, symbol: str = None, timeframe: str = None,
                    limit: int = None) -> Optional[pd.DataFrame]:
-        """获取K线数据"""
+        """获取K线数据（启用 KLINE_BUFFER_ENABLED 时走增量缓冲区，失败退回全量获取）"""
+        if getattr(config, 'KLINE_BUFFER_ENABLED', False):
+            try:
+                return self._exchange.get_klines_buffered(symbol, timeframe, limit)
+            except Exception as e:
+                logger.warning(f"增量K线获取失败，改为全量获取: {e}")
         return self._exchange.get_klines(symbol, timeframe, limit)
 
     def get_orderbook(self, symbol: str = None, limit: int = 20) -> Optional[Dict]:
@@ -69,8 +79,11 @@ class LegacyAdapter:
         转换：List[PositionData] → List[Dict]
         """
         positions = self._exchange.get_positions(symbol)
+        return self._positions_to_dicts(positions)
 
-        # 转换 dataclass 为 dict
+    @staticmethod
+    def _positions_to_dicts(positions: List[PositionData]) -> List[Dict]:
+        """转换 dataclass 为 dict"""
         return [
             {
                 'side': pos.side,
@@ -84,6 +97,29 @@ class LegacyAdapter:
             for pos in positions
         ]
 
+    # ========== 异步读取接口 ==========
+
+    async def get_ticker_async(self, symbol: str = None,
+                               timeout: Optional[float] = None) -> Optional[TickerData]:
+        """异步获取行情"""
+        return await self._exchange.get_ticker_async(symbol, timeout=timeout)
+
+    async def get_klines_async(self, symbol: str = None, timeframe: str = None,
+                               limit: int = None,
+                               timeout: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """异步获取K线数据"""
+        return await self._exchange.get_klines_async(symbol, timeframe, limit, timeout=timeout)
+
+    async def get_positions_async(self, symbol: str = None,
+                                  timeout: Optional[float] = None) -> List[Dict]:
+        """异步获取持仓列表（字典格式）"""
+        positions = await self._exchange.get_positions_async(symbol, timeout=timeout)
+        return self._positions_to_dicts(positions)
+
+    async def close_async(self):
+        """关闭异步客户端"""
+        await self._exchange.close_async()
+
     # ========== 交易接口 ==========
 
     def open_long(self, amount: float, df: pd.DataFrame = None, **kwargs) -> bool:
@@ -1,10 +1,12 @@
 """
 交易所管理器 - 管理多个交易所实例
 """
+import asyncio
 from typing import Dict, Optional
 from utils.logger_utils import get_logger
 from .factory import ExchangeFactory
 from .interface import ExchangeInterface
+from .async_interface import AsyncExchangeInterface
 from .errors import ExchangeError
 
 logger = get_logger("exchange_manager")
@@ -108,6 +110,42 @@ class ExchangeManager:
 
         return self._exchanges[name]
 
+    async def get_async_exchange(self, exchange_name: str = None) -> AsyncExchangeInterface:
+        """获取指定交易所的异步接口（默认当前交易所）
+
+        与同步实例使用同一份配置；请求在共享异步客户端上并发执行，不占用线程。
+        管理器未初始化时直接读取 config.settings 中的交易所配置。
+
+        Args:
+            exchange_name: 交易所名称
+
+        Returns:
+            异步交易所实例
+
+        Raises:
+            ExchangeError: 未指定交易所或配置中未找到交易所
+        """
+        if not self._config:
+            # 只使用异步接口的进程（如 API 服务）：读取配置，不创建同步实例
+            from config.settings import settings as config
+            self._config = getattr(config, 'EXCHANGES_CONFIG', {})
+            self._current_exchange_name = getattr(config, 'ACTIVE_EXCHANGE', '').lower() or None
+
+        name = (exchange_name or self._current_exchange_name or '').lower()
+
+        if not name:
+            raise ExchangeError("交易所管理器未初始化")
+        if name not in self._config:
+            raise ExchangeError(f"配置中未找到交易所: {exchange_name or name}")
+
+        return await ExchangeFactory.get_or_create_async(name, self._config[name])
+
+    async def get_all_async_exchanges(self) -> Dict[str, AsyncExchangeInterface]:
+        """获取所有已创建同步实例的交易所对应的异步接口"""
+        names = list(self._exchanges)
+        exchanges = await asyncio.gather(*(self.get_async_exchange(name) for name in names))
+        return dict(zip(names, exchanges))
+
     def switch_exchange(self, exchange_name: str) -> bool:
         """切换当前交易所
 
@@ -0,0 +1,293 @@
+"""
+行情读取缓存（短 TTL + single-flight 请求合并）
+
+同一秒内主循环、ExecutionFilter、LiquidityValidator、决策状态接口和状态监控可能各自请求
+同一个 ticker / 订单簿。本模块在 ccxt 客户端层接管这些市场数据读取，调用方无需改动：
+
+- 按 (交易所, 方法, 参数) 缓存结果，每个方法单独设置 TTL（MARKET_CACHE_TTL）
+- single-flight：相同请求同时只有一个在途调用，其他调用方等待并共享结果（同步线程与协程均支持）
+- 进程级共享：同一交易所的多个客户端实例（bot、API 服务、回测）共用缓存
+- 返回结果的浅拷贝，调用方修改返回值不会污染缓存
+- CRITICAL 优先级的请求（止损平仓）绕过缓存，始终读取最新数据
+- get_stats() 报告命中率和节省的请求数
+"""
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from config.settings import settings as config
+from utils.logger_utils import get_logger
+
+logger = get_logger("market_cache")
+
+# 默认缓存的 ccxt 方法及 TTL（秒）
+DEFAULT_TTLS = {
+    "fetch_ticker": 1.0,
+    "fetch_order_book": 0.5,
+    "fetch_ohlcv": 2.0,
+    "fetch_funding_rate": 30.0,
+}
+
+
+def _freeze(value) -> Hashable:
+    """把参数转换为可哈希的缓存键"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _copy(value):
+    """返回给调用方的副本：字典 / 列表逐层复制，OHLCV 行和订单簿档位不与缓存共享"""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def _retrieve_exception(task: "asyncio.Task"):
+    """所有等待者都已离开时，避免共享请求的异常触发 "exception was never retrieved" 警告"""
+    if not task.cancelled():
+        task.exception()
+
+
+class _Flight:
+    """同步在途请求"""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class MarketReadCache:
+    """进程级行情读取缓存"""
+
+    def __init__(self, ttls: Dict[str, float] = None, max_entries: int = 1024):
+        """
+        Args:
+            ttls: 方法名 → TTL（秒）；未列出的方法不缓存
+            max_entries: 最多缓存的条目数
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, _Flight] = {}
+        self._async_inflight: Dict[Tuple, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0, "bypassed": 0}
+
+    # ==================== 缓存条目 ====================
+
+    def _lookup(self, key: Tuple) -> Tuple[bool, Any]:
+        """查找未过期的条目（须持有锁）"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        return True, value
+
+    def _store(self, key: Tuple, ttl: float, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _bypass() -> bool:
+        from .rate_limiter import Priority, current_priority
+        priority = current_priority()
+        return priority is not None and priority <= Priority.CRITICAL
+
+    # ==================== 读取 ====================
+
+    def get_or_fetch(self, key: Tuple, ttl: float, fetch: Callable[[], Any]):
+        """
+        同步读取：命中缓存直接返回；相同请求在途时等待其结果；否则执行 fetch 并缓存
+
+        Args:
+            key: 缓存键
+            ttl: 有效期（秒）
+            fetch: 实际请求
+        """
+        if self._bypass():
+            with self._lock:
+                self.stats["bypassed"] += 1
+            value = fetch()
+            self._store(key, ttl, value)
+            return _copy(value)
+
+        with self._lock:
+            hit, value = self._lookup(key)
+            if hit:
+                self.stats["hits"] += 1
+                return _copy(value)
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _copy(flight.value)
+
+        try:
+            flight.value = fetch()
+            self._store(key, ttl, flight.value)
+            return _copy(flight.value)
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    async def get_or_fetch_async(self, key: Tuple, ttl: float, fetch: Callable[[], Any]):
+        """
+        协程读取（语义同 get_or_fetch）
+
+        在途请求在发起它的事件循环中共享（异步客户端的请求都在客户端池的事件循环中执行）。
+        """
+        if self._bypass():
+            with self._lock:
+                self.stats["bypassed"] += 1
+            value = await fetch()
+            self._store(key, ttl, value)
+            return _copy(value)
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop),) + key
+        with self._lock:
+            hit, value = self._lookup(key)
+            if hit:
+                self.stats["hits"] += 1
+                return _copy(value)
+            task = self._async_inflight.get(flight_key)
+            if task is None:
+                # 请求在独立任务中执行：任一调用方被取消（自身超时）不会取消共享的请求
+                task = loop.create_task(self._fetch_shared(flight_key, key, ttl, fetch))
+                task.add_done_callback(_retrieve_exception)
+                self._async_inflight[flight_key] = task
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        return _copy(await asyncio.shield(task))
+
+    async def _fetch_shared(self, flight_key: Tuple, key: Tuple, ttl: float, fetch: Callable[[], Any]):
+        """执行一次共享的协程请求并写入缓存"""
+        try:
+            value = await fetch()
+            self._store(key, ttl, value)
+            return value
+        except BaseException:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._async_inflight.pop(flight_key, None)
+
+    # ==================== 接入 ccxt 客户端 ====================
+
+    def install(self, client):
+        """
+        接管 ccxt 客户端的市场数据读取方法（同步或 async_support 客户端）
+
+        缓存键包含交易所 id，因此同一交易所的多个客户端实例共享缓存。
+        """
+        if getattr(client, "_market_read_cache", None) is self:
+            return client
+
+        exchange_id = client.id
+        for method_name, ttl in self.ttls.items():
+            original = getattr(client, method_name, None)
+            if original is None or ttl <= 0:
+                continue
+            setattr(client, method_name, self._wrap(exchange_id, method_name, ttl, original))
+
+        client._market_read_cache = self
+        return client
+
+    def _wrap(self, exchange_id: str, method_name: str, ttl: float, original):
+        def make_key(args, kwargs):
+            return (exchange_id, method_name, _freeze(args), _freeze(kwargs))
+
+        if inspect.iscoroutinefunction(original):
+            @functools.wraps(original)
+            async def cached_async(*args, **kwargs):
+                return await self.get_or_fetch_async(
+                    make_key(args, kwargs), ttl, lambda: original(*args, **kwargs)
+                )
+            return cached_async
+
+        @functools.wraps(original)
+        def cached(*args, **kwargs):
+            return self.get_or_fetch(make_key(args, kwargs), ttl, lambda: original(*args, **kwargs))
+        return cached
+
+    # ==================== 统计 ====================
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """命中率与节省的请求数（命中 + 合并的调用都没有发出真实请求）"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        served = stats["hits"] + stats["coalesced"]
+        total = served + stats["misses"] + stats["bypassed"]
+        stats["saved_requests"] = served
+        stats["hit_ratio"] = round(served / total, 4) if total else 0.0
+        return stats
+
+
+# 全局单例
+_cache: Optional[MarketReadCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_market_cache() -> MarketReadCache:
+    """获取进程级行情读取缓存"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ttls = dict(DEFAULT_TTLS)
+                ttls.update(getattr(config, "MARKET_CACHE_TTL", {}) or {})
+                _cache = MarketReadCache(ttls, getattr(config, "MARKET_CACHE_MAX_ENTRIES", 1024))
+    return _cache
+
+
+def install_market_cache(client):
+    """MARKET_CACHE_ENABLED 时让 ccxt 客户端的市场数据读取经过进程级缓存，返回原客户端"""
+    if client is None or not getattr(config, "MARKET_CACHE_ENABLED", True):
+        return client
+    try:
+        return get_market_cache().install(client)
+    except Exception as e:
+        logger.warning(f"接入行情读取缓存失败: {e}")
+        return client
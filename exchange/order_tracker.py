@@ -0,0 +1,330 @@
+"""
+订单跟踪器
+
+统一持有所有待完成订单，由一个后台线程批量轮询状态，替代各调用方各自 sleep 轮询 fetch_order：
+- 每轮按交易对调用一次 fetch_open_orders（无论跟踪多少订单），只对离开挂单列表的订单调用一次
+  fetch_order 取最终状态
+- 每个订单对应一个 concurrent.futures.Future，成交 / 撤销 / 超时时解析，并执行注册的回调；
+  同步调用方 future.result()，异步调用方 await tracker.wait(...)
+- 挂单快照供订单健康检查复用（fetch_open_orders），不再单独请求
+- 轮询请求使用 TRADE 优先级，不被行情和分析请求挤占
+
+每个 ccxt 客户端一个跟踪器（get_order_tracker），没有待跟踪订单时后台线程退出。
+
+用法:
+    tracker = get_order_tracker(exchange, params={"productType": "USDT-FUTURES"})
+    future = tracker.track(order["id"], "ETHUSDT", timeout=10, cancel_on_timeout=True)
+    order = future.result()                       # 或 await tracker.wait(order["id"], "ETHUSDT")
+    if order["status"] == FILLED: ...
+"""
+import asyncio
+import concurrent.futures
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import settings as config
+from utils.logger_utils import get_logger
+from .rate_limiter import Priority, request_priority
+
+logger = get_logger("order_tracker")
+
+# 订单最终状态（ccxt 的 closed / canceled 之外，超时由跟踪器给出）
+FILLED = "closed"
+CANCELED = "canceled"
+TIMEOUT = "timeout"
+
+# ccxt 订单状态中视为已结束的状态
+_FINAL_STATUSES = {"closed", "filled", "canceled", "cancelled", "expired", "rejected"}
+
+
+def is_filled(order: Optional[Dict]) -> bool:
+    """订单是否已完全成交"""
+    return bool(order) and order.get("status") in ("closed", "filled")
+
+
+@dataclass
+class TrackedOrder:
+    """一个被跟踪的订单"""
+    order_id: str
+    symbol: str
+    deadline: float
+    cancel_on_timeout: bool
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+    callbacks: List[Callable[[Dict], Any]] = field(default_factory=list)
+    last: Optional[Dict] = None        # 最近一次查询到的订单
+    created: float = field(default_factory=time.monotonic)
+
+
+class OrderTracker:
+    """
+    单个 ccxt 客户端的订单跟踪器
+
+    Args:
+        client: ccxt 客户端（需支持 fetch_open_orders / fetch_order / cancel_order）
+        params: 订单查询的额外参数（如 Bitget 的 productType）
+        poll_interval: 轮询间隔（秒），默认 ORDER_TRACKER_POLL_INTERVAL
+    """
+
+    def __init__(self, client, params: Dict = None, poll_interval: float = None):
+        self.client = client
+        self.params = dict(params or {})
+        self.poll_interval = float(
+            poll_interval if poll_interval is not None
+            else getattr(config, 'ORDER_TRACKER_POLL_INTERVAL', 0.5)
+        )
+        self.default_timeout = getattr(config, 'MAKER_ORDER_TIMEOUT', 10)
+
+        self._orders: Dict[str, TrackedOrder] = {}
+        self._snapshots: Dict[str, tuple] = {}   # symbol → (monotonic 时间, 挂单列表)
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.stats = {"polls": 0, "requests": 0, "filled": 0, "canceled": 0,
+                      "timeouts": 0, "errors": 0}
+
+    # ==================== 跟踪 ====================
+
+    def track(self, order_id: str, symbol: str, timeout: float = None,
+              callback: Callable[[Dict], Any] = None,
+              cancel_on_timeout: bool = False) -> concurrent.futures.Future:
+        """
+        开始跟踪订单（立即返回，不阻塞）
+
+        Args:
+            order_id: 订单ID
+            symbol: 交易对
+            timeout: 超时时间（秒），默认 MAKER_ORDER_TIMEOUT；None/0 以外的值到期后以 TIMEOUT 解析
+            callback: 订单结束时回调，参数为最终订单（在跟踪线程中执行）
+            cancel_on_timeout: 超时时是否撤单
+
+        Returns:
+            Future，结果为最终订单字典（status 为 closed / canceled / timeout 等）
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        with self._lock:
+            tracked = self._orders.get(order_id)
+            if tracked is None:
+                tracked = TrackedOrder(
+                    order_id=order_id, symbol=symbol,
+                    deadline=time.monotonic() + timeout if timeout else float("inf"),
+                    cancel_on_timeout=cancel_on_timeout,
+                )
+                self._orders[order_id] = tracked
+            if callback is not None:
+                tracked.callbacks.append(callback)
+            self._ensure_thread()
+        self._wakeup.set()
+        return tracked.future
+
+    async def wait(self, order_id: str, symbol: str, timeout: float = None,
+                   cancel_on_timeout: bool = False) -> Dict:
+        """异步等待订单结束（不占用事件循环）"""
+        future = self.track(order_id, symbol, timeout, cancel_on_timeout=cancel_on_timeout)
+        return await asyncio.wrap_future(future)
+
+    def untrack(self, order_id: str) -> bool:
+        """停止跟踪订单（Future 被取消）"""
+        with self._lock:
+            tracked = self._orders.pop(order_id, None)
+        if tracked is None:
+            return False
+        tracked.future.cancel()
+        return True
+
+    def cancel(self, order_id: str, symbol: str) -> Dict:
+        """撤单；该订单正被跟踪时立即以撤单结果解析其 Future"""
+        with request_priority(Priority.TRADE):
+            order = self.client.cancel_order(order_id, symbol, params=self.params) or {}
+        self.stats["requests"] += 1
+        with self._lock:
+            tracked = self._orders.get(order_id)
+        if tracked is not None:
+            final = dict(tracked.last or {}, **order)
+            final.setdefault("id", order_id)
+            if final.get("status") not in _FINAL_STATUSES:
+                final["status"] = CANCELED
+            self._resolve(tracked, final)
+        return order
+
+    @property
+    def pending(self) -> int:
+        """待完成订单数"""
+        return len(self._orders)
+
+    # ==================== 挂单快照 ====================
+
+    def fetch_open_orders(self, symbol: str, max_age: float = None) -> List[Dict]:
+        """
+        获取挂单列表（优先复用跟踪轮询的快照）
+
+        Args:
+            symbol: 交易对
+            max_age: 快照有效期（秒），默认为轮询间隔
+        """
+        max_age = self.poll_interval if max_age is None else max_age
+        snapshot = self._snapshots.get(symbol)
+        if snapshot and time.monotonic() - snapshot[0] <= max_age:
+            return list(snapshot[1])
+        return list(self._refresh_open_orders(symbol))
+
+    def _refresh_open_orders(self, symbol: str) -> List[Dict]:
+        with request_priority(Priority.TRADE):
+            orders = self.client.fetch_open_orders(symbol, params=self.params) or []
+        self.stats["requests"] += 1
+        self._snapshots[symbol] = (time.monotonic(), orders)
+        return orders
+
+    # ==================== 轮询 ====================
+
+    def poll_once(self) -> int:
+        """
+        执行一轮批量查询，返回本轮结束的订单数
+
+        每个交易对一次 fetch_open_orders；不在挂单列表中的订单再查询一次最终状态。
+        """
+        with self._lock:
+            by_symbol: Dict[str, List[TrackedOrder]] = {}
+            for tracked in self._orders.values():
+                by_symbol.setdefault(tracked.symbol, []).append(tracked)
+        if not by_symbol:
+            return 0
+
+        self.stats["polls"] += 1
+        resolved = 0
+        for symbol, orders in by_symbol.items():
+            try:
+                open_orders = {o.get("id"): o for o in self._refresh_open_orders(symbol)}
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"查询挂单失败 [{symbol}]: {e}")
+                open_orders = None
+
+            for tracked in orders:
+                order = open_orders.get(tracked.order_id) if open_orders is not None else None
+                if order is None and open_orders is not None:
+                    order = self._fetch_final(tracked)
+                if order is not None:
+                    tracked.last = order
+                    if order.get("status") in _FINAL_STATUSES:
+                        self._resolve(tracked, order)
+                        resolved += 1
+                        continue
+                if time.monotonic() >= tracked.deadline:
+                    self._timeout(tracked)
+                    resolved += 1
+        return resolved
+
+    def _fetch_final(self, tracked: TrackedOrder) -> Optional[Dict]:
+        """订单已不在挂单列表中：查询一次最终状态（刚提交、尚未出现在列表中的订单保持跟踪）"""
+        try:
+            with request_priority(Priority.TRADE):
+                order = self.client.fetch_order(tracked.order_id, tracked.symbol, params=self.params)
+            self.stats["requests"] += 1
+            return order
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"查询订单失败 {tracked.order_id}: {e}")
+            return None
+
+    def _timeout(self, tracked: TrackedOrder):
+        if tracked.cancel_on_timeout:
+            try:
+                with request_priority(Priority.TRADE):
+                    canceled = self.client.cancel_order(tracked.order_id, tracked.symbol, params=self.params)
+                self.stats["requests"] += 1
+                # 撤单前的瞬间已成交：按成交解析
+                if is_filled(canceled):
+                    self._resolve(tracked, canceled)
+                    return
+                logger.info(f"订单超时已撤销: {tracked.order_id}")
+            except Exception as e:
+                logger.warning(f"订单超时撤销失败 {tracked.order_id}: {e}")
+        order = dict(tracked.last or {"id": tracked.order_id, "symbol": tracked.symbol})
+        order["status"] = TIMEOUT
+        self._resolve(tracked, order)
+
+    def _resolve(self, tracked: TrackedOrder, order: Dict):
+        with self._lock:
+            if self._orders.get(tracked.order_id) is not tracked:
+                return
+            del self._orders[tracked.order_id]
+        status = order.get("status")
+        key = "filled" if status in ("closed", "filled") else "timeouts" if status == TIMEOUT else "canceled"
+        self.stats[key] += 1
+        elapsed = time.monotonic() - tracked.created
+        logger.debug(f"订单结束: {tracked.order_id} {status} ({elapsed:.2f}s)")
+
+        if not tracked.future.done():
+            tracked.future.set_result(order)
+        for callback in tracked.callbacks:
+            try:
+                callback(order)
+            except Exception as e:
+                logger.error(f"订单回调失败 {tracked.order_id}: {e}")
+
+    def _ensure_thread(self):
+        """有待跟踪订单时启动轮询线程（调用方持有锁）"""
+        if self._stopped or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._run, name="order-tracker", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.clear()
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"订单跟踪轮询异常: {e}")
+            with self._lock:
+                if not self._orders:
+                    self._thread = None
+                    return
+                wait = min(self.poll_interval, max(min(t.deadline for t in self._orders.values())
+                                                   - time.monotonic(), 0.0))
+            # 新订单加入时立即唤醒，成交不必等满一个间隔
+            self._wakeup.wait(wait)
+
+    def stop(self):
+        """停止跟踪线程，未结束订单的 Future 被取消"""
+        self._stopped = True
+        self._wakeup.set()
+        with self._lock:
+            orders = list(self._orders.values())
+            self._orders.clear()
+        for tracked in orders:
+            tracked.future.cancel()
+
+    def get_stats(self) -> Dict:
+        """获取统计信息"""
+        return {**self.stats, "pending": self.pending}
+
+
+# ==================== 全局实例 ====================
+
+_trackers: Dict[int, OrderTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_order_tracker(client, params: Dict = None) -> OrderTracker:
+    """获取 ccxt 客户端对应的订单跟踪器（每个客户端一个）"""
+    key = id(client)
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None or tracker.client is not client:
+            tracker = OrderTracker(client, params)
+            _trackers[key] = tracker
+        return tracker
+
+
+def reset_order_trackers():
+    """停止并清空所有订单跟踪器（测试用）"""
+    with _trackers_lock:
+        trackers = list(_trackers.values())
+        _trackers.clear()
+    for tracker in trackers:
+        tracker.stop()
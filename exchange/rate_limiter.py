@@ -0,0 +1,471 @@
+"""
+交易所请求限流器（进程级加权令牌桶）
+
+bot 主循环、API 服务的 BitgetTrader、Ticker 服务、价差监控线程和回测数据源各自持有 ccxt 实例，
+ccxt 的 enableRateLimit 只约束单个实例，多个实例叠加后会超过交易所限额，触发 RateLimitError
+和错误退避暂停。本模块把限流提升到进程级（可选跨进程）：
+
+- 每个 (交易所, 端点类别) 一个令牌桶，类别为 market / account / trade
+- 请求权重取 ccxt 端点成本（calculate_rate_limiter_cost），与 ccxt 自身的限流单位一致
+- 优先级通道：CRITICAL（止损/紧急平仓）> TRADE（下单/撤单）> NORMAL（主循环读取）
+  > ANALYTICS（分析/回测/展示）。排队时高优先级请求排在前面，ANALYTICS 不能使用预留容量
+- install(client) 包装 ccxt 客户端的 fetch2（同步/异步客户端均可），并关闭 ccxt 自带的单实例限流
+- 调用方用 request_priority() 声明优先级（contextvars，随 asyncio 任务和 to_thread 传递）
+- 配置 RATE_LIMIT_SHARED_DIR 时令牌状态保存在文件中（fcntl 文件锁），多个进程共用同一额度
+"""
+import asyncio
+import heapq
+import inspect
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import settings as config
+from utils.logger_utils import get_logger
+
+from .errors import RateLimitError
+
+logger = get_logger("rate_limiter")
+
+
+class Priority(IntEnum):
+    """请求优先级（数值越小越优先）"""
+    CRITICAL = 0    # 止损、紧急平仓
+    TRADE = 1       # 下单、撤单
+    NORMAL = 2      # 主循环行情/账户读取
+    ANALYTICS = 3   # 分析、回测、API 展示
+
+
+_priority: ContextVar[Optional[Priority]] = ContextVar("exchange_request_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """在上下文内发出的交易所请求使用指定优先级"""
+    token = _priority.set(Priority(priority))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Optional[Priority]:
+    """当前上下文声明的优先级（未声明时为 None）"""
+    return _priority.get()
+
+
+async def with_priority(coro, priority: Optional[Priority]):
+    """在指定优先级下执行协程（把协程提交到其他事件循环时保留调用方的优先级）"""
+    if priority is None:
+        return await coro
+    with request_priority(priority):
+        return await coro
+
+
+def classify_endpoint(api: Any, method: str, path: str) -> str:
+    """
+    按 ccxt 请求信息划分端点类别
+
+    Returns:
+        'market'（公共接口）、'trade'（下单/撤单/平仓）或 'account'（其他私有接口）
+    """
+    parts = api if isinstance(api, (list, tuple)) else [api]
+    if not any("private" in str(part).lower() for part in parts):
+        return "market"
+    path = path.lower()
+    if method.upper() != "GET" and ("order" in path or "close" in path or path.startswith("trade/")):
+        return "trade"
+    return "account"
+
+
+def resolve_priority(endpoint_class: str) -> Priority:
+    """上下文声明的优先级；未声明时下单类为 TRADE，其他为 NORMAL。下单类请求不低于 TRADE"""
+    declared = current_priority()
+    if endpoint_class == "trade":
+        return Priority.TRADE if declared is None else min(declared, Priority.TRADE)
+    return Priority.NORMAL if declared is None else declared
+
+
+# ==================== 令牌状态 ====================
+
+class _LocalTokenState:
+    """进程内令牌状态"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = self._clock()
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    def take(self, weight: float, floor: float = 0.0) -> float:
+        """
+        尝试扣除令牌（扣除后剩余不低于 floor）
+
+        Returns:
+            0 表示成功；否则为还需等待的秒数
+        """
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + max(now - self.updated, 0.0) * self.rate)
+        self.updated = now
+        if self.tokens - weight >= floor - 1e-9:
+            self.tokens -= weight
+            return 0.0
+        return (weight + floor - self.tokens) / self.rate
+
+    def refund(self, weight: float):
+        self.tokens = min(self.capacity, self.tokens + weight)
+
+
+class _FileTokenState(_LocalTokenState):
+    """文件令牌状态：多个进程通过文件锁共享同一个桶（仅支持 POSIX）"""
+
+    def __init__(self, path: str, rate: float, capacity: float):
+        import fcntl  # noqa: F401  在不支持的平台上尽早失败
+
+        super().__init__(rate, capacity)
+        self.path = path
+
+    @staticmethod
+    def _clock() -> float:
+        # 跨进程必须使用墙上时间
+        return time.time()
+
+    def _locked(self, update):
+        import fcntl
+
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    tokens, updated = (float(v) for v in f.read().split())
+                    self.tokens, self.updated = min(tokens, self.capacity), updated
+                except ValueError:
+                    self.tokens, self.updated = self.capacity, self._clock()
+                result = update()
+                f.seek(0)
+                f.truncate()
+                f.write(f"{self.tokens} {self.updated}")
+                f.flush()
+                return result
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def take(self, weight: float, floor: float = 0.0) -> float:
+        return self._locked(lambda: super(_FileTokenState, self).take(weight, floor))
+
+    def refund(self, weight: float):
+        self._locked(lambda: super(_FileTokenState, self).refund(weight))
+
+
+# ==================== 令牌桶 ====================
+
+class _Waiter:
+    """排队中的请求（同步请求用 Event 唤醒，协程用所在事件循环的 Future 唤醒）"""
+
+    __slots__ = ("priority", "seq", "weight", "floor", "granted", "cancelled", "event", "loop", "future")
+
+    def __init__(self, priority: Priority, seq: int, weight: float, floor: float,
+                 event: threading.Event = None, loop=None, future=None):
+        self.priority = priority
+        self.seq = seq
+        self.weight = weight
+        self.floor = floor
+        self.granted = False
+        self.cancelled = False
+        self.event = event
+        self.loop = loop
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def wake(self):
+        if self.event is not None:
+            self.event.set()
+        elif self.future is not None:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class TokenBucket:
+    """带优先级队列的加权令牌桶（线程安全，同步与异步调用方可混用）"""
+
+    def __init__(self, name: str, rate: float, capacity: float,
+                 analytics_reserve: float = 0.0, state: _LocalTokenState = None):
+        """
+        Args:
+            name: 桶名称（交易所.端点类别）
+            rate: 每秒补充的权重
+            capacity: 桶容量（允许的突发权重）
+            analytics_reserve: ANALYTICS 请求不能使用的容量比例
+            state: 令牌状态（默认进程内）
+        """
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.analytics_reserve = min(max(analytics_reserve, 0.0), 0.9)
+        self._state = state or _LocalTokenState(rate, capacity)
+        self._lock = threading.Lock()
+        self._waiters = []
+        self._seq = itertools.count()
+        self.stats = {"requests": 0, "weight": 0.0, "queued": 0, "timeouts": 0,
+                      "wait_total": 0.0, "wait_max": 0.0}
+        self.requests_by_priority = {p.name: 0 for p in Priority}
+
+    def _prepare(self, weight: float, priority: Priority) -> Tuple[float, float]:
+        floor = self.capacity * self.analytics_reserve if priority >= Priority.ANALYTICS else 0.0
+        # 超过可用容量的请求永远等不到令牌，按可用容量计
+        return min(max(weight, 0.0), self.capacity - floor), floor
+
+    def _enqueue(self, weight: float, priority: Priority, **wake_args) -> Optional[_Waiter]:
+        """登记请求；队列为空且令牌充足时直接放行（返回 None）"""
+        weight, floor = self._prepare(weight, priority)
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["weight"] += weight
+            self.requests_by_priority[priority.name] += 1
+            if not self._waiters and self._state.take(weight, floor) == 0:
+                return None
+            waiter = _Waiter(priority, next(self._seq), weight, floor, **wake_args)
+            heapq.heappush(self._waiters, waiter)
+            self.stats["queued"] += 1
+            return waiter
+
+    def _pump(self) -> Optional[float]:
+        """
+        按优先级依次放行队首请求（须持有锁）
+
+        Returns:
+            队首请求还需等待的秒数；队列已清空时返回 None
+        """
+        while self._waiters:
+            head = self._waiters[0]
+            if head.cancelled:
+                heapq.heappop(self._waiters)
+                continue
+            wait = self._state.take(head.weight, head.floor)
+            if wait > 0:
+                return wait
+            heapq.heappop(self._waiters)
+            head.granted = True
+            head.wake()
+        return None
+
+    def _poll(self, waiter: _Waiter, deadline: Optional[float]) -> Optional[float]:
+        """推进队列；已放行返回 None，否则返回本次应等待的秒数（超时抛出 RateLimitError）"""
+        with self._lock:
+            delay = self._pump()
+            if waiter.granted:
+                return None
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                waiter.cancelled = True
+                self.stats["timeouts"] += 1
+                raise RateLimitError(f"本地限流排队超时: {self.name} ({waiter.priority.name})")
+        wait = 0.05 if delay is None else delay
+        return wait if deadline is None else min(wait, deadline - now)
+
+    def _abandon(self, waiter: _Waiter):
+        """调用方放弃等待（取消/中断）：未放行的出队，已放行的退还令牌"""
+        with self._lock:
+            if waiter.granted:
+                self._state.refund(waiter.weight)
+            waiter.cancelled = True
+
+    def _record_wait(self, waited: float) -> float:
+        with self._lock:
+            self.stats["wait_total"] += waited
+            self.stats["wait_max"] = max(self.stats["wait_max"], waited)
+        return waited
+
+    def acquire(self, weight: float = 1.0, priority: Priority = Priority.NORMAL,
+                timeout: Optional[float] = None) -> float:
+        """
+        阻塞获取令牌
+
+        Returns:
+            排队等待的秒数
+        """
+        waiter = self._enqueue(weight, priority, event=threading.Event())
+        if waiter is None:
+            return 0.0
+        start = time.monotonic()
+        deadline = start + timeout if timeout else None
+        try:
+            while True:
+                wait = self._poll(waiter, deadline)
+                if wait is None:
+                    break
+                waiter.event.wait(wait)
+                waiter.event.clear()
+        except RateLimitError:
+            raise
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return self._record_wait(time.monotonic() - start)
+
+    async def acquire_async(self, weight: float = 1.0, priority: Priority = Priority.NORMAL,
+                            timeout: Optional[float] = None) -> float:
+        """在当前事件循环中等待令牌（不阻塞事件循环）"""
+        loop = asyncio.get_running_loop()
+        waiter = self._enqueue(weight, priority, loop=loop, future=loop.create_future())
+        if waiter is None:
+            return 0.0
+        start = time.monotonic()
+        deadline = start + timeout if timeout else None
+        try:
+            while True:
+                wait = self._poll(waiter, deadline)
+                if wait is None:
+                    break
+                await asyncio.wait({waiter.future}, timeout=wait)
+        except RateLimitError:
+            raise
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return self._record_wait(time.monotonic() - start)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["waiting"] = sum(1 for w in self._waiters if not w.cancelled)
+        stats["rate"] = self.rate
+        stats["capacity"] = self.capacity
+        stats["by_priority"] = {k: v for k, v in self.requests_by_priority.items() if v}
+        return stats
+
+
+# ==================== 限流器 ====================
+
+class ExchangeRateLimiter:
+    """进程级交易所限流器：按 (交易所, 端点类别) 管理令牌桶，并接管 ccxt 客户端的限流"""
+
+    DEFAULT_RATE = 10.0
+
+    def __init__(self, limits: Dict = None, analytics_reserve: float = None,
+                 max_wait: float = None, shared_dir: str = None):
+        self.limits = getattr(config, "RATE_LIMITS", {}) if limits is None else limits
+        self.analytics_reserve = (
+            getattr(config, "RATE_LIMIT_ANALYTICS_RESERVE", 0.3)
+            if analytics_reserve is None else analytics_reserve
+        )
+        self.max_wait = getattr(config, "RATE_LIMIT_MAX_WAIT", 30) if max_wait is None else max_wait
+        self.shared_dir = getattr(config, "RATE_LIMIT_SHARED_DIR", "") if shared_dir is None else shared_dir
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, exchange_id: str, endpoint_class: str,
+               default_rate: Optional[float] = None) -> TokenBucket:
+        """获取（首次使用时创建）令牌桶"""
+        key = (exchange_id, endpoint_class)
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            return bucket
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                spec = self.limits.get(exchange_id, {}).get(endpoint_class, {})
+                rate = float(spec.get("rate") or default_rate or self.DEFAULT_RATE)
+                capacity = float(spec.get("burst") or rate)
+                state = None
+                if self.shared_dir:
+                    os.makedirs(self.shared_dir, exist_ok=True)
+                    path = os.path.join(self.shared_dir, f"{exchange_id}-{endpoint_class}.bucket")
+                    state = _FileTokenState(path, rate, capacity)
+                bucket = TokenBucket(f"{exchange_id}.{endpoint_class}", rate, capacity,
+                                     self.analytics_reserve, state)
+                self._buckets[key] = bucket
+                logger.debug(f"创建限流令牌桶 {bucket.name}: {rate:g} 权重/秒, 容量 {capacity:g}")
+        return bucket
+
+    def acquire(self, exchange_id: str, endpoint_class: str, weight: float = 1.0,
+                priority: Priority = None, default_rate: float = None) -> float:
+        """阻塞获取令牌，返回排队秒数"""
+        priority = resolve_priority(endpoint_class) if priority is None else priority
+        bucket = self.bucket(exchange_id, endpoint_class, default_rate)
+        return bucket.acquire(weight, priority, self.max_wait)
+
+    async def acquire_async(self, exchange_id: str, endpoint_class: str, weight: float = 1.0,
+                            priority: Priority = None, default_rate: float = None) -> float:
+        """异步获取令牌，返回排队秒数"""
+        priority = resolve_priority(endpoint_class) if priority is None else priority
+        bucket = self.bucket(exchange_id, endpoint_class, default_rate)
+        return await bucket.acquire_async(weight, priority, self.max_wait)
+
+    def install(self, client):
+        """
+        接管 ccxt 客户端的限流（同步或 async_support 客户端）
+
+        包装 fetch2：发请求前按端点成本从共享令牌桶取令牌，再关闭客户端自带的单实例限流。
+        """
+        if getattr(client, "_shared_rate_limiter", None) is self:
+            return client
+
+        exchange_id = client.id
+        default_rate = 1000.0 / client.rateLimit if client.rateLimit else None
+        original = client.fetch2
+
+        if inspect.iscoroutinefunction(original):
+            async def fetch2(path, api="public", method="GET", params={}, headers=None, body=None, config={}):
+                endpoint = classify_endpoint(api, method, path)
+                cost = client.calculate_rate_limiter_cost(api, method, path, params, config)
+                await self.acquire_async(exchange_id, endpoint, cost, default_rate=default_rate)
+                return await original(path, api, method, params, headers, body, config)
+        else:
+            def fetch2(path, api="public", method="GET", params={}, headers=None, body=None, config={}):
+                endpoint = classify_endpoint(api, method, path)
+                cost = client.calculate_rate_limiter_cost(api, method, path, params, config)
+                self.acquire(exchange_id, endpoint, cost, default_rate=default_rate)
+                return original(path, api, method, params, headers, body, config)
+
+        client.fetch2 = fetch2
+        client.enableRateLimit = False
+        client._shared_rate_limiter = self
+        return client
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """各令牌桶的请求数、排队和等待统计"""
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return {bucket.name: bucket.get_stats() for bucket in buckets}
+
+
+# 全局单例
+_limiter: Optional[ExchangeRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> ExchangeRateLimiter:
+    """获取进程级交易所限流器"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = ExchangeRateLimiter()
+    return _limiter
+
+
+def install_rate_limiter(client):
+    """RATE_LIMIT_ENABLED 时让 ccxt 客户端使用进程级限流器，返回原客户端"""
+    if client is None or not getattr(config, "RATE_LIMIT_ENABLED", True):
+        return client
+    try:
+        return get_rate_limiter().install(client)
+    except Exception as e:
+        logger.warning(f"接入共享限流器失败，保留 ccxt 自带限流: {e}")
+        return client
@@ -0,0 +1,368 @@
+"""
+交易所 I/O 录制与回放
+
+ExchangeRecorder 包装任意 ExchangeInterface / AsyncExchangeInterface 适配器或 ccxt 客户端（同步或
+async_support），把每次调用的参数、返回值（或异常）和耗时写入 gzip 压缩的 JSONL 文件；
+ExchangeReplayer 读取录制文件，按相同接口确定性地返回录制结果：
+
+- 回放匹配：优先按 (方法, 参数) 顺序匹配；参数不同时退回同一方法的下一条录制
+- 节奏：speed=None 立即返回；speed=1 按录制耗时返回（可复现线上延迟尖峰）；speed=k 按 1/k 耗时
+- 支持 TickerData / OrderResult / PositionData 等 dataclass、DataFrame 和 ccxt 原始字典
+- 录制的异常按原类型重新抛出（无法导入时抛出 ExchangeError）
+
+用法:
+    with ExchangeRecorder(adapter, "logs/bitget_io.jsonl.gz") as recorded:
+        recorded.get_klines(timeframe="15m")
+    replay = ExchangeReplayer("logs/bitget_io.jsonl.gz", speed=10)
+    df = replay.get_klines(timeframe="15m")
+"""
+import asyncio
+import dataclasses
+import functools
+import gzip
+import importlib
+import inspect
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.logger_utils import get_logger
+from .errors import ExchangeError
+
+logger = get_logger("exchange_recording")
+
+FORMAT = "exchange-io"
+VERSION = 1
+
+# 录制目标上随录制文件保存的简单属性（回放时可直接读取）
+_ATTRIBUTE_TYPES = (str, int, float, bool, type(None))
+
+
+def _class_path(obj_or_cls) -> str:
+    cls = obj_or_cls if isinstance(obj_or_cls, type) else type(obj_or_cls)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _import_class(path: str):
+    module, _, name = path.rpartition(".")
+    obj = importlib.import_module(module)
+    for part in name.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+# ==================== 编解码 ====================
+
+def encode(value: Any) -> Any:
+    """把返回值转换为可 JSON 序列化的结构"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(k): encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": str(value.dtype)}
+    if isinstance(value, pd.DataFrame):
+        index = value.index
+        is_datetime = isinstance(index, pd.DatetimeIndex)
+        return {
+            "__frame__": {
+                "index": index.asi8.tolist() if is_datetime else encode(index.tolist()),
+                "index_dtype": str(index.dtype) if is_datetime else None,
+                "index_name": index.name,
+                "columns": [str(c) for c in value.columns],
+                "values": encode(value.to_numpy().tolist()),
+            }
+        }
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            "__dataclass__": _class_path(value),
+            "fields": {f.name: encode(getattr(value, f.name)) for f in dataclasses.fields(value)},
+        }
+    return repr(value)
+
+
+def decode(value: Any) -> Any:
+    """encode 的逆操作"""
+    if isinstance(value, list):
+        return [decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__frame__" in value:
+        frame = value["__frame__"]
+        index = frame["index"]
+        if frame["index_dtype"]:
+            index = pd.DatetimeIndex(np.asarray(index, dtype=np.int64).astype(frame["index_dtype"]),
+                                     name=frame["index_name"])
+        else:
+            index = pd.Index(index, name=frame["index_name"])
+        return pd.DataFrame(frame["values"], index=index, columns=frame["columns"])
+    if "__ndarray__" in value:
+        return np.asarray(value["__ndarray__"], dtype=value["dtype"])
+    if "__dataclass__" in value:
+        fields = {k: decode(v) for k, v in value["fields"].items()}
+        try:
+            return _import_class(value["__dataclass__"])(**fields)
+        except Exception:
+            return fields
+    return {k: decode(v) for k, v in value.items()}
+
+
+def _call_key(method: str, args: tuple, kwargs: Dict) -> str:
+    return json.dumps([method, encode(list(args)), encode(kwargs)], sort_keys=True, default=str)
+
+
+def _rebuild_error(error: Dict) -> Exception:
+    try:
+        cls = _import_class(error["type"])
+        if isinstance(cls, type) and issubclass(cls, Exception):
+            return cls(error["message"])
+    except Exception:
+        pass
+    return ExchangeError(error["message"])
+
+
+# ==================== 录制 ====================
+
+class ExchangeRecorder:
+    """
+    录制代理：对外表现与被包装对象一致，公开方法的调用被写入录制文件
+
+    Args:
+        target: 适配器或 ccxt 客户端
+        path: 录制文件路径（.gz 结尾时 gzip 压缩）
+        methods: 需要录制的方法名，默认所有公开方法
+    """
+
+    def __init__(self, target: Any, path: str, methods: Iterable[str] = None):
+        self._target = target
+        self._path = path
+        self._methods = set(methods) if methods is not None else None
+        self._lock = threading.Lock()
+        self._origin = time.monotonic()
+        self._seq = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8") if path.endswith(".gz") \
+            else open(path, "w", encoding="utf-8")
+        self._write({
+            "format": FORMAT, "version": VERSION, "target": _class_path(target),
+            "created": time.time(), "attributes": self._attributes(target),
+        })
+
+    @staticmethod
+    def _attributes(target) -> Dict:
+        attributes = {}
+        for name, value in vars(target).items() if hasattr(target, "__dict__") else ():
+            if not name.startswith("_") and isinstance(value, _ATTRIBUTE_TYPES):
+                attributes[name] = value
+        return attributes
+
+    def _write(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+
+    def _record(self, method: str, args: tuple, kwargs: Dict, started: float,
+                result: Any = None, error: Exception = None, is_async: bool = False):
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        record = {
+            "seq": seq, "method": method, "async": is_async,
+            "args": encode(list(args)), "kwargs": encode(kwargs),
+            "t": round(started - self._origin, 6),
+            "duration": round(time.monotonic() - started, 6),
+        }
+        if error is not None:
+            record["error"] = {"type": _class_path(error), "message": str(error)}
+        else:
+            record["result"] = encode(result)
+        self._write(record)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr) or name.startswith("_") or \
+                (self._methods is not None and name not in self._methods):
+            return attr
+
+        if inspect.iscoroutinefunction(attr):
+            @functools.wraps(attr)
+            async def recorded_async(*args, **kwargs):
+                started = time.monotonic()
+                try:
+                    result = await attr(*args, **kwargs)
+                except Exception as e:
+                    self._record(name, args, kwargs, started, error=e, is_async=True)
+                    raise
+                self._record(name, args, kwargs, started, result=result, is_async=True)
+                return result
+            return recorded_async
+
+        @functools.wraps(attr)
+        def recorded(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                self._record(name, args, kwargs, started, error=e)
+                raise
+            self._record(name, args, kwargs, started, result=result)
+            return result
+        return recorded
+
+    @property
+    def count(self) -> int:
+        """已录制的调用数"""
+        return self._seq
+
+    def close(self):
+        """结束录制并关闭文件"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        logger.info(f"交易所 I/O 录制完成: {self._path} ({self._seq} 次调用)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# ==================== 回放 ====================
+
+def load_recording(path: str) -> tuple:
+    """
+    读取录制文件
+
+    Returns:
+        (header, records)
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("format") != FORMAT:
+        raise ValueError(f"不是交易所 I/O 录制文件: {path}")
+    return lines[0], lines[1:]
+
+
+class ExchangeReplayer:
+    """
+    回放代理：按录制内容返回结果
+
+    Args:
+        path: 录制文件路径
+        speed: None 立即返回；否则按 录制耗时 / speed 延迟返回
+        loop: True 时录制用完后从头循环（用于压测），False 时抛出 ExchangeError
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = None, loop: bool = False):
+        self.header, self.records = load_recording(path)
+        self.speed = speed
+        self.loop = loop
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, deque] = defaultdict(deque)
+        self._by_method: Dict[str, deque] = defaultdict(deque)
+        self._methods = {r["method"] for r in self.records}
+        self._async_methods = {r["method"] for r in self.records if r.get("async")}
+        self.stats = {"calls": 0, "exact": 0, "fallback": 0, "exhausted": 0}
+        self._reset()
+
+    def _reset(self):
+        self._by_key.clear()
+        self._by_method.clear()
+        for record in self.records:
+            key = json.dumps([record["method"], record["args"], record["kwargs"]], sort_keys=True, default=str)
+            record["_key"] = key
+            record["_used"] = False
+            self._by_key[key].append(record)
+            self._by_method[record["method"]].append(record)
+
+    @staticmethod
+    def _pop(queue: Optional[deque]) -> Optional[Dict]:
+        """取出队列中下一条未使用的录制（同一条录制同时位于按参数和按方法两个队列中）"""
+        while queue:
+            record = queue.popleft()
+            if not record["_used"]:
+                record["_used"] = True
+                return record
+        return None
+
+    def _take(self, method: str, args: tuple, kwargs: Dict) -> Dict:
+        key = _call_key(method, args, kwargs)
+        with self._lock:
+            self.stats["calls"] += 1
+            for attempt in range(2):
+                record = self._pop(self._by_key.get(key))
+                if record is not None:
+                    self.stats["exact"] += 1
+                    return record
+                record = self._pop(self._by_method.get(method))
+                if record is not None:
+                    self.stats["fallback"] += 1
+                    return record
+                if not (self.loop and attempt == 0 and method in self._methods):
+                    break
+                self._reset()
+            self.stats["exhausted"] += 1
+        raise ExchangeError(f"录制中没有可回放的 {method} 调用")
+
+    def _delay(self, record: Dict) -> float:
+        return record["duration"] / self.speed if self.speed else 0.0
+
+    @staticmethod
+    def _result(record: Dict):
+        if "error" in record:
+            raise _rebuild_error(record["error"])
+        return decode(record["result"])
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attributes = self.header.get("attributes", {})
+        if name in attributes:
+            return attributes[name]
+        if name not in self._methods:
+            raise AttributeError(f"录制中没有 {name}")
+
+        if name in self._async_methods:
+            async def replay_async(*args, **kwargs):
+                record = self._take(name, args, kwargs)
+                delay = self._delay(record)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                return self._result(record)
+            return replay_async
+
+        def replay(*args, **kwargs):
+            record = self._take(name, args, kwargs)
+            delay = self._delay(record)
+            if delay > 0:
+                time.sleep(delay)
+            return self._result(record)
+        return replay
+
+    def latency_profile(self) -> Dict[str, Dict[str, float]]:
+        """各方法录制耗时分布（秒）：count / p50 / p95 / p99 / max"""
+        durations: Dict[str, List[float]] = defaultdict(list)
+        for record in self.records:
+            durations[record["method"]].append(record["duration"])
+        profile = {}
+        for method, values in durations.items():
+            array = np.asarray(values)
+            profile[method] = {
+                "count": len(values),
+                "p50": float(np.percentile(array, 50)),
+                "p95": float(np.percentile(array, 95)),
+                "p99": float(np.percentile(array, 99)),
+                "max": float(array.max()),
+            }
+        return profile
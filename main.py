@@ -6,6 +6,14 @@ import sys
 import argparse
 from datetime import datetime
 
+from utils.startup_profiler import get_startup_profiler
+
+# --startup-report：在导入其他模块之前安装导入钩子，统计启动各阶段与模块导入耗时
+startup = get_startup_profiler()
+if '--startup-report' in sys.argv:
+    startup.report_enabled = True
+    startup.install_import_hook()
+
 from config.settings import settings as config
 from utils.logger_utils import get_logger
 
@@ -14,10 +22,12 @@ logger = get_logger("main")
 
 def run_live():
     """运行实盘交易"""
-    from bot import TradingBot
+    with startup.phase("导入 bot"):
+        from bot import TradingBot
 
     # 验证配置
-    errors = config.validate_config()
+    with startup.phase("验证配置"):
+        errors = config.validate_config()
     if errors:
         logger.error("配置错误:")
         for e in errors:
@@ -26,15 +36,37 @@ def run_live():
 
     config.print_config()
 
-    bot = TradingBot()
+    with startup.phase("创建 TradingBot"):
+        bot = TradingBot()
+    # 启动耗时报告在首次决策完成后输出（见 TradingBot._record_first_decision）
     bot.start()
 
 
+def run_multi(args):
+    """单进程运行多个交易对（共享交易所客户端、行情缓冲、数据库和通知器）"""
+    from exchange.manager import ExchangeManager
+    from core.multi_symbol import MultiSymbolRuntime
+
+    errors = config.validate_config()
+    if errors:
+        logger.error("配置错误:")
+        for e in errors:
+            logger.error(f"  - {e}")
+        sys.exit(1)
+
+    symbols = [s.strip() for s in args.symbols.split(',') if s.strip()] if args.symbols else None
+    exchange_manager = ExchangeManager()
+    exchange_manager.initialize()
+    runtime = MultiSymbolRuntime(exchange_manager.get_current_exchange(), symbols)
+    runtime.start()
+
+
 def run_backtest(args):
     """运行回测"""
     import pandas as pd
     import ccxt
     from analysis.backtest import Backtester, compare_strategies
+    from market_data import parse_ohlcv
     
     # 获取数据
     print("获取历史数据...")
@@ -49,12 +81,7 @@ def run_backtest(args):
             limit=args.limit or 1000
         )
         
-        df = pd.DataFrame(
-            ohlcv,
-            columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-        )
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
+        df = parse_ohlcv(ohlcv)
     
     print(f"数据范围: {df.index[0]} ~ {df.index[-1]}")
     print(f"K线数量: {len(df)}")
@@ -78,9 +105,9 @@ def run_backtest(args):
 
 def run_optimize(args):
     """运行参数优化"""
-    import pandas as pd
     import ccxt
     from analysis.backtest import optimize_parameters
+    from market_data import parse_ohlcv
     
     # 获取数据
     exchange = ccxt.binance()
@@ -90,12 +117,7 @@ def run_optimize(args):
         limit=2000
     )
     
-    df = pd.DataFrame(
-        ohlcv,
-        columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-    )
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-    df.set_index('timestamp', inplace=True)
+    df = parse_ohlcv(ohlcv)
     
     # 定义参数网格
     param_grid = {
@@ -147,11 +169,17 @@ def show_status():
 
 def main():
     parser = argparse.ArgumentParser(description='量化交易机器人')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='输出启动耗时报告（阶段耗时与最慢的模块导入）')
     subparsers = parser.add_subparsers(dest='command', help='命令')
     
     # live 命令
     parser_live = subparsers.add_parser('live', help='运行实盘交易')
     
+    # multi 命令
+    parser_multi = subparsers.add_parser('multi', help='单进程运行多个交易对')
+    parser_multi.add_argument('--symbols', help='交易对列表，逗号分隔（默认 TRADING_SYMBOLS）')
+    
     # backtest 命令
     parser_bt = subparsers.add_parser('backtest', help='运行回测')
     parser_bt.add_argument('--file', help='数据文件路径')
@@ -178,6 +206,8 @@ def main():
     
     if args.command == 'live':
         run_live()
+    elif args.command == 'multi':
+        run_multi(args)
     elif args.command == 'backtest':
         run_backtest(args)
     elif args.command == 'optimize':
@@ -187,6 +217,10 @@ def main():
     else:
         parser.print_help()
 
+    if args.startup_report and args.command != 'live':
+        startup.uninstall_import_hook()
+        print(startup.report())
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,52 @@
+"""
+行情数据模块
+提供K线缓冲、L2订单簿、多时间周期聚合、行情推送与事件总线等行情数据基础设施
+"""
+
+from .aggregator import MultiTimeframeAggregator, timeframe_to_ms, plan_resampling
+from .klines import KlineArray, KLINE_FIELDS, OHLCV_COLUMNS, as_frame, parse_ohlcv
+from .kline_buffer import KlineBuffer, get_kline_buffer, reset_kline_buffers
+from .orderbook import OrderBook, BID, ASK, get_order_book, reset_order_books
+from .events import (
+    MarketDataBus, TickerEvent, TradeEvent, CandleEvent,
+    TICKER, TRADE, CANDLE_CLOSE, get_market_bus,
+)
+from .feeds import (
+    MarketFeed, WebSocketFeed, SimulatedFeed, MarketRecorder,
+    create_market_feed, start_market_stream, get_market_stream, stop_market_streams,
+)
+
+__all__ = [
+    'KlineArray',
+    'KLINE_FIELDS',
+    'OHLCV_COLUMNS',
+    'as_frame',
+    'parse_ohlcv',
+    'KlineBuffer',
+    'get_kline_buffer',
+    'reset_kline_buffers',
+    'OrderBook',
+    'BID',
+    'ASK',
+    'get_order_book',
+    'reset_order_books',
+    'MarketDataBus',
+    'TickerEvent',
+    'TradeEvent',
+    'CandleEvent',
+    'TICKER',
+    'TRADE',
+    'CANDLE_CLOSE',
+    'get_market_bus',
+    'MarketFeed',
+    'WebSocketFeed',
+    'SimulatedFeed',
+    'MarketRecorder',
+    'create_market_feed',
+    'start_market_stream',
+    'get_market_stream',
+    'stop_market_streams',
+    'MultiTimeframeAggregator',
+    'timeframe_to_ms',
+    'plan_resampling',
+]
@@ -0,0 +1,489 @@
+"""
+多时间周期K线聚合器
+
+只维护一份基础周期（最小周期）的K线缓冲区，高周期K线通过增量重采样得到：
+- 首次使用时按需要的深度全量拉取一次基础周期K线
+- 之后每个周期只拉取最近几根基础K线，就地合并并只重算受影响的高周期K线
+- 最后一根高周期K线可能尚未走完（partial bar），可选择保留或丢弃
+- 无法由基础周期整除或跨日对齐不确定的周期（如 1w/1M）仍直接向交易所请求
+
+相比逐周期调用 fetch_ohlcv，每个循环节省 N-1 次 REST 请求及其延迟。
+"""
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from config.settings import settings as config
+from utils.logger_utils import get_logger
+
+logger = get_logger("mtf_aggregator")
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+_TIMEFRAME_UNIT_MS = {
+    'm': 60_000,
+    'h': 3_600_000,
+    'd': 86_400_000,
+    'w': 604_800_000,
+}
+
+_DAY_MS = 86_400_000
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """
+    将时间周期字符串转换为毫秒
+
+    Args:
+        timeframe: 时间周期，如 '1m', '15m', '1h', '1d'
+
+    Returns:
+        周期长度（毫秒）
+
+    Raises:
+        ValueError: 无法解析或不是固定长度的周期（如 '1M'）
+    """
+    if not timeframe or len(timeframe) < 2:
+        raise ValueError(f"无效的时间周期: {timeframe}")
+
+    unit = timeframe[-1]
+    if unit not in _TIMEFRAME_UNIT_MS:
+        raise ValueError(f"不支持的时间周期单位: {timeframe}")
+
+    try:
+        amount = int(timeframe[:-1])
+    except ValueError:
+        raise ValueError(f"无效的时间周期: {timeframe}")
+
+    if amount <= 0:
+        raise ValueError(f"无效的时间周期: {timeframe}")
+
+    return amount * _TIMEFRAME_UNIT_MS[unit]
+
+
+def _is_resamplable(timeframe_ms: int, base_ms: int) -> bool:
+    """高周期能否由基础周期按 UTC 对齐重采样得到"""
+    if timeframe_ms % base_ms != 0:
+        return False
+    # 只处理能整除一天的周期，保证与交易所的 UTC 对齐方式一致
+    return _DAY_MS % timeframe_ms == 0
+
+
+def plan_resampling(
+    timeframes: List[str],
+    limit: int,
+    max_base_bars: int,
+    base_timeframe: Optional[str] = None
+) -> Tuple[Optional[str], List[str], List[str]]:
+    """
+    规划哪些周期由重采样得到、哪些需要直接请求
+
+    Args:
+        timeframes: 需要的时间周期列表
+        limit: 每个周期需要的K线数量
+        max_base_bars: 基础周期最多缓存的K线数量
+        base_timeframe: 指定基础周期，默认取最小周期
+
+    Returns:
+        (基础周期, 重采样周期列表(含基础周期), 直接请求周期列表)
+    """
+    parsed = []
+    direct = []
+    for tf in timeframes:
+        try:
+            parsed.append((tf, timeframe_to_ms(tf)))
+        except ValueError:
+            direct.append(tf)
+
+    if not parsed:
+        return None, [], direct
+
+    if base_timeframe is None:
+        base_timeframe = min(parsed, key=lambda item: item[1])[0]
+    base_ms = timeframe_to_ms(base_timeframe)
+
+    derived = []
+    for tf, tf_ms in parsed:
+        ratio = tf_ms // base_ms
+        if _is_resamplable(tf_ms, base_ms) and ratio * (limit + 1) <= max_base_bars:
+            derived.append(tf)
+        else:
+            direct.append(tf)
+
+    # 只有基础周期本身可用时没有节省任何请求，全部直接请求
+    if len(derived) <= 1 and base_timeframe not in timeframes:
+        return None, [], list(timeframes)
+
+    return base_timeframe, derived, direct
+
+
+def _to_arrays(data: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    将 ccxt 原始K线列表或 DataFrame 转换为 (时间戳ms, OHLCV) 数组
+
+    Returns:
+        (int64 时间戳数组, float64 形状为 (n, 5) 的数组)，按时间升序且去重
+    """
+    if data is None:
+        return np.empty(0, dtype=np.int64), np.empty((0, 5), dtype=np.float64)
+
+    if isinstance(data, pd.DataFrame):
+        if data.empty:
+            return np.empty(0, dtype=np.int64), np.empty((0, 5), dtype=np.float64)
+        if isinstance(data.index, pd.DatetimeIndex):
+            ts_values = data.index.values
+        else:
+            ts_values = pd.to_datetime(data['timestamp']).values
+        ts = ts_values.astype('datetime64[ms]').astype(np.int64)
+        values = data[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+    else:
+        if len(data) == 0:
+            return np.empty(0, dtype=np.int64), np.empty((0, 5), dtype=np.float64)
+        raw = np.asarray(data, dtype=np.float64)
+        ts = raw[:, 0].astype(np.int64)
+        values = raw[:, 1:6]
+
+    order = np.argsort(ts, kind='stable')
+    ts = ts[order]
+    values = values[order]
+
+    # 同一时间戳保留最后一条（进行中的K线以最新数据为准）
+    if len(ts) > 1:
+        keep = np.r_[ts[1:] != ts[:-1], True]
+        ts = ts[keep]
+        values = values[keep]
+
+    return ts, values
+
+
+def _to_frame(ts: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    """构建与 fetch_ohlcv 一致的 DataFrame（timestamp 索引 + OHLCV 列）"""
+    index = pd.to_datetime(ts, unit='ms')
+    index.name = 'timestamp'
+    return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS)
+
+
+def _resample(
+    ts: np.ndarray,
+    values: np.ndarray,
+    timeframe_ms: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    将基础周期K线聚合为高周期K线
+
+    Returns:
+        (桶起始时间戳, 聚合后的 OHLCV, 每个桶最后一根基础K线的时间戳)
+    """
+    if len(ts) == 0:
+        return ts, values, ts
+
+    keys = ts - ts % timeframe_ms
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:] - 1, len(ts) - 1]
+
+    out = np.empty((len(starts), 5), dtype=np.float64)
+    out[:, 0] = values[starts, 0]
+    out[:, 1] = np.maximum.reduceat(values[:, 1], starts)
+    out[:, 2] = np.minimum.reduceat(values[:, 2], starts)
+    out[:, 3] = values[ends, 3]
+    out[:, 4] = np.add.reduceat(values[:, 4], starts)
+
+    return keys[starts], out, ts[ends]
+
+
+class MultiTimeframeAggregator:
+    """
+    多时间周期K线聚合器
+
+    用法:
+        aggregator = MultiTimeframeAggregator(['15m', '1h'])
+        frames = aggregator.refresh(lambda tf, limit: exchange.fetch_ohlcv(symbol, tf, limit=limit))
+    """
+
+    def __init__(
+        self,
+        timeframes: List[str],
+        limit: int = None,
+        max_base_bars: int = None,
+        incremental_limit: int = None,
+        base_timeframe: str = None,
+        include_partial: bool = None
+    ):
+        """
+        初始化聚合器
+
+        Args:
+            timeframes: 需要输出的时间周期列表
+            limit: 每个周期输出的K线数量，默认 KLINE_LIMIT
+            max_base_bars: 基础周期最多缓存的K线数量，默认 MTF_MAX_BASE_BARS
+            incremental_limit: 增量刷新时请求的基础K线数量，默认 MTF_INCREMENTAL_LIMIT
+            base_timeframe: 指定基础周期，默认取最小周期
+            include_partial: 是否输出未走完的最后一根K线，默认 MTF_INCLUDE_PARTIAL_BAR
+        """
+        self.timeframes = list(timeframes)
+        self.limit = int(limit or getattr(config, 'KLINE_LIMIT', 200))
+        self.max_base_bars = int(max_base_bars or getattr(config, 'MTF_MAX_BASE_BARS', 1000))
+        self.incremental_limit = int(incremental_limit or getattr(config, 'MTF_INCREMENTAL_LIMIT', 5))
+        if include_partial is None:
+            include_partial = getattr(config, 'MTF_INCLUDE_PARTIAL_BAR', True)
+        self.include_partial = bool(include_partial)
+
+        self.base_timeframe, self.derived, self.direct = plan_resampling(
+            self.timeframes, self.limit, self.max_base_bars, base_timeframe
+        )
+        self.base_ms = timeframe_to_ms(self.base_timeframe) if self.base_timeframe else 0
+
+        # 基础周期缓冲区
+        self._ts = np.empty(0, dtype=np.int64)
+        self._values = np.empty((0, 5), dtype=np.float64)
+
+        # 高周期缓存: tf -> (桶起始时间戳, OHLCV, 桶内最后一根基础K线时间戳)
+        self._bars: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+        # 统计
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.requests_saved = 0
+
+    # ==================== 状态 ====================
+
+    @property
+    def is_seeded(self) -> bool:
+        """基础缓冲区是否已完成首次同步"""
+        return len(self._ts) > 0
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """基础缓冲区最后一根K线的时间戳（ms）"""
+        return int(self._ts[-1]) if len(self._ts) else None
+
+    @property
+    def seed_limit(self) -> int:
+        """首次全量同步需要的基础K线数量"""
+        if not self.derived:
+            return 0
+        max_ratio = max(timeframe_to_ms(tf) // self.base_ms for tf in self.derived)
+        return min(self.max_base_bars, max_ratio * (self.limit + 1))
+
+    def reset(self):
+        """清空缓冲区，下次刷新时重新全量同步"""
+        self._ts = np.empty(0, dtype=np.int64)
+        self._values = np.empty((0, 5), dtype=np.float64)
+        self._bars.clear()
+
+    # ==================== 写入 ====================
+
+    def seed(self, data: Any) -> bool:
+        """
+        用全量K线初始化基础缓冲区
+
+        Args:
+            data: ccxt 原始K线列表或 DataFrame
+
+        Returns:
+            是否成功写入
+        """
+        self.reset()
+        ts, values = _to_arrays(data)
+        if len(ts) == 0:
+            return False
+        self._store(ts, values, dirty_from=int(ts[0]))
+        self.full_syncs += 1
+        return True
+
+    def update(self, data: Any) -> bool:
+        """
+        增量合并最新的基础周期K线
+
+        新数据覆盖缓冲区中相同时间范围的K线（进行中的K线会被最新值替换），
+        只重算受影响的高周期K线。
+
+        Args:
+            data: ccxt 原始K线列表或 DataFrame
+
+        Returns:
+            False 表示与缓冲区之间存在缺口，需要调用方重新全量同步
+        """
+        ts, values = _to_arrays(data)
+        if len(ts) == 0:
+            return True
+        if not self.is_seeded:
+            return self.seed(data)
+
+        last_ts = int(self._ts[-1])
+        if int(ts[0]) > last_ts + self.base_ms:
+            logger.warning(
+                f"基础周期K线出现缺口: 缓冲区最后={last_ts}, 新数据起始={int(ts[0])}"
+            )
+            return False
+
+        if int(ts[-1]) < int(self._ts[0]):
+            return True
+
+        left = np.searchsorted(self._ts, ts[0], side='left')
+        right = np.searchsorted(self._ts, ts[-1], side='right')
+        merged_ts = np.concatenate([self._ts[:left], ts, self._ts[right:]])
+        merged_values = np.concatenate([self._values[:left], values, self._values[right:]])
+
+        self._store(merged_ts, merged_values, dirty_from=int(ts[0]))
+        self.incremental_syncs += 1
+        return True
+
+    def _store(self, ts: np.ndarray, values: np.ndarray, dirty_from: int):
+        """写入基础缓冲区并增量更新高周期缓存"""
+        trimmed = len(ts) > self.max_base_bars
+        if trimmed:
+            ts = ts[-self.max_base_bars:]
+            values = values[-self.max_base_bars:]
+
+        self._ts = ts
+        self._values = values
+
+        for tf in self.derived:
+            if tf == self.base_timeframe:
+                continue
+            self._update_bars(tf, dirty_from, trimmed)
+
+    def _update_bars(self, timeframe: str, dirty_from: int, trimmed: bool):
+        """只重算从 dirty_from 所在桶开始的高周期K线"""
+        tf_ms = timeframe_to_ms(timeframe)
+        dirty_bucket = dirty_from - dirty_from % tf_ms
+
+        cached = self._bars.get(timeframe)
+        if cached is None:
+            keep = 0
+            bucket_ts = np.empty(0, dtype=np.int64)
+            bucket_values = np.empty((0, 5), dtype=np.float64)
+            bucket_last = np.empty(0, dtype=np.int64)
+            dirty_bucket = int(self._ts[0]) - int(self._ts[0]) % tf_ms
+        else:
+            bucket_ts, bucket_values, bucket_last = cached
+            keep = np.searchsorted(bucket_ts, dirty_bucket, side='left')
+
+        start = np.searchsorted(self._ts, dirty_bucket, side='left')
+        new_ts, new_values, new_last = _resample(self._ts[start:], self._values[start:], tf_ms)
+
+        bucket_ts = np.concatenate([bucket_ts[:keep], new_ts])
+        bucket_values = np.concatenate([bucket_values[:keep], new_values])
+        bucket_last = np.concatenate([bucket_last[:keep], new_last])
+
+        # 缓冲区头部被裁剪后，第一个桶可能缺少开头的基础K线，丢弃不完整的头部桶
+        first_ts = int(self._ts[0])
+        first_full = first_ts if first_ts % tf_ms == 0 else first_ts - first_ts % tf_ms + tf_ms
+        head = np.searchsorted(bucket_ts, first_full, side='left')
+        if head:
+            bucket_ts = bucket_ts[head:]
+            bucket_values = bucket_values[head:]
+            bucket_last = bucket_last[head:]
+
+        self._bars[timeframe] = (bucket_ts, bucket_values, bucket_last)
+
+    # ==================== 读取 ====================
+
+    def _is_last_bar_partial(self, bar_ts: int, last_base_ts: int, timeframe_ms: int, now_ms: float) -> bool:
+        """判断最后一根K线是否尚未走完"""
+        covers_bucket = last_base_ts + self.base_ms >= bar_ts + timeframe_ms
+        base_closed = last_base_ts + self.base_ms <= now_ms
+        return not (covers_bucket and base_closed)
+
+    def get(
+        self,
+        timeframe: str,
+        limit: int = None,
+        include_partial: bool = None,
+        now_ms: float = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        获取指定周期的K线
+
+        Args:
+            timeframe: 时间周期（必须是重采样周期之一）
+            limit: K线数量，默认使用初始化时的 limit
+            include_partial: 是否包含未走完的最后一根K线
+            now_ms: 当前时间（ms），默认取系统时间
+
+        Returns:
+            DataFrame，缓冲区为空时返回 None
+        """
+        if timeframe not in self.derived or not self.is_seeded:
+            return None
+
+        limit = limit or self.limit
+        if include_partial is None:
+            include_partial = self.include_partial
+        if now_ms is None:
+            now_ms = time.time() * 1000
+
+        if timeframe == self.base_timeframe:
+            ts, values, last = self._ts, self._values, self._ts
+            tf_ms = self.base_ms
+        else:
+            ts, values, last = self._bars[timeframe]
+            tf_ms = timeframe_to_ms(timeframe)
+
+        if len(ts) == 0:
+            return None
+
+        if not include_partial and self._is_last_bar_partial(int(ts[-1]), int(last[-1]), tf_ms, now_ms):
+            ts = ts[:-1]
+            values = values[:-1]
+
+        return _to_frame(ts[-limit:], values[-limit:])
+
+    def refresh(self, fetch: Callable[[str, int], Any]) -> Dict[str, pd.DataFrame]:
+        """
+        刷新并返回所有周期的K线
+
+        Args:
+            fetch: 获取K线的回调 fetch(timeframe, limit)，返回 ccxt 原始列表或 DataFrame
+
+        Returns:
+            Dict[str, pd.DataFrame]: 时间周期到数据的映射（获取失败的周期不包含在内）
+        """
+        result: Dict[str, pd.DataFrame] = {}
+
+        if self.derived:
+            if not self.is_seeded:
+                synced = self.seed(fetch(self.base_timeframe, self.seed_limit))
+            else:
+                data = fetch(self.base_timeframe, self.incremental_limit)
+                synced = data is not None and len(data) > 0
+                if synced and not self.update(data):
+                    logger.info(f"重新全量同步 {self.base_timeframe} 基础K线")
+                    synced = self.seed(fetch(self.base_timeframe, self.seed_limit))
+
+            # 只有基础周期K线获取成功时才算节省了请求
+            if synced:
+                self.requests_saved += len(self.derived) - 1
+
+        frames: Dict[str, pd.DataFrame] = {}
+        for tf in self.derived:
+            df = self.get(tf)
+            if df is not None and not df.empty:
+                frames[tf] = df
+
+        for tf in self.direct:
+            ts, values = _to_arrays(fetch(tf, self.limit))
+            if len(ts):
+                frames[tf] = _to_frame(ts, values)
+
+        # 保持调用方给定的周期顺序
+        for tf in self.timeframes:
+            if tf in frames:
+                result[tf] = frames[tf]
+
+        return result
+
+    def get_stats(self) -> Dict:
+        """获取聚合器统计信息"""
+        return {
+            'base_timeframe': self.base_timeframe,
+            'derived': list(self.derived),
+            'direct': list(self.direct),
+            'base_bars': len(self._ts),
+            'full_syncs': self.full_syncs,
+            'incremental_syncs': self.incremental_syncs,
+            'requests_saved': self.requests_saved,
+        }
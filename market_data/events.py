@@ -0,0 +1,330 @@
+"""
+行情事件与进程内事件总线
+
+推送型行情（WebSocket / 回放模拟）统一转换为三类事件发布到 MarketDataBus：
+- ticker: 最新行情（TickerEvent）
+- trade: 逐笔成交（TradeEvent）
+- candle_close: K线收盘（CandleEvent，只在一根K线走完时发布一次）
+
+消费方式：
+- subscribe(): 回调在发布线程中同步执行（适合轻量处理，如更新缓存）
+- subscribe_queue(): 线程安全队列，供同步线程阻塞等待
+- subscribe_async(): asyncio 队列，供事件循环中的协程等待
+- latest(): 读取最近一次事件（不订阅）
+"""
+import asyncio
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from exchange.interface import TickerData
+from utils.logger_utils import get_logger
+
+logger = get_logger("market_events")
+
+TICKER = "ticker"
+TRADE = "trade"
+CANDLE_CLOSE = "candle_close"
+
+TOPICS = (TICKER, TRADE, CANDLE_CLOSE)
+
+
+class _MarketEvent:
+    """事件公共方法"""
+    topic = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典（含 topic，用于录制）"""
+        data = asdict(self)
+        data['topic'] = self.topic
+        return data
+
+
+@dataclass
+class TickerEvent(_MarketEvent):
+    """行情事件"""
+    exchange: str
+    symbol: str
+    last: float
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    volume: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    change_pct: Optional[float] = None
+    timestamp: int = 0                      # 交易所时间戳（ms）
+    received_at: float = field(default_factory=time.time)  # 本地接收时间（秒）
+    topic = TICKER
+
+    def to_ticker_data(self) -> TickerData:
+        """转换为交易所接口的 TickerData"""
+        return TickerData(
+            symbol=self.symbol,
+            last=self.last,
+            bid=self.bid,
+            ask=self.ask,
+            volume=self.volume,
+            timestamp=self.timestamp,
+            raw_data=self.to_dict()
+        )
+
+
+@dataclass
+class TradeEvent(_MarketEvent):
+    """逐笔成交事件"""
+    exchange: str
+    symbol: str
+    price: float
+    amount: float
+    side: Optional[str] = None
+    timestamp: int = 0
+    received_at: float = field(default_factory=time.time)
+    topic = TRADE
+
+
+@dataclass
+class CandleEvent(_MarketEvent):
+    """K线收盘事件（timestamp 为K线开盘时间）"""
+    exchange: str
+    symbol: str
+    timeframe: str
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    received_at: float = field(default_factory=time.time)
+    topic = CANDLE_CLOSE
+
+    def to_row(self) -> List[float]:
+        """转换为 ccxt 原始K线行"""
+        return [self.timestamp, self.open, self.high, self.low, self.close, self.volume]
+
+
+_EVENT_TYPES = {cls.topic: cls for cls in (TickerEvent, TradeEvent, CandleEvent)}
+
+
+def event_from_dict(data: Dict[str, Any]):
+    """从字典（如录制文件中的一行）还原事件"""
+    data = dict(data)
+    cls = _EVENT_TYPES.get(data.pop('topic', None))
+    if cls is None:
+        raise ValueError(f"未知的行情事件类型: {data}")
+    return cls(**data)
+
+
+class Subscription:
+    """同步订阅：事件进入有界队列，队列满时丢弃最旧事件"""
+
+    def __init__(self, bus: 'MarketDataBus', maxsize: int = 1000):
+        self._bus = bus
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._tokens: List[int] = []
+        self.dropped = 0
+
+    def _offer(self, event):
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: float = None):
+        """取出下一条事件，超时返回 None"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self) -> List:
+        """取出当前队列中的全部事件"""
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        """取消订阅"""
+        for token in self._tokens:
+            self._bus.unsubscribe(token)
+        self._tokens = []
+
+
+class AsyncSubscription(Subscription):
+    """异步订阅：事件通过 call_soon_threadsafe 投递到所属事件循环的队列"""
+
+    def __init__(self, bus: 'MarketDataBus', loop: asyncio.AbstractEventLoop, maxsize: int = 1000):
+        super().__init__(bus, maxsize)
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def _offer(self, event):
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # 事件循环已关闭
+            self.close()
+
+    def _put(self, event):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: float = None):
+        """等待下一条事件，超时返回 None"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self) -> List:
+        events = []
+        while not self._queue.empty():
+            events.append(self._queue.get_nowait())
+        return events
+
+
+class MarketDataBus:
+    """进程内行情事件总线（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        # token -> (topic, symbol, exchange, callback)
+        self._subscribers: Dict[int, Tuple[str, Optional[str], Optional[str], Callable]] = {}
+        # (topic, exchange, symbol) -> 最新事件；exchange 为 None 表示任意交易所
+        self._latest: Dict[Tuple[str, Optional[str], str], Any] = {}
+        self.published = 0
+        self.callback_errors = 0
+
+    # ==================== 订阅 ====================
+
+    def subscribe(self, topic: str, callback: Callable, symbol: str = None,
+                  exchange: str = None) -> int:
+        """
+        订阅事件，回调在发布线程中同步执行
+
+        Args:
+            topic: ticker / trade / candle_close
+            callback: callback(event)
+            symbol: 只接收该交易对（None 表示全部）
+            exchange: 只接收该交易所（None 表示全部）
+
+        Returns:
+            订阅 token，用于 unsubscribe
+        """
+        if topic not in TOPICS:
+            raise ValueError(f"未知的行情事件类型: {topic}")
+        token = next(self._ids)
+        with self._lock:
+            self._subscribers[token] = (topic, symbol, exchange, callback)
+        return token
+
+    def unsubscribe(self, token: int):
+        """取消订阅"""
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def subscribe_queue(self, topics: Iterable[str], symbol: str = None,
+                        exchange: str = None, maxsize: int = 1000) -> Subscription:
+        """订阅到线程安全队列"""
+        sub = Subscription(self, maxsize)
+        sub._tokens = [self.subscribe(t, sub._offer, symbol, exchange) for t in topics]
+        return sub
+
+    def subscribe_async(self, topics: Iterable[str], symbol: str = None,
+                        exchange: str = None, maxsize: int = 1000) -> AsyncSubscription:
+        """订阅到当前事件循环的 asyncio 队列（须在协程中调用）"""
+        sub = AsyncSubscription(self, asyncio.get_running_loop(), maxsize)
+        sub._tokens = [self.subscribe(t, sub._offer, symbol, exchange) for t in topics]
+        return sub
+
+    def wait_for(self, topics: Iterable[str], symbol: str = None,
+                 exchange: str = None, timeout: float = None):
+        """阻塞等待下一条匹配的事件，超时返回 None"""
+        sub = self.subscribe_queue(topics, symbol, exchange, maxsize=1)
+        try:
+            return sub.get(timeout)
+        finally:
+            sub.close()
+
+    # ==================== 发布 ====================
+
+    def publish(self, event):
+        """发布事件：更新最新值并同步调用订阅者"""
+        topic = event.topic
+        with self._lock:
+            self._latest[(topic, event.exchange, event.symbol)] = event
+            self._latest[(topic, None, event.symbol)] = event
+            self.published += 1
+            callbacks = [
+                callback for t, symbol, exchange, callback in self._subscribers.values()
+                if t == topic
+                and (symbol is None or symbol == event.symbol)
+                and (exchange is None or exchange == event.exchange)
+            ]
+
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                self.callback_errors += 1
+                logger.error(f"行情事件回调失败 ({topic} {event.symbol}): {e}")
+
+    def latest(self, topic: str, symbol: str, exchange: str = None,
+               max_age: float = None):
+        """
+        最近一次事件
+
+        Args:
+            max_age: 最大允许的本地接收时间间隔（秒），超过返回 None
+        """
+        with self._lock:
+            event = self._latest.get((topic, exchange, symbol))
+        if event is None:
+            return None
+        if max_age is not None and time.time() - event.received_at > max_age:
+            return None
+        return event
+
+    def clear(self):
+        """清空订阅与最新值"""
+        with self._lock:
+            self._subscribers.clear()
+            self._latest.clear()
+
+    def get_stats(self) -> Dict:
+        """获取总线统计信息"""
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'published': self.published,
+                'callback_errors': self.callback_errors,
+            }
+
+
+# 全局单例
+_bus: Optional[MarketDataBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_market_bus() -> MarketDataBus:
+    """获取全局行情事件总线"""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = MarketDataBus()
+    return _bus
@@ -0,0 +1,487 @@
+"""
+行情推送数据源（可插拔传输层）
+
+- WebSocketFeed: 交易所 WebSocket（ccxt.pro watch_* 接口），断线指数退避重连
+- SimulatedFeed: 进程内模拟 / 录制文件回放，离线测试使用
+- MarketRecorder: 把总线上的事件录制为 JSONL，供 SimulatedFeed 回放
+
+数据源只负责把原始行情转换为事件发布到 MarketDataBus；K线收盘由
+MarketFeed.publish_ohlcv 统一检测（进行中K线的时间戳前进即上一根收盘）。
+"""
+import asyncio
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from config.settings import settings as config
+from utils.logger_utils import get_logger
+from .events import (
+    MarketDataBus, TickerEvent, TradeEvent, CandleEvent,
+    TOPICS, event_from_dict, get_market_bus,
+)
+
+logger = get_logger("market_feeds")
+
+
+def to_exchange_symbol(symbol: str) -> str:
+    """配置格式 (ETHUSDT) → ccxt 合约格式 (ETH/USDT:USDT)，已是 ccxt 格式则原样返回"""
+    if "/" not in symbol and symbol.endswith("USDT"):
+        return f"{symbol[:-4]}/USDT:USDT"
+    return symbol
+
+
+class MarketFeed(ABC):
+    """行情推送数据源基类"""
+
+    transport = ""
+
+    def __init__(self, exchange: str, bus: MarketDataBus = None):
+        self.exchange = exchange
+        self.bus = bus or get_market_bus()
+        self.symbols: List[str] = []
+        self.timeframes: List[str] = []
+        self.running = False
+        # (symbol, timeframe) -> 进行中的K线
+        self._forming: Dict[Tuple[str, str], List[float]] = {}
+        self.events_published = 0
+
+    # ==================== 生命周期 ====================
+
+    @abstractmethod
+    def start(self):
+        """启动数据源"""
+
+    @abstractmethod
+    def stop(self):
+        """停止数据源"""
+
+    def watch(self, symbols: Iterable[str], timeframes: Iterable[str] = ()):
+        """追加订阅的交易对和K线周期"""
+        for symbol in symbols:
+            if symbol not in self.symbols:
+                self.symbols.append(symbol)
+        for timeframe in timeframes:
+            if timeframe not in self.timeframes:
+                self.timeframes.append(timeframe)
+
+    # ==================== 发布 ====================
+
+    def _publish(self, event):
+        self.events_published += 1
+        self.bus.publish(event)
+
+    def publish_ticker(self, symbol: str, ticker: Dict):
+        """发布 ccxt 格式的 ticker"""
+        self._publish(TickerEvent(
+            exchange=self.exchange,
+            symbol=symbol,
+            last=ticker.get('last'),
+            bid=ticker.get('bid'),
+            ask=ticker.get('ask'),
+            volume=ticker.get('baseVolume'),
+            high=ticker.get('high'),
+            low=ticker.get('low'),
+            change_pct=ticker.get('percentage'),
+            timestamp=ticker.get('timestamp') or int(time.time() * 1000)
+        ))
+
+    def publish_trades(self, symbol: str, trades: List[Dict]):
+        """发布 ccxt 格式的成交列表"""
+        for trade in trades:
+            self._publish(TradeEvent(
+                exchange=self.exchange,
+                symbol=symbol,
+                price=trade.get('price'),
+                amount=trade.get('amount'),
+                side=trade.get('side'),
+                timestamp=trade.get('timestamp') or int(time.time() * 1000)
+            ))
+
+    def publish_ohlcv(self, symbol: str, timeframe: str, rows: List[List[float]]):
+        """
+        合并 ccxt 原始K线，进行中K线的时间戳前进时发布上一根的收盘事件
+
+        首次收到数据时只记录最后一根（进行中）K线，不补发历史收盘事件。
+        """
+        if not rows:
+            return
+        key = (symbol, timeframe)
+        forming = self._forming.get(key)
+        if forming is None:
+            self._forming[key] = list(rows[-1])
+            return
+
+        for row in sorted(rows, key=lambda r: r[0]):
+            if row[0] == forming[0]:
+                forming = list(row)
+            elif row[0] > forming[0]:
+                self._publish(CandleEvent(
+                    self.exchange, symbol, timeframe, int(forming[0]),
+                    *(float(v) for v in forming[1:6])
+                ))
+                forming = list(row)
+        self._forming[key] = forming
+
+    def get_stats(self) -> Dict:
+        """获取数据源统计信息"""
+        return {
+            'transport': self.transport,
+            'exchange': self.exchange,
+            'running': self.running,
+            'symbols': list(self.symbols),
+            'timeframes': list(self.timeframes),
+            'events_published': self.events_published,
+        }
+
+
+class WebSocketFeed(MarketFeed):
+    """
+    交易所 WebSocket 数据源
+
+    在独立线程的事件循环中为每个交易对运行 watch_ticker（可选 watch_trades），
+    为每个 (交易对, 周期) 运行 watch_ohlcv。单个订阅出错时指数退避后重连，不影响其他订阅。
+    """
+
+    transport = "websocket"
+
+    def __init__(self, exchange: str, symbols: Iterable[str] = (), timeframes: Iterable[str] = (),
+                 watch_trades: bool = None, bus: MarketDataBus = None, client_factory=None):
+        """
+        Args:
+            exchange: ccxt 交易所 id（bitget / binance / okx）
+            symbols: 交易对（事件中的 symbol 与此处一致）
+            timeframes: 需要收盘事件的K线周期
+            watch_trades: 是否订阅逐笔成交，默认 MARKET_STREAM_WATCH_TRADES
+            client_factory: 创建 ccxt.pro 客户端的函数（测试时注入）
+        """
+        super().__init__(exchange, bus)
+        self.watch_trades = (
+            getattr(config, 'MARKET_STREAM_WATCH_TRADES', False)
+            if watch_trades is None else watch_trades
+        )
+        self.max_reconnect_delay = getattr(config, 'MARKET_STREAM_RECONNECT_MAX_DELAY', 30)
+        self._client_factory = client_factory or self._create_client
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._tasks: Dict[tuple, asyncio.Task] = {}
+        self._start_error: Optional[BaseException] = None
+        self.reconnects = 0
+        self.watch(symbols, timeframes)
+
+    def _create_client(self):
+        """创建 ccxt.pro 公共行情客户端"""
+        import ccxt.pro as ccxtpro
+
+        default_type = "future" if self.exchange == "binance" else "swap"
+        return getattr(ccxtpro, self.exchange)({
+            "enableRateLimit": True,
+            "options": {"defaultType": default_type},
+        })
+
+    # ==================== 生命周期 ====================
+
+    def start(self):
+        """
+        启动行情线程，等待客户端创建完成
+
+        Raises:
+            RuntimeError: 客户端创建失败或启动超时（running 复位，可再次 start）
+        """
+        if self.running:
+            return
+        self.running = True
+        self._start_error = None
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._thread_main, args=(ready,),
+            name=f"ws-feed-{self.exchange}", daemon=True
+        )
+        self._thread.start()
+        started = ready.wait(timeout=5)
+
+        if self._start_error is not None or not started:
+            error = self._start_error
+            self.stop()
+            reason = f"{type(error).__name__}: {error}" if error else "启动超时"
+            logger.error(f"{self.exchange} WebSocket 行情启动失败: {reason}")
+            raise RuntimeError(f"{self.exchange} WebSocket 行情启动失败: {reason}") from error
+        logger.info(f"{self.exchange} WebSocket 行情已启动: {self.symbols} {self.timeframes}")
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        if self._loop and self._stopped:
+            try:
+                self._loop.call_soon_threadsafe(self._stopped.set)
+            except RuntimeError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=5)
+        logger.info(f"{self.exchange} WebSocket 行情已停止")
+
+    def watch(self, symbols: Iterable[str], timeframes: Iterable[str] = ()):
+        super().watch(symbols, timeframes)
+        if self.running and self._loop:
+            self._loop.call_soon_threadsafe(self._spawn_watchers)
+
+    def _thread_main(self, ready: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run(ready))
+        finally:
+            self._loop.close()
+
+    async def _run(self, ready: threading.Event):
+        self._stopped = asyncio.Event()
+        try:
+            self._client = self._client_factory()
+        except Exception as e:
+            # 由 start() 在调用方线程中报告
+            self._start_error = e
+            self.running = False
+            ready.set()
+            return
+        self._spawn_watchers()
+        ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            tasks = list(self._tasks.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._tasks.clear()
+            try:
+                await self._client.close()
+            except Exception as e:
+                logger.debug(f"关闭 WebSocket 客户端失败: {e}")
+
+    def _spawn_watchers(self):
+        """为尚未运行的订阅创建任务"""
+        for symbol in self.symbols:
+            self._spawn(('ticker', symbol), self._watch_ticker, symbol)
+            if self.watch_trades:
+                self._spawn(('trades', symbol), self._watch_trades, symbol)
+            for timeframe in self.timeframes:
+                self._spawn(('ohlcv', symbol, timeframe), self._watch_ohlcv, symbol, timeframe)
+
+    def _spawn(self, key: tuple, watcher, *args):
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.get_running_loop().create_task(self._supervise(key, watcher, *args))
+
+    async def _supervise(self, key: tuple, watcher, *args):
+        """运行单个订阅，出错后指数退避重连"""
+        delay = 1.0
+        while self.running:
+            try:
+                await watcher(*args)
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.reconnects += 1
+                logger.warning(f"{self.exchange} 行情订阅 {key} 异常，{delay:.0f}秒后重连: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _watch_ticker(self, symbol: str):
+        ticker = await self._client.watch_ticker(to_exchange_symbol(symbol))
+        self.publish_ticker(symbol, ticker)
+
+    async def _watch_trades(self, symbol: str):
+        trades = await self._client.watch_trades(to_exchange_symbol(symbol))
+        self.publish_trades(symbol, trades)
+
+    async def _watch_ohlcv(self, symbol: str, timeframe: str):
+        rows = await self._client.watch_ohlcv(to_exchange_symbol(symbol), timeframe)
+        self.publish_ohlcv(symbol, timeframe, rows)
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats['reconnects'] = self.reconnects
+        return stats
+
+
+class SimulatedFeed(MarketFeed):
+    """
+    本地模拟数据源
+
+    - push_ticker / push_trade / push_ohlcv: 在调用线程中直接发布事件（单元测试）
+    - replay: 回放 MarketRecorder 录制的 JSONL 文件或事件字典列表
+    """
+
+    transport = "simulated"
+
+    def __init__(self, exchange: str = "simulated", recording: str = None,
+                 speed: float = None, bus: MarketDataBus = None):
+        """
+        Args:
+            recording: start() 时在后台线程回放的录制文件
+            speed: 回放速度倍数（0 表示不等待），默认 MARKET_STREAM_REPLAY_SPEED
+        """
+        super().__init__(exchange, bus)
+        self.recording = recording
+        self.speed = getattr(config, 'MARKET_STREAM_REPLAY_SPEED', 1.0) if speed is None else speed
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.running = True
+        if self.recording and self._thread is None:
+            self._thread = threading.Thread(
+                target=self.replay, args=(self.recording,),
+                name="simulated-feed", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def push_ticker(self, symbol: str, last: float, **fields):
+        """发布一条行情（fields 为 ccxt ticker 字段，如 bid / ask / baseVolume）"""
+        self.publish_ticker(symbol, dict(fields, last=last))
+
+    def push_trade(self, symbol: str, price: float, amount: float, side: str = None,
+                   timestamp: int = None):
+        """发布一笔成交"""
+        self.publish_trades(symbol, [{'price': price, 'amount': amount, 'side': side,
+                                      'timestamp': timestamp}])
+
+    def push_ohlcv(self, symbol: str, timeframe: str, rows: List[List[float]]):
+        """推送原始K线（与 WebSocket 相同的收盘检测）"""
+        self.publish_ohlcv(symbol, timeframe, rows)
+
+    def replay(self, source: Union[str, Iterable[Dict]], speed: float = None) -> int:
+        """
+        回放录制的事件（接收时间更新为当前时间）
+
+        Args:
+            source: JSONL 文件路径或事件字典序列
+            speed: 回放速度倍数，按录制时的接收间隔等待；0 表示不等待
+
+        Returns:
+            回放的事件数量
+        """
+        speed = self.speed if speed is None else speed
+        if isinstance(source, str):
+            with open(source, encoding='utf-8') as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = list(source)
+
+        count = 0
+        previous = None
+        self.running = True
+        for record in records:
+            if not self.running:
+                break
+            event = event_from_dict(record)
+            if speed and previous is not None:
+                time.sleep(max(event.received_at - previous, 0) / speed)
+            previous = event.received_at
+            event.received_at = time.time()
+            self._publish(event)
+            count += 1
+        return count
+
+
+class MarketRecorder:
+    """把总线上的行情事件录制为 JSONL（每行一个事件）"""
+
+    def __init__(self, path: str, bus: MarketDataBus = None, topics: Iterable[str] = TOPICS,
+                 symbol: str = None):
+        self.path = path
+        self.bus = bus or get_market_bus()
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._tokens = [self.bus.subscribe(topic, self._record, symbol) for topic in topics]
+
+    def _record(self, event):
+        line = json.dumps(event.to_dict(), ensure_ascii=False)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self.count += 1
+
+    def close(self):
+        """停止录制并关闭文件"""
+        for token in self._tokens:
+            self.bus.unsubscribe(token)
+        with self._lock:
+            self._file.close()
+
+
+# ==================== 全局数据源 ====================
+
+_feeds: Dict[str, MarketFeed] = {}
+_feeds_lock = threading.Lock()
+
+
+def create_market_feed(exchange: str, symbols: Iterable[str] = (), timeframes: Iterable[str] = (),
+                       transport: str = None) -> MarketFeed:
+    """
+    按配置创建数据源
+
+    Args:
+        transport: websocket / simulated，默认 MARKET_STREAM_TRANSPORT
+    """
+    transport = transport or getattr(config, 'MARKET_STREAM_TRANSPORT', 'websocket')
+    if transport == "websocket":
+        return WebSocketFeed(exchange, symbols, timeframes)
+    if transport == "simulated":
+        feed = SimulatedFeed(exchange, recording=getattr(config, 'MARKET_STREAM_RECORDING', '') or None)
+        feed.watch(symbols, timeframes)
+        return feed
+    raise ValueError(f"不支持的行情传输方式: {transport}")
+
+
+def start_market_stream(exchange: str, symbols: Iterable[str], timeframes: Iterable[str] = (),
+                        transport: str = None) -> MarketFeed:
+    """
+    启动（或复用）某交易所的行情推送，追加订阅 symbols / timeframes
+
+    同一进程内每个交易所只有一个数据源，所有消费者共享同一条连接和事件总线。
+    """
+    with _feeds_lock:
+        feed = _feeds.get(exchange)
+        if feed is None:
+            feed = create_market_feed(exchange, symbols, timeframes, transport)
+            _feeds[exchange] = feed
+        else:
+            feed.watch(symbols, timeframes)
+    try:
+        feed.start()
+    except Exception:
+        # 启动失败的数据源不保留，下次调用重新创建
+        with _feeds_lock:
+            if _feeds.get(exchange) is feed:
+                del _feeds[exchange]
+        raise
+    return feed
+
+
+def get_market_stream(exchange: str) -> Optional[MarketFeed]:
+    """获取已启动的行情数据源"""
+    return _feeds.get(exchange)
+
+
+def stop_market_streams():
+    """停止所有行情数据源"""
+    with _feeds_lock:
+        feeds = list(_feeds.values())
+        _feeds.clear()
+    for feed in feeds:
+        try:
+            feed.stop()
+        except Exception as e:
+            logger.warning(f"停止行情数据源失败 ({feed.exchange}): {e}")
@@ -0,0 +1,282 @@
+"""
+实时K线增量缓冲区
+
+每个 (exchange, symbol, timeframe) 一份 KlineArray 缓冲区：
+- 启动时全量拉取一次 limit 根K线（多个调用方请求不同数量时取最大值，按各自的 limit 截取返回）
+- 之后每个循环只拉取上次最后一根K线（可能是进行中的K线）以来的K线，就地更新
+- 对外返回独立的 DataFrame 副本，调用方可以自由修改，也不会随下次刷新变化；
+  零拷贝视图只在缓冲区内部使用
+- 检测到缺口（新数据与缓冲区不连续）或漂移（已收盘K线被改写、时间间隔异常）时全量重新同步
+
+相比每次拉取 KLINE_LIMIT 根K线并重建 DataFrame，请求数据量、解析和内存分配都降到 1~2 根K线。
+"""
+import threading
+import time
+from typing import Any, Callable, Awaitable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import settings as config
+from utils.logger_utils import get_logger
+from .aggregator import timeframe_to_ms
+from .klines import KlineArray, KLINE_FIELDS
+
+logger = get_logger("kline_buffer")
+
+
+def _to_rows(data: Any) -> np.ndarray:
+    """ccxt 原始K线列表或 DataFrame → (n, 6) float64 数组"""
+    if isinstance(data, pd.DataFrame):
+        klines = KlineArray.from_frame(data, dtype='float64')
+        return np.column_stack([klines.timestamp] + [klines[field] for field in KLINE_FIELDS])
+    if data is None or len(data) == 0:
+        return np.empty((0, 6))
+    return np.asarray(data, dtype=np.float64).reshape(-1, 6)
+
+
+class KlineBuffer:
+    """
+    单个 (symbol, timeframe) 的增量K线缓冲区
+
+    用法:
+        buffer = KlineBuffer('ETH/USDT:USDT', '15m', limit=200)
+        df = buffer.refresh(lambda n: exchange.fetch_ohlcv(symbol, '15m', limit=n))
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = None,
+        max_incremental: int = None,
+        dtype=None
+    ):
+        """
+        Args:
+            symbol: 交易对
+            timeframe: 时间周期
+            limit: 对外提供的K线数量，默认 KLINE_LIMIT
+            max_incremental: 增量拉取的最大K线数，超过则全量同步，默认 KLINE_BUFFER_MAX_INCREMENTAL
+            dtype: 浮点精度，默认 KLINE_FLOAT_DTYPE
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.timeframe_ms = timeframe_to_ms(timeframe)
+        self.limit = int(limit or getattr(config, 'KLINE_LIMIT', 200))
+        self.max_incremental = int(
+            max_incremental or getattr(config, 'KLINE_BUFFER_MAX_INCREMENTAL', 20)
+        )
+        # 容量留出一倍余量，减少裁剪次数
+        self._klines = KlineArray(capacity=2 * self.limit + self.max_incremental, dtype=dtype)
+        self._lock = threading.Lock()
+        self._seeded_limit = 0      # 最近一次全量同步时的 limit
+
+        # 统计
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.gaps = 0
+        self.drifts = 0
+        self.bars_fetched = 0
+
+    # ==================== 状态 ====================
+
+    @property
+    def is_seeded(self) -> bool:
+        """是否已完成首次全量同步"""
+        return len(self._klines) > 0
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """最后一根K线的时间戳（ms）"""
+        return self._klines.last_timestamp
+
+    def __len__(self) -> int:
+        return len(self._klines)
+
+    def reset(self):
+        """清空缓冲区，下次刷新时全量同步"""
+        with self._lock:
+            self._klines.trim(0)
+
+    def fetch_limit(self, now_ms: float = None) -> int:
+        """
+        本次刷新需要拉取的K线数量
+
+        覆盖从缓冲区最后一根K线（上次可能未收盘）到当前进行中K线的全部K线，
+        并多取一根已收盘K线用于漂移校验。未同步或落后太多时返回 limit（全量）。
+        """
+        if not self.is_seeded or self._seeded_limit < self.limit:
+            return self.limit
+        if now_ms is None:
+            now_ms = time.time() * 1000
+
+        behind = int((now_ms - self.last_timestamp) // self.timeframe_ms)
+        count = max(behind, 0) + 2
+        if count > self.max_incremental:
+            return self.limit
+        return count
+
+    # ==================== 写入 ====================
+
+    def seed(self, data: Any) -> bool:
+        """用全量K线重建缓冲区"""
+        rows = _to_rows(data)
+        with self._lock:
+            self._klines.trim(0)
+            if len(rows) == 0:
+                return False
+            self._klines.extend(rows)
+            self._seeded_limit = self.limit
+            self.full_syncs += 1
+            self.bars_fetched += len(rows)
+        return True
+
+    def update(self, data: Any) -> bool:
+        """
+        增量合并最新K线
+
+        Returns:
+            False 表示检测到缺口或漂移，需要全量重新同步
+        """
+        rows = _to_rows(data)
+        if len(rows) == 0:
+            return True
+        if not self.is_seeded:
+            return self.seed(rows)
+
+        ts = rows[:, 0].astype(np.int64)
+        tf_ms = self.timeframe_ms
+
+        with self._lock:
+            self.bars_fetched += len(rows)
+            last_ts = self._klines.last_timestamp
+
+            if int(ts[0]) > last_ts + tf_ms:
+                self.gaps += 1
+                logger.warning(
+                    f"{self.symbol} {self.timeframe} K线出现缺口: "
+                    f"缓冲区最后={last_ts}, 新数据起始={int(ts[0])}"
+                )
+                return False
+
+            if len(ts) > 1 and np.any(np.diff(ts) != tf_ms):
+                self.drifts += 1
+                logger.warning(f"{self.symbol} {self.timeframe} K线时间间隔异常，重新同步")
+                return False
+
+            # 与缓冲区重叠的已收盘K线（早于缓冲区最后一根）必须一致，否则视为漂移
+            buffered_ts = self._klines.timestamp
+            closed = ts < last_ts
+            if closed.any():
+                pos = np.searchsorted(buffered_ts, ts[closed])
+                if (
+                    np.any(buffered_ts[pos] != ts[closed])
+                    or not np.allclose(self._klines.close[pos], rows[closed, 4], rtol=1e-6)
+                ):
+                    self.drifts += 1
+                    logger.warning(f"{self.symbol} {self.timeframe} 已收盘K线与缓冲区不一致，重新同步")
+                    return False
+
+            self._klines.extend(rows[ts >= last_ts])
+            if len(self._klines) > 2 * self.limit:
+                self._klines.trim(self.limit)
+            self.incremental_syncs += 1
+        return True
+
+    # ==================== 读取 ====================
+
+    def ensure_limit(self, limit: int):
+        """扩大对外提供的K线数量（不足时下次刷新全量同步）"""
+        with self._lock:
+            self.limit = max(self.limit, int(limit))
+
+    def frame(self, limit: int = None) -> Optional[pd.DataFrame]:
+        """
+        最近 limit 根K线的 DataFrame（独立副本，不随后续刷新变化）
+        """
+        with self._lock:
+            if not self.is_seeded:
+                return None
+            return self._klines.tail(limit or self.limit).to_frame(readonly=True).copy()
+
+    def refresh(self, fetch: Callable[[int], Any], now_ms: float = None,
+                limit: int = None) -> Optional[pd.DataFrame]:
+        """
+        拉取增量K线并返回最新窗口
+
+        Args:
+            fetch: fetch(limit) 返回 ccxt 原始K线列表或 DataFrame
+            now_ms: 当前时间（ms），默认取系统时间
+            limit: 返回的K线数量，默认为缓冲区的 limit
+        """
+        count = self.fetch_limit(now_ms)
+        if count >= self.limit:
+            self.seed(fetch(self.limit))
+        elif not self.update(fetch(count)):
+            self.seed(fetch(self.limit))
+        return self.frame(limit)
+
+    async def refresh_async(
+        self,
+        fetch: Callable[[int], Awaitable[Any]],
+        now_ms: float = None,
+        limit: int = None
+    ) -> Optional[pd.DataFrame]:
+        """refresh 的异步版本，fetch(limit) 返回协程"""
+        count = self.fetch_limit(now_ms)
+        if count >= self.limit:
+            self.seed(await fetch(self.limit))
+        elif not self.update(await fetch(count)):
+            self.seed(await fetch(self.limit))
+        return self.frame(limit)
+
+    def get_stats(self) -> Dict:
+        """获取缓冲区统计信息"""
+        return {
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'bars': len(self._klines),
+            'full_syncs': self.full_syncs,
+            'incremental_syncs': self.incremental_syncs,
+            'gaps': self.gaps,
+            'drifts': self.drifts,
+            'bars_fetched': self.bars_fetched,
+        }
+
+
+# ==================== 全局缓冲区 ====================
+
+_buffers: Dict[Tuple[str, str, str], KlineBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def get_kline_buffer(exchange: str, symbol: str, timeframe: str, limit: int = None) -> KlineBuffer:
+    """
+    获取全局K线缓冲区（首次调用时创建）
+
+    同一 (exchange, symbol, timeframe) 只有一个缓冲区；请求的 limit 大于现有缓冲区时扩大缓冲区，
+    调用方通过 refresh(..., limit=limit) 截取自己需要的数量。
+
+    Args:
+        exchange: 交易所名称（不同交易所的同名交易对互不共享）
+        symbol: 交易对
+        timeframe: 时间周期
+        limit: 需要的K线数量，默认 KLINE_LIMIT
+    """
+    limit = int(limit or getattr(config, 'KLINE_LIMIT', 200))
+    key = (exchange, symbol, timeframe)
+    with _buffers_lock:
+        buffer = _buffers.get(key)
+        if buffer is None:
+            buffer = KlineBuffer(symbol, timeframe, limit)
+            _buffers[key] = buffer
+        elif limit > buffer.limit:
+            buffer.ensure_limit(limit)
+        return buffer
+
+
+def reset_kline_buffers():
+    """清空所有全局缓冲区"""
+    with _buffers_lock:
+        _buffers.clear()
@@ -0,0 +1,379 @@
+"""
+紧凑K线容器
+
+以列存（struct-of-arrays）方式保存K线：
+- 时间戳为 int64 毫秒，OHLCV 每列一段连续内存，精度可选 float32 / float64
+- 追加为均摊 O(1)（容量不足时倍增），同一时间戳的追加视为更新最后一根K线
+- 切片/窗口返回共享底层内存的视图，不复制数据；trim / 扩容换新缓冲区，已取出的视图不受影响
+  （只有同一时间戳的追加会就地更新最后一根K线）
+- to_frame() 生成与 fetch_ohlcv 一致的 DataFrame，供 pandas 使用方兼容
+- parse_ohlcv() 是所有K线拉取路径共用的 ccxt 原始列表转换器
+
+多品种、长历史同时驻留内存时，float32 模式约为 pandas float64 DataFrame 的一半内存。
+"""
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from config.settings import settings as config
+
+KLINE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+OHLCV_COLUMNS = ('timestamp',) + KLINE_FIELDS
+
+_DEFAULT_CAPACITY = 256
+
+
+def _resolve_dtype(dtype) -> np.dtype:
+    """解析浮点精度，默认使用 KLINE_FLOAT_DTYPE"""
+    dtype = np.dtype(dtype or getattr(config, 'KLINE_FLOAT_DTYPE', 'float64'))
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"不支持的K线精度: {dtype}")
+    return dtype
+
+
+class KlineArray:
+    """
+    列存K线容器
+
+    用法:
+        klines = KlineArray.from_ohlcv(exchange.fetch_ohlcv(symbol, '15m'), dtype='float32')
+        klines.append(ts, o, h, l, c, v)
+        recent = klines[-200:]          # 零拷贝视图
+        df = recent.to_frame()          # 需要 pandas 时再转换
+    """
+
+    __slots__ = ('_ts', '_values', '_start', '_end', '_is_view')
+
+    def __init__(self, capacity: int = _DEFAULT_CAPACITY, dtype=None):
+        """
+        Args:
+            capacity: 初始容量
+            dtype: 浮点精度（'float32' / 'float64'），默认 KLINE_FLOAT_DTYPE
+        """
+        capacity = max(int(capacity), 1)
+        self._ts = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty((len(KLINE_FIELDS), capacity), dtype=_resolve_dtype(dtype))
+        self._start = 0
+        self._end = 0
+        self._is_view = False
+
+    # ==================== 构造 ====================
+
+    @classmethod
+    def from_ohlcv(cls, rows: Any, dtype=None) -> 'KlineArray':
+        """
+        从 ccxt 原始K线列表 [[ts, o, h, l, c, v], ...] 构建
+
+        Args:
+            rows: ccxt fetch_ohlcv 返回值或形状为 (n, 6) 的数组
+            dtype: 浮点精度
+        """
+        raw = np.asarray(rows, dtype=np.float64) if len(rows) else np.empty((0, 6))
+        klines = cls(capacity=max(len(raw), _DEFAULT_CAPACITY), dtype=dtype)
+        klines.extend(raw)
+        return klines
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dtype=None) -> 'KlineArray':
+        """
+        从 DataFrame 构建（timestamp 索引或 timestamp 列）
+
+        Args:
+            df: 包含 open/high/low/close/volume 列的 K线数据
+            dtype: 浮点精度
+        """
+        if isinstance(df.index, pd.DatetimeIndex):
+            ts = df.index.values.astype('datetime64[ms]').astype(np.int64)
+        else:
+            ts = pd.to_datetime(df['timestamp']).values.astype('datetime64[ms]').astype(np.int64)
+
+        klines = cls(capacity=max(len(df), _DEFAULT_CAPACITY), dtype=dtype)
+        n = len(df)
+        klines._ts[:n] = ts
+        for i, field in enumerate(KLINE_FIELDS):
+            klines._values[i, :n] = df[field].to_numpy()
+        klines._end = n
+        return klines
+
+    # ==================== 基本属性 ====================
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"KlineArray(0, dtype={self.dtype})"
+        first = pd.Timestamp(int(self._ts[self._start]), unit='ms')
+        last = pd.Timestamp(int(self._ts[self._end - 1]), unit='ms')
+        return f"KlineArray({len(self)}, dtype={self.dtype}, {first} ~ {last})"
+
+    @property
+    def dtype(self) -> np.dtype:
+        """浮点精度"""
+        return self._values.dtype
+
+    @property
+    def is_view(self) -> bool:
+        """是否为共享内存的窗口视图"""
+        return self._is_view
+
+    @property
+    def nbytes(self) -> int:
+        """有效数据占用的字节数"""
+        n = len(self)
+        return n * (self._ts.itemsize + len(KLINE_FIELDS) * self._values.itemsize)
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        """int64 毫秒时间戳（视图）"""
+        return self._ts[self._start:self._end]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._values[0, self._start:self._end]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._values[1, self._start:self._end]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._values[2, self._start:self._end]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._values[3, self._start:self._end]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._values[4, self._start:self._end]
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """最后一根K线的时间戳（ms）"""
+        return int(self._ts[self._end - 1]) if len(self) else None
+
+    # ==================== 访问 ====================
+
+    def __getitem__(self, key: Union[slice, int, str]):
+        """
+        - 切片: 返回零拷贝窗口视图
+        - 整数: 返回 (ts, open, high, low, close, volume)
+        - 字段名: 返回对应列的数组视图
+        """
+        if isinstance(key, str):
+            if key == 'timestamp':
+                return self.timestamp
+            if key not in KLINE_FIELDS:
+                raise KeyError(key)
+            return self._values[KLINE_FIELDS.index(key), self._start:self._end]
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("KlineArray 切片不支持步长")
+            return self._view(self._start + start, self._start + max(start, stop))
+
+        n = len(self)
+        index = int(key)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(key)
+        pos = self._start + index
+        return (int(self._ts[pos]),) + tuple(float(v) for v in self._values[:, pos])
+
+    def tail(self, n: int) -> 'KlineArray':
+        """最近 n 根K线的零拷贝视图"""
+        return self[-n:] if n < len(self) else self[:]
+
+    def _view(self, start: int, end: int) -> 'KlineArray':
+        view = object.__new__(KlineArray)
+        view._ts = self._ts
+        view._values = self._values
+        view._start = start
+        view._end = end
+        view._is_view = True
+        return view
+
+    # ==================== 写入 ====================
+
+    def _reserve(self, extra: int):
+        """确保还能追加 extra 根K线（倍增扩容）"""
+        needed = self._end + extra
+        capacity = len(self._ts)
+        if needed <= capacity:
+            return
+
+        new_capacity = max(needed, capacity * 2)
+        ts = np.empty(new_capacity, dtype=np.int64)
+        values = np.empty((len(KLINE_FIELDS), new_capacity), dtype=self._values.dtype)
+        ts[:self._end] = self._ts[:self._end]
+        values[:, :self._end] = self._values[:, :self._end]
+        self._ts = ts
+        self._values = values
+
+    def _check_writable(self):
+        if self._is_view:
+            raise ValueError("KlineArray 窗口视图为只读，不能追加数据")
+
+    def append(
+        self,
+        ts: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float
+    ):
+        """
+        追加一根K线；时间戳与最后一根相同时就地更新（进行中的K线）
+
+        Raises:
+            ValueError: 时间戳早于最后一根K线，或在视图上追加
+        """
+        self._check_writable()
+        ts = int(ts)
+
+        if self._end:
+            last_ts = int(self._ts[self._end - 1])
+            if ts == last_ts:
+                self._values[:, self._end - 1] = (open, high, low, close, volume)
+                return
+            if ts < last_ts:
+                raise ValueError(f"K线时间戳倒序: {ts} < {last_ts}")
+
+        self._reserve(1)
+        self._ts[self._end] = ts
+        self._values[:, self._end] = (open, high, low, close, volume)
+        self._end += 1
+
+    def extend(self, rows: Any):
+        """
+        批量追加K线（ccxt 原始列表或 (n, 6) 数组）
+
+        早于最后一根的K线会被忽略，与最后一根时间戳相同的K线会覆盖最后一根。
+        """
+        self._check_writable()
+        raw = np.asarray(rows, dtype=np.float64)
+        if raw.size == 0:
+            return
+        raw = raw.reshape(-1, 6)
+
+        ts = raw[:, 0].astype(np.int64)
+        if self._end:
+            last_ts = int(self._ts[self._end - 1])
+            same = ts == last_ts
+            if same.any():
+                self._values[:, self._end - 1] = raw[same][-1, 1:6]
+            keep = ts > last_ts
+            raw = raw[keep]
+            ts = ts[keep]
+            if not len(ts):
+                return
+
+        if len(ts) > 1 and np.any(np.diff(ts) <= 0):
+            order = np.argsort(ts, kind='stable')
+            ts = ts[order]
+            raw = raw[order]
+            last = np.r_[ts[1:] != ts[:-1], True]
+            ts = ts[last]
+            raw = raw[last]
+
+        n = len(ts)
+        self._reserve(n)
+        self._ts[self._end:self._end + n] = ts
+        self._values[:, self._end:self._end + n] = raw[:, 1:6].T
+        self._end += n
+
+    def trim(self, max_bars: int):
+        """
+        只保留最近 max_bars 根K线
+
+        复制到新的缓冲区（容量不变），之前取出的视图仍指向原缓冲区中的原K线，不会被搬移覆盖。
+        """
+        self._check_writable()
+        n = len(self)
+        if n <= max_bars:
+            return
+        drop = self._end - max_bars
+        capacity = len(self._ts)
+        ts = np.empty(capacity, dtype=np.int64)
+        values = np.empty((len(KLINE_FIELDS), capacity), dtype=self._values.dtype)
+        ts[:max_bars] = self._ts[drop:self._end]
+        values[:, :max_bars] = self._values[:, drop:self._end]
+        self._ts = ts
+        self._values = values
+        self._start = 0
+        self._end = max_bars
+
+    # ==================== 转换 ====================
+
+    def datetime_index(self) -> pd.DatetimeIndex:
+        """生成 timestamp 索引"""
+        return pd.DatetimeIndex(self.timestamp.astype('datetime64[ms]'), name='timestamp')
+
+    def to_frame(self, readonly: bool = False) -> pd.DataFrame:
+        """
+        转换为 DataFrame（timestamp 索引 + OHLCV 列，保持当前精度）
+
+        Args:
+            readonly: 列直接引用底层内存并设为只读（零拷贝，原地写入会抛出 ValueError）
+        """
+        index = self.datetime_index()
+        columns = {}
+        for field in KLINE_FIELDS:
+            column = self[field]
+            if readonly:
+                column = column.view()
+                column.flags.writeable = False
+            columns[field] = column
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def copy(self) -> 'KlineArray':
+        """复制为独立（可写）的容器"""
+        klines = KlineArray(capacity=max(len(self), 1), dtype=self.dtype)
+        n = len(self)
+        klines._ts[:n] = self.timestamp
+        klines._values[:, :n] = self._values[:, self._start:self._end]
+        klines._end = n
+        return klines
+
+
+def as_frame(data: Union[pd.DataFrame, KlineArray]) -> pd.DataFrame:
+    """将 KlineArray 转换为 DataFrame，DataFrame 原样返回"""
+    if isinstance(data, KlineArray):
+        return data.to_frame()
+    return data
+
+
+def parse_ohlcv(rows: Any, as_array: bool = False, dtype=None,
+                index: bool = True) -> Union[pd.DataFrame, KlineArray]:
+    """
+    ccxt 原始K线列表 [[ts, o, h, l, c, v], ...] → DataFrame / KlineArray
+
+    一次 np.asarray(float64) 得到 (n, 6) 矩阵，OHLCV 转置为一整块连续内存直接交给 DataFrame，
+    时间戳 int64 毫秒按 datetime64[ms] 视图转换，不经过 pd.to_datetime 逐次解析。
+
+    Args:
+        rows: fetch_ohlcv 返回值或形状为 (n, 6) 的数组（缺失值按 NaN 处理）
+        as_array: True 时返回 KlineArray（精度默认 KLINE_FLOAT_DTYPE）
+        dtype: 浮点精度，DataFrame 默认 float64
+        index: False 时 timestamp 作为普通列返回（RangeIndex）
+    """
+    raw = np.asarray(rows, dtype=np.float64) if len(rows) else np.empty((0, 6))
+    raw = raw.reshape(-1, 6)
+    if as_array:
+        return KlineArray.from_ohlcv(raw, dtype=dtype)
+
+    ts = raw[:, 0].astype(np.int64).view('datetime64[ms]')
+    values = np.ascontiguousarray(raw[:, 1:].T, dtype=np.dtype(dtype or np.float64))
+    if index:
+        return pd.DataFrame(
+            values.T, index=pd.DatetimeIndex(ts, name='timestamp'),
+            columns=list(KLINE_FIELDS), copy=False,
+        )
+    df = pd.DataFrame(values.T, columns=list(KLINE_FIELDS), copy=False)
+    df.insert(0, 'timestamp', ts)
+    return df
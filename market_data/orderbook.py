@@ -0,0 +1,347 @@
+"""
+L2 订单簿
+
+每个 (exchange, symbol) 一份订单簿，所有使用方（套利机会检测、流动性验证等）共享：
+- 买卖盘各用一对有序 NumPy 数组保存（价格键升序，第 0 档为最优价；买盘以负价格作键）
+- 支持全量快照和增量更新（数量为 0 表示删除该档），增量批量合并为一次向量化操作
+- 每次更新后预先计算累计数量与累计金额，查询均为 O(log n)：
+  最优买卖价、X 基点内深度、前 N 档深度、成交 Q 所需的 VWAP / 滑点
+- 更新时整体替换数组（不原地修改），读取方无需加锁即可拿到一致的一侧数据
+- refresh() 在快照过期（ORDERBOOK_MAX_AGE）时才通过 REST 重新拉取，并发调用只拉取一次
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from config.settings import settings as config
+from utils.logger_utils import get_logger
+
+logger = get_logger("orderbook")
+
+BID = 'bid'
+ASK = 'ask'
+
+
+class _Side(NamedTuple):
+    """一侧盘口（不可变，更新时整体替换）"""
+    keys: np.ndarray          # 价格键（升序）：卖盘为价格，买盘为负价格
+    sizes: np.ndarray         # 各档数量
+    cum_size: np.ndarray      # 累计数量
+    cum_notional: np.ndarray  # 累计金额（价格 × 数量）
+
+
+def _build_side(keys: np.ndarray, sizes: np.ndarray, max_levels: Optional[int]) -> _Side:
+    if max_levels:
+        keys, sizes = keys[:max_levels], sizes[:max_levels]
+    return _Side(keys, sizes, np.cumsum(sizes), np.cumsum(np.abs(keys) * sizes))
+
+
+_EMPTY = _build_side(np.empty(0), np.empty(0), None)
+
+
+def _as_levels(levels: Any) -> np.ndarray:
+    """[[price, amount, ...], ...] → (n, 2) float64 数组"""
+    if levels is None or len(levels) == 0:
+        return np.empty((0, 2))
+    array = np.asarray(levels, dtype=np.float64)
+    return array.reshape(len(array), -1)[:, :2]
+
+
+class OrderBook:
+    """
+    单个交易对的 L2 订单簿
+
+    用法:
+        book = get_order_book('bitget', 'ETH/USDT:USDT')
+        book.refresh(lambda: exchange.get_orderbook(symbol, limit=20))
+        book.depth_within(10, BID)        # 买一价以下 10 基点内的买盘金额
+        book.vwap('buy', 2.5)             # 市价买入 2.5 的成交均价
+    """
+
+    def __init__(self, symbol: str, exchange: str = '', max_levels: int = None):
+        """
+        Args:
+            symbol: 交易对
+            exchange: 交易所名称
+            max_levels: 每侧最多保留的档位数（None 不限制）
+        """
+        self.symbol = symbol
+        self.exchange = exchange
+        self.max_levels = max_levels
+        self._bids = _EMPTY
+        self._asks = _EMPTY
+        self.timestamp: Optional[int] = None
+        self.nonce: Optional[int] = None
+        self.updated_at: float = 0.0
+        self._lock = threading.Lock()
+
+        # 统计
+        self.snapshots = 0
+        self.deltas = 0
+        self.stale_deltas = 0
+
+    @classmethod
+    def from_snapshot(cls, orderbook: Dict, symbol: str = '', exchange: str = '') -> 'OrderBook':
+        """由 ccxt / get_orderbook 格式的字典创建订单簿"""
+        book = cls(symbol, exchange)
+        book.apply_snapshot(orderbook.get('bids'), orderbook.get('asks'),
+                            orderbook.get('timestamp'), orderbook.get('nonce'))
+        return book
+
+    # ==================== 写入 ====================
+
+    def _side(self, side: str) -> _Side:
+        return self._bids if side == BID else self._asks
+
+    @staticmethod
+    def _sign(side: str) -> float:
+        return -1.0 if side == BID else 1.0
+
+    def _snapshot_side(self, side: str, levels: Any) -> _Side:
+        array = _as_levels(levels)
+        array = array[array[:, 1] > 0]
+        keys = self._sign(side) * array[:, 0]
+        order = np.argsort(keys, kind='stable')
+        return _build_side(keys[order], array[order, 1], self.max_levels)
+
+    def _merge_side(self, side: str, updates: Any) -> _Side:
+        """把一批增量合并进一侧（同一价格以批内最后一次更新为准）"""
+        current = self._side(side)
+        array = _as_levels(updates)
+        if len(array) == 0:
+            return current
+
+        keys = self._sign(side) * array[:, 0]
+        unique_keys, last = np.unique(keys[::-1], return_index=True)
+        sizes = array[::-1, 1][last]
+
+        pos = np.searchsorted(unique_keys, current.keys)
+        replaced = (pos < len(unique_keys)) & (unique_keys[np.minimum(pos, len(unique_keys) - 1)] == current.keys)
+        alive = sizes > 0
+
+        merged_keys = np.concatenate((current.keys[~replaced], unique_keys[alive]))
+        merged_sizes = np.concatenate((current.sizes[~replaced], sizes[alive]))
+        order = np.argsort(merged_keys, kind='stable')
+        return _build_side(merged_keys[order], merged_sizes[order], self.max_levels)
+
+    def _accept(self, timestamp: Optional[int], nonce: Optional[int]):
+        self.timestamp = int(timestamp) if timestamp else int(time.time() * 1000)
+        if nonce is not None:
+            self.nonce = nonce
+        self.updated_at = time.monotonic()
+
+    def _replace(self, bids: Iterable, asks: Iterable, timestamp: Optional[int], nonce: Optional[int]):
+        self._bids = self._snapshot_side(BID, bids)
+        self._asks = self._snapshot_side(ASK, asks)
+        self._accept(timestamp, nonce)
+        self.snapshots += 1
+
+    def apply_snapshot(self, bids: Iterable, asks: Iterable,
+                       timestamp: Optional[int] = None, nonce: Optional[int] = None):
+        """用全量快照替换订单簿"""
+        with self._lock:
+            self._replace(bids, asks, timestamp, nonce)
+
+    def apply_delta(self, bids: Iterable = (), asks: Iterable = (),
+                    timestamp: Optional[int] = None, nonce: Optional[int] = None) -> bool:
+        """
+        应用增量更新（[price, amount]，amount 为 0 表示删除该档）
+
+        Returns:
+            是否应用；nonce 不大于当前 nonce 的过期增量被丢弃
+        """
+        with self._lock:
+            if nonce is not None and self.nonce is not None and nonce <= self.nonce:
+                self.stale_deltas += 1
+                return False
+            self._bids = self._merge_side(BID, bids)
+            self._asks = self._merge_side(ASK, asks)
+            self._accept(timestamp, nonce)
+            self.deltas += 1
+            return True
+
+    def refresh(self, fetch: Callable[[], Optional[Dict]], max_age: float = None) -> 'OrderBook':
+        """
+        快照过期时通过 fetch（返回 get_orderbook 格式的字典）重新拉取
+
+        Args:
+            fetch: 拉取订单簿快照的函数
+            max_age: 快照有效期（秒），默认 ORDERBOOK_MAX_AGE
+        """
+        if max_age is None:
+            max_age = getattr(config, 'ORDERBOOK_MAX_AGE', 1.0)
+        if not self.is_stale(max_age):
+            return self
+        with self._lock:
+            # 并发调用方在锁内复查，只有第一个真正拉取
+            if not self.is_stale(max_age):
+                return self
+            orderbook = fetch()
+            if orderbook:
+                self._replace(orderbook.get('bids'), orderbook.get('asks'),
+                              orderbook.get('timestamp'), orderbook.get('nonce'))
+        return self
+
+    # ==================== 查询 ====================
+
+    def is_stale(self, max_age: float) -> bool:
+        """快照是否早于 max_age 秒（从未更新视为过期）"""
+        return self.updated_at == 0.0 or time.monotonic() - self.updated_at > max_age
+
+    def __len__(self) -> int:
+        return max(len(self._bids.keys), len(self._asks.keys))
+
+    def level_count(self, side: str) -> int:
+        """一侧的档位数"""
+        return len(self._side(side).keys)
+
+    def _top(self, side: str) -> Optional[Tuple[float, float]]:
+        data = self._side(side)
+        if len(data.keys) == 0:
+            return None
+        return float(abs(data.keys[0])), float(data.sizes[0])
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        """买一 (价格, 数量)"""
+        return self._top(BID)
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        """卖一 (价格, 数量)"""
+        return self._top(ASK)
+
+    def mid(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread_bps(self) -> Optional[float]:
+        """买卖价差（基点，相对中间价）"""
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (ask[0] - bid[0]) / ((ask[0] + bid[0]) / 2) * 10000
+
+    def depth(self, side: str, levels: int = None, quote: bool = True) -> float:
+        """
+        前 N 档深度
+
+        Args:
+            side: BID / ASK
+            levels: 档位数（None 为全部）
+            quote: True 返回金额（USDT），False 返回数量
+        """
+        data = self._side(side)
+        count = len(data.keys) if levels is None else min(int(levels), len(data.keys))
+        if count <= 0:
+            return 0.0
+        cumulative = data.cum_notional if quote else data.cum_size
+        return float(cumulative[count - 1])
+
+    def depth_within(self, bps: float, side: str, quote: bool = True) -> float:
+        """
+        距最优价 bps 基点以内的深度
+
+        Args:
+            bps: 基点范围（买盘为买一价以下，卖盘为卖一价以上）
+            side: BID / ASK
+            quote: True 返回金额（USDT），False 返回数量
+        """
+        data = self._side(side)
+        if len(data.keys) == 0:
+            return 0.0
+        best = abs(data.keys[0])
+        limit = best * (1 - bps / 10000) if side == BID else best * (1 + bps / 10000)
+        count = int(np.searchsorted(data.keys, self._sign(side) * limit, side='right'))
+        if count == 0:
+            return 0.0
+        cumulative = data.cum_notional if quote else data.cum_size
+        return float(cumulative[count - 1])
+
+    def vwap(self, side: str, quantity: float, quote: bool = False) -> Optional[float]:
+        """
+        市价成交 quantity 的成交均价
+
+        Args:
+            side: 'buy'（吃卖盘）或 'sell'（吃买盘）
+            quantity: 成交数量；quote=True 时为成交金额（USDT）
+            quote: quantity 是否为金额
+
+        Returns:
+            成交均价；深度不足时返回 None
+        """
+        data = self._asks if side == 'buy' else self._bids
+        if quantity <= 0 or len(data.keys) == 0:
+            return None
+        cumulative = data.cum_notional if quote else data.cum_size
+        idx = int(np.searchsorted(cumulative, quantity, side='left'))
+        if idx >= len(cumulative):
+            return None
+
+        price = float(abs(data.keys[idx]))
+        size_before = float(data.cum_size[idx - 1]) if idx else 0.0
+        notional_before = float(data.cum_notional[idx - 1]) if idx else 0.0
+        if quote:
+            size = size_before + (quantity - notional_before) / price
+            return quantity / size
+        return (notional_before + (quantity - size_before) * price) / quantity
+
+    def slippage(self, side: str, quantity: float, quote: bool = False) -> Optional[float]:
+        """市价成交 quantity 相对最优价的滑点比例（深度不足时返回 None）"""
+        top = self.best_ask() if side == 'buy' else self.best_bid()
+        average = self.vwap(side, quantity, quote)
+        if top is None or average is None:
+            return None
+        return abs(average - top[0]) / top[0]
+
+    def to_dict(self, limit: int = None) -> Dict:
+        """转换为 get_orderbook 格式的字典"""
+        def levels(data: _Side):
+            count = len(data.keys) if limit is None else min(limit, len(data.keys))
+            return np.column_stack((np.abs(data.keys[:count]), data.sizes[:count])).tolist()
+
+        return {
+            'bids': levels(self._bids),
+            'asks': levels(self._asks),
+            'timestamp': self.timestamp or 0,
+            'nonce': self.nonce,
+        }
+
+    def get_stats(self) -> Dict:
+        return {
+            'bid_levels': len(self._bids.keys),
+            'ask_levels': len(self._asks.keys),
+            'snapshots': self.snapshots,
+            'deltas': self.deltas,
+            'stale_deltas': self.stale_deltas,
+            'age': round(time.monotonic() - self.updated_at, 3) if self.updated_at else None,
+        }
+
+
+_books: Dict[Tuple[str, str], OrderBook] = {}
+_books_lock = threading.Lock()
+
+
+def get_order_book(exchange: str, symbol: str) -> OrderBook:
+    """
+    获取全局订单簿（首次调用时创建）
+
+    Args:
+        exchange: 交易所名称（不同交易所的同名交易对互不共享）
+        symbol: 交易对
+    """
+    key = (exchange, symbol)
+    with _books_lock:
+        book = _books.get(key)
+        if book is None:
+            book = OrderBook(symbol, exchange, getattr(config, 'ORDERBOOK_MAX_LEVELS', None))
+            _books[key] = book
+        return book
+
+
+def reset_order_books():
+    """清空所有全局订单簿"""
+    with _books_lock:
+        _books.clear()
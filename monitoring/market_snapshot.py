@@ -13,6 +13,7 @@ from core.trader import BitgetTrader
 from strategies.indicators import IndicatorCalculator
 from strategies.market_regime import MarketRegimeDetector
 from strategies.strategies import analyze_all_strategies, get_consensus_signal
+from market_data import MultiTimeframeAggregator
 from utils.logger_utils import get_logger
 
 logger = get_logger("market_snapshot")
@@ -31,6 +32,15 @@ class MarketSnapshot:
         """
         self.trader = trader
         self.timeframes = timeframes or ['5m', '15m', '1h', '4h']
+        self.aggregator: Optional[MultiTimeframeAggregator] = None
+        if getattr(config, 'MTF_RESAMPLE_ENABLED', False):
+            self.aggregator = MultiTimeframeAggregator(self.timeframes)
+
+    def _load_frames(self) -> Dict[str, pd.DataFrame]:
+        """通过聚合器一次性加载所有周期的K线（基础周期增量拉取，高周期本地重采样）"""
+        return self.aggregator.refresh(
+            lambda tf, limit: self.trader._fetch_ohlcv_raw(config.SYMBOL, tf, limit)
+        )
 
     async def fetch_snapshot(self) -> Dict:
         """
@@ -45,10 +55,19 @@ class MarketSnapshot:
             'timeframes': {}
         }
 
+        # 启用聚合器时先统一加载K线，避免逐周期请求
+        frames: Dict[str, pd.DataFrame] = {}
+        if self.aggregator is not None:
+            try:
+                frames = await asyncio.to_thread(self._load_frames)
+            except Exception as e:
+                logger.warning(f"聚合器加载K线失败，回退逐周期获取: {e}")
+                self.aggregator.reset()
+
         # 并发获取多时间周期数据
         tasks = []
         for tf in self.timeframes:
-            tasks.append(self._fetch_timeframe_data(tf))
+            tasks.append(self._fetch_timeframe_data(tf, frames.get(tf)))
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -65,23 +84,25 @@ class MarketSnapshot:
 
         return snapshot
 
-    async def _fetch_timeframe_data(self, timeframe: str) -> Dict:
+    async def _fetch_timeframe_data(self, timeframe: str, df: Optional[pd.DataFrame] = None) -> Dict:
         """
         获取单个时间周期的数据
 
         Args:
             timeframe: 时间周期（如 '15m', '1h'）
+            df: 已加载的K线数据，为空时直接向交易所获取
 
         Returns:
             包含价格、指标、市场状态、策略信号的字典
         """
         try:
             # 获取K线数据
-            df = self.trader.fetch_ohlcv(
-                symbol=config.SYMBOL,
-                timeframe=timeframe,
-                limit=config.KLINE_LIMIT
-            )
+            if df is None:
+                df = self.trader.fetch_ohlcv(
+                    symbol=config.SYMBOL,
+                    timeframe=timeframe,
+                    limit=config.KLINE_LIMIT
+                )
 
             if df is None or df.empty:
                 return {'error': 'No data available'}
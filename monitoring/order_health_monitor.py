@@ -1,6 +1,9 @@
 """
 订单健康监控器 (Order Health Monitor)
 后台监控订单状态，检测并处理异常订单
+
+挂单列表和撤单都经过订单跟踪器（exchange.order_tracker）：跟踪器轮询时已拉取的挂单快照直接复用，
+撤单会同时解析正在等待该订单的 Future
 """
 from typing import Dict, List, Optional, Set
 from datetime import datetime, timedelta
@@ -8,6 +11,8 @@ from dataclasses import dataclass
 import time
 
 from config.settings import settings as config
+from exchange.interface import ExchangeInterface
+from exchange.order_tracker import OrderTracker, get_order_tracker
 from utils.logger_utils import get_logger, db
 
 logger = get_logger("order_health_monitor")
@@ -126,16 +131,27 @@ class OrderHealthMonitor:
             logger.error(f"订单健康检查失败: {e}")
             return {'error': str(e)}
 
+    def _get_tracker(self) -> Optional[OrderTracker]:
+        """
+        交易执行器背后 ccxt 客户端的订单跟踪器
+
+        支持 BitgetTrader（exchange 为 ccxt 客户端）和 LegacyAdapter / ExchangeInterface（再包一层）
+        """
+        target = getattr(self.trader, 'exchange', None) or getattr(self.trader, '_exchange', None)
+        if isinstance(target, ExchangeInterface):
+            target = target.exchange
+        if target is None:
+            return None
+        return get_order_tracker(target, params={"productType": config.PRODUCT_TYPE})
+
     def _fetch_open_orders(self) -> List[Dict]:
-        """获取所有开放订单"""
+        """获取所有开放订单（优先复用订单跟踪器的挂单快照）"""
         try:
-            if not self.trader.exchange:
+            tracker = self._get_tracker()
+            if tracker is None:
                 return []
 
-            orders = self.trader.exchange.fetch_open_orders(
-                symbol=config.SYMBOL,
-                params={"productType": config.PRODUCT_TYPE}
-            )
+            orders = tracker.fetch_open_orders(config.SYMBOL)
             return orders if orders else []
 
         except Exception as e:
@@ -225,7 +241,10 @@ class OrderHealthMonitor:
         """
         try:
             logger.info(f"🚫 取消订单: {order_id}, 原因: {reason}")
-            self.trader.cancel_order(order_id)
+            tracker = self._get_tracker()
+            if tracker is None:
+                return False
+            tracker.cancel(order_id, config.SYMBOL)
             self.stats['orders_cleaned'] += 1
             return True
 
@@ -11,7 +11,9 @@
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from types import SimpleNamespace
+from typing import Callable, Dict, Any, Optional, List
+import copy
 import time
 import traceback
 from collections import deque
@@ -19,6 +21,7 @@ import hashlib
 
 from config.settings import settings as config
 from utils.logger_utils import get_logger, notifier, db
+from market_data import TICKER
 
 
 class PriceHistory:
@@ -347,6 +350,12 @@ class StatusMonitorScheduler:
         # 推送过滤器
         self.push_filter = FeishuPushFilter()
 
+        # 行情推送订阅（attach_stream 后价格历史由行情事件更新）
+        self._stream = None
+        self._stream_token = None
+        self._stream_sample_seconds = 5.0
+        self._last_stream_sample = 0.0
+
         if self.enabled:
             self.logger.info(f"✅ 状态监控调度器已启用，间隔: {interval_minutes}分钟")
         else:
@@ -372,13 +381,45 @@ class StatusMonitorScheduler:
 
     def update_price(self, price: float):
         """
-        更新价格记录
+        更新价格记录（已订阅行情推送时忽略，由事件更新）
 
         Args:
             price: 当前价格
         """
+        if self._stream_token is not None:
+            return
         self.price_history.add_price(price)
 
+    def attach_stream(self, bus, symbol: str, sample_seconds: float = 5.0):
+        """
+        订阅行情推送更新价格历史
+
+        Args:
+            bus: MarketDataBus
+            symbol: 交易对
+            sample_seconds: 采样间隔（价格历史按每5秒一条设计容量）
+        """
+        self.detach_stream()
+        self._stream = bus
+        self._stream_sample_seconds = sample_seconds
+        self._stream_token = bus.subscribe(TICKER, self._on_ticker_event, symbol=symbol)
+        self.logger.info(f"状态监控已订阅行情推送: {symbol}")
+
+    def detach_stream(self):
+        """取消行情推送订阅，恢复由主循环更新价格"""
+        if self._stream_token is not None:
+            self._stream.unsubscribe(self._stream_token)
+            self._stream_token = None
+
+    def _on_ticker_event(self, event):
+        """行情事件回调：按采样间隔记录价格"""
+        if event.last is None:
+            return
+        if event.received_at - self._last_stream_sample < self._stream_sample_seconds:
+            return
+        self._last_stream_sample = event.received_at
+        self.price_history.add_price(event.last)
+
     def check_and_push(self, trader, risk_manager) -> bool:
         """
         检查并推送状态（如果需要）
@@ -475,6 +516,51 @@ class StatusMonitorScheduler:
         return remaining if remaining.total_seconds() > 0 else timedelta(0)
 
 
+class TraderSnapshot:
+    """
+    交易器读取接口的只读快照
+
+    异步主循环用本轮已取得的K线 / 持仓 / 行情构建快照交给推送线程，推送线程不再与策略评估
+    并发使用同一个同步 ccxt 客户端和 RiskManager；快照中没有的余额通过 balance_reader 读取
+    （只读请求，不与平仓路径争用平仓锁）。
+    """
+
+    def __init__(self, klines=None, positions: List[Dict] = None, ticker=None,
+                 balance_reader: Callable[[], float] = None):
+        """
+        Args:
+            klines: 本轮K线 DataFrame
+            positions: 本轮持仓（字典格式）
+            ticker: 本轮行情（TickerData 或字典）
+            balance_reader: 读取余额的回调
+        """
+        self._klines = klines.copy() if klines is not None else None
+        self._positions = copy.deepcopy(positions or [])
+        last = getattr(ticker, 'last', None) if ticker is not None and not isinstance(ticker, dict) \
+            else (ticker or {}).get('last')
+        self._ticker = {'last': last} if last is not None else None
+        self._balance_reader = balance_reader
+
+    @staticmethod
+    def snapshot_risk(risk_manager) -> SimpleNamespace:
+        """RiskManager 的只读快照（收集器只读取当前持仓）"""
+        return SimpleNamespace(position=copy.copy(getattr(risk_manager, 'position', None)))
+
+    def get_klines(self, limit: int = None):
+        if self._klines is None:
+            return None
+        return self._klines.tail(limit) if limit else self._klines
+
+    def get_positions(self) -> List[Dict]:
+        return self._positions
+
+    def get_ticker(self) -> Optional[Dict]:
+        return self._ticker
+
+    def get_balance(self) -> float:
+        return self._balance_reader() if self._balance_reader else 0.0
+
+
 class StatusMonitorCollector:
     """状态监控数据收集器"""
 
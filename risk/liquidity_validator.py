@@ -3,8 +3,9 @@
 检查订单簿深度，防止流动性不足导致滑点过大
 """
 from decimal import Decimal
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, Union
 from config.settings import settings as config
+from market_data.orderbook import OrderBook, BID, ASK
 from utils.logger_utils import get_logger
 
 logger = get_logger("liquidity_validator")
@@ -110,7 +111,7 @@ class LiquidityValidator:
 
     def validate_with_orderbook(
         self,
-        orderbook: Dict[str, Any],
+        orderbook: Union[Dict[str, Any], OrderBook],
         order_amount: float,
         order_price: float,
         is_buy: bool
@@ -119,7 +120,7 @@ class LiquidityValidator:
         使用完整订单簿验证流动性（精确版本）
 
         Args:
-            orderbook: 订单簿数据 {'bids': [[price, amount], ...], 'asks': [...]}
+            orderbook: 共享订单簿（market_data.get_order_book）或订单簿数据 {'bids': [[price, amount], ...], 'asks': [...]}
             order_amount: 订单数量
             order_price: 订单价格
             is_buy: 是否买入
@@ -137,38 +138,28 @@ class LiquidityValidator:
         }
 
         try:
-            # 1. 检查订单簿有效性
-            if not orderbook:
+            # 1. 检查订单簿有效性（空订单簿不是缺失，按对手盘无深度处理）
+            if orderbook is None:
                 return False, "订单簿数据缺失", details
-
-            # 2. 获取对手盘
-            if is_buy:
-                # 买入时检查卖盘（asks）
-                levels = orderbook.get('asks', [])
-                side_name = "卖盘"
-            else:
-                # 卖出时检查买盘（bids）
-                levels = orderbook.get('bids', [])
-                side_name = "买盘"
-
-            if not levels or len(levels) == 0:
+            if not isinstance(orderbook, OrderBook):
+                orderbook = OrderBook.from_snapshot(orderbook)
+
+            # 2. 获取对手盘（买入检查卖盘，卖出检查买盘）
+            side = ASK if is_buy else BID
+            side_name = "卖盘" if is_buy else "买盘"
+            top = orderbook.best_ask() if is_buy else orderbook.best_bid()
+            if top is None:
                 return False, f"{side_name}无深度", details
 
             # 3. 计算对手盘可用深度
             # 取最优N档的总量
-            total_available = 0
-            total_value_usdt = 0
-            depth_levels = min(5, len(levels))  # 检查前5档
-
-            for i in range(depth_levels):
-                level_price = float(levels[i][0])
-                level_amount = float(levels[i][1])
-                total_available += level_amount
-                total_value_usdt += level_price * level_amount
+            total_available = orderbook.depth(side, levels=5, quote=False)
+            total_value_usdt = orderbook.depth(side, levels=5)
 
             details['available_amount'] = total_available
             details['available_value_usdt'] = total_value_usdt
-            details['depth_levels_checked'] = depth_levels
+            details['depth_levels_checked'] = min(5, orderbook.level_count(side))
+            details['expected_avg_price'] = orderbook.vwap('buy' if is_buy else 'sell', order_amount)
 
             # 4. 检查数量是否充足
             if total_available < order_amount:
@@ -5,7 +5,7 @@
 import time
 from dataclasses import dataclass, field
 from typing import Optional, Tuple, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import numpy as np
 import pandas as pd
 
@@ -186,6 +186,20 @@ class RiskMetrics:
         self.kelly_fraction = min(self.kelly_fraction, 0.25)
 
 
+@dataclass
+class DailyStats:
+    """
+    日内统计
+
+    按账户计算：多品种运行时所有交易对的 RiskManager 共用一份，日内亏损和交易次数上限
+    针对整个账户，而不是每个交易对各算一份。
+    """
+    loss: float = 0
+    trades: int = 0
+    pnl: float = 0
+    last_reset: date = field(default_factory=lambda: datetime.now().date())
+
+
 @dataclass
 class StopLossResult:
     """止损检查结果"""
@@ -202,16 +216,22 @@ class StopLossResult:
 class RiskManager:
     """风险管理器"""
     
-    def __init__(self, trader=None):
+    def __init__(self, trader=None, symbol: str = None, metrics: RiskMetrics = None,
+                 daily: DailyStats = None):
+        """
+        Args:
+            trader: 交易执行器
+            symbol: 管理的交易对，默认 config.SYMBOL
+            metrics: 共享的风险指标（多品种运行时各品种共用一份，传入时不再加载历史）
+            daily: 共享的日内统计（多品种运行时各品种共用一份，日内限额按账户计算）
+        """
         self.trader = trader
+        self.symbol = symbol or config.SYMBOL
         self.position: Optional[PositionInfo] = None
-        self.metrics = RiskMetrics()
+        self.metrics = metrics if metrics is not None else RiskMetrics()
         
         # 日内统计
-        self.daily_loss = 0
-        self.daily_trades = 0
-        self.daily_pnl = 0
-        self.last_daily_reset = datetime.now().date()
+        self.daily = daily if daily is not None else DailyStats()
         self.last_rejection_reason: str = ""
         self.last_rejection_time: Optional[datetime] = None
         self.last_rejection_details: Dict[str, Any] = {}
@@ -227,8 +247,12 @@ class RiskManager:
         self.trade_history: List[Dict] = []
         self.equity_curve: List[Dict] = []
         
+        # 止损检查详细日志采样（DEBUG，按 STOP_CHECK_LOG_INTERVAL 秒采样一次）
+        self._last_stop_log_time = 0.0
+
         # 加载历史数据
-        self._load_history()
+        if metrics is None:
+            self._load_history()
     
     def _load_history(self):
         """加载历史交易数据计算指标"""
@@ -849,18 +873,21 @@ class RiskManager:
         result = StopLossResult(current_price=current_price)
 
         # 更新持仓价格信息
+        extremes = (position.highest_price, position.lowest_price)
         position.update_price(current_price)
 
-        # ===== 调试日志：打印关键变量 =====
-        logger.info("=" * 60)
-        logger.info(f"[止损检查] 当前价: {current_price:.2f}")
-        logger.info(f"[止损检查] 开仓价: {position.entry_price:.2f}")
-        logger.info(f"[止损检查] 持仓方向: {position.side}")
-        logger.info(f"[止损检查] 持仓数量: {position.amount:.8f}")
-        logger.info(f"[止损检查] 最高价: {position.highest_price:.2f}")
-        logger.info(f"[止损检查] 最低价: {position.lowest_price:.2f}")
-        logger.info(f"[止损检查] ATR止损价: {position.stop_loss_price:.2f}")
-        logger.info(f"[止损检查] 固定止盈价: {position.take_profit_price:.2f}")
+        # ===== 调试日志：打印关键变量（每次调用都会执行，按时间采样输出 DEBUG） =====
+        verbose = self._should_log_stop_detail()
+        if verbose:
+            logger.debug("=" * 60)
+            logger.debug(f"[止损检查] 当前价: {current_price:.2f}")
+            logger.debug(f"[止损检查] 开仓价: {position.entry_price:.2f}")
+            logger.debug(f"[止损检查] 持仓方向: {position.side}")
+            logger.debug(f"[止损检查] 持仓数量: {position.amount:.8f}")
+            logger.debug(f"[止损检查] 最高价: {position.highest_price:.2f}")
+            logger.debug(f"[止损检查] 最低价: {position.lowest_price:.2f}")
+            logger.debug(f"[止损检查] ATR止损价: {position.stop_loss_price:.2f}")
+            logger.debug(f"[止损检查] 固定止盈价: {position.take_profit_price:.2f}")
         
         # 计算当前盈亏比例
         if position.side == 'long':
@@ -909,28 +936,30 @@ class RiskManager:
             trailing_tp = self.calculate_trailing_take_profit(current_price, position)
 
             # ===== 调试日志：动态止盈详情 =====
-            net_profit = position.calculate_net_profit(current_price)
-
-            # 计算动态门槛（与calculate_trailing_take_profit中的逻辑一致）
-            close_fee = current_price * position.amount * config.TRADING_FEE_RATE
-            total_fee = position.entry_fee + close_fee
-            if hasattr(config, 'MIN_PROFIT_THRESHOLD_MULTIPLIER'):
-                dynamic_threshold = total_fee * config.MIN_PROFIT_THRESHOLD_MULTIPLIER
-            else:
-                dynamic_threshold = config.MIN_PROFIT_THRESHOLD_USDT
-
-            logger.info(f"[动态止盈] 净盈利: {net_profit:.4f} USDT")
-            logger.info(f"[动态止盈] 最大盈利: {position.max_profit:.4f} USDT")
-            logger.info(f"[动态止盈] 总手续费: {total_fee:.4f} USDT")
-            logger.info(f"[动态止盈] 盈利门槛: {dynamic_threshold:.4f} USDT (手续费×{getattr(config, 'MIN_PROFIT_THRESHOLD_MULTIPLIER', 'N/A')})")
-            logger.info(f"[动态止盈] 门槛已达: {position.profit_threshold_reached}")
-            logger.info(f"[动态止盈] 价格窗口: {position.recent_prices}")
-            if len(position.recent_prices) >= config.TRAILING_TP_PRICE_WINDOW:
-                logger.info(f"[动态止盈] 价格均值: {position.get_price_average():.2f}")
-            logger.info(f"[动态止盈] 计算结果: {trailing_tp:.2f}")
+            if verbose:
+                net_profit = position.calculate_net_profit(current_price)
+
+                # 计算动态门槛（与calculate_trailing_take_profit中的逻辑一致）
+                close_fee = current_price * position.amount * config.TRADING_FEE_RATE
+                total_fee = position.entry_fee + close_fee
+                if hasattr(config, 'MIN_PROFIT_THRESHOLD_MULTIPLIER'):
+                    dynamic_threshold = total_fee * config.MIN_PROFIT_THRESHOLD_MULTIPLIER
+                else:
+                    dynamic_threshold = config.MIN_PROFIT_THRESHOLD_USDT
+
+                logger.debug(f"[动态止盈] 净盈利: {net_profit:.4f} USDT")
+                logger.debug(f"[动态止盈] 最大盈利: {position.max_profit:.4f} USDT")
+                logger.debug(f"[动态止盈] 总手续费: {total_fee:.4f} USDT")
+                logger.debug(f"[动态止盈] 盈利门槛: {dynamic_threshold:.4f} USDT (手续费×{getattr(config, 'MIN_PROFIT_THRESHOLD_MULTIPLIER', 'N/A')})")
+                logger.debug(f"[动态止盈] 门槛已达: {position.profit_threshold_reached}")
+                logger.debug(f"[动态止盈] 价格窗口: {position.recent_prices}")
+                if len(position.recent_prices) >= config.TRAILING_TP_PRICE_WINDOW:
+                    logger.debug(f"[动态止盈] 价格均值: {position.get_price_average():.2f}")
+                logger.debug(f"[动态止盈] 计算结果: {trailing_tp:.2f}")
 
             if trailing_tp > 0:
                 position.trailing_take_profit_price = trailing_tp
+                net_profit = position.calculate_net_profit(current_price)
 
                 # 计算净盈利百分比
                 net_profit_pct = (net_profit / (position.entry_price * position.amount)) * 100
@@ -955,19 +984,20 @@ class RiskManager:
         trailing_stop = self.calculate_trailing_stop(current_price, position)
 
         # ===== 调试日志：移动止损详情 =====
-        logger.info(f"[移动止损] 计算结果: {trailing_stop:.2f}")
-        logger.info(f"[移动止损] TRAILING_STOP_PERCENT: {config.TRAILING_STOP_PERCENT}")
-        if position.side == 'long':
-            expected_trailing = position.highest_price * (1 - config.TRAILING_STOP_PERCENT)
-            logger.info(f"[移动止损] 预期值(多仓): {position.highest_price:.2f} × {1-config.TRAILING_STOP_PERCENT} = {expected_trailing:.2f}")
-            logger.info(f"[移动止损] 是否高于开仓价: {expected_trailing:.2f} > {position.entry_price:.2f} = {expected_trailing > position.entry_price}")
-            logger.info(f"[移动止损] 当前价是否触发: {current_price:.2f} <= {trailing_stop:.2f} = {current_price <= trailing_stop if trailing_stop > 0 else False}")
-        else:
-            expected_trailing = position.lowest_price * (1 + config.TRAILING_STOP_PERCENT)
-            logger.info(f"[移动止损] 预期值(空仓): {position.lowest_price:.2f} × {1+config.TRAILING_STOP_PERCENT} = {expected_trailing:.2f}")
-            logger.info(f"[移动止损] 是否低于开仓价: {expected_trailing:.2f} < {position.entry_price:.2f} = {expected_trailing < position.entry_price}")
-            logger.info(f"[移动止损] 当前价是否触发: {current_price:.2f} >= {trailing_stop:.2f} = {current_price >= trailing_stop if trailing_stop > 0 else False}")
-        logger.info("=" * 60)
+        if verbose:
+            logger.debug(f"[移动止损] 计算结果: {trailing_stop:.2f}")
+            logger.debug(f"[移动止损] TRAILING_STOP_PERCENT: {config.TRAILING_STOP_PERCENT}")
+            if position.side == 'long':
+                expected_trailing = position.highest_price * (1 - config.TRAILING_STOP_PERCENT)
+                logger.debug(f"[移动止损] 预期值(多仓): {position.highest_price:.2f} × {1-config.TRAILING_STOP_PERCENT} = {expected_trailing:.2f}")
+                logger.debug(f"[移动止损] 是否高于开仓价: {expected_trailing:.2f} > {position.entry_price:.2f} = {expected_trailing > position.entry_price}")
+                logger.debug(f"[移动止损] 当前价是否触发: {current_price:.2f} <= {trailing_stop:.2f} = {current_price <= trailing_stop if trailing_stop > 0 else False}")
+            else:
+                expected_trailing = position.lowest_price * (1 + config.TRAILING_STOP_PERCENT)
+                logger.debug(f"[移动止损] 预期值(空仓): {position.lowest_price:.2f} × {1+config.TRAILING_STOP_PERCENT} = {expected_trailing:.2f}")
+                logger.debug(f"[移动止损] 是否低于开仓价: {expected_trailing:.2f} < {position.entry_price:.2f} = {expected_trailing < position.entry_price}")
+                logger.debug(f"[移动止损] 当前价是否触发: {current_price:.2f} >= {trailing_stop:.2f} = {current_price >= trailing_stop if trailing_stop > 0 else False}")
+            logger.debug("=" * 60)
 
         if trailing_stop > 0:
             position.trailing_stop_price = trailing_stop
@@ -987,13 +1017,23 @@ class RiskManager:
                 result.stop_price = trailing_stop
                 logger.warning(f"!!! 触发移动止损 !!! 当前价 {current_price:.2f} >= 止损价 {trailing_stop:.2f}")
                 return result
-        else:
-            logger.info(f"[移动止损] 未启用 (trailing_stop = {trailing_stop})")
+        elif verbose:
+            logger.debug(f"[移动止损] 未启用 (trailing_stop = {trailing_stop})")
 
-        # 保存更新后的持仓状态到数据库（包括更新的highest_price和lowest_price）
-        self._save_position_to_db()
+        # 最高/最低价变化时保存持仓状态到数据库（快照会请求交易所持仓详情，不在每次检查时执行）
+        if (position.highest_price, position.lowest_price) != extremes:
+            self._save_position_to_db()
 
         return result
+
+    def _should_log_stop_detail(self) -> bool:
+        """止损检查详细日志采样：每 STOP_CHECK_LOG_INTERVAL 秒输出一次（0 表示每次输出）"""
+        interval = getattr(config, 'STOP_CHECK_LOG_INTERVAL', 60)
+        now = time.time()
+        if now - self._last_stop_log_time < interval:
+            return False
+        self._last_stop_log_time = now
+        return True
     
     # ==================== 开仓控制 ====================
     
@@ -1336,6 +1376,40 @@ class RiskManager:
                 'drawdown': self.metrics.current_drawdown,
             })
     
+    # ==================== 日内统计（读写共享的 DailyStats） ====================
+
+    @property
+    def daily_loss(self) -> float:
+        return self.daily.loss
+
+    @daily_loss.setter
+    def daily_loss(self, value: float):
+        self.daily.loss = value
+
+    @property
+    def daily_trades(self) -> int:
+        return self.daily.trades
+
+    @daily_trades.setter
+    def daily_trades(self, value: int):
+        self.daily.trades = value
+
+    @property
+    def daily_pnl(self) -> float:
+        return self.daily.pnl
+
+    @daily_pnl.setter
+    def daily_pnl(self, value: float):
+        self.daily.pnl = value
+
+    @property
+    def last_daily_reset(self) -> date:
+        return self.daily.last_reset
+
+    @last_daily_reset.setter
+    def last_daily_reset(self, value: date):
+        self.daily.last_reset = value
+
     def reset_daily_stats(self):
         """重置日内统计（每日调用）"""
         logger.info(f"重置日内统计 - 昨日: 交易={self.daily_trades}次, "
@@ -1366,7 +1440,7 @@ class RiskManager:
                 exchange_manager = ExchangeManager()
                 exchange = exchange_manager.get_current_exchange()
                 if exchange:
-                    positions = exchange.get_positions()
+                    positions = [p for p in exchange.get_positions(self.symbol) if p.side == self.position.side]
                     if positions:
                         pos = positions[0]
                         if hasattr(pos, 'raw_data') and pos.raw_data:
@@ -1382,7 +1456,7 @@ class RiskManager:
                 logger.debug(f"获取持仓详细信息失败: {e}")
 
             db.log_position_snapshot(
-                symbol=config.SYMBOL,
+                symbol=self.symbol,
                 side=self.position.side,
                 amount=self.position.amount,
                 entry_price=self.position.entry_price,
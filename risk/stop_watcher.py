@@ -0,0 +1,330 @@
+"""
+快速止损监视器 (Stop-Loss Watcher)
+
+独立于主循环的止损快速通道：
+- 持仓变化时预先计算触发价（固定止损、ATR止损、固定止盈），移动止损只随最高/最低价更新
+- 每个价格只做几次浮点比较（微秒级），触发后立即调用平仓回调，不等待主循环的
+  K线、持仓、Claude、Policy Layer 等步骤
+- 价格来源：行情推送（TICKER 事件回调）或独立轮询线程
+- 记录每次检查耗时和“收到价格 → 触发 / 平仓完成”的延迟，get_stats() 报告最坏情况
+
+判定规则与 RiskManager.check_stop_loss 一致（不含动态止盈，动态止盈依赖价格窗口，
+仍由主循环检查）。
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from config.settings import settings as config
+from exchange.rate_limiter import Priority, request_priority
+from risk.risk_manager import RiskManager, StopLossResult
+from utils.logger_utils import get_logger
+
+logger = get_logger("stop_watcher")
+
+
+class StopLossWatcher:
+    """快速止损监视器"""
+
+    def __init__(
+        self,
+        risk_manager: RiskManager,
+        on_trigger: Callable[[StopLossResult], bool],
+        metrics_logger=None,
+        latency_window: int = 1000
+    ):
+        """
+        Args:
+            risk_manager: 风控管理器（读取当前持仓和止损价）
+            on_trigger: 触发后的平仓回调，返回是否平仓成功
+            metrics_logger: 可选的 MetricsLogger，记录 stop_watcher.* 延迟
+            latency_window: 保留的最近延迟样本数
+        """
+        self.risk_manager = risk_manager
+        self.on_trigger = on_trigger
+        self.metrics_logger = metrics_logger
+
+        self._lock = threading.Lock()
+        self._position = None
+        self._position_key = None
+        self._fired = False
+        self._retry_at = 0.0
+
+        # 预计算的触发价（0 表示未启用）
+        self._side = ""
+        self._entry_price = 0.0
+        self._fixed_stop = 0.0
+        self._atr_stop = 0.0
+        self._take_profit = 0.0
+        self._trailing_ratio = 0.0
+        self._extreme = 0.0
+        self._trailing_stop = 0.0
+
+        # 价格来源
+        self._bus = None
+        self._stream_token = None
+        self._poll_thread: Optional[threading.Thread] = None
+        self._poll_stop = threading.Event()
+
+        # 统计
+        self.checks = 0
+        self.triggers = 0
+        self.check_max_us = 0.0
+        self._check_total_us = 0.0
+        self.trigger_latency_max_ms = 0.0
+        self.close_latency_max_ms = 0.0
+        self._trigger_latencies = deque(maxlen=latency_window)
+        self._close_latencies = deque(maxlen=latency_window)
+
+    # ==================== 触发价 ====================
+
+    def _sync_position(self) -> bool:
+        """持仓变化时重新计算触发价，返回是否有持仓"""
+        position = self.risk_manager.position
+        if position is None:
+            self._position = None
+            self._position_key = None
+            return False
+
+        key = (position.side, position.entry_price, position.amount, position.stop_loss_price)
+        if position is not self._position or key != self._position_key:
+            self._arm(position)
+            self._position_key = key
+        return True
+
+    def _arm(self, position):
+        """根据持仓计算触发价（与 check_stop_loss 的百分比判定等价）"""
+        self._position = position
+        self._fired = False
+        self._retry_at = 0.0
+        self._side = position.side
+        entry = self._entry_price = position.entry_price
+        leverage = config.LEVERAGE
+        stop_move = config.STOP_LOSS_PERCENT / leverage
+        profit_move = config.TAKE_PROFIT_PERCENT / leverage
+        self._trailing_ratio = config.TRAILING_STOP_PERCENT
+        use_atr = config.USE_ATR_STOP_LOSS and position.stop_loss_price > 0
+        self._atr_stop = position.stop_loss_price if use_atr else 0.0
+
+        if self._side == 'long':
+            self._fixed_stop = entry * (1 - stop_move)
+            self._take_profit = entry * (1 + profit_move)
+            self._extreme = position.highest_price or entry
+        else:
+            self._fixed_stop = entry * (1 + stop_move)
+            self._take_profit = entry * (1 - profit_move)
+            self._extreme = position.lowest_price or entry
+        self._update_trailing()
+
+        logger.debug(
+            f"[快速止损] 已布防 {self._side} @ {entry:.2f}: 止损 {self._fixed_stop:.2f}, "
+            f"ATR止损 {self._atr_stop:.2f}, 止盈 {self._take_profit:.2f}, 移动止损 {self._trailing_stop:.2f}"
+        )
+
+    def _update_trailing(self):
+        """移动止损价：多仓最高价回撤、空仓最低价反弹，须优于开仓价才启用"""
+        if self._side == 'long':
+            price = self._extreme * (1 - self._trailing_ratio)
+            self._trailing_stop = price if price > self._entry_price else 0.0
+        else:
+            price = self._extreme * (1 + self._trailing_ratio)
+            self._trailing_stop = price if price < self._entry_price else 0.0
+
+    def _evaluate(self, price: float) -> Optional[StopLossResult]:
+        """比较价格与触发价，顺序与 check_stop_loss 一致"""
+        if self._side == 'long':
+            if price > self._extreme:
+                self._extreme = price
+                self._update_trailing()
+            if price <= self._fixed_stop:
+                return self._result("stop_loss", price, self._fixed_stop, f"触发止损: 价格 {price:.2f} <= {self._fixed_stop:.2f}")
+            if self._atr_stop and price <= self._atr_stop:
+                return self._result("atr_stop", price, self._atr_stop, f"触发ATR止损: 价格 {price:.2f} <= {self._atr_stop:.2f}")
+            if price >= self._take_profit:
+                return self._result("take_profit", price, self._take_profit, f"触发固定止盈: 价格 {price:.2f} >= {self._take_profit:.2f}")
+            if self._trailing_stop and price <= self._trailing_stop:
+                return self._result("trailing_stop", price, self._trailing_stop, f"触发移动止损: 从最高点 {self._extreme:.2f} 回撤")
+        else:
+            if price < self._extreme:
+                self._extreme = price
+                self._update_trailing()
+            if price >= self._fixed_stop:
+                return self._result("stop_loss", price, self._fixed_stop, f"触发止损: 价格 {price:.2f} >= {self._fixed_stop:.2f}")
+            if self._atr_stop and price >= self._atr_stop:
+                return self._result("atr_stop", price, self._atr_stop, f"触发ATR止损: 价格 {price:.2f} >= {self._atr_stop:.2f}")
+            if price <= self._take_profit:
+                return self._result("take_profit", price, self._take_profit, f"触发固定止盈: 价格 {price:.2f} <= {self._take_profit:.2f}")
+            if self._trailing_stop and price >= self._trailing_stop:
+                return self._result("trailing_stop", price, self._trailing_stop, f"触发移动止损: 从最低点 {self._extreme:.2f} 反弹")
+        return None
+
+    def _result(self, stop_type: str, price: float, stop_price: float, reason: str) -> StopLossResult:
+        if self._side == 'long':
+            pnl_pct = (price - self._entry_price) / self._entry_price * config.LEVERAGE * 100
+        else:
+            pnl_pct = (self._entry_price - price) / self._entry_price * config.LEVERAGE * 100
+        return StopLossResult(
+            should_stop=True, stop_type=stop_type, reason=f"[快速止损] {reason}",
+            current_price=price, stop_price=stop_price, pnl_percent=pnl_pct
+        )
+
+    # ==================== 价格输入 ====================
+
+    def on_price(self, price: float, received_at: float = None) -> Optional[StopLossResult]:
+        """
+        检查一个价格，触发时调用平仓回调（每个持仓只触发一次；平仓失败时退避后重新布防）
+
+        Args:
+            price: 最新价格
+            received_at: 收到该价格的时间戳（秒），用于计算止损延迟；默认为当前时间
+        """
+        if not price or price <= 0:
+            return None
+        start = time.perf_counter()
+        received_at = time.time() if received_at is None else received_at
+
+        with self._lock:
+            if not self._sync_position() or self._fired or received_at < self._retry_at:
+                return None
+            result = self._evaluate(price)
+            if result is not None:
+                self._fired = True
+                position = self._position
+            elapsed_us = (time.perf_counter() - start) * 1e6
+            self.checks += 1
+            self._check_total_us += elapsed_us
+            self.check_max_us = max(self.check_max_us, elapsed_us)
+
+        if result is not None:
+            if not self._fire(result, received_at):
+                self._rearm_after_failure(position)
+        return result
+
+    def _rearm_after_failure(self, position):
+        """平仓失败：重新布防同一持仓，退避一小段时间后才再次触发，避免每个价格都重复下单"""
+        backoff = getattr(config, 'STOP_WATCHER_RETRY_BACKOFF', 1.0)
+        with self._lock:
+            if self._position is position:
+                self._fired = False
+                self._retry_at = time.time() + backoff
+        logger.warning(f"[快速止损] 平仓未完成，{backoff:.1f} 秒后重新检查")
+
+    def _fire(self, result: StopLossResult, received_at: float) -> bool:
+        """调用平仓回调并记录延迟，返回是否平仓成功"""
+        self.triggers += 1
+        trigger_latency = (time.time() - received_at) * 1000
+        self.trigger_latency_max_ms = max(self.trigger_latency_max_ms, trigger_latency)
+        self._trigger_latencies.append(trigger_latency)
+        logger.warning(f"{result.reason}（收到价格后 {trigger_latency:.1f}ms）")
+
+        try:
+            # 平仓请求走 CRITICAL 限流通道，排在所有行情/分析请求之前
+            with request_priority(Priority.CRITICAL):
+                success = self.on_trigger(result)
+        except Exception as e:
+            logger.error(f"[快速止损] 平仓回调失败: {e}")
+            success = False
+
+        close_latency = (time.time() - received_at) * 1000
+        self.close_latency_max_ms = max(self.close_latency_max_ms, close_latency)
+        self._close_latencies.append(close_latency)
+        if self.metrics_logger:
+            self.metrics_logger.record_latency("stop_watcher.trigger", trigger_latency)
+            self.metrics_logger.record_latency("stop_watcher.close", close_latency)
+        logger.info(
+            f"[快速止损] 平仓{'完成' if success else '失败'}: 触发延迟 {trigger_latency:.1f}ms, "
+            f"平仓延迟 {close_latency:.1f}ms（最坏 {self.close_latency_max_ms:.1f}ms）"
+        )
+        return bool(success)
+
+    def _on_ticker_event(self, event):
+        self.on_price(event.last, received_at=event.received_at)
+
+    # ==================== 价格来源 ====================
+
+    def attach_stream(self, bus, symbol: str, exchange: str = None):
+        """订阅推送行情，每个 TICKER 事件在推送线程中立即检查"""
+        from market_data.events import TICKER
+
+        self.detach_stream()
+        self._bus = bus
+        self._stream_token = bus.subscribe(TICKER, self._on_ticker_event, symbol=symbol, exchange=exchange)
+        logger.info(f"[快速止损] 已订阅 {symbol} 推送行情")
+
+    def detach_stream(self):
+        """取消订阅推送行情"""
+        if self._bus is not None and self._stream_token is not None:
+            self._bus.unsubscribe(self._stream_token)
+        self._bus = None
+        self._stream_token = None
+
+    def start_polling(self, price_source: Callable[[], Optional[float]], interval: float):
+        """
+        未启用推送时，在独立线程中轮询价格（仅持仓时请求）
+
+        Args:
+            price_source: 返回最新价格的函数（失败返回 None）
+            interval: 轮询间隔（秒）
+        """
+        if self._poll_thread and self._poll_thread.is_alive():
+            return
+        self._poll_stop.clear()
+
+        def run():
+            while not self._poll_stop.is_set():
+                if self.risk_manager.has_position():
+                    try:
+                        # 止损价格走 CRITICAL 通道：不排在行情/分析请求之后，且绕过行情读缓存
+                        with request_priority(Priority.CRITICAL):
+                            price = price_source()
+                        if price:
+                            self.on_price(price)
+                    except Exception as e:
+                        logger.debug(f"[快速止损] 获取价格失败: {e}")
+                self._poll_stop.wait(interval)
+
+        self._poll_thread = threading.Thread(target=run, name="stop-watcher", daemon=True)
+        self._poll_thread.start()
+        logger.info(f"[快速止损] 价格轮询已启动，间隔 {interval} 秒")
+
+    def stop(self):
+        """停止所有价格来源并输出延迟报告"""
+        active = self._stream_token is not None or self._poll_thread is not None
+        self.detach_stream()
+        self._poll_stop.set()
+        if self._poll_thread:
+            self._poll_thread.join(timeout=5)
+            self._poll_thread = None
+        if active and self.checks:
+            stats = self.get_stats()
+            logger.info(
+                f"[快速止损] 检查 {stats['checks']} 次（平均 {stats['check_avg_us']:.1f}µs, "
+                f"最坏 {stats['check_max_us']:.1f}µs），触发 {stats['triggers']} 次，"
+                f"最坏平仓延迟 {stats['close_latency_max_ms']:.1f}ms"
+            )
+
+    # ==================== 统计 ====================
+
+    @staticmethod
+    def _percentile(samples, pct: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    def get_stats(self) -> Dict:
+        """获取检查耗时和止损延迟统计"""
+        return {
+            'armed': self._position is not None and not self._fired,
+            'checks': self.checks,
+            'triggers': self.triggers,
+            'check_avg_us': self._check_total_us / self.checks if self.checks else 0.0,
+            'check_max_us': self.check_max_us,
+            'trigger_latency_max_ms': self.trigger_latency_max_ms,
+            'trigger_latency_p99_ms': self._percentile(self._trigger_latencies, 0.99),
+            'close_latency_max_ms': self.close_latency_max_ms,
+            'close_latency_p99_ms': self._percentile(self._close_latencies, 0.99),
+            'source': 'stream' if self._stream_token is not None else (
+                'polling' if self._poll_thread is not None else 'main_loop'),
+        }
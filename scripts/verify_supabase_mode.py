@@ -18,8 +18,12 @@ def main():
     _logger.info("Supabase Mode Verification")
     _logger.info("=" * 60)
 
-    # 检查数据库类型
-    db_type = type(db).__name__
+    # 检查数据库类型（db 是延迟创建的代理，先取得实际实例）
+    try:
+        db_type = type(db._resolve()).__name__
+    except Exception as e:
+        _logger.error("❌ Database initialization failed: %s", e)
+        return False
     _logger.info("Current database type: %s", db_type)
 
     if db_type == "SupabaseTradeDatabase":
@@ -1,6 +1,11 @@
+import functools
+import inspect
+from typing import Tuple, Optional, Dict, List, Union, Iterable
+
 import numpy as np
 import pandas as pd
-from typing import Tuple, Optional, Dict, List
+
+from market_data.klines import KlineArray, as_frame
 
 
 # ==================== 基础移动平均 ====================
@@ -650,10 +655,52 @@ def detect_market_state(
 
 # ==================== 综合指标计算器 ====================
 
+def _copy_result(value):
+    """复制缓存的指标结果（Series / DataFrame 或其字典）"""
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return value.copy()
+    return value
+
+
+def _cached(method):
+    """
+    按参数缓存指标结果
+
+    同一个 IndicatorCalculator 的 df 不变，多个策略共享计算器时
+    相同指标（含默认参数展开后相同的调用）只计算一次。
+    返回缓存结果的副本，调用方就地修改不会影响其他策略。
+    """
+    signature = inspect.signature(method)
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (name,) + tuple(bound.arguments.values())[1:]
+        cache = self._cache
+        if key not in cache:
+            cache[key] = method(self, *args, **kwargs)
+        return _copy_result(cache[key])
+
+    return wrapper
+
+
+# calculate() 支持的指标组（与 calculate_all 的输出列一一对应）
+INDICATOR_GROUPS = (
+    'rsi', 'macd', 'bollinger', 'kdj', 'adx', 'atr', 'ema',
+    'volatility', 'trend_strength', 'trend_direction', 'volume_ratio',
+)
+
+
 class IndicatorCalculator:
     """技术指标计算器"""
     
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: Union[pd.DataFrame, KlineArray]):
+        df = as_frame(df)
+        self._cache: Dict[tuple, object] = {}
         self.df = df
         self.close = df['close']
         self.high = df['high']
@@ -661,32 +708,39 @@ class IndicatorCalculator:
         self.open = df['open']
         self.volume = df.get('volume', pd.Series([0] * len(df)))
     
+    @_cached
     def sma(self, period: int) -> pd.Series:
         return calc_sma(self.close, period)
     
+    @_cached
     def ema(self, period: int) -> pd.Series:
         return calc_ema(self.close, period)
     
+    @_cached
     def wma(self, period: int) -> pd.Series:
         return calc_wma(self.close, period)
     
+    @_cached
     def bollinger_bands(
         self, 
         period: int = 20, 
         std_dev: float = 2
     ) -> Dict[str, pd.Series]:
-        upper, middle, lower = calc_bollinger_bands(self.close, period, std_dev)
+        bands = calc_bollinger_bands(self.close, period, std_dev)
+        upper, middle, lower = bands
         return {
             'upper': upper,
             'middle': middle,
             'lower': lower,
-            'bandwidth': calc_bollinger_bandwidth(self.close, period, std_dev),
-            'percent_b': calc_bollinger_percent_b(self.close, period, std_dev),
+            'bandwidth': calc_bollinger_bandwidth(self.close, period, std_dev, bands=bands),
+            'percent_b': calc_bollinger_percent_b(self.close, period, std_dev, bands=bands),
         }
     
+    @_cached
     def rsi(self, period: int = 14) -> pd.Series:
         return calc_rsi(self.close, period)
     
+    @_cached
     def stoch_rsi(
         self,
         rsi_period: int = 14,
@@ -697,6 +751,7 @@ class IndicatorCalculator:
         k, d = calc_stoch_rsi(self.close, rsi_period, stoch_period, k_period, d_period)
         return {'k': k, 'd': d}
     
+    @_cached
     def macd(
         self, 
         fast: int = 12, 
@@ -717,6 +772,7 @@ class IndicatorCalculator:
             'crossunder': crossunder,
         }
     
+    @_cached
     def kdj(
         self,
         period: int = 9,
@@ -737,6 +793,7 @@ class IndicatorCalculator:
             'crossunder': crossunder,
         }
     
+    @_cached
     def adx(self, period: int = 14) -> Dict[str, pd.Series]:
         """ADX 指标（新增）"""
         adx, plus_di, minus_di = calc_adx(self.high, self.low, self.close, period)
@@ -746,22 +803,27 @@ class IndicatorCalculator:
             'minus_di': minus_di,
         }
     
+    @_cached
     def williams_r(self, period: int = 14) -> pd.Series:
         """威廉指标（新增）"""
         return calc_williams_r(self.high, self.low, self.close, period)
     
+    @_cached
     def obv(self) -> pd.Series:
         """OBV（新增）"""
         return calc_obv(self.close, self.volume)
     
+    @_cached
     def obv_divergence(self, period: int = 14) -> pd.Series:
         """OBV 背离（新增）"""
         return calc_obv_divergence(self.close, self.volume, period)
     
+    @_cached
     def vwap(self) -> pd.Series:
         """VWAP（新增）"""
         return calc_vwap(self.high, self.low, self.close, self.volume)
     
+    @_cached
     def vwap_bands(self, std_dev: float = 2) -> Dict[str, pd.Series]:
         """VWAP 带（新增）"""
         upper, middle, lower = calc_vwap_bands(
@@ -769,25 +831,31 @@ class IndicatorCalculator:
         )
         return {'upper': upper, 'middle': middle, 'lower': lower}
     
+    @_cached
     def atr(self, period: int = 14) -> pd.Series:
         return calc_atr(self.high, self.low, self.close, period)
     
+    @_cached
     def atr_percent(self, period: int = 14) -> pd.Series:
         """ATR 百分比（新增）"""
         return calc_atr_percent(self.high, self.low, self.close, period)
     
+    @_cached
     def volatility(self, period: int = 20) -> pd.Series:
         """波动率（新增）"""
         return calc_volatility(self.close, period)
     
+    @_cached
     def volatility_ratio(self, short_period: int = 5, long_period: int = 20) -> pd.Series:
         """波动率比率（新增）"""
         return calc_volatility_ratio(self.close, short_period, long_period)
     
+    @_cached
     def trend_strength(self, period: int = 20) -> pd.Series:
         """趋势强度（新增）"""
         return calc_trend_strength(self.close, period)
     
+    @_cached
     def trend_direction(self, short_period: int = 10, long_period: int = 30) -> pd.Series:
         """趋势方向（新增）"""
         return calc_trend_direction(self.close, short_period, long_period)
@@ -804,10 +872,12 @@ class IndicatorCalculator:
         """支撑阻力位（新增）"""
         return calc_support_resistance(self.high, self.low, self.close, period, num_levels)
     
+    @_cached
     def volume_ratio(self, period: int = 20) -> pd.Series:
         """量比（新增）"""
         return calc_volume_ratio(self.volume, period)
     
+    @_cached
     def mfi(self, period: int = 14) -> pd.Series:
         """MFI（新增）"""
         return calc_mfi(self.high, self.low, self.close, self.volume, period)
@@ -838,52 +908,80 @@ class IndicatorCalculator:
             'candle_pattern': self.candle_pattern(),
         }
 
-    def calculate_all(self) -> pd.DataFrame:
-        """计算所有指标并添加到DataFrame中"""
+    def calculate(self, groups: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        只计算指定指标组并添加到DataFrame中
+
+        Args:
+            groups: INDICATOR_GROUPS 中的指标组，None 表示全部
+
+        Returns:
+            带指标列的 DataFrame 副本
+        """
+        groups = INDICATOR_GROUPS if groups is None else set(groups)
+        unknown = set(groups) - set(INDICATOR_GROUPS)
+        if unknown:
+            raise ValueError(f"未知指标组: {sorted(unknown)}")
+
         result = self.df.copy()
 
         # RSI
-        result['rsi'] = self.rsi()
+        if 'rsi' in groups:
+            result['rsi'] = self.rsi()
 
         # MACD
-        macd_data = self.macd()
-        result['macd'] = macd_data['macd']
-        result['macd_signal'] = macd_data['signal']
-        result['macd_histogram'] = macd_data['histogram']
+        if 'macd' in groups:
+            macd_data = self.macd()
+            result['macd'] = macd_data['macd']
+            result['macd_signal'] = macd_data['signal']
+            result['macd_histogram'] = macd_data['histogram']
 
         # Bollinger Bands
-        bb_data = self.bollinger_bands()
-        result['bb_upper'] = bb_data['upper']
-        result['bb_middle'] = bb_data['middle']
-        result['bb_lower'] = bb_data['lower']
-        result['bb_bandwidth'] = bb_data['bandwidth']
+        if 'bollinger' in groups:
+            bb_data = self.bollinger_bands()
+            result['bb_upper'] = bb_data['upper']
+            result['bb_middle'] = bb_data['middle']
+            result['bb_lower'] = bb_data['lower']
+            result['bb_bandwidth'] = bb_data['bandwidth']
 
         # KDJ
-        kdj_data = self.kdj()
-        result['kdj_k'] = kdj_data['k']
-        result['kdj_d'] = kdj_data['d']
-        result['kdj_j'] = kdj_data['j']
+        if 'kdj' in groups:
+            kdj_data = self.kdj()
+            result['kdj_k'] = kdj_data['k']
+            result['kdj_d'] = kdj_data['d']
+            result['kdj_j'] = kdj_data['j']
 
         # ADX
-        adx_data = self.adx()
-        result['adx'] = adx_data['adx']
-        result['adx_plus'] = adx_data['plus_di']
-        result['adx_minus'] = adx_data['minus_di']
+        if 'adx' in groups:
+            adx_data = self.adx()
+            result['adx'] = adx_data['adx']
+            result['adx_plus'] = adx_data['plus_di']
+            result['adx_minus'] = adx_data['minus_di']
 
         # ATR
-        result['atr'] = self.atr()
-        result['atr_percent'] = self.atr_percent()
+        if 'atr' in groups:
+            result['atr'] = self.atr()
+            result['atr_percent'] = self.atr_percent()
 
         # EMA
-        result['ema_7'] = self.ema(7)
-        result['ema_25'] = self.ema(25)
-        result['ema_99'] = self.ema(99)
+        if 'ema' in groups:
+            result['ema_7'] = self.ema(7)
+            result['ema_25'] = self.ema(25)
+            result['ema_99'] = self.ema(99)
 
         # 趋势和波动
-        result['volatility'] = self.volatility()
-        result['trend_strength'] = self.trend_strength()
-        result['trend_direction'] = self.trend_direction()
-        result['volume_ratio'] = self.volume_ratio()
+        if 'volatility' in groups:
+            result['volatility'] = self.volatility()
+        if 'trend_strength' in groups:
+            result['trend_strength'] = self.trend_strength()
+        if 'trend_direction' in groups:
+            result['trend_direction'] = self.trend_direction()
+        if 'volume_ratio' in groups:
+            result['volume_ratio'] = self.volume_ratio()
 
         return result
 
+    def calculate_all(self) -> pd.DataFrame:
+        """计算所有指标并添加到DataFrame中"""
+        return self.calculate()
+
@@ -9,7 +9,8 @@ import numpy as np
 from typing import Dict, Optional
 
 from config.settings import settings as config
-from strategies.indicators import IndicatorCalculator
+from strategies.indicators import IndicatorCalculator, calc_bollinger_bandwidth
+from market_data.klines import as_frame
 from utils.logger_utils import get_logger
 
 logger = get_logger("market_regime")
@@ -39,6 +40,7 @@ class MarketRegimeDetector:
     """市场状态检测器"""
 
     def __init__(self, df: pd.DataFrame, prev_regime: Optional[MarketRegime] = None):
+        df = as_frame(df)
         self.df = df
         self.ind = IndicatorCalculator(df)
         self.prev_regime = prev_regime  # 上一次的市场状态（用于滞回机制）
@@ -118,6 +120,32 @@ class MarketRegimeDetector:
             details=details
         )
 
+    @classmethod
+    def detect_series(
+        cls,
+        df: pd.DataFrame,
+        prev_regime: Optional[MarketRegime] = None,
+        hysteresis: bool = True
+    ) -> pd.DataFrame:
+        """
+        一次向量化计算每根K线的市场状态
+
+        分类规则与 _classify_regime 一致，滞回机制使用上一根K线的状态。
+
+        Args:
+            df: K线数据
+            prev_regime: 第一根K线之前的市场状态
+            hysteresis: 是否启用滞回机制
+
+        Returns:
+            与 df 索引对齐的 DataFrame，包含 regime/confidence/adx/bb_width_pct/
+            plus_di/minus_di/trend_direction/volatility/close 列，
+            指标预热期的 regime 为空值
+        """
+        return classify_regime_frame(
+            compute_regime_indicators(df), prev_regime, hysteresis
+        )
+
     def _classify_regime(
         self,
         adx: float,
@@ -239,6 +267,246 @@ class MarketRegimeDetector:
         return True, "市场状态正常"
 
 
+def regime_lookback() -> int:
+    """计算最后一根K线的市场状态所需的最少K线数量"""
+    return max(
+        2 * config.ADX_PERIOD,
+        config.BB_PERIOD,
+        config.VOLATILITY_LOOKBACK + 1
+    ) + 1
+
+
+def compute_regime_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    计算市场状态判断所需的指标列
+
+    Returns:
+        包含 adx/plus_di/minus_di/bb_width_pct/volatility/close 的 DataFrame
+    """
+    df = as_frame(df)
+    ind = IndicatorCalculator(df)
+    adx_data = ind.adx(config.ADX_PERIOD)
+
+    return pd.DataFrame({
+        'adx': adx_data['adx'],
+        'plus_di': adx_data['plus_di'],
+        'minus_di': adx_data['minus_di'],
+        'bb_width_pct': calc_bollinger_bandwidth(df['close'], config.BB_PERIOD, config.BB_STD_DEV),
+        'volatility': ind.volatility(config.VOLATILITY_LOOKBACK),
+        'close': df['close'],
+    }, index=df.index)
+
+
+def classify_regime_frame(
+    frame: pd.DataFrame,
+    prev_regime: Optional[MarketRegime] = None,
+    hysteresis: bool = True
+) -> pd.DataFrame:
+    """
+    向量化分类市场状态（与 MarketRegimeDetector._classify_regime 规则一致）
+
+    滞回机制: 上一根K线为趋势市时，只要 ADX/布林带宽度不低于退出阈值就保持趋势市。
+    等价于: 从最近一次"既不满足趋势条件也不满足保持条件"的K线之后，
+    只要出现过满足趋势条件的K线，后续满足保持条件的K线都仍是趋势市。
+
+    Args:
+        frame: compute_regime_indicators 的输出
+        prev_regime: 第一根K线之前的市场状态
+        hysteresis: 是否启用滞回机制
+
+    Returns:
+        在 frame 基础上增加 regime/confidence/trend_direction 列的 DataFrame
+    """
+    adx = frame['adx'].to_numpy(dtype=np.float64)
+    bb = frame['bb_width_pct'].to_numpy(dtype=np.float64)
+    plus_di = frame['plus_di'].to_numpy(dtype=np.float64)
+    minus_di = frame['minus_di'].to_numpy(dtype=np.float64)
+
+    valid = ~(np.isnan(adx) | np.isnan(bb))
+
+    strong = (adx >= config.STRONG_TREND_ADX) & (bb > config.STRONG_TREND_BB)
+    standard = (adx >= 30) & (bb > 3.0)
+    trending = strong | standard
+
+    if hysteresis:
+        hold = (adx >= config.TREND_EXIT_ADX) & (bb >= config.TREND_EXIT_BB)
+        breaks = ~(hold | trending)
+        idx = np.arange(len(adx))
+        # prev_regime 为趋势市时，相当于第一根K线之前已经进入趋势
+        no_break = -2 if prev_regime == MarketRegime.TRENDING else -1
+        last_trend = np.maximum.accumulate(np.where(trending, idx, -1))
+        last_break = np.maximum.accumulate(np.where(breaks, idx, no_break))
+        trending = trending | (hold & (last_trend > last_break))
+
+    ranging = (adx < 20) & (bb < 2.0) & ~trending
+
+    # 置信度
+    score = (
+        0.7 * np.clip((adx - 25.0) / (50.0 - 25.0), 0.0, 1.0)
+        + 0.3 * np.clip((bb - 1.0) / (4.0 - 1.0), 0.0, 1.0)
+    )
+    confidence = np.where(
+        trending,
+        np.clip(score, 0.5, 1.0),
+        np.where(
+            ranging,
+            np.clip(1.0 - (adx / 40) * 0.5 - (bb / 4) * 0.5, 0.5, 1.0),
+            np.clip(score * 0.6, 0.3, 0.7)
+        )
+    )
+
+    regime = np.where(
+        trending, MarketRegime.TRENDING.value,
+        np.where(ranging, MarketRegime.RANGING.value, MarketRegime.TRANSITIONING.value)
+    ).astype(object)
+    regime[~valid] = None
+    confidence = np.where(valid, confidence, np.nan)
+
+    trend_direction = np.where(
+        plus_di > minus_di + 5, 1,
+        np.where(minus_di > plus_di + 5, -1, 0)
+    )
+
+    result = frame.copy()
+    result['regime'] = regime
+    result['confidence'] = confidence
+    result['trend_direction'] = trend_direction
+    return result
+
+
+def regime_info_from_row(row: pd.Series) -> RegimeInfo:
+    """将 detect_series 的一行转换为 RegimeInfo"""
+    details = {
+        'adx': float(row['adx']),
+        'bb_width_pct': float(row['bb_width_pct']),
+        'plus_di': float(row['plus_di']),
+        'minus_di': float(row['minus_di']),
+        'volatility': float(row['volatility']),
+        'close': float(row['close']),
+    }
+
+    return RegimeInfo(
+        regime=MarketRegime(row['regime']),
+        confidence=float(row['confidence']),
+        adx=details['adx'],
+        bb_width=details['bb_width_pct'],
+        trend_direction=int(row['trend_direction']),
+        volatility=details['volatility'],
+        details=details
+    )
+
+
+class RegimeTracker:
+    """
+    增量市场状态跟踪器
+
+    缓存每根K线的市场状态。新K线到来或最后一根K线更新时，只用尾部
+    regime_lookback() 根K线重算指标并沿用缓存中上一根K线的状态做滞回判断；
+    同一批K线重复调用直接命中缓存。
+    """
+
+    def __init__(self, hysteresis: bool = True, max_bars: int = None):
+        """
+        Args:
+            hysteresis: 是否启用滞回机制
+            max_bars: 最多缓存的K线数量，默认 REGIME_CACHE_BARS
+        """
+        self.hysteresis = hysteresis
+        self.max_bars = int(max_bars or getattr(config, 'REGIME_CACHE_BARS', 1000))
+
+        self._series: Optional[pd.DataFrame] = None
+        self._last_key = None
+
+        # 统计
+        self.full_updates = 0
+        self.incremental_updates = 0
+        self.cache_hits = 0
+
+    def reset(self):
+        """清空缓存"""
+        self._series = None
+        self._last_key = None
+
+    @staticmethod
+    def _key(df: pd.DataFrame):
+        last = df.iloc[-1]
+        return (df.index[-1], float(last['open']), float(last['high']),
+                float(last['low']), float(last['close']))
+
+    def _resume_position(self, df: pd.DataFrame) -> Optional[int]:
+        """找到需要重算的起始位置（缓存最后一根K线在 df 中的位置），无法衔接时返回 None"""
+        if self._series is None or self._series.empty:
+            return None
+
+        pos = df.index.get_indexer([self._series.index[-1]])[0]
+        if pos < 0:
+            return None
+
+        overlap = min(pos + 1, len(self._series))
+        if not df.index[pos + 1 - overlap:pos + 1].equals(self._series.index[-overlap:]):
+            return None
+
+        return int(pos)
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        更新并返回市场状态序列
+
+        Args:
+            df: K线数据
+
+        Returns:
+            最近 max_bars 根K线的市场状态序列（格式同 detect_series）
+        """
+        df = as_frame(df)
+        key = self._key(df)
+        if self._series is not None and key == self._last_key:
+            self.cache_hits += 1
+            return self._series
+
+        start = self._resume_position(df)
+        if start is None:
+            series = MarketRegimeDetector.detect_series(df, hysteresis=self.hysteresis)
+            self.full_updates += 1
+        else:
+            tail_start = max(0, start - regime_lookback())
+            indicators = compute_regime_indicators(df.iloc[tail_start:])
+
+            kept = self._series.iloc[:len(self._series) - 1]
+            prev = kept['regime'].iloc[-1] if len(kept) else None
+            prev_regime = MarketRegime(prev) if pd.notna(prev) else None
+
+            new_rows = classify_regime_frame(
+                indicators.iloc[start - tail_start:], prev_regime, self.hysteresis
+            )
+            series = pd.concat([kept, new_rows]) if len(kept) else new_rows
+            self.incremental_updates += 1
+
+        self._series = series.iloc[-self.max_bars:]
+        self._last_key = key
+        return self._series
+
+    def detect(self, df: pd.DataFrame) -> RegimeInfo:
+        """
+        获取最后一根K线的市场状态
+
+        数据不足以完成指标预热时回退到 MarketRegimeDetector.detect()
+        """
+        df = as_frame(df)
+        series = self.update(df)
+        row = series.iloc[-1]
+        if pd.isna(row['regime']):
+            return MarketRegimeDetector(df).detect()
+        return regime_info_from_row(row)
+
+
+def detect_regime_series(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    便捷函数: 计算每根K线的市场状态
+    """
+    return MarketRegimeDetector.detect_series(df)
+
+
 def detect_market_regime(df: pd.DataFrame) -> RegimeInfo:
     """
     便捷函数: 检测市场状态
@@ -1,12 +1,14 @@
+import importlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
 
 from config.settings import settings as config
 from strategies.indicators import IndicatorCalculator, detect_market_state
+from market_data.klines import as_frame
 from utils.logger_utils import get_logger
 
 logger = get_logger("strategies")
@@ -37,16 +39,62 @@ class TradeSignal:
 
 # ==================== 策略基类 ====================
 
+def indicator_warmup(name: str) -> int:
+    """
+    单个指标组产生有效值所需的K线数
+
+    Args:
+        name: 指标组名称（见 strategies.indicators.INDICATOR_GROUPS）
+    """
+    table = {
+        'rsi': config.RSI_PERIOD + 1,
+        'macd': config.MACD_SLOW + config.MACD_SIGNAL,
+        'bollinger': config.BB_PERIOD,
+        'kdj': config.KDJ_PERIOD + 2 * config.KDJ_SIGNAL_PERIOD,
+        'adx': 2 * config.ADX_PERIOD + 1,
+        'atr': config.ATR_PERIOD + 1,
+        'ema': 2 * config.EMA_LONG,
+        'volatility': config.VOLATILITY_LOOKBACK + 1,
+        'trend_strength': 21,
+        'trend_direction': 30,
+        'volume_ratio': 20,
+    }
+    if name not in table:
+        raise ValueError(f"未知指标组: {name}")
+    return table[name]
+
+
 class BaseStrategy(ABC):
     """策略基类"""
 
     name: str = "base"
     description: str = ""
 
-    def __init__(self, df: pd.DataFrame, **kwargs):
+    # 策略依赖的指标组，供指标规划器按需计算及推导预热K线数
+    required_indicators: Tuple[str, ...] = ()
+    # 指标之外策略自身回看的K线数（如 iloc[-2] 为 2）
+    lookback_bars: int = 1
+    # 策略要求的最少K线数（策略内部有硬性长度检查时使用）
+    min_warmup_bars: int = 0
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        indicator_calc: Optional[IndicatorCalculator] = None,
+        **kwargs
+    ):
+        # 支持直接传入 KlineArray
+        df = as_frame(df)
         self.df = df
-        self.ind = IndicatorCalculator(df)
+        # 多个策略分析同一份K线时共享计算器，相同指标只计算一次
+        self.ind = indicator_calc if indicator_calc is not None else IndicatorCalculator(df)
         self.params = kwargs  # 保存优化参数供子类使用
+
+    @classmethod
+    def get_warmup_bars(cls, **params) -> int:
+        """策略产生有效信号所需的最少K线数（指标预热 + 自身回看）"""
+        warmup = max((indicator_warmup(name) for name in cls.required_indicators), default=0)
+        return max(warmup + cls.lookback_bars, cls.min_warmup_bars)
     
     @abstractmethod
     def analyze(self) -> TradeSignal:
@@ -70,6 +118,11 @@ class BandLimitedHedgingStrategy(BaseStrategy):
     name = "band_limited_hedging"
     description = "双向持仓 + MES 不交易区间 + 利润迁移的动态对冲策略"
 
+    @classmethod
+    def get_warmup_bars(cls, **params) -> int:
+        """波动率窗口即预热长度"""
+        return int(params.get("sigma_window", 50))
+
     def __init__(self, df: pd.DataFrame, **kwargs):
         super().__init__(df, **kwargs)
 
@@ -488,9 +541,11 @@ class BollingerBreakthroughStrategy(BaseStrategy):
     
     name = "bollinger_breakthrough"
     description = "价格突破布林带上下轨产生信号"
+    required_indicators = ('bollinger',)
+    lookback_bars = config.BB_BREAKTHROUGH_COUNT
     
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
         self.bb = self.ind.bollinger_bands(
             period=config.BB_PERIOD,
             std_dev=config.BB_STD_DEV
@@ -597,9 +652,11 @@ class BollingerTrendStrategy(BaseStrategy):
 
     name = "bollinger_trend"
     description = "价格突破布林带上轨做多,突破下轨做空(趋势跟踪)"
+    required_indicators = ('bollinger', 'volume_ratio')
+    lookback_bars = config.BB_BREAKTHROUGH_COUNT
 
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
         self.bb = self.ind.bollinger_bands(
             period=config.BB_PERIOD,
             std_dev=config.BB_STD_DEV
@@ -712,9 +769,11 @@ class RSIDivergenceStrategy(BaseStrategy):
     
     name = "rsi_divergence"
     description = "RSI 超买超卖配合背离信号"
+    required_indicators = ('rsi',)
+    lookback_bars = 5
     
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
         self.rsi = self.ind.rsi(config.RSI_PERIOD)
     
     def analyze(self) -> TradeSignal:
@@ -792,9 +851,11 @@ class MACDCrossStrategy(BaseStrategy):
     
     name = "macd_cross"
     description = "MACD 金叉做多，死叉做空"
+    required_indicators = ('macd',)
+    lookback_bars = 2
     
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
         self.macd = self.ind.macd(
             fast=config.MACD_FAST,
             slow=config.MACD_SLOW,
@@ -875,9 +936,11 @@ class EMACrossStrategy(BaseStrategy):
     
     name = "ema_cross"
     description = "短期EMA上穿长期EMA做多，下穿做空"
+    required_indicators = ('ema',)
+    lookback_bars = 2
     
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
         self.ema_short = self.ind.ema(config.EMA_SHORT)
         self.ema_long = self.ind.ema(config.EMA_LONG)
     
@@ -947,9 +1010,10 @@ class KDJStrategy(BaseStrategy):
     
     name = "kdj_cross"
     description = "KDJ 金叉死叉配合超买超卖"
+    required_indicators = ('kdj',)
     
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
         self.kdj = self.ind.kdj(
             period=config.KDJ_PERIOD,
             signal_period=config.KDJ_SIGNAL_PERIOD
@@ -1023,9 +1087,11 @@ class ADXTrendStrategy(BaseStrategy):
     
     name = "adx_trend"
     description = "ADX 判断趋势强度，DI 判断方向"
+    required_indicators = ('adx', 'ema')
+    lookback_bars = 3
     
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
         self.adx_data = self.ind.adx(config.ADX_PERIOD)
         self.ema_short = self.ind.ema(config.EMA_SHORT)
         self.ema_long = self.ind.ema(config.EMA_LONG)
@@ -1149,9 +1215,11 @@ class VolumeBreakoutStrategy(BaseStrategy):
     
     name = "volume_breakout"
     description = "放量突破关键位置"
+    required_indicators = ('volume_ratio', 'bollinger', 'atr')
+    lookback_bars = 2
     
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
         self.volume_ratio = self.ind.volume_ratio(20)
         self.bb = self.ind.bollinger_bands()
         self.atr = self.ind.atr()
@@ -1210,14 +1278,23 @@ class MultiTimeframeStrategy(BaseStrategy):
     
     name = "multi_timeframe"
     description = "综合多个时间周期的信号"
+    required_indicators = ('rsi', 'macd', 'ema', 'trend_direction')
+    min_warmup_bars = 50
     
-    def __init__(self, df: pd.DataFrame, timeframe_data: Dict[str, pd.DataFrame] = None):
-        super().__init__(df)
-        self.timeframe_data = timeframe_data or {}
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        timeframe_data: Dict[str, pd.DataFrame] = None,
+        **kwargs
+    ):
+        super().__init__(df, **kwargs)
+        self.timeframe_data = {
+            tf: as_frame(data) for tf, data in (timeframe_data or {}).items()
+        }
     
     def set_timeframe_data(self, timeframe_data: Dict[str, pd.DataFrame]):
         """设置多时间周期数据"""
-        self.timeframe_data = timeframe_data
+        self.timeframe_data = {tf: as_frame(data) for tf, data in timeframe_data.items()}
     
     def _analyze_single_timeframe(self, df: pd.DataFrame) -> Tuple[int, float]:
         """
@@ -1227,7 +1304,7 @@ class MultiTimeframeStrategy(BaseStrategy):
         if len(df) < 50:
             return 0, 0
         
-        ind = IndicatorCalculator(df)
+        ind = self.ind if df is self.df else IndicatorCalculator(df)
         
         # RSI
         rsi = ind.rsi().iloc[-1]
@@ -1331,9 +1408,10 @@ class GridStrategy(BaseStrategy):
     
     name = "grid"
     description = "在设定价格区间内网格交易"
+    required_indicators = ('bollinger',)
     
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
         self.grid_lines = []
         self._calculate_grid()
     
@@ -1432,9 +1510,11 @@ class CompositeScoreStrategy(BaseStrategy):
     
     name = "composite_score"
     description = "综合多个技术指标进行评分决策"
+    required_indicators = ('rsi', 'macd', 'bollinger', 'kdj', 'adx', 'trend_direction', 'trend_strength', 'volume_ratio')
+    lookback_bars = 2
     
-    def __init__(self, df: pd.DataFrame):
-        super().__init__(df)
+    def __init__(self, df: pd.DataFrame, **kwargs):
+        super().__init__(df, **kwargs)
     
     def _calculate_scores(self) -> Dict[str, float]:
         """
@@ -1606,7 +1686,8 @@ class CompositeScoreStrategy(BaseStrategy):
 
 # ==================== 策略注册表 ====================
 
-STRATEGY_MAP: Dict[str, type] = {
+# 值为策略类，或 "module.path:ClassName" 形式的延迟导入路径（首次使用时解析并缓存为类）
+STRATEGY_MAP: Dict[str, Union[type, str]] = {
     "bollinger_breakthrough": BollingerBreakthroughStrategy,
     "bollinger_trend": BollingerTrendStrategy,  # 新增: 趋势突破版本
     "rsi_divergence": RSIDivergenceStrategy,
@@ -1622,23 +1703,83 @@ STRATEGY_MAP: Dict[str, type] = {
 }
 
 
-def get_strategy(name: str, df: pd.DataFrame, **kwargs) -> BaseStrategy:
-    """获取策略实例"""
+def register_strategy(name: str, strategy: Union[type, str]):
+    """
+    注册策略
+
+    Args:
+        name: 策略名称
+        strategy: 策略类，或 "module.path:ClassName" 延迟导入路径
+                  （模块在策略首次被使用时才导入）
+    """
+    if isinstance(strategy, str) and ':' not in strategy:
+        raise ValueError(f"策略路径格式应为 'module.path:ClassName': {strategy}")
+    STRATEGY_MAP[name] = strategy
+
+
+def get_strategy_class(name: str) -> type:
+    """获取策略类（延迟导入的策略在此时解析）"""
     if name not in STRATEGY_MAP:
         raise ValueError(f"未知策略: {name}")
-    return STRATEGY_MAP[name](df, **kwargs)
+
+    strategy = STRATEGY_MAP[name]
+    if isinstance(strategy, str):
+        module_path, class_name = strategy.split(':', 1)
+        strategy = getattr(importlib.import_module(module_path), class_name)
+        STRATEGY_MAP[name] = strategy
+    return strategy
+
+
+def get_strategy(name: str, df: pd.DataFrame, **kwargs) -> BaseStrategy:
+    """获取策略实例"""
+    return get_strategy_class(name)(df, **kwargs)
+
+
+# ==================== 预热与回测窗口 ====================
+
+def get_required_warmup(strategy_names: Iterable[str], **params) -> int:
+    """
+    一组策略所需的预热K线数（取最大值，未知策略忽略）
+
+    Args:
+        strategy_names: 策略名称列表
+        **params: 策略参数（部分策略的预热长度与参数相关）
+    """
+    warmups = [
+        get_strategy_class(name).get_warmup_bars(**params)
+        for name in strategy_names
+        if name in STRATEGY_MAP
+    ]
+    return max(warmups, default=1)
+
+
+def get_backtest_window(klines: pd.DataFrame, i: int) -> pd.DataFrame:
+    """
+    回测第 i 根K线时传给策略的窗口：当前K线及之前 BACKTEST_WINDOW_BARS 根
+
+    预热长度只决定从哪根K线开始决策，不改变窗口长度，避免回测结果随预热推导变化。
+    """
+    bars = int(getattr(config, 'BACKTEST_WINDOW_BARS', 50))
+    return klines.iloc[max(i - bars, 0):i + 1]
 
 
 def analyze_all_strategies(
     df: pd.DataFrame, 
     strategy_names: List[str],
     min_strength: float = 0.5,
-    min_confidence: float = 0.5
+    min_confidence: float = 0.5,
+    indicator_calc: Optional[IndicatorCalculator] = None
 ) -> List[TradeSignal]:
     """
     运行多个策略并返回所有有效信号
     新增: 过滤低强度和低置信度信号
+
+    Args:
+        indicator_calc: 可选的共享指标计算器（需基于同一份 df），
+                        不传时内部创建，各策略间共享指标结果
     """
+    df = as_frame(df)
+    ind = indicator_calc if indicator_calc is not None else IndicatorCalculator(df)
     signals = []
     
     for name in strategy_names:
@@ -1646,7 +1787,7 @@ def analyze_all_strategies(
             continue
         
         try:
-            strategy = get_strategy(name, df)
+            strategy = get_strategy(name, df, indicator_calc=ind)
             signal = strategy.analyze()
             
             if signal.signal in [Signal.LONG, Signal.SHORT]:
@@ -1671,13 +1812,15 @@ def get_consensus_signal(
     获取共识信号（新增 - 来自 Qbot）
     只有当多数策略同向时才生成信号
     """
+    df = as_frame(df)
+    ind = IndicatorCalculator(df)
     signals = []
     
     for name in strategy_names:
         if name not in STRATEGY_MAP:
             continue
         try:
-            strategy = get_strategy(name, df)
+            strategy = get_strategy(name, df, indicator_calc=ind)
             signal = strategy.analyze()
             signals.append(signal)
         except (KeyError, ValueError, AttributeError) as e:
@@ -1749,6 +1892,8 @@ def get_weighted_signal(
     if total_weight <= 0:
         return TradeSignal(Signal.HOLD, "weighted", "无有效权重配置")
 
+    df = as_frame(df)
+    ind = IndicatorCalculator(df)
     contributions = []
 
     for item in strategies:
@@ -1761,7 +1906,7 @@ def get_weighted_signal(
                 continue
 
             # 获取策略实例并分析
-            strategy = get_strategy(strategy_name, df, **params)
+            strategy = get_strategy(strategy_name, df, indicator_calc=ind, **params)
             signal = strategy.analyze()
 
             # 只处理多空信号
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+交易所 I/O 回放基准测试
+
+用录制的交易所响应（EXCHANGE_IO_RECORDING 指定录制文件，未指定时现场录制模拟交易所的 ccxt
+客户端）回放 fetch_ohlcv / fetch_ticker，测量适配器解析与 DataFrame 构建的耗时，不访问网络。
+
+录制线上数据:
+    from exchange import ExchangeRecorder
+    adapter.exchange = ExchangeRecorder(adapter.exchange, "logs/bitget_io.jsonl.gz")
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from exchange import ExchangeRecorder, ExchangeReplayer
+from exchange.adapters.simulated_adapter import SimulatedClient, SimulatedExchangeAdapter
+
+ROUNDS = 200
+
+
+def _make_recording(path: str):
+    """录制模拟交易所 ccxt 客户端的行情响应"""
+    client = SimulatedClient({"name": "sim_benchmark", "symbol": "ETHUSDT", "seed": 1, "history_bars": 3000})
+    with ExchangeRecorder(client, path) as recorded:
+        for _ in range(ROUNDS):
+            recorded.fetch_ohlcv("ETHUSDT", "15m", limit=200)
+            recorded.fetch_ticker("ETHUSDT")
+
+
+def test_replay_kline_parsing_benchmark():
+    """回放录制响应，测量 K线 DataFrame 构建与行情解析耗时"""
+    print("=" * 60)
+    print("交易所 I/O 回放基准测试")
+    print("=" * 60)
+
+    path = os.getenv("EXCHANGE_IO_RECORDING")
+    if not path:
+        path = os.path.join(tempfile.mkdtemp(), "exchange_io.jsonl.gz")
+        _make_recording(path)
+    print(f"录制文件: {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+
+    replay = ExchangeReplayer(path, loop=True)
+    # 未连接的适配器只用于调用共用的响应解析方法
+    parser = SimulatedExchangeAdapter({"symbol": "ETHUSDT"})._parse_klines
+
+    start = time.perf_counter()
+    payloads = [replay.fetch_ohlcv("ETHUSDT", "15m", limit=200) for _ in range(ROUNDS)]
+    replay_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frames = [parser(payload) for payload in payloads]
+    parse_elapsed = time.perf_counter() - start
+
+    print(f"回放 {ROUNDS} 次 fetch_ohlcv: {replay_elapsed * 1000:.1f} ms")
+    print(f"构建 {ROUNDS} 个 DataFrame: {parse_elapsed * 1000:.1f} ms "
+          f"({parse_elapsed / ROUNDS * 1e6:.0f} µs/次)")
+    print(f"录制耗时分布: {replay.latency_profile()}")
+
+    assert all(len(frame) == len(payloads[0]) for frame in frames)
+    assert replay.stats["exhausted"] == 0
+
+
+if __name__ == "__main__":
+    test_replay_kline_parsing_benchmark()
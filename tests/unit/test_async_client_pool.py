@@ -0,0 +1,137 @@
+"""
+进程级异步客户端池单元测试（不访问网络）
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from exchange import BitgetAdapter
+from exchange.async_pool import AsyncClientPool, get_async_client_pool
+
+
+class FakeClient:
+    def __init__(self):
+        self.load_calls = 0
+        self.loops = set()
+        self.closed = False
+
+    async def load_markets(self):
+        self.load_calls += 1
+        self.loops.add(asyncio.get_running_loop())
+        await asyncio.sleep(0.05)
+        return {'ETH/USDT:USDT': {}}
+
+    async def fetch_ticker(self, symbol):
+        self.loops.add(asyncio.get_running_loop())
+        return {'last': 1.0}
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    pool = AsyncClientPool()
+    yield pool
+    pool.shutdown()
+
+
+def test_sync_and_async_callers_share_background_loop(pool):
+    client = FakeClient()
+
+    # 同步代码
+    assert pool.run(client.fetch_ticker('ETH'))['last'] == 1.0
+
+    # 已在运行的事件循环中调用同步接口（以前需要 nest_asyncio）
+    async def inside_running_loop():
+        sync_result = pool.run(client.fetch_ticker('ETH'))
+        async_result = await pool.call(client.fetch_ticker('ETH'))
+        return sync_result, async_result
+
+    assert asyncio.run(inside_running_loop()) == ({'last': 1.0}, {'last': 1.0})
+    assert client.loops == {pool.loop}
+
+
+def test_load_markets_runs_once_for_concurrent_callers(pool):
+    client = FakeClient()
+    pool._clients[('fake', '', 'swap')] = client
+
+    async def many():
+        return await asyncio.gather(*(pool.load_markets(client) for _ in range(5)))
+
+    results = pool.run(many())
+    pool.run(pool.load_markets(client))
+
+    assert client.load_calls == 1
+    assert all(r == {'ETH/USDT:USDT': {}} for r in results)
+    assert pool.get_stats()['markets_loaded'] == 1
+
+    pool.shutdown()
+    assert client.closed
+
+
+def test_run_timeout_cancels_coroutine(pool):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        pool.run(slow(), timeout=0.05)
+    assert cancelled.wait(1)
+
+
+def test_adapters_reuse_one_client_per_exchange_and_account():
+    class SyncExchange:
+        id = 'bitget'
+        apiKey = 'key'
+        secret = 'secret'
+        password = 'pw'
+        options = {'defaultType': 'swap'}
+
+    first = BitgetAdapter({'symbol': 'ETH/USDT:USDT'})
+    second = BitgetAdapter({'symbol': 'BTC/USDT:USDT'})
+    first.exchange = second.exchange = SyncExchange()
+
+    client = first._get_async_client()
+    assert client is second._get_async_client()
+    assert client.apiKey == 'key' and client.options['defaultType'] == 'swap'
+
+    other = BitgetAdapter({'symbol': 'ETH/USDT:USDT'})
+    other.exchange = type('OtherAccount', (SyncExchange,), {'apiKey': 'other'})()
+    assert other._get_async_client() is not client
+
+    get_async_client_pool().shutdown()
+
+
+def test_clients_keyed_on_full_options_and_closed_by_last_release(pool, monkeypatch):
+    import ccxt.async_support as ccxt_async
+
+    created = []
+
+    class FakeExchange(FakeClient):
+        def __init__(self, config):
+            super().__init__()
+            self.options = config['options']
+            created.append(self)
+
+    monkeypatch.setattr(ccxt_async, 'fakeex', FakeExchange, raising=False)
+    monkeypatch.setattr('exchange.async_pool.install_rate_limiter', lambda client: None)
+    monkeypatch.setattr('exchange.async_pool.install_market_cache', lambda client: None)
+
+    swap = pool.get_client('fakeex', options={'defaultType': 'swap'})
+    hedged = pool.get_client('fakeex', options={'defaultType': 'swap', 'hedged': True})
+    assert hedged is not swap
+    assert pool.get_client('fakeex', options={'defaultType': 'swap'}) is swap
+
+    pool.run(pool.release(swap))
+    assert not swap.closed
+    pool.run(pool.release(swap))
+    assert swap.closed and not hedged.closed
+    assert pool.get_stats()['clients'] == 1
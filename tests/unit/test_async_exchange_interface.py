@@ -0,0 +1,194 @@
+"""
+交易所异步接口单元测试（假客户端，不访问网络）
+"""
+
+import asyncio
+import time
+
+import ccxt
+import pytest
+
+from exchange import (
+    AsyncExchangeInterface, BinanceAsyncAdapter, ExchangeFactory, ExchangeManager, OKXAsyncAdapter,
+)
+from exchange.async_manager import AsyncExchangeManager
+from exchange.async_pool import get_async_client_pool
+from exchange.interface import ORDER_STATUS_UNKNOWN
+from exchange.errors import ExchangeError, NetworkError
+
+DELAY = 0.2
+
+
+class FakeAsyncClient:
+    """模拟 ccxt 异步客户端：记录请求参数，每个请求固定延迟"""
+
+    def __init__(self, exchange_id, delay=DELAY):
+        self.id = exchange_id
+        self.delay = delay
+        self.calls = []
+        self.has = {'fetchClosedOrders': False}
+        self.create_delay = None       # 设置后下单请求按该延迟返回（模拟超时）
+        self.accepted = []             # 交易所已接受的订单
+
+    async def _reply(self, call, value):
+        self.calls.append(call)
+        await asyncio.sleep(self.delay)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    async def fetch_ticker(self, symbol):
+        return await self._reply(('ticker', symbol), {'last': 100.0, 'bid': 99.5, 'timestamp': 1})
+
+    async def fetch_order_book(self, symbol, limit):
+        return await self._reply(('orderbook', limit), {'bids': [[99.5, 1]], 'asks': [[100.5, 2]], 'timestamp': 1})
+
+    async def fetch_balance(self, params=None):
+        return await self._reply(('balance', params), {'USDT': {'free': 1234.5}})
+
+    async def fetch_positions(self, symbols, params=None):
+        return await self._reply(('positions', params), [{'side': 'long', 'contracts': 2, 'entryPrice': 100}])
+
+    async def create_order(self, symbol, type, side, amount, price=None, params=None):
+        if amount > 100:
+            return await self._reply(('create', params), ccxt.InsufficientFunds('not enough'))
+        order = {'id': 'o1', 'clientOrderId': params.get('clientOrderId'), 'amount': amount,
+                 'status': 'open', 'filled': 0}
+        if self.create_delay is not None:
+            # 订单已在交易所生效，但响应迟迟不返回
+            self.accepted.append(order)
+            self.calls.append(('create', params))
+            await asyncio.sleep(self.create_delay)
+            return order
+        return await self._reply(('create', params), order)
+
+    async def fetch_open_orders(self, symbol, params=None):
+        return await self._reply(('open_orders', params), list(self.accepted))
+
+    async def cancel_order(self, order_id, symbol, params=None):
+        return await self._reply(('cancel', params), {'id': order_id, 'status': 'canceled'})
+
+    async def fetch_order(self, order_id, symbol, params=None):
+        return await self._reply(('fetch_order', params), {
+            'id': order_id, 'side': 'buy', 'amount': 1, 'filled': 1, 'average': 100.2, 'status': 'closed',
+        })
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    clients = {}
+
+    async def acquire(exchange_id, api_key="", secret="", password="", options=None):
+        return clients.setdefault(exchange_id, FakeAsyncClient(exchange_id))
+
+    monkeypatch.setattr(get_async_client_pool(), 'acquire', acquire)
+    yield clients
+    ExchangeFactory.clear_instances()
+
+
+@pytest.fixture
+def manager(monkeypatch, fake_pool):
+    manager = ExchangeManager()
+    monkeypatch.setattr(manager, '_config', {
+        'bitget': {'symbol': 'ETH/USDT:USDT'},
+        'okx': {'symbol': 'ETH/USDT:USDT'},
+    })
+    monkeypatch.setattr(manager, '_current_exchange_name', 'bitget')
+    return manager
+
+
+def test_manager_serves_async_adapters_with_concurrent_reads(manager, fake_pool):
+    async def run():
+        bitget = await manager.get_async_exchange()
+        assert isinstance(bitget, AsyncExchangeInterface)
+        assert await manager.get_async_exchange('bitget') is bitget
+
+        start = time.perf_counter()
+        result = await asyncio.gather(
+            bitget.get_ticker(), bitget.get_orderbook(limit=5),
+            bitget.get_balance(), bitget.get_positions(),
+        )
+        return result, time.perf_counter() - start
+
+    (ticker, orderbook, balance, positions), elapsed = asyncio.run(run())
+
+    assert elapsed < DELAY * 2
+    assert ticker.last == 100.0 and ticker.symbol == 'ETH/USDT:USDT'
+    assert orderbook['asks'] == [[100.5, 2]]
+    assert balance == 1234.5
+    assert [(p.side, p.amount) for p in positions] == [('long', 2.0)]
+    # Bitget 请求携带 productType（与同步适配器一致）
+    assert ('balance', {'productType': 'USDT-FUTURES'}) in fake_pool['bitget'].calls
+
+
+def test_order_lifecycle_uses_adapter_params(manager, fake_pool):
+    async def run():
+        okx = await manager.get_async_exchange('okx')
+        placed = await okx.place_order('ETH/USDT:USDT', 'buy', 1)
+        rejected = await okx.place_order('ETH/USDT:USDT', 'buy', 1000)
+        canceled = await okx.cancel_order('o1', 'ETH/USDT:USDT')
+        status = await okx.get_order_status('o1', 'ETH/USDT:USDT')
+        return placed, rejected, canceled, status
+
+    placed, rejected, canceled, status = asyncio.run(run())
+
+    assert placed.success and placed.order_id == 'o1' and placed.side == 'buy'
+    assert not rejected.success and '余额不足' in rejected.error
+    assert canceled.success and canceled.status == 'canceled'
+    assert status.filled_quantity == 1 and status.avg_price == 100.2 and status.side == 'buy'
+    create_params = fake_pool['okx'].calls[0][1]
+    assert create_params['tdMode'] == 'cross' and create_params['clientOrderId']
+
+    with pytest.raises(ExchangeError):
+        asyncio.run(manager.get_async_exchange('binance'))
+
+
+def test_timeout_and_disconnected_errors(fake_pool):
+    adapter = BinanceAsyncAdapter({'symbol': 'BTC/USDT:USDT'})
+    with pytest.raises(ExchangeError):
+        asyncio.run(adapter.get_ticker())
+
+    async def run():
+        async with OKXAsyncAdapter({}) as okx:
+            okx.client.delay = 1.0
+            await okx.get_ticker(timeout=0.05)
+
+    with pytest.raises(NetworkError):
+        asyncio.run(run())
+
+
+def test_order_timeout_is_confirmed_by_client_order_id(fake_pool):
+    async def run():
+        async with OKXAsyncAdapter({}) as okx:
+            okx.client.delay = 0.0
+            okx.client.create_delay = 1.0
+            return await okx.place_order('ETH/USDT:USDT', 'buy', 1, timeout=0.05)
+
+    # 请求超时但订单已生效：按 clientOrderId 在挂单中找到，返回成功
+    confirmed = asyncio.run(run())
+    assert confirmed.success and confirmed.order_id == 'o1' and confirmed.side == 'buy'
+
+
+def test_unconfirmed_order_timeout_reports_unknown_state(fake_pool):
+    async def run():
+        async with OKXAsyncAdapter({}) as okx:
+            okx.client.delay = 0.0
+            okx.client.create_delay = 1.0
+            # 交易所查不到该订单（请求仍在途）
+            okx.client.fetch_open_orders = lambda symbol, params=None: asyncio.sleep(0, result=[])
+            return await okx.place_order('ETH/USDT:USDT', 'buy', 1, timeout=0.05)
+
+    result = asyncio.run(run())
+    assert not result.success and result.status == ORDER_STATUS_UNKNOWN
+    assert result.raw_data['clientOrderId']
+
+
+def test_async_exchange_manager_delegates_to_unified_adapter(manager, fake_pool):
+    async def run():
+        async with AsyncExchangeManager('bitget') as legacy:
+            assert legacy.exchange is await manager.get_async_exchange('bitget')
+            return await legacy.fetch_ticker_async('ETH/USDT:USDT')
+
+    ticker = asyncio.run(run())
+    assert ticker['last'] == 100.0
+    assert ('ticker', 'ETH/USDT:USDT') in fake_pool['bitget'].calls
@@ -0,0 +1,96 @@
+"""
+交易所异步读取接口单元测试（不访问网络）
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from exchange import BitgetAdapter
+from exchange.errors import NetworkError
+from exchange.legacy_adapter import LegacyAdapter
+
+DELAY = 0.2
+
+
+class FakeAsyncClient:
+    """模拟 ccxt 异步客户端：每个请求固定延迟"""
+
+    def __init__(self, delay=DELAY):
+        self.delay = delay
+        self.calls = []
+        self.closed = False
+
+    async def fetch_ticker(self, symbol):
+        self.calls.append('ticker')
+        await asyncio.sleep(self.delay)
+        return {'last': 100.0, 'bid': 99.5, 'ask': 100.5, 'baseVolume': 10, 'timestamp': 1}
+
+    async def fetch_ohlcv(self, symbol, timeframe, limit=None, params=None):
+        self.calls.append(('ohlcv', timeframe, limit, params))
+        await asyncio.sleep(self.delay)
+        return [[1_700_000_000_000 + i * 300_000, 1, 2, 0.5, 1.5, 10] for i in range(limit)]
+
+    async def fetch_positions(self, symbols, params=None):
+        self.calls.append(('positions', params))
+        await asyncio.sleep(self.delay)
+        return [
+            {'side': 'long', 'contracts': 2, 'entryPrice': 100, 'unrealizedPnl': 1, 'leverage': 5},
+            {'side': 'short', 'contracts': 0},
+        ]
+
+    async def close(self):
+        self.closed = True
+
+
+def make_adapter(client):
+    adapter = BitgetAdapter({'symbol': 'ETH/USDT:USDT'})
+    adapter.exchange = object()  # 标记为已连接
+    adapter._get_async_client = lambda: client
+    return adapter
+
+
+def test_reads_run_concurrently_and_parse_like_sync_api():
+    client = FakeAsyncClient()
+    trader = LegacyAdapter(make_adapter(client))
+
+    async def cycle():
+        start = time.perf_counter()
+        result = await asyncio.gather(
+            trader.get_klines_async(),
+            trader.get_ticker_async(),
+            trader.get_positions_async(),
+        )
+        return result, time.perf_counter() - start
+
+    (df, ticker, positions), elapsed = asyncio.run(cycle())
+
+    assert elapsed < DELAY * 2
+    assert len(df) == 100 and df.index.name == 'timestamp'
+    assert ticker.last == 100.0 and ticker.bid == 99.5
+    assert positions == [{
+        'side': 'long', 'amount': 2.0, 'entry_price': 100.0, 'unrealized_pnl': 1.0,
+        'leverage': 5, 'margin_mode': 'crossed', 'raw_data': positions[0]['raw_data'],
+    }]
+    # Bitget 请求携带 productType，默认参数与同步接口一致
+    assert ('ohlcv', '5m', 100, {'productType': 'USDT-FUTURES'}) in client.calls
+
+
+def test_per_call_timeout_raises_network_error():
+    trader = LegacyAdapter(make_adapter(FakeAsyncClient(delay=1.0)))
+
+    with pytest.raises(NetworkError):
+        asyncio.run(trader.get_ticker_async(timeout=0.05))
+
+
+def test_falls_back_to_sync_client_in_thread():
+    class SyncClient:
+        def fetch_ticker(self, symbol):
+            return {'last': 42.0, 'timestamp': 1}
+
+    adapter = BitgetAdapter({'symbol': 'ETH/USDT:USDT'})
+    adapter.exchange = SyncClient()  # 没有 ccxt id，无法创建异步客户端
+
+    ticker = asyncio.run(adapter.get_ticker_async(timeout=1))
+    assert ticker.last == 42.0 and ticker.bid is None
@@ -0,0 +1,82 @@
+"""
+后台分析执行器与 Policy Layer 原子更新单元测试
+"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from ai.policy_layer import PolicyDecision, PolicyLayer, RiskMode
+from core.background_analysis import BackgroundAnalysisWorker
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_submit_does_not_wait_and_skips_while_running():
+    worker = BackgroundAnalysisWorker(max_result_age=60)
+    release = threading.Event()
+    df = pd.DataFrame({'close': [1.0, 2.0, 3.0]})
+
+    def slow_job(snapshot):
+        release.wait(2)
+        return snapshot.df['close'].sum()
+
+    snapshot = worker.snapshot(df, 3.0, {'side': 'long', 'amount': 0.1})
+    start = time.perf_counter()
+    assert worker.submit('policy', snapshot, slow_job)
+    assert time.perf_counter() - start < 0.1
+    assert not worker.submit('policy', worker.snapshot(df, 3.0), slow_job)
+    assert worker.drain() == []
+
+    # 快照与原始数据隔离且只读
+    df.loc[0, 'close'] = 100.0
+    with pytest.raises(TypeError):
+        snapshot.position_info['side'] = 'short'
+
+    release.set()
+    assert wait_for(lambda: not worker.is_busy('policy'))
+    results = worker.drain()
+    assert [(r.name, r.value, r.snapshot.position_side) for r in results] == [('policy', 6.0, 'long')]
+    assert worker.get_stats()['skipped'] == 1
+    worker.shutdown()
+
+
+def test_stale_results_are_discarded():
+    worker = BackgroundAnalysisWorker(max_result_age=0.05, inline=True)
+    snapshot = worker.snapshot(pd.DataFrame({'close': [1.0]}), 1.0)
+    assert worker.submit('claude', snapshot, lambda snap: time.sleep(0.1) or 'late')
+    assert worker.drain() == []
+    assert worker.get_stats()['stale'] == 1
+
+    assert worker.submit('claude', worker.snapshot(pd.DataFrame(), 1.0), lambda snap: 1 / 0)
+    assert worker.drain() == [] and worker.get_stats()['failed'] == 1
+
+
+def test_policy_decision_replaces_parameters_atomically():
+    layer = PolicyLayer()
+    before = layer.get_current_parameters()
+    old_stop_loss = before.stop_loss_pct
+
+    decision = PolicyDecision(
+        suggested_risk_mode=RiskMode.DEFENSIVE,
+        suggested_position_multiplier=0.5,
+        strategies_to_disable=['nonexistent'],
+        confidence=0.9,
+        reason='test',
+    )
+    success, _, actions = layer.validate_and_apply_decision(decision, None)
+    after = layer.get_current_parameters()
+
+    assert success and actions
+    assert after is not before
+    # 旧参数对象保持不变：持有引用的读取方不会看到半更新状态
+    assert before.stop_loss_pct == old_stop_loss and before.risk_mode == RiskMode.NORMAL
+    assert after.risk_mode == RiskMode.DEFENSIVE and after.position_size_multiplier == 0.5
+    assert after.last_decision is decision
@@ -0,0 +1,111 @@
+"""
+Band-Limited 回测快速路径单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.logger_utils  # noqa: F401  保证导入顺序，避免 backtest 与 logger_utils 循环导入
+from config.settings import settings as config
+from backtest.engine import BacktestEngine
+from backtest.band_limited_fast import ACTION_DTYPE
+
+
+class _DummyRepo:
+    def __init__(self):
+        self.trades = []
+
+    def append_trade(self, session_id, trade):
+        self.trades.append(dict(trade))
+        return len(self.trades)
+
+
+def _make_klines(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    # 高/低波动交替，覆盖再平衡、低波动退出与暂停
+    vol = np.where(np.arange(n) % 300 < 150, 0.004, 0.0003)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 1, n) * vol))
+    df = pd.DataFrame({
+        "open": prices, "high": prices, "low": prices, "close": prices,
+        "volume": np.ones(n),
+    })
+    df.index = pd.date_range("2024-01-01", periods=n, freq="min")
+    return df
+
+
+def _run(df, params, fast, monkeypatch):
+    monkeypatch.setattr(config, "BACKTEST_BAND_LIMITED_FAST_PATH", fast, raising=False)
+    repo = _DummyRepo()
+    metrics = BacktestEngine(repo)._run_band_limited("test", df, dict(params), 10000)
+    return metrics, repo.trades
+
+
+@pytest.mark.parametrize("params", [
+    {"MES": 0.01, "alpha": 0.5, "leverage": 3},
+    {"MES": 0.004, "alpha": 0.5, "leverage": 2, "E_max": 50, "tau_max": 600},
+    {"MES": 0.004, "alpha": 0.3, "leverage": 2, "exit_sigma_k": 500,
+     "exit_sigma_consecutive": 3, "sigma_window": 20},
+])
+def test_fast_path_matches_strategy_analyze(params, monkeypatch):
+    df = _make_klines()
+    slow_metrics, slow_trades = _run(df, params, False, monkeypatch)
+    fast_metrics, fast_trades = _run(df, params, True, monkeypatch)
+
+    assert len(slow_trades) > 2
+    assert fast_trades == slow_trades
+    assert fast_metrics == slow_metrics
+
+
+def test_fast_path_returns_structured_actions():
+    from strategies.strategies import BandLimitedHedgingStrategy
+    from backtest.band_limited_fast import BandLimitedFastPath, ACTION_OPEN
+
+    df = _make_klines(200)
+    strategy = BandLimitedHedgingStrategy(df.iloc[:51], MES=0.01, initial_capital=10000, leverage=2)
+    fast = BandLimitedFastPath(strategy)
+    actions = fast.run(df["close"].to_numpy(), start=50, window=51)
+
+    assert actions.dtype == ACTION_DTYPE
+    assert (actions["action"][:2] == ACTION_OPEN).all()
+    fast.sync_strategy()
+    assert strategy.state["p_ref"] is not None
+
+
+@pytest.mark.parametrize("seed", [1, 7])
+@pytest.mark.parametrize("params", [
+    {"MES": 0.004, "alpha": 0.5, "leverage": 2, "tau_max": 1800},
+    {"MES": 0.003, "alpha": 0.7, "leverage": 3, "E_max": 80, "eta": 0.5},
+    {"MES": 0.004, "alpha": 0.3, "leverage": 2, "exit_sigma_k": 500,
+     "exit_sigma_consecutive": 2, "sigma_window": 10},
+])
+def test_fast_path_parity_bar_by_bar(seed, params):
+    """同一组K线上，快速路径每根K线的动作与最终状态都与 analyze() 一致"""
+    from strategies.strategies import BandLimitedHedgingStrategy, get_backtest_window, get_required_warmup
+    from backtest.band_limited_fast import BandLimitedFastPath, SIDE_LONG
+
+    df = _make_klines(500, seed=seed)
+    params = dict(params, initial_capital=10000)
+    start = get_required_warmup(["band_limited_hedging"], **params)
+
+    slow = BandLimitedHedgingStrategy(df.iloc[:51], **params)
+    fast = BandLimitedFastPath(BandLimitedHedgingStrategy(df.iloc[:51], **params))
+    assert BandLimitedFastPath.supports(slow)
+
+    ts = df.index.values.astype("datetime64[ns]").astype(np.int64) / 1e9
+    actions = fast.run(df["close"].to_numpy(), ts, start=start, window=51)
+
+    side_names = {SIDE_LONG: "long"}
+    for i in range(start, len(df)):
+        slow.update_window(get_backtest_window(df, i))
+        expected = slow.analyze().indicators.get("actions", [])
+        got = actions[actions["bar"] == i]
+        assert [(a["side"], a["action"], round(a["qty"], 10), round(a["price"], 10)) for a in expected] == [
+            (side_names.get(int(a["side"]), "short"), "open" if a["action"] == 0 else "close",
+             round(float(a["qty"]), 10), round(float(a["price"]), 10))
+            for a in got
+        ], f"bar {i}"
+
+    fast_state = fast.state_dict()
+    for key, value in slow.state.items():
+        assert fast_state[key] == pytest.approx(value) if isinstance(value, float) else fast_state[key] == value
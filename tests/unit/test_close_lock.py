@@ -0,0 +1,69 @@
+"""
+平仓锁单元测试：快速止损通道与主循环策略退出不会重复平仓
+"""
+
+import contextlib
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import bot as bot_module
+from bot import TradingBot
+from risk.risk_manager import StopLossResult
+
+
+class _RiskStub:
+    def __init__(self):
+        self.position = SimpleNamespace(side='long', amount=1.0, entry_price=100.0)
+
+    def clear_position(self):
+        self.position = None
+
+
+def _make_bot(monkeypatch):
+    monkeypatch.setattr(bot_module, 'db', MagicMock())
+    monkeypatch.setattr(bot_module, 'notifier', MagicMock())
+
+    bot = TradingBot.__new__(TradingBot)
+    bot._close_lock = threading.RLock()
+    bot.risk_manager = _RiskStub()
+    bot.metrics_logger = SimpleNamespace(timer=lambda name: contextlib.nullcontext())
+    bot.shadow_tracker = MagicMock()
+    bot.current_trade_id = None
+    bot.current_position_side = 'long'
+    bot.current_strategy = 'test'
+
+    calls = []
+
+    def close_position(reason, position_data=None):
+        calls.append(reason)
+        time.sleep(0.05)
+        # trader.close_position 内部记录交易结果并清空风控持仓
+        bot.risk_manager.position = None
+        return True
+
+    bot.trader = SimpleNamespace(close_position=close_position)
+    return bot, calls
+
+
+def test_strategy_exit_skips_position_closed_by_fast_stop(monkeypatch):
+    bot, calls = _make_bot(monkeypatch)
+    position = {'side': 'long', 'amount': 1.0, 'entry_price': 100.0}
+    stop = StopLossResult(should_stop=True, reason='止损', current_price=95.0)
+
+    fast = threading.Thread(target=bot._on_fast_stop, args=(stop,))
+    fast.start()
+    time.sleep(0.01)
+    assert bot._execute_close_position(position, '策略退出', 'strategy', 95.0) is False
+    fast.join()
+
+    assert calls == ['止损']
+
+
+def test_close_runs_when_position_still_open(monkeypatch):
+    bot, calls = _make_bot(monkeypatch)
+    position = {'side': 'long', 'amount': 1.0, 'entry_price': 100.0}
+
+    assert bot._execute_close_position(position, '策略退出', 'strategy', 105.0) is True
+    assert calls == ['策略退出']
@@ -0,0 +1,68 @@
+"""
+主循环评估重试单元测试：poll() 消费收盘评估后，本轮数据获取失败时重新登记评估
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from bot import TradingBot
+from config.settings import settings as config
+from core.cycle_scheduler import CycleScheduler, EVALUATE
+
+
+def _klines():
+    return pd.DataFrame({c: np.linspace(100, 110, 60) for c in ('open', 'high', 'low', 'close', 'volume')},
+                        index=pd.date_range('2024-01-01', periods=60, freq='5min'))
+
+
+def _make_bot(monkeypatch, **trader):
+    monkeypatch.setattr(config, 'DEFAULT_CHECK_INTERVAL', 1, raising=False)
+    bot = TradingBot.__new__(TradingBot)
+    bot.cycle_count = 0
+    bot.metrics_logger = MagicMock()
+    bot._last_df = None
+    bot.market_stream = None
+    bot.trader = SimpleNamespace(**trader)
+    bot.scheduler = CycleScheduler(['5m'], price_interval=0.5)
+    # 收盘评估已被 poll() 消费
+    assert EVALUATE in bot.scheduler.poll(False)
+    assert bot.scheduler._evaluate_due is None
+    return bot
+
+
+def test_sync_ticker_failure_reschedules_evaluation(monkeypatch):
+    bot = _make_bot(monkeypatch, get_klines=_klines, get_ticker=lambda: None)
+    bot._main_loop({EVALUATE})
+    assert bot.scheduler._evaluate_due is not None
+    assert bot.scheduler._evaluate_due <= time.time() + 1
+
+
+def test_async_ticker_and_position_failures_reschedule_evaluation(monkeypatch):
+    async def klines(timeout=None):
+        return _klines()
+
+    async def no_ticker(timeout=None):
+        return None
+
+    async def ticker(timeout=None):
+        return SimpleNamespace(last=105.0)
+
+    async def no_positions(timeout=None):
+        return None
+
+    bot = _make_bot(monkeypatch, get_klines_async=klines, get_ticker_async=no_ticker,
+                    get_positions_async=no_positions)
+    bot.stop_watcher = None
+    bot.status_monitor = None
+    asyncio.run(bot._main_loop_async({EVALUATE}))
+    assert bot.scheduler._evaluate_due is not None
+
+    bot.scheduler._evaluate_due = None
+    bot.trader.get_ticker_async = ticker
+    asyncio.run(bot._main_loop_async({EVALUATE}))
+    assert bot.scheduler._evaluate_due is not None
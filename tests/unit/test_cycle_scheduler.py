@@ -0,0 +1,82 @@
+"""
+K线收盘对齐的主循环调度器单元测试
+"""
+
+import pytest
+
+from core.cycle_scheduler import CycleScheduler, EVALUATE, PRICE
+
+T0 = 1_700_000_100.0  # 5m 收盘边界（300 的整数倍）
+
+
+def make_scheduler(now=T0 + 10, **kwargs):
+    kwargs.setdefault('price_interval', 0.5)
+    kwargs.setdefault('close_delay', 1.0)
+    kwargs.setdefault('max_wait', 5.0)
+    return CycleScheduler(['5m'], now=now, **kwargs)
+
+
+def test_evaluates_on_start_then_only_at_candle_close():
+    scheduler = make_scheduler()
+    assert scheduler.poll(False, now=T0 + 10) == {EVALUATE}
+    assert scheduler.poll(False, now=T0 + 11) == set()
+    assert scheduler.poll(False, now=T0 + 300.5) == set()  # 收盘延迟内
+    assert scheduler.poll(False, now=T0 + 301) == {EVALUATE}
+    assert scheduler.poll(False, now=T0 + 302) == set()
+    assert scheduler.evaluations == 2
+
+
+def test_candle_close_event_is_not_evaluated_twice():
+    scheduler = make_scheduler()
+    scheduler.poll(False, now=T0 + 10)
+
+    # 推送的收盘事件早于时钟边界 + 延迟到达
+    scheduler.on_candle_close('5m', int(T0 * 1000))
+    assert scheduler.seconds_until_next(False, now=T0 + 300.2) == 0
+    assert scheduler.poll(False, now=T0 + 300.2) == {EVALUATE}
+    assert scheduler.poll(False, now=T0 + 301) == set()
+
+    # 重复或其他周期的事件不触发
+    scheduler.on_candle_close('5m', int(T0 * 1000))
+    scheduler.on_candle_close('1h', int(T0 * 1000))
+    assert scheduler.poll(False, now=T0 + 302) == set()
+
+
+def test_price_checks_only_while_holding_position():
+    scheduler = make_scheduler()
+    scheduler.poll(True, now=T0 + 10)
+
+    scheduler.on_price_update()
+    assert scheduler.poll(False, now=T0 + 10.1) == set()
+    assert scheduler.poll(True, now=T0 + 10.2) == {PRICE}
+    assert scheduler.poll(True, now=T0 + 10.3) == set()
+    assert scheduler.poll(True, now=T0 + 10.7) == {PRICE}  # 无推送时按 price_interval 轮询
+
+
+def test_timers_run_at_their_own_interval():
+    scheduler = make_scheduler(timers={'claude': 60})
+    assert scheduler.poll(False, now=T0 + 10) == {EVALUATE, 'claude'}
+    assert scheduler.poll(False, now=T0 + 69) == set()
+    assert scheduler.poll(False, now=T0 + 70) == {'claude'}
+
+
+def test_seconds_until_next():
+    scheduler = make_scheduler(max_wait=5.0, timers={'status': 3})
+    scheduler.poll(False, now=T0 + 10)
+    assert scheduler.seconds_until_next(False, now=T0 + 10) == pytest.approx(3)
+    assert scheduler.seconds_until_next(True, now=T0 + 10) == pytest.approx(0.5)
+
+    scheduler = make_scheduler(max_wait=5.0)
+    scheduler.poll(False, now=T0 + 10)
+    assert scheduler.seconds_until_next(False, now=T0 + 10) == pytest.approx(5)
+    assert scheduler.seconds_until_next(False, now=T0 + 299) == pytest.approx(2)
+    assert scheduler.next_candle_close(now=T0 + 299) == pytest.approx(T0 + 301)
+
+
+def test_failed_evaluation_is_retried_after_delay():
+    scheduler = make_scheduler()
+    scheduler.poll(False, now=T0 + 10)
+    scheduler.request_evaluation(delay=1.0, now=T0 + 10)
+    assert scheduler.seconds_until_next(False, now=T0 + 10) == pytest.approx(1.0)
+    assert scheduler.poll(False, now=T0 + 10.5) == set()
+    assert scheduler.poll(False, now=T0 + 11) == {EVALUATE}
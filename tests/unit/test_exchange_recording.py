@@ -0,0 +1,93 @@
+"""
+交易所 I/O 录制与回放单元测试（基于模拟交易所，不访问网络）
+"""
+
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from exchange import ExchangeFactory, ExchangeRecorder, ExchangeReplayer
+from exchange.adapters.simulated_adapter import reset_simulated_exchanges
+from exchange.interface import OrderResult, TickerData
+
+
+@pytest.fixture
+def simulated():
+    reset_simulated_exchanges()
+    exchange = ExchangeFactory.create("simulated", {
+        "name": "sim_recording", "symbol": "ETHUSDT", "seed": 3, "latency_ms": 20,
+        "history_bars": 300, "initial_balance": 1000.0,
+    })
+    yield exchange
+    reset_simulated_exchanges()
+
+
+def test_record_and_replay_adapter_calls(simulated, tmp_path):
+    path = str(tmp_path / "io.jsonl.gz")
+    with ExchangeRecorder(simulated, path) as recorded:
+        assert recorded.symbol == "ETHUSDT"
+        ticker = recorded.get_ticker()
+        df = recorded.get_klines(timeframe="15m", limit=50)
+        order = recorded.place_order("ETHUSDT", "buy", 0.1)
+        recorded.get_ticker()
+        assert recorded.count == 4
+
+    replay = ExchangeReplayer(path)
+    assert replay.symbol == "ETHUSDT" and replay.exchange_name == "sim_recording"
+
+    # 按参数匹配：先请求K线也能拿到对应录制
+    replay_df = replay.get_klines(timeframe="15m", limit=50)
+    pd.testing.assert_frame_equal(replay_df, df, check_freq=False)
+    assert isinstance(replay_df.index, pd.DatetimeIndex)
+
+    replay_ticker = replay.get_ticker()
+    assert isinstance(replay_ticker, TickerData) and replay_ticker == ticker
+    replay_order = replay.place_order("ETHUSDT", "buy", 0.1)
+    assert isinstance(replay_order, OrderResult) and replay_order.avg_price == order.avg_price
+
+    # 参数不同时退回同一方法的下一条录制；用完后报错
+    replay.get_ticker("OTHER")
+    with pytest.raises(Exception):
+        replay.get_ticker()
+    assert replay.stats == {"calls": 5, "exact": 3, "fallback": 1, "exhausted": 1}
+
+    profile = replay.latency_profile()
+    assert profile["get_ticker"]["count"] == 2 and profile["get_ticker"]["p50"] >= 0.015
+
+
+def test_replay_pacing_errors_and_async(tmp_path):
+    class FakeClient:
+        id = "bitget"
+
+        def fetch_ticker(self, symbol):
+            time.sleep(0.1)
+            return {"symbol": symbol, "last": 1.5}
+
+        def create_order(self, *args):
+            from ccxt import InsufficientFunds
+            raise InsufficientFunds("余额不足")
+
+        async def fetch_order_book(self, symbol, limit=None):
+            await asyncio.sleep(0.01)
+            return {"bids": [[1.0, 2.0]], "asks": [[1.1, 3.0]]}
+
+    path = str(tmp_path / "io.jsonl")
+    recorder = ExchangeRecorder(FakeClient(), path)
+    recorder.fetch_ticker("ETH")
+    with pytest.raises(Exception):
+        recorder.create_order("ETH", "market", "buy", 1)
+    asyncio.run(recorder.fetch_order_book("ETH", 5))
+    recorder.close()
+
+    fast = ExchangeReplayer(path, speed=10, loop=True)
+    for _ in range(3):
+        start = time.monotonic()
+        assert fast.fetch_ticker("ETH") == {"symbol": "ETH", "last": 1.5}
+        assert 0.005 <= time.monotonic() - start < 0.08
+    import ccxt
+    with pytest.raises(ccxt.InsufficientFunds):
+        fast.create_order("ETH", "market", "buy", 1)
+    book = asyncio.run(fast.fetch_order_book("ETH", 5))
+    assert book["asks"] == [[1.1, 3.0]]
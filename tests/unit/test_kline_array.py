@@ -0,0 +1,115 @@
+"""
+KlineArray 单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import KlineArray
+from strategies.indicators import IndicatorCalculator
+from strategies.strategies import analyze_all_strategies, get_strategy
+
+BASE_MS = 15 * 60_000
+START_MS = 1_700_006_400_000
+
+
+def make_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 5, n))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 3, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 3, n)
+    ts = START_MS + np.arange(n) * BASE_MS
+    return [[int(t), o, h, l, c, v] for t, o, h, l, c, v in
+            zip(ts, open_, high, low, close, rng.uniform(10, 100, n))]
+
+
+def rows_to_frame(rows):
+    df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.set_index('timestamp', inplace=True)
+    return df
+
+
+def test_to_frame_matches_fetch_ohlcv_layout():
+    rows = make_rows(50)
+    klines = KlineArray.from_ohlcv(rows)
+    pd.testing.assert_frame_equal(klines.to_frame(), rows_to_frame(rows), check_index_type=False)
+
+    roundtrip = KlineArray.from_frame(rows_to_frame(rows))
+    np.testing.assert_array_equal(roundtrip.timestamp, klines.timestamp)
+
+
+def test_append_grows_and_updates_last_bar():
+    rows = make_rows(10)
+    klines = KlineArray(capacity=2)
+    for row in rows:
+        klines.append(*row)
+
+    assert len(klines) == 10
+    ts = rows[-1][0]
+    klines.append(ts, 1.0, 2.0, 0.5, 1.5, 7.0)
+    assert len(klines) == 10
+    assert klines[-1] == (ts, 1.0, 2.0, 0.5, 1.5, 7.0)
+
+    with pytest.raises(ValueError):
+        klines.append(rows[0][0], 1, 1, 1, 1, 1)
+
+
+def test_extend_skips_old_rows_and_overwrites_last():
+    rows = make_rows(20)
+    klines = KlineArray.from_ohlcv(rows[:15])
+    updated = list(rows[14])
+    updated[4] = 123.0
+    klines.extend([rows[10], updated] + rows[15:])
+
+    assert len(klines) == 20
+    assert klines.close[14] == 123.0
+    np.testing.assert_array_equal(klines.timestamp, [r[0] for r in rows])
+
+
+def test_windows_are_zero_copy_and_read_only():
+    klines = KlineArray.from_ohlcv(make_rows(100))
+    window = klines[-30:]
+
+    assert len(window) == 30
+    assert np.shares_memory(window.close, klines.close)
+    assert window.timestamp[0] == klines.timestamp[70]
+    with pytest.raises(ValueError):
+        window.append(0, 1, 1, 1, 1, 1)
+
+
+
+def test_trim_does_not_move_data_under_existing_views():
+    rows = make_rows(100)
+    klines = KlineArray.from_ohlcv(rows)
+    window = klines[:10]
+    expected = window.close.copy()
+
+    klines.trim(5)
+    assert len(klines) == 5 and klines.timestamp[0] == rows[95][0]
+    np.testing.assert_array_equal(window.close, expected)
+    assert window.timestamp[0] == rows[0][0]
+
+def test_float32_precision_halves_value_memory():
+    rows = make_rows(100)
+    compact = KlineArray.from_ohlcv(rows, dtype='float32')
+    full = KlineArray.from_ohlcv(rows, dtype='float64')
+
+    assert compact.to_frame()['close'].dtype == np.float32
+    assert compact.nbytes < full.nbytes
+    np.testing.assert_allclose(compact.close, full.close, rtol=1e-6)
+
+
+def test_indicators_and_strategies_accept_kline_array():
+    rows = make_rows(200)
+    klines = KlineArray.from_ohlcv(rows)
+    df = rows_to_frame(rows)
+
+    pd.testing.assert_series_equal(
+        IndicatorCalculator(klines).rsi(), IndicatorCalculator(df).rsi(), check_index_type=False
+    )
+    assert get_strategy('macd_cross', klines).analyze().signal == get_strategy('macd_cross', df).analyze().signal
+    assert len(analyze_all_strategies(klines, ['macd_cross', 'ema_cross'])) == \
+        len(analyze_all_strategies(df, ['macd_cross', 'ema_cross']))
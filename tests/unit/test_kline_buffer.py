@@ -0,0 +1,148 @@
+"""
+实时K线增量缓冲区单元测试
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from market_data import KlineBuffer, get_kline_buffer, reset_kline_buffers
+
+TF_MS = 15 * 60 * 1000
+START = 1_700_000_100_000 // TF_MS * TF_MS
+
+
+def bars(start_index, count, close_offset=0.0):
+    """生成连续的 ccxt 原始K线"""
+    rows = []
+    for i in range(start_index, start_index + count):
+        close = 100.0 + i + close_offset
+        rows.append([START + i * TF_MS, close - 1, close + 1, close - 2, close, 10.0 + i])
+    return rows
+
+
+class FakeFetcher:
+    """按 limit 返回截至 head 的最新K线，记录请求数量"""
+
+    def __init__(self, head):
+        self.head = head
+        self.limits = []
+        self.close_offset = 0.0
+
+    def __call__(self, limit):
+        self.limits.append(limit)
+        return bars(self.head - limit + 1, limit, self.close_offset)
+
+
+def now_at(index):
+    """第 index 根K线进行中的当前时间"""
+    return START + index * TF_MS + TF_MS // 2
+
+
+@pytest.fixture(autouse=True)
+def clean_buffers():
+    reset_kline_buffers()
+    yield
+    reset_kline_buffers()
+
+
+def test_incremental_refresh_fetches_only_new_bars():
+    fetch = FakeFetcher(head=199)
+    buffer = KlineBuffer('ETH/USDT:USDT', '15m', limit=100)
+
+    df = buffer.refresh(fetch, now_ms=now_at(199))
+    assert fetch.limits == [100]
+    assert len(df) == 100
+
+    fetch.head = 200
+    df = buffer.refresh(fetch, now_ms=now_at(200))
+    assert fetch.limits[-1] == 3
+    assert len(df) == 100
+    assert df['close'].iloc[-1] == 300.0
+    assert df.index[-1].value // 10**6 == START + 200 * TF_MS
+    assert buffer.get_stats()['incremental_syncs'] == 1
+
+
+def test_forming_bar_is_updated_in_place():
+    buffer = KlineBuffer('ETH/USDT:USDT', '15m', limit=50)
+    buffer.seed(bars(0, 50))
+
+    latest = bars(48, 2)
+    latest[-1][4] = 999.0
+    assert buffer.update(latest)
+
+    df = buffer.frame()
+    assert len(df) == 50
+    assert df['close'].iloc[-1] == 999.0
+    assert df.index.is_unique
+
+
+def test_gap_triggers_full_resync():
+    buffer = KlineBuffer('ETH/USDT:USDT', '15m', limit=50)
+    buffer.seed(bars(0, 50))
+
+    assert not buffer.update(bars(55, 2))
+    assert buffer.gaps == 1
+
+    fetch = FakeFetcher(head=56)
+    buffer.refresh(fetch, now_ms=now_at(50))
+    assert fetch.limits == [3, 50]
+    assert buffer.last_timestamp == START + 56 * TF_MS
+
+
+def test_rewritten_closed_bar_triggers_resync():
+    fetch = FakeFetcher(head=99)
+    buffer = KlineBuffer('ETH/USDT:USDT', '15m', limit=50)
+    buffer.refresh(fetch, now_ms=now_at(99))
+
+    fetch.head = 100
+    fetch.close_offset = 5.0
+    df = buffer.refresh(fetch, now_ms=now_at(100))
+
+    assert fetch.limits == [50, 3, 50]
+    assert buffer.drifts == 1
+    assert df['close'].iloc[0] == 100.0 + 51 + 5.0
+
+
+def test_frame_is_independent_copy():
+    buffer = KlineBuffer('ETH/USDT:USDT', '15m', limit=20)
+    buffer.seed(bars(0, 20))
+    df = buffer.frame()
+    last_close = df['close'].iloc[-1]
+
+    df.loc[df.index[0], 'close'] = 0.0     # 调用方可以就地修改
+    assert not np.shares_memory(df['close'].to_numpy(), buffer._klines.close)
+    assert buffer.frame()['close'].iloc[0] != 0.0
+
+    buffer.update([[bars(19, 20)[0][0], 1, 1, 1, 999.0, 1]])
+    assert df['close'].iloc[-1] == last_close and buffer.frame()['close'].iloc[-1] == 999.0
+
+
+def test_registry_shares_one_buffer_across_limits():
+    small = get_kline_buffer('bitget', 'BTC/USDT:USDT', '15m', 20)
+    assert get_kline_buffer('bitget', 'BTC/USDT:USDT', '15m', 40) is small and small.limit == 40
+
+    fetch = FakeFetcher(head=60)
+    assert len(small.refresh(fetch, now_ms=now_at(60), limit=20)) == 20
+    assert len(small.refresh(fetch, now_ms=now_at(60), limit=40)) == 40
+    assert fetch.limits == [40, 2]
+
+
+def test_async_refresh_and_shared_registry():
+    buffer = get_kline_buffer('bitget', 'ETH/USDT:USDT', '15m', 30)
+    assert get_kline_buffer('bitget', 'ETH/USDT:USDT', '15m', 30) is buffer
+    assert get_kline_buffer('okx', 'ETH/USDT:USDT', '15m', 30) is not buffer
+
+    fetch = FakeFetcher(head=40)
+
+    async def fetch_async(limit):
+        await asyncio.sleep(0)
+        return fetch(limit)
+
+    df = asyncio.run(buffer.refresh_async(fetch_async, now_ms=now_at(40)))
+    fetch.head = 41
+    df = asyncio.run(buffer.refresh_async(fetch_async, now_ms=now_at(41)))
+
+    assert fetch.limits == [30, 3]
+    assert len(df) == 30 and df['close'].iloc[-1] == 141.0
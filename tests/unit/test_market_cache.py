@@ -0,0 +1,153 @@
+"""
+行情读取缓存单元测试（假客户端，不访问网络）
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from exchange.market_cache import MarketReadCache
+from exchange.rate_limiter import Priority, request_priority
+
+
+class FakeClient:
+    """模拟同步 ccxt 客户端：记录真实请求次数"""
+
+    id = "bitget"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def fetch_ticker(self, symbol, params={}):
+        self.calls.append(symbol)
+        time.sleep(self.delay)
+        return {"symbol": symbol, "last": 100.0 + len(self.calls)}
+
+    def fetch_balance(self, params={}):
+        self.calls.append("balance")
+        return {"USDT": {"free": 1}}
+
+
+class FakeAsyncClient:
+    """模拟 ccxt.async_support 客户端"""
+
+    id = "okx"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_order_book(self, symbol, limit=None, params={}):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if symbol == "BAD/USDT":
+            raise RuntimeError("boom")
+        return {"bids": [[99, 1]], "asks": [[101, 1]]}
+
+
+def test_ttl_cache_and_shared_entries_across_clients():
+    cache = MarketReadCache({"fetch_ticker": 0.2})
+    a, b = cache.install(FakeClient()), cache.install(FakeClient())
+    assert cache.install(a) is a
+
+    first = a.fetch_ticker("BTC/USDT")
+    first["last"] = -1  # 修改返回值不影响缓存
+    assert b.fetch_ticker("BTC/USDT")["last"] == 101.0
+    assert a.fetch_ticker("ETH/USDT")["symbol"] == "ETH/USDT"
+    assert len(a.calls) == 2 and b.calls == []
+
+    # 未列出的方法不缓存
+    a.fetch_balance()
+    a.fetch_balance()
+    assert a.calls.count("balance") == 2
+
+    time.sleep(0.25)
+    b.fetch_ticker("BTC/USDT")
+    assert b.calls == ["BTC/USDT"]
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["saved_requests"] == 1 and stats["hit_ratio"] == 0.25
+
+
+def test_cached_ohlcv_rows_are_not_shared_with_callers():
+    class OhlcvClient(FakeClient):
+        def fetch_ohlcv(self, symbol, timeframe="5m", since=None, limit=None, params={}):
+            self.calls.append(symbol)
+            return [[1, 10.0, 11.0, 9.0, 10.5, 100.0], [2, 10.5, 12.0, 10.0, 11.5, 80.0]]
+
+    cache = MarketReadCache({"fetch_ohlcv": 5.0})
+    client = cache.install(OhlcvClient())
+    rows = client.fetch_ohlcv("BTC/USDT")
+    rows[0][4] = -1.0  # 修改返回的行不影响缓存
+    assert client.fetch_ohlcv("BTC/USDT")[0][4] == 10.5
+    assert client.calls == ["BTC/USDT"]
+
+
+def test_concurrent_sync_reads_share_one_request():
+    cache = MarketReadCache({"fetch_ticker": 1.0})
+    client = cache.install(FakeClient(delay=0.1))
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(client.fetch_ticker("BTC/USDT")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(client.calls) == 1 and len(results) == 8
+    assert cache.get_stats()["coalesced"] == 7
+
+    # 止损平仓绕过缓存
+    with request_priority(Priority.CRITICAL):
+        client.fetch_ticker("BTC/USDT")
+    assert len(client.calls) == 2 and cache.get_stats()["bypassed"] == 1
+
+
+def test_concurrent_async_reads_coalesce_and_share_errors():
+    cache = MarketReadCache({"fetch_order_book": 1.0})
+    client = cache.install(FakeAsyncClient())
+
+    async def run():
+        books = await asyncio.gather(*(client.fetch_order_book("BTC/USDT", 20) for _ in range(5)))
+        errors = await asyncio.gather(*(client.fetch_order_book("BAD/USDT", 20) for _ in range(3)),
+                                      return_exceptions=True)
+        return books, errors
+
+    books, errors = asyncio.run(run())
+    assert all(book["bids"] == [[99, 1]] for book in books)
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    # 5 个相同请求合并为 1 次，失败的请求也只发出 1 次且不写入缓存
+    assert client.calls == 2
+    stats = cache.get_stats()
+    assert stats["coalesced"] == 6 and stats["errors"] == 1 and stats["entries"] == 1
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(client.fetch_order_book("BAD/USDT", 20))
+    assert client.calls == 3
+
+
+def test_cancelled_async_caller_does_not_cancel_shared_fetch():
+    class SlowAsyncClient(FakeAsyncClient):
+        async def fetch_order_book(self, symbol, limit=None, params={}):
+            self.calls += 1
+            await asyncio.sleep(0.3)
+            return {"bids": [[99, 1]], "asks": [[101, 1]]}
+
+    cache = MarketReadCache({"fetch_order_book": 1.0})
+    client = cache.install(SlowAsyncClient())
+
+    async def run():
+        # 先发起的调用方超时很短，合并进来的调用方超时很长
+        short = asyncio.ensure_future(asyncio.wait_for(client.fetch_order_book("BTC/USDT", 20), 0.05))
+        await asyncio.sleep(0)
+        long = asyncio.ensure_future(asyncio.wait_for(client.fetch_order_book("BTC/USDT", 20), 5))
+        return await asyncio.gather(short, long, return_exceptions=True)
+
+    short, long = asyncio.run(run())
+    assert isinstance(short, asyncio.TimeoutError)
+    assert long["bids"] == [[99, 1]]
+    assert client.calls == 1 and cache.get_stats()["entries"] == 1
@@ -0,0 +1,198 @@
+"""
+行情推送（事件总线、模拟/WebSocket 数据源、消费者）单元测试，全部离线运行
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from market_data import (
+    TICKER, CANDLE_CLOSE, MarketDataBus, SimulatedFeed, WebSocketFeed, MarketRecorder,
+    get_market_bus,
+)
+from market_data.events import TickerEvent
+
+
+@pytest.fixture
+def bus():
+    bus = get_market_bus()
+    bus.clear()
+    yield bus
+    bus.clear()
+
+
+def test_bus_filters_by_symbol_and_keeps_latest():
+    bus = MarketDataBus()
+    received = []
+    bus.subscribe(TICKER, received.append, symbol='ETHUSDT')
+    bus.subscribe(TICKER, lambda event: 1 / 0)  # 异常回调不影响其他订阅者
+
+    feed = SimulatedFeed('bitget', bus=bus)
+    feed.push_ticker('BTCUSDT', 50000.0)
+    feed.push_ticker('ETHUSDT', 2000.0, bid=1999.5, ask=2000.5)
+
+    assert [e.symbol for e in received] == ['ETHUSDT']
+    assert bus.callback_errors == 2
+    latest = bus.latest(TICKER, 'ETHUSDT', exchange='bitget')
+    assert latest.to_ticker_data().ask == 2000.5
+    assert bus.latest(TICKER, 'ETHUSDT', max_age=-1) is None
+
+
+def test_candle_close_emitted_once_when_bar_rolls_over():
+    bus = MarketDataBus()
+    closes = []
+    bus.subscribe(CANDLE_CLOSE, closes.append)
+    feed = SimulatedFeed('bitget', bus=bus)
+
+    t0, tf = 1_700_000_000_000, 300_000
+    feed.push_ohlcv('ETHUSDT', '5m', [[t0 - tf, 1, 2, 0, 1, 5], [t0, 1, 2, 0, 1.5, 1]])
+    feed.push_ohlcv('ETHUSDT', '5m', [[t0, 1, 3, 0, 2.5, 4]])
+    assert closes == []
+
+    feed.push_ohlcv('ETHUSDT', '5m', [[t0, 1, 3, 0, 2.8, 6], [t0 + tf, 2.8, 2.9, 2.7, 2.9, 1]])
+    assert len(closes) == 1
+    assert closes[0].timestamp == t0
+    assert closes[0].close == 2.8 and closes[0].volume == 6
+
+
+def test_recorder_roundtrip_replays_events(tmp_path):
+    source, target = MarketDataBus(), MarketDataBus()
+    path = str(tmp_path / 'stream.jsonl')
+    recorder = MarketRecorder(path, bus=source)
+    feed = SimulatedFeed('okx', bus=source)
+    feed.push_ticker('ETHUSDT', 2000.0)
+    feed.push_trade('ETHUSDT', 2000.5, 0.3, side='buy')
+    recorder.close()
+
+    replayed = []
+    target.subscribe(TICKER, replayed.append)
+    assert SimulatedFeed(bus=target).replay(path, speed=0) == 2
+    assert replayed[0].exchange == 'okx' and replayed[0].last == 2000.0
+    assert time.time() - replayed[0].received_at < 1
+
+
+class FakeProClient:
+    """模拟 ccxt.pro 客户端：每次 watch_ticker 推送一条新价格"""
+
+    def __init__(self):
+        self.price = 2000.0
+        self.closed = False
+        self.failed = False
+
+    async def watch_ticker(self, symbol):
+        await asyncio.sleep(0.01)
+        if not self.failed:
+            self.failed = True
+            raise ConnectionError("断线")
+        self.price += 1
+        return {'symbol': symbol, 'last': self.price, 'timestamp': 1}
+
+    async def watch_ohlcv(self, symbol, timeframe):
+        await asyncio.sleep(1)
+        return []
+
+    async def close(self):
+        self.closed = True
+
+
+def test_websocket_feed_reconnects_and_publishes():
+    bus = MarketDataBus()
+    client = FakeProClient()
+    arrived = threading.Event()
+    bus.subscribe(TICKER, lambda event: arrived.set(), symbol='ETHUSDT')
+
+    feed = WebSocketFeed('bitget', ['ETHUSDT'], ['5m'], watch_trades=False, bus=bus,
+                         client_factory=lambda: client)
+    feed.start()
+    try:
+        assert arrived.wait(timeout=3)
+    finally:
+        feed.stop()
+
+    assert feed.reconnects == 1
+    assert bus.latest(TICKER, 'ETHUSDT').last > 2000.0
+    assert client.closed
+
+
+
+def test_websocket_feed_start_reports_client_failure():
+    def broken_factory():
+        raise ImportError("ccxt.pro 不可用")
+
+    feed = WebSocketFeed('bitget', ['ETHUSDT'], bus=MarketDataBus(), client_factory=broken_factory)
+    with pytest.raises(RuntimeError, match="ccxt.pro 不可用"):
+        feed.start()
+    assert not feed.running
+
+def test_spread_monitor_recomputes_on_ticker_events(bus, monkeypatch):
+    from arbitrage import spread_monitor as module
+
+    feeds = {}
+    monkeypatch.setattr(
+        module, 'start_market_stream',
+        lambda exchange, symbols: feeds.setdefault(exchange, SimulatedFeed(exchange, bus=bus))
+    )
+    monitor = module.SpreadMonitor(None, {
+        'symbol': 'BTCUSDT', 'exchanges': ['bitget', 'okx'], 'use_stream': True,
+    })
+    monitor.start()
+    try:
+        feeds['bitget'].push_ticker('BTCUSDT', 100.0, bid=99.9, ask=100.0)
+        assert monitor.get_latest_spreads() == []
+        feeds['okx'].push_ticker('BTCUSDT', 101.0, bid=101.0, ask=101.1)
+        SimulatedFeed('binance', bus=bus).push_ticker('BTCUSDT', 90.0, bid=90.0, ask=90.1)
+    finally:
+        monitor.stop()
+
+    spreads = monitor.get_latest_spreads()
+    assert monitor.monitor_thread is None
+    assert {(s.exchange_a, s.exchange_b) for s in spreads} == {('bitget', 'okx'), ('okx', 'bitget')}
+    best = max(spreads, key=lambda s: s.spread_pct)
+    assert best.exchange_a == 'bitget' and best.spread_pct == pytest.approx(1.0)
+
+
+def test_ticker_service_updates_cache_from_stream(bus):
+    from apps.api.services.ticker_service import TickerService
+
+    async def scenario():
+        service = TickerService()
+        service._symbol = 'ETHUSDT'
+        service._stream_enabled = True
+        task = asyncio.create_task(service.start_background_refresh())
+        await asyncio.sleep(0.05)
+
+        sent = time.perf_counter()
+        threading.Thread(
+            target=SimulatedFeed('bitget', bus=bus).push_ticker,
+            args=('ETHUSDT', 2345.0), kwargs={'percentage': 1.5},
+        ).start()
+        while (await service.get_ticker()) is None:
+            await asyncio.sleep(0.001)
+        latency = time.perf_counter() - sent
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return await service.get_ticker(), latency
+
+    ticker, latency = asyncio.run(scenario())
+    assert ticker.last == 2345.0 and ticker.change_24h == 1.5 and not ticker.stale
+    assert latency < 0.5
+    assert bus.get_stats()['subscribers'] == 0
+
+
+def test_status_monitor_samples_stream_prices(bus):
+    from monitoring.status_monitor import StatusMonitorScheduler
+
+    scheduler = StatusMonitorScheduler(enabled=False)
+    scheduler.attach_stream(bus, 'ETHUSDT', sample_seconds=60)
+    feed = SimulatedFeed('bitget', bus=bus)
+    feed.push_ticker('ETHUSDT', 2000.0)
+    feed.push_ticker('ETHUSDT', 2001.0)  # 采样间隔内，忽略
+    scheduler.update_price(1.0)          # 已订阅推送，主循环调用被忽略
+    assert [r['price'] for r in scheduler.price_history.prices] == [2000.0]
+
+    scheduler.detach_stream()
+    scheduler.update_price(1.0)
+    assert len(scheduler.price_history.prices) == 2
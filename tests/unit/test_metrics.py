@@ -0,0 +1,95 @@
+"""
+固定内存性能指标（直方图、速率窗口、快照导出）单元测试
+"""
+
+import random
+
+import pytest
+
+from utils.logger_utils import MetricsLogger, load_metrics_snapshot
+from utils.metrics import LatencyHistogram, RateWindow, render_prometheus
+
+
+def test_histogram_percentiles_with_fixed_memory():
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(2.0, 1.0) for _ in range(50_000)]
+    histogram = LatencyHistogram()
+    buckets = len(histogram._counts)
+    for value in samples:
+        histogram.record(value)
+
+    ordered = sorted(samples)
+    for pct in (50, 95, 99):
+        exact = ordered[int(len(ordered) * pct / 100) - 1]
+        assert histogram.percentile(pct) == pytest.approx(exact, rel=0.05)
+    assert histogram.max == max(samples) and histogram.count == len(samples)
+    assert len(histogram._counts) == buckets
+
+    histogram.record(0.0)
+    histogram.record(1e9)
+    assert histogram.percentile(0) == 0.0 and histogram.percentile(100) == 1e9
+
+
+def test_rate_window_drops_old_seconds():
+    window = RateWindow(10)
+    for second in range(100, 120):
+        window.add(2, now=second + 0.5)
+    assert window.total(now=119.9) == 20
+    assert window.rate(now=119.9) == pytest.approx(2.0)
+    assert window.total(now=135) == 0
+
+
+def test_metrics_logger_snapshot_and_prometheus(tmp_path):
+    metrics = MetricsLogger(track_gc=False)
+    for latency in (1.0, 2.0, 3.0, 100.0):
+        metrics.record_latency("main_loop.fetch", latency)
+    with metrics.timer("main_loop.persistence"):
+        pass
+
+    stats = metrics.get_stats("main_loop.fetch")
+    assert stats['count'] == 4 and stats['max'] == 100.0
+    assert stats['p50'] == pytest.approx(2.0, rel=0.05)
+    assert stats['rate_per_sec'] > 0
+    assert set(metrics.get_breakdown("main_loop")) == {"fetch", "persistence"}
+    assert "fetch=" in metrics.format_breakdown("main_loop")
+
+    path = str(tmp_path / "metrics.json")
+    metrics.write_snapshot(path)
+    snapshot = load_metrics_snapshot(path)
+    assert snapshot['operations']['main_loop.fetch']['p99'] == pytest.approx(100.0, rel=0.05)
+    assert snapshot['gauges']['memory_rss_mb'] > 0
+    assert 'gc_collections_gen0' in snapshot['gauges']
+    assert load_metrics_snapshot(str(tmp_path / "missing.json")) is None
+
+    text = render_prometheus([("bot", snapshot), ("api", None)])
+    assert 'trading_bot_latency_ms{process="bot",operation="main_loop.fetch",quantile="0.99"}' in text
+    assert 'trading_bot_latency_ms_count{process="bot",operation="main_loop.fetch"} 4' in text
+    assert 'process="api"' not in text
+
+
+def test_metrics_route_serves_bot_snapshot(tmp_path, monkeypatch):
+    pytest.importorskip("jose")
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from apps.api.auth import get_current_user
+    from apps.api.routes import metrics as module
+
+    bot_metrics = MetricsLogger(track_gc=False)
+    bot_metrics.record_latency("evaluate.claude", 850.0)
+    path = str(tmp_path / "metrics.json")
+    bot_metrics.write_snapshot(path)
+    monkeypatch.setattr(module, "load_metrics_snapshot", lambda: load_metrics_snapshot(path))
+
+    app = FastAPI()
+    app.include_router(module.router)
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "test"}
+    client = TestClient(app)
+
+    body = client.get("/api/metrics").json()
+    assert body['bot']['operations']['evaluate.claude']['max'] == 850.0
+    assert 'memory_rss_mb' in body['api']['gauges']
+
+    response = client.get("/api/metrics/prometheus")
+    assert response.headers['content-type'].startswith("text/plain")
+    assert 'operation="evaluate.claude"' in response.text
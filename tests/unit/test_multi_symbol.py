@@ -0,0 +1,183 @@
+"""
+多品种运行时单元测试（模拟交易所，不访问网络）
+"""
+
+import asyncio
+
+import pytest
+
+import core.multi_symbol as multi_symbol
+from core.multi_symbol import CLOSE, HOLD, OPEN, MultiSymbolRuntime
+from exchange import ExchangeFactory
+from exchange.adapters.simulated_adapter import reset_simulated_exchanges
+from exchange.errors import ExchangeError
+from exchange.interface import symbol_key
+from risk.risk_manager import RiskManager, StopLossResult
+from strategies.strategies import Signal, TradeSignal
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args))
+
+
+@pytest.fixture
+def exchange(monkeypatch):
+    reset_simulated_exchanges()
+    monkeypatch.setattr(RiskManager, '_save_position_to_db', lambda self: None)
+    monkeypatch.setattr(multi_symbol, 'db', Recorder())
+    monkeypatch.setattr(multi_symbol, 'notifier', Recorder())
+    adapter = ExchangeFactory.create("simulated", {
+        "name": "sim_multi", "symbol": SYMBOLS[0], "seed": 3, "latency_ms": 0, "speed": 1e-6,
+        "initial_balance": 100000.0, "start_price": 100.0, "history_bars": 300,
+        "book_levels": 5, "level_size": 1000.0,
+    })
+    yield adapter
+    reset_simulated_exchanges()
+
+
+def test_symbol_key_matches_config_and_unified_symbols():
+    assert symbol_key("ETH/USDT:USDT") == symbol_key("ETHUSDT") == symbol_key("eth-usdt") == "ETHUSDT"
+
+
+def test_batch_endpoints_use_one_request(exchange):
+    client = exchange.exchange
+    exchange.open_long(1.0, symbol="ETHUSDT")
+    exchange.open_short(2.0, symbol="SOLUSDT")
+
+    before = client.stats["requests"]
+    positions = exchange.get_positions_batch(SYMBOLS)
+    tickers = exchange.get_tickers(SYMBOLS)
+    assert client.stats["requests"] - before == 2
+
+    assert positions["BTCUSDT"] == []
+    assert positions["ETHUSDT"][0].side == "long" and positions["SOLUSDT"][0].amount == pytest.approx(2.0)
+    assert set(tickers) == set(SYMBOLS) and all(t.last > 0 for t in tickers.values())
+
+    # 按交易对平仓，不影响其他交易对
+    assert exchange.close_position("test", {"symbol": "SOLUSDT", "side": "short", "amount": 2.0})
+    assert [p.side for p in exchange.get_positions("ETHUSDT")] == ["long"]
+    assert exchange.get_positions("SOLUSDT") == []
+
+
+def test_runtime_drives_independent_symbol_state_machines(exchange, monkeypatch):
+    def fake_signals(df, strategy_names, **kwargs):
+        # 只有 ETH 和 SOL 出信号；SOL 信号更弱
+        symbol = fake_signals.current
+        if symbol == "ETHUSDT":
+            return [TradeSignal(Signal.LONG, "test", "eth up", strength=0.9, confidence=0.9)]
+        if symbol == "SOLUSDT":
+            return [TradeSignal(Signal.SHORT, "test", "sol down", strength=0.6, confidence=0.6)]
+        return []
+
+    runtime = MultiSymbolRuntime(exchange, SYMBOLS, strategies=["test"], timeframe="1m",
+                                 kline_limit=50, interval=0, max_positions=1)
+    original_step = runtime._step
+
+    def step(state, *args):
+        fake_signals.current = state.symbol
+        return original_step(state, *args)
+
+    monkeypatch.setattr(runtime, '_step', step)
+    monkeypatch.setattr(multi_symbol, 'analyze_all_strategies', fake_signals)
+
+    # 风控共享一份历史指标，持仓互相独立
+    metrics = {id(state.risk_manager.metrics) for state in runtime.states.values()}
+    assert len(metrics) == 1
+
+    actions = asyncio.run(runtime.run_cycle())
+    # 持仓上限为 1：ETH 先开仓，SOL 被拒绝
+    assert actions == {"BTCUSDT": HOLD, "ETHUSDT": OPEN, "SOLUSDT": HOLD}
+    assert runtime.states["ETHUSDT"].side == "long" and runtime.open_positions() == 1
+    assert [p.side for p in exchange.get_positions("ETHUSDT")] == ["long"]
+    assert multi_symbol.db.calls[0][1][:3] == ("ETHUSDT", "long", "open")
+
+    # 同一根K线不重复评估；强制止损后平仓
+    monkeypatch.setattr(runtime.states["ETHUSDT"].risk_manager, 'check_stop_loss',
+                        lambda price, position, df=None: StopLossResult(
+                            should_stop=True, stop_type="stop_loss", reason="test stop"))
+    actions = asyncio.run(runtime.run_cycle())
+    assert actions["ETHUSDT"] == CLOSE and runtime.states["ETHUSDT"].side is None
+    assert exchange.get_positions("ETHUSDT") == []
+    assert runtime.states["SOLUSDT"].stats["evaluations"] == 1
+
+    status = runtime.get_status()
+    assert status["cycles"] == 2 and status["batch_requests"] == 4
+    assert status["symbols"]["ETHUSDT"]["opens"] == 1 and status["symbols"]["ETHUSDT"]["closes"] == 1
+
+
+def test_daily_limits_apply_to_the_whole_account(exchange):
+    runtime = MultiSymbolRuntime(exchange, SYMBOLS, strategies=["test"], interval=0)
+    btc, eth = runtime.states["BTCUSDT"].risk_manager, runtime.states["ETHUSDT"].risk_manager
+
+    # BTC 的亏损计入账户日内亏损，ETH 也不能再开仓
+    btc.record_trade_result(-300.0)
+    eth.record_trade_result(-250.0)
+    assert runtime.daily.loss == pytest.approx(-550.0)
+    allowed, reason = runtime.states["SOLUSDT"].risk_manager.can_open_position()
+    assert not allowed and "日内亏损" in reason
+
+    # 交易次数同样按账户累计
+    runtime.daily.loss = 0
+    runtime.daily.trades = 20
+    allowed, reason = runtime.states["SOLUSDT"].risk_manager.can_open_position()
+    assert not allowed and "交易次数" in reason
+    assert runtime.get_status()["daily_trades"] == 20
+
+
+def test_missing_batch_position_is_cleared_only_after_two_snapshots(exchange):
+    runtime = MultiSymbolRuntime(exchange, SYMBOLS, strategies=["test"], interval=0)
+    state = runtime.states["ETHUSDT"]
+    state.risk_manager.set_position("long", 1.0, 100.0, strategy="trend")
+    state.strategy = "trend"
+    held = [multi_symbol.PositionData("long", 1.0, 100.0, 0.0, 1, "cross", {})]
+
+    # 一轮缺失（刚开仓 / 符号不匹配）不清除本地持仓
+    runtime._sync_position(state, [], None)
+    assert state.side == "long"
+    runtime._sync_position(state, held, None)
+    runtime._sync_position(state, [], None)
+    assert state.side == "long"
+
+    # 连续两轮缺失才清除，之后恢复时沿用原策略
+    runtime._sync_position(state, [], None)
+    assert state.side is None and state.strategy == "trend"
+
+    restored = []
+    set_position = state.risk_manager.set_position
+    state.risk_manager.set_position = lambda *args, **kwargs: restored.append(kwargs) or set_position(*args, **kwargs)
+    runtime._sync_position(state, held, None)
+    assert state.side == "long" and restored[0]["strategy"] == "trend"
+
+
+def test_failed_per_symbol_position_read_is_unknown_not_missing(exchange, monkeypatch):
+    exchange.open_long(1.0, symbol="ETHUSDT")
+    get_positions = exchange.get_positions
+
+    def flaky_get_positions(symbol=None):
+        if symbol == "ETHUSDT":
+            raise ExchangeError("获取持仓失败: timeout")
+        return get_positions(symbol)
+
+    # 交易所不支持 fetchPositions 时逐个读取，失败的品种为 None
+    monkeypatch.setattr(exchange, '_supports', lambda capability: False)
+    monkeypatch.setattr(exchange, 'get_positions', flaky_get_positions)
+    positions = exchange.get_positions_batch(SYMBOLS)
+    assert positions["ETHUSDT"] is None and positions["BTCUSDT"] == []
+
+    runtime = MultiSymbolRuntime(exchange, SYMBOLS, strategies=["test"], interval=0)
+    state = runtime.states["ETHUSDT"]
+    state.risk_manager.set_position("long", 1.0, 100.0)
+    for _ in range(3):
+        runtime._sync_position(state, None, None)
+    assert state.side == "long" and state.missing_snapshots == 0
+
+    # 持仓未知时不评估开仓
+    state.risk_manager.clear_position()
+    assert runtime._step(state, None, 100.0, None, lambda: 1000.0) == HOLD
+    assert state.stats["evaluations"] == 0
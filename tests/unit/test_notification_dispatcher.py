@@ -0,0 +1,113 @@
+"""
+异步通知分发器单元测试（使用假渠道，不发送真实消息）
+"""
+
+import threading
+import time
+
+from utils.logger_utils import MetricsLogger, NotificationDispatcher
+
+
+class FakeChannel:
+    def __init__(self, delay=0.0):
+        self.enabled = True
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _record(self, *args):
+        time.sleep(self.delay)
+        with self.lock:
+            self.calls.append(args)
+
+    def notify_trade(self, action, symbol, side, amount, price, pnl=None, reason=""):
+        self._record('trade', action, side)
+
+    def notify_error(self, error):
+        self._record('error', error)
+
+    def notify_signal(self, strategy, signal, reason, strength=None, confidence=None):
+        self._record('signal', strategy, signal)
+
+
+def make_dispatcher(channels, **kwargs):
+    kwargs.setdefault('coalesce_delay', 0.0)
+    return NotificationDispatcher(channels, metrics=MetricsLogger(track_gc=False), **kwargs)
+
+
+def test_enqueue_does_not_wait_for_slow_channel():
+    fast, slow = FakeChannel(), FakeChannel(delay=0.3)
+    dispatcher = make_dispatcher({'fast': fast, 'slow': slow})
+
+    start = time.perf_counter()
+    for i in range(5):
+        dispatcher.submit('notify_trade', ('open', 'ETHUSDT', 'long', 0.1, 2000.0 + i), high_priority=True)
+    assert time.perf_counter() - start < 0.05
+
+    deadline = time.time() + 1
+    while len(fast.calls) < 5 and time.time() < deadline:
+        time.sleep(0.01)
+    assert len(fast.calls) == 5 and len(slow.calls) < 5
+
+    assert dispatcher.shutdown(timeout=5)
+    assert len(slow.calls) == 5
+    stats = dispatcher.get_stats()
+    assert stats['sent'] == 10 and stats['depth'] == 0 and stats['inflight'] == 0
+
+
+def test_busy_channel_queues_without_delaying_other_channels():
+    fast, slow = FakeChannel(), FakeChannel(delay=0.5)
+    dispatcher = make_dispatcher({'telegram': fast, 'email': slow}, channel_concurrency=1)
+
+    start = time.perf_counter()
+    for i in range(4):
+        dispatcher.submit('notify_trade', ('open', 'ETHUSDT', 'long', 0.1, 2000.0 + i), high_priority=True)
+
+    deadline = time.time() + 1
+    while len(fast.calls) < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    # 邮件渠道每条 0.5s，但 telegram 的 4 条不排在它后面
+    assert len(fast.calls) == 4 and time.perf_counter() - start < 0.3
+
+    assert dispatcher.shutdown(timeout=5)
+    assert len(slow.calls) == 4
+    stats = dispatcher.get_stats()
+    assert stats['sent'] == 8 and stats['channel_busy'] == 0 and stats['inflight'] == 0
+
+
+def test_identical_errors_coalesce_within_window():
+    channel = FakeChannel()
+    dispatcher = make_dispatcher({'feishu': channel}, coalesce_delay=0.2)
+
+    for _ in range(5):
+        dispatcher.submit('notify_error', ('主循环异常: timeout',), key=('notify_error', '主循环异常: timeout'))
+    dispatcher.submit('notify_signal', ('ema', 'long', 'a'), key=('notify_signal', 'ema'))
+    dispatcher.submit('notify_signal', ('ema', 'short', 'b'), key=('notify_signal', 'ema'))
+    assert dispatcher.flush(timeout=2)
+
+    assert channel.calls == [
+        ('error', '主循环异常: timeout（0.2s 内重复 5 次）'),
+        ('signal', 'ema', 'short'),
+    ]
+    assert dispatcher.get_stats()['coalesced'] == 5
+    dispatcher.shutdown(timeout=1)
+
+
+def test_full_queue_drops_low_priority_before_trades():
+    channel = FakeChannel()
+    dispatcher = make_dispatcher({'feishu': channel}, max_queue=2, coalesce_delay=60)
+
+    assert dispatcher.submit('notify_error', ('e1',))
+    assert dispatcher.submit('notify_error', ('e2',))
+    assert dispatcher.submit('notify_error', ('e3',))
+    assert dispatcher.submit('notify_trade', ('close', 'ETHUSDT', 'long', 0.1, 2000.0), high_priority=True)
+
+    # 低优先级消息在合并窗口内等待；关闭时全部立即发送
+    assert dispatcher.shutdown(timeout=2)
+    assert channel.calls == [('trade', 'close', 'long'), ('error', 'e3')]
+    assert dispatcher.get_stats()['dropped'] == 2
+
+    rejecting = make_dispatcher({'feishu': FakeChannel()}, max_queue=1, drop_policy='drop_new', coalesce_delay=60)
+    assert rejecting.submit('notify_error', ('e1',))
+    assert not rejecting.submit('notify_error', ('e2',))
+    rejecting.shutdown(timeout=1)
@@ -0,0 +1,79 @@
+"""
+订单跟踪器单元测试（模拟交易所，不访问网络）
+"""
+
+import asyncio
+
+import pytest
+
+from exchange import ExchangeFactory
+from exchange.adapters.simulated_adapter import reset_simulated_exchanges
+from exchange.order_tracker import CANCELED, FILLED, TIMEOUT, OrderTracker, reset_order_trackers
+
+SYMBOL = "ETH/USDT:USDT"
+
+
+@pytest.fixture
+def client():
+    reset_simulated_exchanges()
+    reset_order_trackers()
+    adapter = ExchangeFactory.create("simulated", {
+        "name": "sim_tracker", "symbol": SYMBOL, "seed": 5, "latency_ms": 0, "speed": 1e-6,
+        "initial_balance": 100000.0, "start_price": 100.0, "history_bars": 50,
+    })
+    yield adapter.exchange
+    reset_order_trackers()
+    reset_simulated_exchanges()
+
+
+def _rest(client, side="buy", offset=0.02):
+    """挂一个远离盘口的 post-only 限价单"""
+    price = client.fetch_order_book(SYMBOL)["bids" if side == "buy" else "asks"][0][0]
+    price *= (1 - offset) if side == "buy" else (1 + offset)
+    return client.create_order(SYMBOL, "limit", side, 0.1, price, {"postOnly": True})["id"]
+
+
+def test_batched_poll_resolves_fills(client):
+    tracker = OrderTracker(client, poll_interval=0.01)
+    tracker._ensure_thread = lambda: None   # 手动轮询
+    ids = [_rest(client) for _ in range(3)]
+    done = []
+    futures = [tracker.track(order_id, SYMBOL, timeout=0, callback=done.append) for order_id in ids]
+
+    requests = client.stats["requests"]
+    assert tracker.poll_once() == 0 and tracker.pending == 3
+    # 三个订单只用一次挂单查询
+    assert client.stats["requests"] - requests == 1
+    assert len(tracker.fetch_open_orders(SYMBOL, max_age=60)) == 3
+    assert client.stats["requests"] - requests == 1
+
+    client._market(SYMBOL).bars[:, :4] *= 0.9   # 价格下跌，买单全部触及
+    assert tracker.poll_once() == 3
+    assert all(f.result(0)["status"] == FILLED for f in futures)
+    assert len(done) == 3 and tracker.get_stats()["filled"] == 3
+
+
+def test_timeout_cancels_and_background_thread(client):
+    tracker = OrderTracker(client, poll_interval=0.01)
+    order = tracker.track(_rest(client), SYMBOL, timeout=0.05, cancel_on_timeout=True).result(5)
+    assert order["status"] == TIMEOUT
+    assert client.fetch_order(order["id"], SYMBOL)["status"] == "canceled"
+
+    order_id = _rest(client, side="sell")
+    future = tracker.track(order_id, SYMBOL, timeout=5)
+    tracker.cancel(order_id, SYMBOL)
+    assert future.result(1)["status"] == CANCELED and tracker.pending == 0
+
+
+def test_async_wait(client):
+    tracker = OrderTracker(client, poll_interval=0.01)
+    order_id = _rest(client)
+
+    async def scenario():
+        waiter = asyncio.ensure_future(tracker.wait(order_id, SYMBOL, timeout=5))
+        await asyncio.sleep(0.03)
+        assert not waiter.done()
+        client._market(SYMBOL).bars[:, :4] *= 0.9
+        return await asyncio.wait_for(waiter, 5)
+
+    assert asyncio.run(scenario())["status"] == FILLED
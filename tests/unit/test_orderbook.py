@@ -0,0 +1,97 @@
+"""
+L2 订单簿单元测试
+"""
+
+import threading
+import time
+
+import pytest
+
+from market_data.orderbook import ASK, BID, OrderBook, get_order_book, reset_order_books
+from risk.liquidity_validator import LiquidityValidator
+
+SNAPSHOT = {
+    'bids': [[99.0, 1.0], [100.0, 2.0], [98.0, 3.0]],   # 乱序输入
+    'asks': [[101.0, 1.0], [102.0, 2.0], [103.0, 3.0]],
+    'timestamp': 1_700_000_000_000,
+}
+
+
+def test_snapshot_queries():
+    book = OrderBook.from_snapshot(SNAPSHOT, 'ETHUSDT', 'bitget')
+    assert book.best_bid() == (100.0, 2.0) and book.best_ask() == (101.0, 1.0)
+    assert book.mid() == 100.5 and book.spread_bps() == pytest.approx(99.5, rel=1e-3)
+
+    assert book.depth(BID, levels=2, quote=False) == 3.0
+    assert book.depth(ASK) == pytest.approx(101 + 204 + 309)
+    # 买一 100 以下 150 基点（≥ 98.5）只包含 100 和 99 两档
+    assert book.depth_within(150, BID) == pytest.approx(200 + 99)
+    assert book.depth_within(0, ASK, quote=False) == 1.0
+
+    # 买入 2：1 @ 101 + 1 @ 102
+    assert book.vwap('buy', 2.0) == pytest.approx(101.5)
+    assert book.slippage('buy', 2.0) == pytest.approx(0.5 / 101)
+    # 按金额：卖出 299 USDT = 2 @ 100 + 1 @ 99
+    assert book.vwap('sell', 299.0, quote=True) == pytest.approx(299 / 3)
+    assert book.vwap('buy', 100.0) is None  # 深度不足
+    assert book.to_dict(limit=1)['bids'] == [[100.0, 2.0]]
+
+
+def test_deltas_merge_remove_and_drop_stale():
+    book = OrderBook('ETHUSDT')
+    book.apply_snapshot(SNAPSHOT['bids'], SNAPSHOT['asks'], nonce=10)
+
+    assert book.apply_delta(
+        bids=[[100.0, 0.0], [100.5, 4.0], [100.5, 5.0]],  # 删除 100；同价以最后一次为准
+        asks=[[101.0, 0.5], [100.8, 1.0]],
+        nonce=11,
+    )
+    assert book.best_bid() == (100.5, 5.0) and book.level_count(BID) == 3
+    assert book.to_dict()['asks'][:2] == [[100.8, 1.0], [101.0, 0.5]]
+    assert book.depth(ASK, quote=False) == pytest.approx(6.5)
+
+    assert not book.apply_delta(bids=[[100.9, 1.0]], nonce=11)
+    assert book.best_bid()[0] == 100.5 and book.get_stats()['stale_deltas'] == 1
+
+
+def test_shared_book_refreshes_once_for_concurrent_consumers():
+    reset_order_books()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return SNAPSHOT
+
+    book = get_order_book('okx', 'ETHUSDT')
+    assert get_order_book('okx', 'ETHUSDT') is book and get_order_book('binance', 'ETHUSDT') is not book
+
+    threads = [threading.Thread(target=book.refresh, args=(fetch, 5.0)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1 and book.best_ask() == (101.0, 1.0)
+
+    book.refresh(fetch, max_age=0)
+    assert len(calls) == 2
+    reset_order_books()
+
+
+def test_liquidity_validator_accepts_dict_or_book():
+    validator = LiquidityValidator()
+    validator.enabled, validator.depth_multiplier, validator.min_depth_usdt = True, 1.0, 100
+
+    ok, _, details = validator.validate_with_orderbook(SNAPSHOT, 2.0, 101.0, is_buy=True)
+    assert ok and details['available_amount'] == 6.0 and details['expected_avg_price'] == pytest.approx(101.5)
+
+    book = OrderBook.from_snapshot(SNAPSHOT)
+    ok, reason, _ = validator.validate_with_orderbook(book, 10.0, 100.0, is_buy=False)
+    assert not ok and "买盘深度不足" in reason
+
+    ok, reason, _ = validator.validate_with_orderbook(OrderBook('ETHUSDT'), 1.0, 100.0, is_buy=True)
+    assert not ok and reason == "卖盘无深度"
+    ok, reason, _ = validator.validate_with_orderbook({'bids': [], 'asks': []}, 1.0, 100.0, is_buy=False)
+    assert not ok and reason == "买盘无深度"
+    ok, reason, _ = validator.validate_with_orderbook(None, 1.0, 100.0, is_buy=True)
+    assert not ok and reason == "订单簿数据缺失"
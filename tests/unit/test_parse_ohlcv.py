@@ -0,0 +1,41 @@
+"""
+共享 OHLCV 转换器单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import KlineArray, parse_ohlcv
+
+START = 1_700_000_000_000
+ROWS = [[START + i * 60_000, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, None if i == 2 else 10.0]
+        for i in range(5)]
+
+
+def legacy(rows):
+    df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df.set_index('timestamp')
+
+
+def test_frame_matches_legacy_conversion():
+    df = parse_ohlcv(ROWS)
+    pd.testing.assert_frame_equal(df, legacy(ROWS), check_index_type=False)
+    assert df.index.dtype == 'datetime64[ms]' and df.index.name == 'timestamp'
+    assert df['close'].to_numpy().flags['C_CONTIGUOUS'] and np.isnan(df['volume'].iloc[2])
+
+    flat = parse_ohlcv(ROWS, index=False)
+    assert list(flat.columns) == ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+    assert flat['timestamp'].iloc[-1] == pd.Timestamp(START + 4 * 60_000, unit='ms')
+
+    empty = parse_ohlcv([])
+    assert empty.empty and list(empty.columns) == ['open', 'high', 'low', 'close', 'volume']
+
+
+def test_array_container_and_dtype():
+    klines = parse_ohlcv(ROWS, as_array=True, dtype='float32')
+    assert isinstance(klines, KlineArray) and klines.dtype == np.float32
+    assert klines.timestamp[0] == START and klines.close[-1] == pytest.approx(104.5)
+
+    assert parse_ohlcv(np.asarray(ROWS, dtype=float), dtype='float32')['open'].dtype == np.float32
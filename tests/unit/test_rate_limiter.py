@@ -0,0 +1,115 @@
+"""
+交易所共享限流器单元测试（假客户端，不访问网络）
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from exchange.async_pool import get_async_client_pool
+from exchange.errors import RateLimitError
+from exchange.rate_limiter import (
+    ExchangeRateLimiter, Priority, TokenBucket, classify_endpoint, current_priority, request_priority,
+)
+
+
+class FakeClient:
+    """模拟同步 ccxt 客户端：fetch2 只记录请求"""
+
+    id = "bitget"
+    rateLimit = 50
+    enableRateLimit = True
+
+    def __init__(self):
+        self.requests = []
+
+    def calculate_rate_limiter_cost(self, api, method, path, params, config={}):
+        return 2 if method == "POST" else 1
+
+    def fetch2(self, path, api="public", method="GET", params={}, headers=None, body=None, config={}):
+        self.requests.append((time.monotonic(), path))
+        return {"path": path}
+
+
+def test_clients_share_one_bucket_per_endpoint_class():
+    limiter = ExchangeRateLimiter(limits={"bitget": {"market": {"rate": 50, "burst": 5}}},
+                                  analytics_reserve=0, max_wait=5, shared_dir="")
+    a, b = limiter.install(FakeClient()), limiter.install(FakeClient())
+    assert a.enableRateLimit is False and limiter.install(a) is a
+
+    start = time.monotonic()
+    for _ in range(10):
+        a.fetch2("v2/mix/market/ticker", ["public", "mix"])
+        b.fetch2("v2/mix/market/ticker", ["public", "mix"])
+    elapsed = time.monotonic() - start
+
+    # 20 次请求、突发 5、速率 50/s：两个实例合计受限，至少需要 (20 - 5) / 50 = 0.3s
+    assert 0.25 <= elapsed < 1.0
+    # 下单使用独立的 trade 桶，不受行情请求影响
+    assert limiter.acquire("bitget", "trade", 1, default_rate=20) == 0
+    stats = limiter.get_stats()
+    assert stats["bitget.market"]["requests"] == 20 and stats["bitget.market"]["queued"] > 0
+
+
+def test_higher_priority_requests_preempt_queued_analytics():
+    bucket = TokenBucket("test.market", rate=20, capacity=1)
+    bucket.acquire(1)  # 取空
+    order = []
+
+    def request(name, priority):
+        bucket.acquire(1, priority, timeout=5)
+        order.append(name)
+
+    threads = [threading.Thread(target=request, args=(f"analytics{i}", Priority.ANALYTICS)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.02)
+    critical = threading.Thread(target=request, args=("stop_loss", Priority.CRITICAL))
+    critical.start()
+    for thread in threads + [critical]:
+        thread.join(5)
+
+    assert len(order) == 5 and order.index("stop_loss") <= 1
+    assert bucket.get_stats()["by_priority"] == {"NORMAL": 1, "CRITICAL": 1, "ANALYTICS": 4}
+
+
+def test_analytics_cannot_use_reserved_capacity():
+    bucket = TokenBucket("test.account", rate=1, capacity=10, analytics_reserve=0.5)
+
+    async def run():
+        for _ in range(5):
+            assert await bucket.acquire_async(1, Priority.ANALYTICS) == 0
+        # 剩余 5 个令牌为预留容量：分析请求排队，交易请求立即放行
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire_async(1, Priority.TRADE)
+        trade_wait = time.monotonic() - start
+        with pytest.raises(RateLimitError):
+            await bucket.acquire_async(1, Priority.ANALYTICS, timeout=0.2)
+        return trade_wait
+
+    assert asyncio.run(run()) < 0.05
+    assert bucket.get_stats()["timeouts"] == 1
+
+
+def test_shared_dir_spans_limiters_and_priority_crosses_client_pool(tmp_path):
+    first = ExchangeRateLimiter(limits={}, analytics_reserve=0, max_wait=5, shared_dir=str(tmp_path))
+    second = ExchangeRateLimiter(limits={}, analytics_reserve=0, max_wait=5, shared_dir=str(tmp_path))
+    # 模拟两个进程：各自的限流器通过文件共享 2 个令牌
+    assert first.acquire("okx", "market", 2, default_rate=2) == 0
+    assert second.acquire("okx", "market", 1, default_rate=2) >= 0.3
+
+    assert classify_endpoint(["private", "mix"], "POST", "v2/mix/order/place-order") == "trade"
+    assert classify_endpoint("private", "POST", "trade/close-position") == "trade"
+    assert classify_endpoint("fapiPrivate", "GET", "positionRisk") == "account"
+    assert classify_endpoint(["public", "mix"], "GET", "v2/mix/market/candles") == "market"
+
+    async def read_priority():
+        return current_priority()
+
+    pool = get_async_client_pool()
+    with request_priority(Priority.ANALYTICS):
+        assert pool.run(read_priority(), timeout=2) == Priority.ANALYTICS
+    assert pool.run(read_priority(), timeout=2) is None
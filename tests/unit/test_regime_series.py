@@ -0,0 +1,91 @@
+"""
+市场状态序列 / 增量跟踪器单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.market_regime import (
+    MarketRegime,
+    MarketRegimeDetector,
+    RegimeTracker,
+)
+
+
+def make_klines(n=400, seed=1):
+    """生成带趋势段和震荡段的K线"""
+    rng = np.random.default_rng(seed)
+    drift = np.where((np.arange(n) // 80) % 2 == 0, 0.004, 0.0)
+    close = 2000 * np.exp(np.cumsum(drift + rng.normal(0, 0.004, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.003, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.003, n))
+    index = pd.date_range('2024-01-01', periods=n, freq='15min', name='timestamp')
+    return pd.DataFrame({
+        'open': open_, 'high': high, 'low': low, 'close': close,
+        'volume': rng.uniform(10, 100, n),
+    }, index=index)
+
+
+@pytest.mark.parametrize('end', [60, 150, 260, 400])
+def test_series_matches_scalar_detect(end):
+    df = make_klines().iloc[:end]
+    series = MarketRegimeDetector.detect_series(df, hysteresis=False)
+    expected = MarketRegimeDetector(df).detect()
+
+    last = series.iloc[-1]
+    assert last['regime'] == expected.regime.value
+    assert last['confidence'] == pytest.approx(expected.confidence)
+    assert last['trend_direction'] == expected.trend_direction
+
+
+def test_series_hysteresis_matches_sequential_classification():
+    df = make_klines()
+    series = MarketRegimeDetector.detect_series(df, hysteresis=True)
+
+    prev = None
+    for ts, row in series.dropna(subset=['regime']).iterrows():
+        detector = MarketRegimeDetector(df, prev_regime=prev)
+        regime, confidence = detector._classify_regime(row['adx'], row['bb_width_pct'], row['volatility'])
+        assert row['regime'] == regime.value, ts
+        assert row['confidence'] == pytest.approx(confidence)
+        prev = regime
+
+
+def test_warmup_rows_have_no_regime():
+    series = MarketRegimeDetector.detect_series(make_klines(60))
+    assert pd.isna(series['regime'].iloc[0])
+    assert pd.notna(series['regime'].iloc[-1])
+
+
+def test_tracker_incremental_matches_full_series():
+    df = make_klines()
+    tracker = RegimeTracker(hysteresis=True)
+
+    tracker.update(df.iloc[:200])
+    for end in range(201, 401):
+        # 模拟最后一根K线先以未完成状态出现，再被最终值覆盖
+        partial = df.iloc[:end].copy()
+        partial.iloc[-1, partial.columns.get_loc('close')] *= 1.001
+        tracker.update(partial)
+        result = tracker.update(df.iloc[end - 200:end])
+
+    expected = MarketRegimeDetector.detect_series(df, hysteresis=True)
+    assert tracker.full_updates == 1
+    assert list(result['regime']) == list(expected['regime'].iloc[-len(result):])
+    np.testing.assert_allclose(
+        result['adx'].to_numpy(), expected['adx'].iloc[-len(result):].to_numpy(), rtol=1e-9
+    )
+
+
+def test_tracker_cache_hit_and_regime_info():
+    df = make_klines(300)
+    tracker = RegimeTracker(hysteresis=False)
+
+    info = tracker.detect(df)
+    tracker.detect(df)
+
+    assert tracker.cache_hits == 1
+    assert isinstance(info.regime, MarketRegime)
+    assert info.regime == MarketRegimeDetector(df).detect().regime
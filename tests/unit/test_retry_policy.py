@@ -0,0 +1,126 @@
+"""
+交易所重试策略单元测试：错误分类、去相关抖动、异步非阻塞、重试预算与退避控制器联动
+"""
+
+import asyncio
+import time
+
+import ccxt
+import pytest
+
+from exchange import decorators
+from exchange.decorators import (
+    RetryBudget, decorrelated_jitter, get_retry_budget, get_retry_rule, retry_on_error,
+)
+from exchange.errors import ExchangeError, InsufficientBalanceError, NetworkError, RateLimitError
+from risk import error_backoff_controller
+from risk.error_backoff_controller import ErrorBackoffController
+
+
+class FlakyClient:
+    def __init__(self, name, errors):
+        self.exchange_name = name
+        self.errors = list(errors)
+        self.calls = 0
+
+    def _step(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+    @retry_on_error(max_retries=3, backoff_base=0.01)
+    def fetch(self):
+        return self._step()
+
+    @retry_on_error(max_retries=3, backoff_base=0.01)
+    async def fetch_async(self):
+        return self._step()
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    controller = ErrorBackoffController()
+    monkeypatch.setattr(error_backoff_controller, '_backoff_controller', controller)
+    return controller
+
+
+def test_errors_are_classified_per_rule():
+    wrapped = ExchangeError("获取余额失败", ccxt.InsufficientFunds("no money"))
+    assert not get_retry_rule(wrapped).retryable
+    assert not get_retry_rule(ExchangeError("交易所未连接")).retryable
+    assert not get_retry_rule(ValueError("bug")).retryable
+    assert get_retry_rule(ExchangeError("获取行情失败", ccxt.RequestTimeout("t"))).retryable
+    assert get_retry_rule(RateLimitError("限流")).base > get_retry_rule(NetworkError("net")).base
+
+    client = FlakyClient("test-classify", [InsufficientBalanceError("余额不足")])
+    with pytest.raises(InsufficientBalanceError):
+        client.fetch()
+    assert client.calls == 1
+
+    flaky = FlakyClient("test-classify", [NetworkError("reset"), NetworkError("reset")])
+    assert flaky.fetch() == "ok" and flaky.calls == 3
+
+    for previous in (0.0, 0.5, 5.0):
+        for _ in range(50):
+            assert 0.5 <= decorrelated_jitter(previous, 0.5, 2.0) <= 2.0
+
+
+def test_async_retry_does_not_block_event_loop():
+    client = FlakyClient("test-async", [NetworkError("reset"), NetworkError("reset")])
+
+    async def run():
+        gaps = []
+
+        async def heartbeat():
+            last = time.perf_counter()
+            while client.calls < 3:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        result, _ = await asyncio.gather(client.fetch_async(), heartbeat())
+        return result, max(gaps)
+
+    result, max_gap = asyncio.run(run())
+    assert result == "ok" and client.calls == 3
+    assert max_gap < 0.05
+
+    # 同步接口在事件循环线程上被调用（如异步主循环中的平仓）时仍然重试
+    async def sync_call_inside_loop():
+        sync_client = FlakyClient("test-async", [NetworkError("reset")])
+        return sync_client.fetch(), sync_client.calls
+
+    assert asyncio.run(sync_call_inside_loop()) == ("ok", 2)
+
+
+def test_budget_and_backoff_controller_stop_retries(controller, monkeypatch):
+    monkeypatch.setattr(decorators.time, 'sleep', lambda seconds: None)
+
+    # 限流重试耗尽后登记退避，之后同一交易所失败不再重试
+    client = FlakyClient("test-throttled", [RateLimitError("429")] * 3)
+    with pytest.raises(RateLimitError):
+        client.fetch()
+    assert client.calls == 3 and controller.is_paused("test-throttled")
+
+    paused = FlakyClient("test-throttled", [RateLimitError("429"), RateLimitError("429")])
+    with pytest.raises(RateLimitError):
+        paused.fetch()
+    assert paused.calls == 1
+
+    # 预算耗尽：只允许有限次数的重试
+    budget = get_retry_budget("test-budget")
+    budget._tokens = 1
+    budget.min_per_second = 0
+    client = FlakyClient("test-budget", [NetworkError("reset")] * 3)
+    with pytest.raises(NetworkError):
+        client.fetch()
+    assert client.calls == 2
+    assert budget.get_stats()["exhausted"] == 1
+
+    fresh = RetryBudget(ratio=0.5, min_per_second=0, capacity=2)
+    fresh._tokens = 0
+    fresh.record_request()
+    fresh.record_request()
+    assert fresh.try_spend() and not fresh.try_spend()
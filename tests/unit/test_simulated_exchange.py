@@ -0,0 +1,132 @@
+"""
+模拟交易所适配器单元测试（本地撮合，不访问网络）
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from exchange import ExchangeFactory
+from exchange.adapters.simulated_adapter import (
+    SimulatedMarket, reset_simulated_exchanges,
+)
+
+SYMBOL = "ETHUSDT"
+
+
+def make_config(**overrides):
+    config = {
+        "name": "sim_test", "symbol": SYMBOL, "leverage": 10, "initial_balance": 10000.0,
+        "maker_fee": 0.0002, "taker_fee": 0.0006, "seed": 7, "speed": 1.0,
+        "latency_ms": 0, "start_price": 2000.0, "history_bars": 500,
+        "book_levels": 5, "spread_bps": 2.0, "level_step_bps": 1.0, "level_size": 1.0,
+    }
+    config.update(overrides)
+    return config
+
+
+@pytest.fixture(autouse=True)
+def fresh_exchanges():
+    reset_simulated_exchanges()
+    yield
+    reset_simulated_exchanges()
+
+
+def test_market_orders_walk_the_book_and_track_positions():
+    exchange = ExchangeFactory.create("simulated", make_config())
+    ticker = exchange.get_ticker()
+    assert ticker.bid < ticker.last < ticker.ask
+
+    book = exchange.get_orderbook(limit=5)
+    assert [size for _, size in book["asks"]] == [1.0, 1.5, 2.0, 2.5, 3.0]
+
+    # 2 张跨越两档：均价介于卖一和卖二之间，支付 taker 手续费
+    result = exchange.open_long(2.0)
+    assert result.success and result.filled_quantity == pytest.approx(2.0)
+    assert book["asks"][0][0] < result.avg_price < book["asks"][1][0] * 1.001
+    fee = result.raw_data["fee"]["cost"]
+    assert fee == pytest.approx(2.0 * result.avg_price * 0.0006)
+
+    positions = exchange.get_positions()
+    assert len(positions) == 1 and positions[0].side == "long" and positions[0].amount == pytest.approx(2.0)
+
+    # 超过全部深度（10 张）：部分成交，剩余撤销
+    partial = exchange.place_order(SYMBOL, "sell", 50.0)
+    assert partial.status == "canceled" and partial.filled_quantity == pytest.approx(10.0)
+
+    assert sorted(p.side for p in exchange.get_positions()) == ["long", "short"]
+    assert all(r.success for r in exchange.close_all_positions())
+    assert exchange.get_positions() == []
+    stats = exchange.get_stats()
+    assert stats["fills"] >= 8 and stats["fees"] > 0
+
+
+def test_limit_post_only_and_partial_fills():
+    exchange = ExchangeFactory.create("simulated", make_config(partial_fill_ratio=0.5))
+    client = exchange.exchange
+    price = exchange.get_ticker().last
+
+    # post-only 买单高于卖一会立即成交：拒绝
+    rejected = exchange.place_order(SYMBOL, "buy", 1.0, price * 1.01, order_type="post_only")
+    assert not rejected.success
+
+    resting = exchange.place_order(SYMBOL, "buy", 1.0, price * 0.999, order_type="post_only")
+    assert resting.success and resting.status == "open" and resting.filled_quantity == 0
+
+    # 价格跌破挂单价：每次撮合成交一半，按 maker 费率收费
+    client._market(SYMBOL).bars[:, :4] *= 0.99
+    first = exchange.get_order_status(resting.order_id, SYMBOL)
+    assert first.status == "open" and first.filled_quantity == pytest.approx(0.5)
+    second = exchange.get_order_status(resting.order_id, SYMBOL)
+    assert second.status == "closed" and second.avg_price == pytest.approx(price * 0.999)
+    assert second.raw_data["fee"]["cost"] == pytest.approx(price * 0.999 * 0.0002)
+
+    # 保证金不足
+    broke = exchange.place_order(SYMBOL, "buy", 1000.0)
+    assert not broke.success and "保证金不足" in broke.error
+    assert exchange.get_balance() < 10000.0
+
+
+def test_replay_recorded_klines_at_high_speed():
+    start = 1_700_000_000_000
+    closes = 100.0 + np.arange(200, dtype=float)
+    klines = [[start + i * 60_000, c - 0.5, c + 1, c - 1, c, 10.0] for i, c in enumerate(closes)]
+    exchange = ExchangeFactory.create(
+        "simulated", make_config(name="sim_replay", klines=klines, history_bars=100, speed=6000.0)
+    )
+
+    # 6000 倍速：每实际秒推进 100 根 1 分钟K线
+    df = exchange.get_klines(timeframe="5m", limit=10)
+    assert len(df) == 10 and (df.index[1:] - df.index[:-1]).min().total_seconds() == 300
+    assert df["volume"].iloc[:-1].eq(50.0).all()
+
+    first = exchange.get_ticker().timestamp
+    exchange.exchange.clock.sleep(60)  # 虚拟 60 秒
+    assert exchange.get_ticker().timestamp - first >= 60_000
+
+
+def test_async_adapter_shares_the_simulated_account():
+    async def run():
+        adapter = await ExchangeFactory.create_async("simulated", make_config(name="sim_async"))
+        order = await adapter.place_order(SYMBOL, "buy", 1.0)
+        positions = await adapter.get_positions(timeout=5)
+        return order, positions
+
+    order, positions = asyncio.run(run())
+    assert order.success and positions[0].amount == pytest.approx(1.0)
+    sync = ExchangeFactory.create("simulated", make_config(name="sim_async"))
+    assert sync.get_positions()[0].entry_price == pytest.approx(order.avg_price)
+
+
+def test_synthetic_market_is_reproducible_and_aggregates():
+    a = SimulatedMarket(SYMBOL, "1m", 1_700_000_000_000, history_bars=300, seed=1)
+    b = SimulatedMarket(SYMBOL, "1m", 1_700_000_000_000, history_bars=300, seed=1)
+    now = 1_700_000_000_000 + 30_000
+    assert a.price(now) == b.price(now)
+
+    hourly = a.ohlcv(now, "1h", limit=3)
+    minutes = a.ohlcv(now, "1m", limit=300)
+    last_hour = [row for row in minutes if row[0] >= hourly[-1][0]]
+    assert hourly[-1][2] == pytest.approx(max(row[2] for row in last_hour))
+    assert hourly[-1][4] == pytest.approx(minutes[-1][4])
@@ -0,0 +1,68 @@
+"""
+启动优化单元测试：延迟导入、延迟建库、启动耗时报告
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+from utils.logger_utils import TradeDatabase
+from utils.startup_profiler import StartupProfiler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_importing_bot_skips_optional_subsystems():
+    code = textwrap.dedent("""
+        import sys
+        import bot
+        from utils import logger_utils
+        lazy = ['anthropic', 'ai.ml_predictor', 'ai.ml_predictor_lite', 'ai.policy_layer',
+                'monitoring.status_monitor', 'arbitrage.engine']
+        print(sorted(name for name in lazy if name in sys.modules))
+        print(logger_utils.db.initialized, logger_utils.notifier.initialized)
+    """)
+    env = dict(os.environ, SUPABASE_URL="http://127.0.0.1:9", SUPABASE_SERVICE_ROLE_KEY="x")
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-2:] == ["[]", "False False"]
+
+
+def test_trade_database_creates_schema_on_first_use(tmp_path):
+    path = str(tmp_path / "trades.db")
+    database = TradeDatabase(path)
+    assert not os.path.exists(path)
+
+    assert database.get_trades(limit=1) == []
+    assert os.path.exists(path)
+    assert os.path.abspath(path) in TradeDatabase._schema_ready
+
+
+def test_startup_profiler_records_imports_and_phases(tmp_path, monkeypatch):
+    (tmp_path / "startup_probe_child.py").write_text("import time\ntime.sleep(0.01)\n")
+    (tmp_path / "startup_probe_parent.py").write_text("import startup_probe_child\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler()
+    profiler.install_import_hook()
+    try:
+        with profiler.phase("导入探针"):
+            import startup_probe_parent  # noqa: F401
+    finally:
+        profiler.uninstall_import_hook()
+        sys.modules.pop("startup_probe_parent", None)
+        sys.modules.pop("startup_probe_child", None)
+
+    recorded = {name: (self_time, cumulative, depth) for name, self_time, cumulative, depth in profiler.imports}
+    parent, child = recorded["startup_probe_parent"], recorded["startup_probe_child"]
+    assert child[2] == parent[2] + 1
+    assert parent[1] >= child[1] >= 0.01
+    assert parent[0] < 0.01
+
+    assert profiler.mark("首次决策") is not None
+    assert profiler.mark("首次决策") is None
+    report = profiler.report()
+    assert "导入探针" in report and "startup_probe_parent" in report and "首次决策" in report
@@ -0,0 +1,36 @@
+"""
+状态推送只读快照单元测试
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from exchange.interface import TickerData
+from monitoring.status_monitor import PriceHistory, StatusMonitorCollector, TraderSnapshot
+
+
+def test_collector_reads_snapshot_not_live_objects():
+    df = pd.DataFrame({c: np.linspace(100, 110, 120) for c in ('open', 'high', 'low', 'close', 'volume')},
+                      index=pd.date_range('2024-01-01', periods=120, freq='5min'))
+    positions = [{'side': 'long', 'amount': 1.0, 'entry_price': 100.0, 'unrealized_pnl': 5.0}]
+    ticker = TickerData('ETHUSDT', 105.0, None, None, None, 0, {})
+    risk = SimpleNamespace(position=SimpleNamespace(entry_time=datetime.now() - timedelta(minutes=5)))
+
+    balances = []
+    snapshot = TraderSnapshot(df, positions, ticker, balance_reader=lambda: balances.append(1) or 1000.0)
+    risk_snapshot = TraderSnapshot.snapshot_risk(risk)
+
+    # 快照之后主循环修改持仓 / 平仓，不影响推送线程看到的数据
+    positions[0]['amount'] = 0.0
+    risk.position = None
+    df.iloc[-1, :] = 0.0
+
+    collector = StatusMonitorCollector(snapshot, risk_snapshot, PriceHistory(), datetime.now(), 0)
+    account = collector._collect_account_info()
+    assert account['balance'] == 1000.0 and balances == [1]
+    assert account['position']['amount'] == 1.0 and account['position']['current_price'] == 105.0
+    assert account['position']['duration'] != 'N/A'
+    assert snapshot.get_klines(limit=50)['close'].iloc[-1] == 110.0
@@ -0,0 +1,152 @@
+"""
+快速止损监视器单元测试（不访问交易所）
+"""
+
+import threading
+import time
+
+import pytest
+
+from config.settings import settings as config
+from exchange.rate_limiter import Priority, current_priority
+from market_data import MarketDataBus, SimulatedFeed
+from risk.risk_manager import RiskManager
+from risk.stop_watcher import StopLossWatcher
+
+
+@pytest.fixture
+def risk_manager(monkeypatch):
+    manager = RiskManager()
+    monkeypatch.setattr(manager, '_save_position_to_db', lambda: None)
+    return manager
+
+
+def open_position(manager, side='long', entry=2000.0, atr_stop=0.0):
+    manager.set_position(side, 0.1, entry)
+    manager.position.stop_loss_price = atr_stop
+    return manager.position
+
+
+def test_fixed_stop_matches_check_stop_loss(risk_manager):
+    fired = []
+    watcher = StopLossWatcher(risk_manager, lambda result: fired.append(result) or True)
+    open_position(risk_manager, 'short', entry=2000.0)
+    trigger = 2000.0 * (1 + config.STOP_LOSS_PERCENT / config.LEVERAGE)
+
+    assert watcher.on_price(trigger - 0.01) is None
+    assert not risk_manager.check_stop_loss(trigger - 0.01, risk_manager.position).should_stop
+
+    result = watcher.on_price(trigger + 0.01)
+    assert result.stop_type == 'stop_loss'
+    assert risk_manager.check_stop_loss(trigger + 0.01, risk_manager.position).stop_type == 'stop_loss'
+    assert len(fired) == 1
+
+    # 同一持仓只触发一次
+    assert watcher.on_price(trigger + 1) is None
+    assert watcher.get_stats()['triggers'] == 1
+
+
+def test_failed_close_rearms_after_backoff(risk_manager, monkeypatch):
+    monkeypatch.setattr(config, 'STOP_WATCHER_RETRY_BACKOFF', 0.05)
+    attempts = []
+
+    def close(result):
+        attempts.append(result.stop_type)
+        if len(attempts) == 1:
+            return False
+        raise RuntimeError("交易所超时")
+
+    watcher = StopLossWatcher(risk_manager, close)
+    open_position(risk_manager, 'long', entry=2000.0)
+    assert watcher.on_price(1000.0).stop_type == 'stop_loss'
+
+    # 退避期内不重复触发，退避结束后重新平仓
+    assert watcher.on_price(1000.0) is None
+    assert watcher.get_stats()['armed']
+    time.sleep(0.06)
+    assert watcher.on_price(1000.0).stop_type == 'stop_loss'
+
+    # 回调抛异常同样重新布防
+    time.sleep(0.06)
+    assert watcher.on_price(1000.0) is not None
+    assert attempts == ['stop_loss'] * 3
+
+
+def test_trailing_atr_and_take_profit_triggers(risk_manager, monkeypatch):
+    monkeypatch.setattr(config, 'LEVERAGE', 1)
+    monkeypatch.setattr(config, 'STOP_LOSS_PERCENT', 0.05)
+    monkeypatch.setattr(config, 'TAKE_PROFIT_PERCENT', 0.2)
+    monkeypatch.setattr(config, 'TRAILING_STOP_PERCENT', 0.02)
+    fired = []
+    watcher = StopLossWatcher(risk_manager, lambda result: fired.append(result.stop_type) or True)
+
+    # 移动止损跟随新高
+    open_position(risk_manager, 'long', entry=2000.0, atr_stop=1960.0)
+    for price in (2010.0, 2100.0, 2080.0):
+        assert watcher.on_price(price) is None
+    result = watcher.on_price(2100.0 * 0.98)
+    assert result.stop_type == 'trailing_stop' and result.stop_price == pytest.approx(2058.0)
+
+    # 新持仓重新布防：ATR 止损先于固定止损
+    open_position(risk_manager, 'short', entry=2000.0, atr_stop=2040.0)
+    assert watcher.on_price(2041.0).stop_type == 'atr_stop'
+
+    open_position(risk_manager, 'short', entry=1900.0)
+    assert watcher.on_price(1520.0).stop_type == 'take_profit'
+    assert fired == ['trailing_stop', 'atr_stop', 'take_profit']
+
+
+def test_stream_ticker_fires_close_and_reports_latency(risk_manager):
+    bus = MarketDataBus()
+    closed = threading.Event()
+
+    def close(result):
+        closed.set()
+        risk_manager.clear_position()
+        return True
+
+    watcher = StopLossWatcher(risk_manager, close)
+    watcher.attach_stream(bus, 'ETHUSDT', exchange='bitget')
+    open_position(risk_manager, 'long', entry=2000.0)
+
+    feed = SimulatedFeed('bitget', bus=bus)
+    for _ in range(200):
+        feed.push_ticker('ETHUSDT', 2000.2)
+    feed.push_ticker('ETHUSDT', 1900.0)
+    assert closed.is_set()
+
+    stats = watcher.get_stats()
+    watcher.stop()
+    assert stats['source'] == 'stream'
+    assert stats['checks'] == 201 and stats['triggers'] == 1
+    assert 0 < stats['check_max_us'] < 50_000
+    assert stats['close_latency_max_ms'] >= stats['trigger_latency_max_ms'] >= 0
+    assert bus.get_stats()['subscribers'] == 0
+
+
+def test_polled_prices_are_read_with_critical_priority(risk_manager):
+    priorities = []
+    polled = threading.Event()
+
+    def price_source():
+        priorities.append(current_priority())
+        polled.set()
+        return 2000.0
+
+    watcher = StopLossWatcher(risk_manager, lambda result: True)
+    open_position(risk_manager, 'long', entry=2000.0)
+    watcher.start_polling(price_source, interval=0.01)
+    assert polled.wait(1)
+    watcher.stop()
+    assert priorities[0] == Priority.CRITICAL
+
+
+def test_check_stop_loss_saves_snapshot_only_when_extremes_move(risk_manager, monkeypatch):
+    saves = []
+    position = open_position(risk_manager, 'long', entry=2000.0)
+    monkeypatch.setattr(risk_manager, '_save_position_to_db', lambda: saves.append(position.highest_price))
+
+    for price in (2000.5, 2000.2, 2000.3, 2001.0, 2000.9):
+        risk_manager.check_stop_loss(price, position)
+
+    assert saves == [2000.5, 2001.0]
@@ -0,0 +1,115 @@
+"""
+策略指标依赖、预热长度与延迟注册单元测试
+"""
+
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.indicators import IndicatorCalculator, INDICATOR_GROUPS
+from strategies.strategies import (
+    STRATEGY_MAP, BaseStrategy, TradeSignal, Signal,
+    register_strategy, get_strategy, get_strategy_class,
+    get_required_warmup, get_backtest_window, analyze_all_strategies,
+)
+
+
+def make_df(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 5, n))
+    open_ = np.r_[close[0], close[:-1]]
+    df = pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.uniform(0, 3, n),
+        'low': np.minimum(open_, close) - rng.uniform(0, 3, n),
+        'close': close,
+        'volume': rng.uniform(10, 100, n),
+    })
+    df.index = pd.date_range('2024-01-01', periods=n, freq='15min', name='timestamp')
+    return df
+
+
+def test_every_strategy_declares_known_indicator_groups():
+    for name in STRATEGY_MAP:
+        cls = get_strategy_class(name)
+        assert set(cls.required_indicators) <= set(INDICATOR_GROUPS), name
+
+
+def test_warmup_is_derived_from_requirements():
+    assert get_required_warmup(['macd_cross']) > get_required_warmup(['kdj_cross'])
+    assert get_required_warmup(['kdj_cross', 'macd_cross']) == get_required_warmup(['macd_cross'])
+    assert get_required_warmup(['multi_timeframe']) >= 50
+    assert get_required_warmup(['band_limited_hedging'], sigma_window=80) == 80
+    assert get_required_warmup(['not_a_strategy']) == 1
+
+
+def test_strategies_run_on_minimal_warmup_window():
+    df = make_df()
+    for name in STRATEGY_MAP:
+        if name == 'band_limited_hedging':
+            continue
+        warmup = get_required_warmup([name])
+        signal = get_strategy(name, df.iloc[-(warmup + 1):]).analyze()
+        assert isinstance(signal, TradeSignal), name
+
+
+def test_calculate_only_requested_groups_matches_calculate_all():
+    df = make_df()
+    groups = {'macd', 'rsi'}
+
+    partial = IndicatorCalculator(df).calculate(groups)
+    full = IndicatorCalculator(df).calculate_all()
+    assert 'adx' not in partial.columns
+    pd.testing.assert_frame_equal(partial, full[partial.columns])
+
+    with pytest.raises(ValueError):
+        IndicatorCalculator(df).calculate(['unknown'])
+
+
+def test_shared_calculator_computes_each_indicator_once():
+    df = make_df()
+    ind = IndicatorCalculator(df)
+    analyze_all_strategies(df, ['macd_cross', 'composite_score', 'adx_trend'], indicator_calc=ind)
+
+    macd_keys = [key for key in ind._cache if key[0] == 'macd']
+    assert len(macd_keys) == 1
+    pd.testing.assert_series_equal(ind.macd()['macd'], ind.macd(12, 26, 9)['macd'])
+
+    # 返回副本：调用方就地修改不影响缓存
+    first = ind.macd()
+    first['macd'].iloc[-1] = 1e9
+    first['signal'] = None
+    assert ind.macd()['macd'].iloc[-1] != 1e9 and ind.macd()['signal'] is not None
+
+
+def test_backtest_window_length_independent_of_warmup():
+    df = make_df(200)
+    assert get_required_warmup(['macd_cross']) != 50
+    window = get_backtest_window(df, 120)
+    assert len(window) == 51 and window.index[-1] == df.index[120]
+    assert len(get_backtest_window(df, 10)) == 11
+
+
+def test_register_strategy_resolves_lazily(monkeypatch):
+    module = types.ModuleType('lazy_strategy_module')
+
+    class AlwaysLong(BaseStrategy):
+        name = 'always_long'
+        required_indicators = ('rsi',)
+
+        def analyze(self):
+            return TradeSignal(Signal.LONG, self.name)
+
+    module.AlwaysLong = AlwaysLong
+    monkeypatch.setitem(sys.modules, 'lazy_strategy_module', module)
+    monkeypatch.setitem(STRATEGY_MAP, 'always_long', 'lazy_strategy_module:AlwaysLong')
+
+    assert STRATEGY_MAP['always_long'] == 'lazy_strategy_module:AlwaysLong'
+    assert get_strategy('always_long', make_df(30)).analyze().signal == Signal.LONG
+    assert STRATEGY_MAP['always_long'] is AlwaysLong
+
+    with pytest.raises(ValueError):
+        register_strategy('bad', 'no_class_path')
@@ -0,0 +1,125 @@
+"""
+MultiTimeframeAggregator 单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import MultiTimeframeAggregator, timeframe_to_ms, plan_resampling
+
+BASE_MS = 15 * 60_000
+START_MS = 1_700_006_400_000  # 对齐到 UTC 整点（4h 边界）
+
+
+def make_rows(n, start=START_MS, seed=0):
+    """生成 ccxt 格式的 15m K线"""
+    rng = np.random.default_rng(seed)
+    close = 2000 + np.cumsum(rng.normal(0, 5, n))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 3, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 3, n)
+    volume = rng.uniform(10, 100, n)
+    ts = start + np.arange(n) * BASE_MS
+    return [[int(t), o, h, l, c, v] for t, o, h, l, c, v in zip(ts, open_, high, low, close, volume)]
+
+
+def pandas_resample(rows, rule):
+    """使用 pandas resample 作为参照结果"""
+    df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.set_index('timestamp', inplace=True)
+    return df.resample(rule).agg({
+        'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
+    }).dropna()
+
+
+def test_timeframe_to_ms():
+    assert timeframe_to_ms('15m') == BASE_MS
+    assert timeframe_to_ms('4h') == 4 * 3_600_000
+    with pytest.raises(ValueError):
+        timeframe_to_ms('1M')
+
+
+def test_plan_falls_back_to_direct_when_base_too_deep():
+    base, derived, direct = plan_resampling(['15m', '1h', '4h'], limit=200, max_base_bars=1000)
+    assert base == '15m'
+    assert derived == ['15m', '1h']
+    assert direct == ['4h']
+
+
+def test_resample_matches_pandas():
+    rows = make_rows(400)
+    agg = MultiTimeframeAggregator(['15m', '1h'], limit=50, max_base_bars=1000)
+    agg.seed(rows)
+
+    result = agg.get('1h', include_partial=True)
+    expected = pandas_resample(rows, '1h').iloc[-50:]
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+
+def test_incremental_update_matches_full_resample():
+    rows = make_rows(300)
+    agg = MultiTimeframeAggregator(['15m', '1h'], limit=40, max_base_bars=1000)
+    agg.seed(rows[:250])
+
+    # 分批推进，并覆盖最后一根进行中的K线
+    for end in range(252, 301, 2):
+        assert agg.update(rows[end - 4:end])
+
+    result = agg.get('1h', include_partial=True)
+    expected = pandas_resample(rows, '1h').iloc[-40:]
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+
+def test_partial_bar_excluded_when_requested():
+    rows = make_rows(402)  # 最后一个 1h 桶只有 2 根 15m
+    agg = MultiTimeframeAggregator(['15m', '1h'], limit=50)
+    agg.seed(rows)
+
+    now_ms = rows[-1][0] + BASE_MS
+    with_partial = agg.get('1h', include_partial=True, now_ms=now_ms)
+    without_partial = agg.get('1h', include_partial=False, now_ms=now_ms)
+
+    assert with_partial.index[-1] == pd.Timestamp(rows[400][0], unit='ms')
+    assert without_partial.index[-1] == pd.Timestamp(rows[396][0], unit='ms')
+
+
+def test_gap_triggers_reseed_via_refresh():
+    rows = make_rows(600)
+    calls = []
+
+    def fetch(tf, limit):
+        calls.append((tf, limit))
+        return rows[:limit] if len(calls) == 1 else rows[-limit:]
+
+    agg = MultiTimeframeAggregator(['15m', '1h'], limit=50, incremental_limit=5)
+    agg.refresh(fetch)
+    frames = agg.refresh(fetch)
+
+    assert agg.full_syncs == 2
+    assert [tf for tf, _ in calls] == ['15m', '15m', '15m']
+    assert frames['15m'].index[-1] == pd.Timestamp(rows[-1][0], unit='ms')
+
+
+
+def test_requests_saved_only_counts_successful_fetches():
+    rows = make_rows(300)
+    responses = iter([rows, [], None, rows[-3:]])
+
+    agg = MultiTimeframeAggregator(['15m', '1h'], limit=50, incremental_limit=5)
+    for _ in range(4):
+        agg.refresh(lambda tf, limit: next(responses))
+
+    # 首次同步 + 最后一次增量成功，中间两次获取失败不计
+    assert agg.get_stats()['requests_saved'] == 2
+
+def test_trimmed_buffer_drops_incomplete_head_bucket():
+    rows = make_rows(50)
+    agg = MultiTimeframeAggregator(['15m', '1h'], limit=5, max_base_bars=24)
+    agg.seed(rows[:30])
+    agg.update(rows[30:50])
+
+    result = agg.get('1h', include_partial=True)
+    expected = pandas_resample(rows[28:], '1h').iloc[-5:]
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
@@ -1,9 +1,15 @@
 """
 日志和数据库工具 - 增强版
 """
+import atexit
 import logging
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 import time
 from typing import Optional, Dict, Any, List
@@ -16,6 +22,7 @@ from email.mime.multipart import MIMEMultipart
 import numpy as np
 
 from config.settings import settings as config
+from utils.metrics import LatencyHistogram, RateWindow, GcPauseTracker, collect_process_gauges, render_prometheus
 
 # 创建日志目录
 LOG_DIR = getattr(config, 'LOG_DIR', 'logs')
@@ -217,36 +224,102 @@ def get_logger(name: str) -> logging.Logger:
 
 
 class MetricsLogger:
-    """轻量级性能指标记录器（Phase 0）"""
+    """
+    轻量级性能指标记录器（Phase 0）
 
-    def __init__(self):
+    每个操作一个固定内存的对数分桶直方图（p50/p95/p99/max）和滑动窗口速率，
+    长时间运行内存不增长；snapshot() 附带内存/GC 指标，可写入快照文件供 API 导出。
+    """
+
+    def __init__(self, rate_window: int = None, track_gc: bool = None):
         self.logger = logging.getLogger("metrics")
-        self.metrics = {}
+        self.metrics: Dict[str, LatencyHistogram] = {}
+        self.rates: Dict[str, RateWindow] = {}
+        self.gauges: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._rate_window = rate_window or getattr(config, 'METRICS_RATE_WINDOW', 60)
+        self._started_at = time.time()
+        self._last_snapshot_write = 0.0
+
+        self._gc_tracker = None
+        if track_gc if track_gc is not None else getattr(config, 'METRICS_TRACK_GC', True):
+            self._gc_tracker = GcPauseTracker()
+            self._gc_tracker.install()
 
     def record_latency(self, operation: str, latency_ms: float):
         """记录操作延迟（毫秒）"""
-        if operation not in self.metrics:
-            self.metrics[operation] = []
-        self.metrics[operation].append(latency_ms)
+        with self._lock:
+            histogram = self.metrics.get(operation)
+            if histogram is None:
+                histogram = self.metrics[operation] = LatencyHistogram()
+                self.rates[operation] = RateWindow(self._rate_window)
+            histogram.record(latency_ms)
+            self.rates[operation].add()
         self.logger.debug(f"{operation}: {latency_ms:.2f}ms")
 
+    @contextmanager
+    def timer(self, operation: str):
+        """计时上下文：with metrics.timer("main_loop.fetch"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_latency(operation, (time.perf_counter() - start) * 1000)
+
     def record_memory(self, label: str, memory_mb: float):
         """记录内存使用（MB）"""
+        self.set_gauge(f"memory_{label}_mb", memory_mb)
         self.logger.debug(f"Memory [{label}]: {memory_mb:.2f}MB")
 
+    def set_gauge(self, name: str, value: float):
+        """设置瞬时指标"""
+        self.gauges[name] = value
+
+    def _collect_gc_pauses(self):
+        if self._gc_tracker:
+            for generation, pause_ms in self._gc_tracker.drain():
+                self.record_latency(f"gc.pause.gen{generation}", pause_ms)
+
     def get_stats(self, operation: str) -> Dict:
-        """获取操作的统计信息"""
-        if operation not in self.metrics or not self.metrics[operation]:
-            return {}
+        """获取操作的统计信息（count/avg/min/max/p50/p95/p99/rate_per_sec）"""
+        with self._lock:
+            histogram = self.metrics.get(operation)
+            if histogram is None or not histogram.count:
+                return {}
+            stats = histogram.get_stats()
+            stats['rate_per_sec'] = self.rates[operation].rate()
+        return stats
+
+    def get_breakdown(self, prefix: str) -> Dict[str, Dict]:
+        """
+        获取某个流程各阶段的统计（操作名形如 "{prefix}.{phase}"）
 
-        latencies = self.metrics[operation]
+        Returns:
+            {phase: get_stats 结果}
+        """
+        head = f"{prefix}."
         return {
-            'count': len(latencies),
-            'avg': sum(latencies) / len(latencies),
-            'min': min(latencies),
-            'max': max(latencies)
+            operation[len(head):]: self.get_stats(operation)
+            for operation in list(self.metrics)
+            if operation.startswith(head) and self.metrics[operation].count
         }
 
+    def format_breakdown(self, prefix: str) -> str:
+        """各阶段 p50/p99/最大耗时的单行摘要"""
+        breakdown = self.get_breakdown(prefix)
+        return ", ".join(
+            f"{phase}={stats['p50']:.0f}/{stats['p99']:.0f}/{stats['max']:.0f}ms"
+            for phase, stats in breakdown.items()
+        )
+
+    def reset(self, operation: str = None):
+        """清空某个操作（或全部）的样本"""
+        with self._lock:
+            for name in ([operation] if operation else list(self.metrics)):
+                if name in self.metrics:
+                    self.metrics[name].reset()
+                    self.rates[name] = RateWindow(self._rate_window)
+
     def get_memory_usage(self) -> Dict[str, float]:
         """获取内存使用情况（MB）"""
         try:
@@ -265,15 +338,87 @@ class MetricsLogger:
                 'rss': usage.ru_maxrss / 1024,  # KB to MB
             }
 
+    # ==================== 导出 ====================
+
+    def snapshot(self) -> Dict[str, Any]:
+        """全部操作统计 + 内存/GC 指标（JSON 可序列化）"""
+        self._collect_gc_pauses()
+        gauges = collect_process_gauges()
+        gauges['uptime_seconds'] = time.time() - self._started_at
+        gauges.update(self.gauges)
+        operations = {}
+        for operation in list(self.metrics):
+            stats = self.get_stats(operation)
+            if stats:
+                operations[operation] = stats
+        return {
+            'timestamp': time.time(),
+            'operations': operations,
+            'gauges': gauges,
+        }
+
+    def export_prometheus(self, process: str = "bot") -> str:
+        """Prometheus 文本格式"""
+        return render_prometheus([(process, self.snapshot())])
+
+    def write_snapshot(self, path: str = None) -> str:
+        """把快照原子写入 JSON 文件（供 API 进程导出）"""
+        path = path or getattr(config, 'METRICS_SNAPSHOT_FILE', os.path.join(LOG_DIR, 'metrics.json'))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._last_snapshot_write = time.time()
+        return path
+
+    def maybe_write_snapshot(self) -> bool:
+        """距上次写入超过 METRICS_SNAPSHOT_INTERVAL 秒时写入快照"""
+        interval = getattr(config, 'METRICS_SNAPSHOT_INTERVAL', 15)
+        if interval <= 0 or time.time() - self._last_snapshot_write < interval:
+            return False
+        try:
+            self.write_snapshot()
+            return True
+        except Exception as e:
+            self.logger.debug(f"写入指标快照失败: {e}")
+            return False
+
+
+_metrics_logger: Optional[MetricsLogger] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics_logger() -> MetricsLogger:
+    """获取进程级 MetricsLogger 实例"""
+    global _metrics_logger
+    if _metrics_logger is None:
+        with _metrics_lock:
+            if _metrics_logger is None:
+                _metrics_logger = MetricsLogger()
+    return _metrics_logger
+
+
+def load_metrics_snapshot(path: str = None) -> Optional[Dict[str, Any]]:
+    """读取其他进程（交易机器人）写入的指标快照，不存在时返回 None"""
+    path = path or getattr(config, 'METRICS_SNAPSHOT_FILE', os.path.join(LOG_DIR, 'metrics.json'))
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
 
 class TradeDatabase:
     """交易记录数据库"""
-    
+
+    # 本进程已完成建表的数据库文件（建表推迟到首次获取连接时，且每个文件只执行一次）
+    _schema_ready = set()
+    _schema_lock = threading.Lock()
+
     def __init__(self, db_file: str = None):
         # 兼容不同配置名
         default_db = getattr(config, 'DB_FILE', None) or getattr(config, 'DB_PATH', 'trading_bot.db')
         self.db_file = db_file or default_db
-        self._init_db()
         # Phase 3: 批量写入缓冲区
         self._trade_buffer: List[Dict[str, Any]] = []
         self._signal_buffer: List[Dict[str, Any]] = []
@@ -479,8 +624,19 @@ class TradeDatabase:
         conn.commit()
         conn.close()
     
+    def _ensure_schema(self):
+        """首次使用时建表"""
+        key = os.path.abspath(self.db_file)
+        if key in TradeDatabase._schema_ready:
+            return
+        with TradeDatabase._schema_lock:
+            if key not in TradeDatabase._schema_ready:
+                self._init_db()
+                TradeDatabase._schema_ready.add(key)
+
     def _get_conn(self):
         """获取数据库连接"""
+        self._ensure_schema()
         conn = sqlite3.connect(self.db_file)
         # 启用 WAL 模式以提升并发性能
         conn.execute("PRAGMA journal_mode=WAL")
@@ -1250,6 +1406,11 @@ class TradeDatabase:
         return [dict(row) for row in rows]
 
 
+def _channel_timeout(channel: str) -> float:
+    """通知渠道发送超时（秒）"""
+    return getattr(config, 'NOTIFY_CHANNEL_TIMEOUT', {}).get(channel, 10)
+
+
 class TelegramNotifier:
     """Telegram 通知器"""
     
@@ -1257,6 +1418,7 @@ class TelegramNotifier:
         self.bot_token = bot_token or getattr(config, 'TELEGRAM_BOT_TOKEN', '')
         self.chat_id = chat_id or getattr(config, 'TELEGRAM_CHAT_ID', '')
         self.enabled = getattr(config, 'ENABLE_TELEGRAM', False) and self.bot_token and self.chat_id
+        self.timeout = _channel_timeout('telegram')
         self.logger = get_logger(__name__)
     
     def send_message(self, message: str, parse_mode: str = "HTML") -> bool:
@@ -1272,7 +1434,7 @@ class TelegramNotifier:
                 "parse_mode": parse_mode,
             }
             
-            response = requests.post(url, data=data, timeout=10)
+            response = requests.post(url, data=data, timeout=self.timeout)
             
             if response.status_code == 200:
                 return True
@@ -1438,6 +1600,7 @@ class FeishuNotifier:
     def __init__(self, webhook_url: str = None):
         self.webhook_url = webhook_url or getattr(config, 'FEISHU_WEBHOOK_URL', '')
         self.enabled = getattr(config, 'ENABLE_FEISHU', False) and self.webhook_url
+        self.timeout = _channel_timeout('feishu')
         self.logger = get_logger(__name__)
 
     def send_message(self, message: str, msg_type: str = "text") -> bool:
@@ -1453,7 +1616,7 @@ class FeishuNotifier:
                 }
             }
 
-            response = requests.post(self.webhook_url, json=data, timeout=10)
+            response = requests.post(self.webhook_url, json=data, timeout=self.timeout)
 
             if response.status_code == 200:
                 result = response.json()
@@ -1596,6 +1759,7 @@ class EmailNotifier:
         self.enabled = getattr(config, 'ENABLE_EMAIL', False) and all([
             self.sender_email, self.sender_password, self.receiver_email
         ])
+        self.timeout = _channel_timeout('email')
         self.logger = get_logger(__name__)
 
     def send_message(self, subject: str, body: str, html: bool = True) -> bool:
@@ -1617,7 +1781,7 @@ class EmailNotifier:
                 msg.attach(MIMEText(body, 'plain', 'utf-8'))
 
             # 发送邮件
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout) as server:
                 server.starttls()
                 server.login(self.sender_email, self.sender_password)
                 server.send_message(msg)
@@ -1824,54 +1988,451 @@ class EmailNotifier:
         self.send_message("📊 每日交易总结", html)
 
 
+@dataclass
+class _Notification:
+    """待发送的通知任务"""
+    method: str
+    args: tuple
+    kwargs: dict
+    channels: Optional[tuple] = None
+    key: Optional[tuple] = None
+    high_priority: bool = False
+    count: int = 1
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class NotificationDispatcher:
+    """
+    异步通知分发器
+
+    调用方只付出一次入队的开销，由后台线程把任务分发给各渠道的线程池：
+    - 有界队列：队列满时按 drop_oldest / drop_new / block 策略处理
+    - 合并：带合并键的消息在合并窗口内重复入队只计数，发送时附带重复次数
+    - 每个渠道独立的并发上限、待发送队列和超时：渠道忙时任务进入该渠道自己的队列，
+      由该渠道的发送线程依次取出，分发线程从不等待，慢渠道不会拖慢其他渠道
+    - flush/shutdown 时等待队列发送完毕
+    """
+
+    DROP_POLICIES = ("drop_oldest", "drop_new", "block")
+
+    def __init__(
+        self,
+        channels: Dict[str, Any],
+        max_queue: int = None,
+        drop_policy: str = None,
+        coalesce_delay: float = None,
+        channel_concurrency: int = None,
+        enqueue_timeout: float = None,
+        metrics: 'MetricsLogger' = None,
+    ):
+        self.channels = channels
+        self.max_queue = max(1, max_queue or getattr(config, 'NOTIFY_QUEUE_SIZE', 500))
+        self.drop_policy = drop_policy or getattr(config, 'NOTIFY_DROP_POLICY', 'drop_oldest')
+        if self.drop_policy not in self.DROP_POLICIES:
+            raise ValueError(f"未知的通知丢弃策略: {self.drop_policy}")
+        self.coalesce_delay = (
+            getattr(config, 'NOTIFY_COALESCE_DELAY', 2.0) if coalesce_delay is None else coalesce_delay
+        )
+        self.enqueue_timeout = (
+            getattr(config, 'NOTIFY_ENQUEUE_TIMEOUT', 0.05) if enqueue_timeout is None else enqueue_timeout
+        )
+        self.concurrency = max(1, channel_concurrency or getattr(config, 'NOTIFY_CHANNEL_CONCURRENCY', 2))
+        self.channel_backlog = max(1, getattr(config, 'NOTIFY_CHANNEL_BACKLOG', 50))
+        self.metrics = metrics or get_metrics_logger()
+        self.logger = get_logger(__name__)
+
+        # 高优先级（交易、风控）立即发送；低优先级（错误、信号等）等待合并窗口
+        self._high: deque = deque()
+        self._low: deque = deque()
+        self._pending: Dict[tuple, _Notification] = {}
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._flushing = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        # 每个渠道正在发送的任务数和排队任务（由 self._cond 保护）
+        self._busy = {name: 0 for name in channels}
+        self._backlog = {name: deque() for name in channels}
+
+        self.stats = {
+            'enqueued': 0, 'coalesced': 0, 'dropped': 0, 'sent': 0,
+            'failed': 0, 'timeouts': 0, 'channel_busy': 0, 'max_depth': 0,
+        }
+
+    # ==================== 入队（调用方路径） ====================
+
+    def submit(self, method: str, args: tuple = (), kwargs: dict = None, channels: tuple = None,
+               key: tuple = None, high_priority: bool = False) -> bool:
+        """
+        提交通知任务
+
+        Returns:
+            是否已入队（合并到已有任务也算入队；被丢弃返回 False）
+        """
+        with self._cond:
+            if not self._running:
+                self._start()
+            self.stats['enqueued'] += 1
+
+            pending = self._pending.get(key) if key is not None else None
+            if pending is not None:
+                # 相同消息尚未发送：只计数并保留最新参数
+                pending.count += 1
+                pending.args, pending.kwargs = args, kwargs or {}
+                self.stats['coalesced'] += 1
+                return True
+
+            job = _Notification(method, args, kwargs or {}, channels, key, high_priority)
+            if self._depth() >= self.max_queue and not self._make_room(job):
+                self.stats['dropped'] += 1
+                return False
+
+            (self._high if high_priority else self._low).append(job)
+            if key is not None:
+                self._pending[key] = job
+            depth = self._depth()
+            self.stats['max_depth'] = max(self.stats['max_depth'], depth)
+            self.metrics.set_gauge('notify.queue_depth', depth)
+            self._cond.notify_all()
+            return True
+
+    def _depth(self) -> int:
+        return len(self._high) + len(self._low)
+
+    def _make_room(self, job: _Notification) -> bool:
+        """队列已满时按策略腾出空间（调用时持有锁）"""
+        if self.drop_policy == "block":
+            deadline = time.monotonic() + self.enqueue_timeout
+            while self._depth() >= self.max_queue:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+        if self.drop_policy == "drop_new":
+            return False
+
+        # drop_oldest：优先丢弃最旧的低优先级消息，绝不为低优先级消息丢弃交易通知
+        if self._low:
+            victim = self._low.popleft()
+        elif job.high_priority:
+            victim = self._high.popleft()
+        else:
+            return False
+        if victim.key is not None:
+            self._pending.pop(victim.key, None)
+        self.stats['dropped'] += 1
+        self.logger.debug(f"通知队列已满，丢弃最旧消息: {victim.method}")
+        return True
+
+    # ==================== 后台分发 ====================
+
+    def _start(self):
+        """首次入队时启动后台线程（shutdown 后再次入队会重新启动）"""
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"notify-{name}")
+            for name in self.channels
+        }
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="notify-dispatcher", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def _next_job(self) -> Optional[_Notification]:
+        """取出下一个到期任务（持有锁调用），队列为空且已停止时返回 None"""
+        while True:
+            if self._high:
+                return self._high.popleft()
+            if self._low:
+                wait = self._low[0].enqueued_at + self.coalesce_delay - time.monotonic()
+                if wait <= 0 or self._flushing or not self._running:
+                    return self._low.popleft()
+                self._cond.wait(wait)
+                continue
+            if not self._running:
+                return None
+            self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                if job is None:
+                    return
+                if job.key is not None:
+                    self._pending.pop(job.key, None)
+                depth = self._depth()
+                # 计入在途任务，flush 会等待其发送完毕
+                self._inflight += 1
+                self._cond.notify_all()
+
+            try:
+                self.metrics.set_gauge('notify.queue_depth', depth)
+                self.metrics.record_latency('notify.queue_wait', (time.monotonic() - job.enqueued_at) * 1000)
+                self._dispatch(job)
+            except Exception as e:
+                self.logger.error(f"通知分发异常: {e}")
+            finally:
+                self._release()
+
+    def _dispatch(self, job: _Notification):
+        for name in job.channels or self.channels:
+            channel = self.channels.get(name)
+            if channel is None or not getattr(channel, 'enabled', True):
+                continue
+            with self._cond:
+                if self._busy[name] >= self.concurrency:
+                    # 渠道并发已满：进入该渠道自己的队列，不等待，继续分发给其他渠道
+                    if len(self._backlog[name]) >= self.channel_backlog:
+                        # 队列也满了，说明该渠道卡住，丢弃而不是无限堆积
+                        self.stats['channel_busy'] += 1
+                        self.logger.warning(f"通知渠道 {name} 繁忙，丢弃消息: {job.method}")
+                    else:
+                        self._backlog[name].append(job)
+                        self._inflight += 1
+                    continue
+                self._busy[name] += 1
+                self._inflight += 1
+            self._executors[name].submit(self._send, name, channel, job)
+
+    def _send(self, name: str, channel: Any, job: _Notification):
+        """发送一个任务，然后依次发送该渠道排队的任务"""
+        while job is not None:
+            try:
+                self._send_one(name, channel, job)
+            finally:
+                self._release()
+            with self._cond:
+                job = self._backlog[name].popleft() if self._backlog[name] else None
+                if job is None:
+                    self._busy[name] -= 1
+
+    def _send_one(self, name: str, channel: Any, job: _Notification):
+        start = time.perf_counter()
+        try:
+            args, kwargs = self._with_repeat_count(job)
+            ok = getattr(channel, job.method)(*args, **kwargs) is not False
+        except Exception as e:
+            ok = False
+            self.logger.error(f"通知渠道 {name} 发送异常: {e}")
+
+        elapsed = time.perf_counter() - start
+        timed_out = elapsed > _channel_timeout(name)
+        self.metrics.record_latency(f'notify.{name}', elapsed * 1000)
+        with self._cond:
+            self.stats['sent' if ok else 'failed'] += 1
+            self.stats['timeouts'] += int(timed_out)
+        if timed_out:
+            self.logger.warning(f"通知渠道 {name} 发送耗时 {elapsed:.1f}s，超过超时设置")
+
+    def _with_repeat_count(self, job: _Notification):
+        """合并后的错误消息附带重复次数"""
+        if job.count > 1 and job.method == 'notify_error' and job.args:
+            return (f"{job.args[0]}（{self.coalesce_delay:g}s 内重复 {job.count} 次）",) + job.args[1:], job.kwargs
+        return job.args, job.kwargs
+
+    def _release(self):
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify_all()
+
+    # ==================== 生命周期 ====================
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        等待队列和在途消息发送完毕（合并窗口内的消息立即发送）
+
+        Returns:
+            是否在超时前全部发送完毕
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if not self._running:
+                return self._depth() == 0
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._depth() or self._inflight:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._flushing -= 1
+
+    def shutdown(self, timeout: float = None) -> bool:
+        """发送剩余消息并停止后台线程"""
+        if timeout is None:
+            timeout = getattr(config, 'NOTIFY_SHUTDOWN_TIMEOUT', 10)
+        with self._cond:
+            if not self._running:
+                return self._depth() == 0
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+            remaining = self._depth()
+        if self._thread:
+            self._thread.join(timeout=1)
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+        try:
+            atexit.unregister(self.shutdown)
+        except Exception:
+            pass
+        if not flushed:
+            self.logger.warning(f"通知队列未在 {timeout}s 内发送完毕，剩余 {remaining} 条")
+        return flushed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self.stats)
+            stats['depth'] = self._depth()
+            stats['inflight'] = self._inflight
+        latency = self.metrics.get_stats('notify.queue_wait')
+        stats['queue_wait_p99_ms'] = latency.get('p99', 0.0)
+        return stats
+
+
 class MultiNotifier:
-    """多渠道通知器"""
+    """多渠道通知器（默认异步：调用方只入队，后台线程发送）"""
+
+    # 交易与风控通知优先发送、不合并；其余消息按合并键在合并窗口内去重
+    HIGH_PRIORITY = {'notify_trade', 'notify_risk_event'}
 
     def __init__(self):
         self.telegram = TelegramNotifier()
         self.feishu = FeishuNotifier()
         self.email = EmailNotifier()
         self.logger = get_logger(__name__)
+        self.channels = {'telegram': self.telegram, 'feishu': self.feishu, 'email': self.email}
+        self.dispatcher = (
+            NotificationDispatcher(self.channels) if getattr(config, 'NOTIFY_ASYNC_ENABLED', True) else None
+        )
+
+    @staticmethod
+    def _coalesce_key(method: str, args: tuple, kwargs: dict) -> Optional[tuple]:
+        if method == 'notify_error':
+            return (method, args[0] if args else kwargs.get('error'))
+        if method == 'notify_signal':
+            # 同一策略的信号只保留最新一条
+            return (method, args[0] if args else kwargs.get('strategy'))
+        if method == 'notify_daily_summary':
+            return (method,)
+        return None
+
+    def dispatch(self, method: str, *args, channels: tuple = None, **kwargs) -> bool:
+        """
+        把通知方法分发到各渠道
+
+        Args:
+            method: 渠道通知器上的方法名（如 notify_trade、send_message）
+            channels: 限定渠道名，None 表示全部渠道
+        """
+        if self.dispatcher is None:
+            for name in channels or self.channels:
+                getattr(self.channels[name], method)(*args, **kwargs)
+            return True
+        if not any(getattr(self.channels[name], 'enabled', False) for name in channels or self.channels):
+            return False
+        key = self._coalesce_key(method, args, kwargs) if method not in self.HIGH_PRIORITY else None
+        return self.dispatcher.submit(
+            method, args, kwargs, channels=channels, key=key, high_priority=method in self.HIGH_PRIORITY
+        )
 
     def notify_trade(self, *args, **kwargs):
         """发送交易通知到所有渠道"""
-        self.telegram.notify_trade(*args, **kwargs)
-        self.feishu.notify_trade(*args, **kwargs)
-        self.email.notify_trade(*args, **kwargs)
+        self.dispatch('notify_trade', *args, **kwargs)
 
     def notify_error(self, error: str):
         """发送错误通知到所有渠道"""
-        self.telegram.notify_error(error)
-        self.feishu.notify_error(error)
-        self.email.notify_error(error)
+        self.dispatch('notify_error', error)
 
     def notify_signal(self, *args, **kwargs):
         """发送信号通知到所有渠道"""
-        self.telegram.notify_signal(*args, **kwargs)
-        self.feishu.notify_signal(*args, **kwargs)
-        self.email.notify_signal(*args, **kwargs)
+        self.dispatch('notify_signal', *args, **kwargs)
 
     def notify_risk_event(self, *args, **kwargs):
         """发送风控事件通知到所有渠道"""
-        self.telegram.notify_risk_event(*args, **kwargs)
-        self.feishu.notify_risk_event(*args, **kwargs)
-        self.email.notify_risk_event(*args, **kwargs)
+        self.dispatch('notify_risk_event', *args, **kwargs)
 
     def notify_daily_summary(self, *args, **kwargs):
         """发送每日总结到所有渠道"""
-        self.telegram.notify_daily_summary(*args, **kwargs)
-        self.feishu.notify_daily_summary(*args, **kwargs)
-        self.email.notify_daily_summary(*args, **kwargs)
-
-
-# 全局实例
-# 根据配置选择数据库实现
-if getattr(config, 'USE_SUPABASE_FOR_LIVE_DATA', False):
-    from utils.supabase_trade_database import SupabaseTradeDatabase
-    db = SupabaseTradeDatabase()
-    get_logger(__name__).info("Using SupabaseTradeDatabase for live trading data")
-else:
-    db = TradeDatabase()
-    get_logger(__name__).info("Using SQLite TradeDatabase for live trading data")
-
-notifier = MultiNotifier()
+        self.dispatch('notify_daily_summary', *args, **kwargs)
+
+    def flush(self, timeout: float = None) -> bool:
+        """等待已入队的通知发送完毕"""
+        return self.dispatcher.flush(timeout) if self.dispatcher else True
+
+    def shutdown(self, timeout: float = None) -> bool:
+        """发送剩余通知并停止后台线程"""
+        return self.dispatcher.shutdown(timeout) if self.dispatcher else True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """通知队列统计"""
+        return self.dispatcher.get_stats() if self.dispatcher else {}
+
+
+class _LazyGlobal:
+    """
+    延迟创建的全局实例代理
+
+    首次访问属性时才调用工厂函数创建实例，之后所有属性读写都转发给该实例。
+    `from utils.logger_utils import db, notifier` 因此不再有建库、连接 Supabase、
+    创建通知器等导入副作用。
+    """
+
+    __slots__ = ('_factory', '_instance', '_lock')
+
+    def __init__(self, factory):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _resolve(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    object.__setattr__(self, '_instance', self._factory())
+                instance = self._instance
+        return instance
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._resolve(), name)
+
+    def __repr__(self):
+        if self._instance is None:
+            return f"<lazy {getattr(self._factory, '__name__', 'instance')} (未创建)>"
+        return repr(self._instance)
+
+
+def _create_trade_db():
+    """根据配置选择数据库实现"""
+    if getattr(config, 'USE_SUPABASE_FOR_LIVE_DATA', False):
+        from utils.supabase_trade_database import SupabaseTradeDatabase
+        instance = SupabaseTradeDatabase()
+        get_logger(__name__).info("Using SupabaseTradeDatabase for live trading data")
+    else:
+        instance = TradeDatabase()
+        get_logger(__name__).info("Using SQLite TradeDatabase for live trading data")
+    return instance
+
+
+# 全局实例（首次使用时创建）
+db = _LazyGlobal(_create_trade_db)
+notifier = _LazyGlobal(MultiNotifier)
@@ -0,0 +1,248 @@
+"""
+性能指标基础组件（固定内存）
+
+- LatencyHistogram: 对数分桶直方图，任意样本数下内存固定，分位数相对误差约 ±4%
+- RateWindow: 按秒分槽的滑动窗口计数器，计算最近 N 秒的速率
+- GcPauseTracker: 通过 gc.callbacks 记录垃圾回收停顿
+- collect_process_gauges / render_prometheus: 进程级指标采集与 Prometheus 文本格式导出
+
+本模块不依赖日志和配置，MetricsLogger（utils/logger_utils.py）与 API 导出端共用。
+"""
+import gc
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+QUANTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """固定内存的对数分桶延迟直方图（单位由调用方决定，MetricsLogger 使用毫秒）"""
+
+    def __init__(self, min_value: float = 0.001, max_value: float = 3_600_000.0,
+                 buckets_per_decade: int = 30):
+        """
+        Args:
+            min_value: 最小可分辨值（更小的样本计入第一个桶）
+            max_value: 最大可分辨值（更大的样本计入最后一个桶，max 仍精确记录）
+            buckets_per_decade: 每个数量级的桶数（30 → 相邻桶比值约 1.08）
+        """
+        self.min_value = min_value
+        self._log_min = math.log10(min_value)
+        self._scale = buckets_per_decade
+        size = int(math.ceil((math.log10(max_value) - self._log_min) * buckets_per_decade)) + 2
+        self._counts = [0] * size
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = int((math.log10(value) - self._log_min) * self._scale) + 1
+        return min(index, len(self._counts) - 1)
+
+    def _bucket_value(self, index: int) -> float:
+        """桶的代表值（上下界几何平均）"""
+        lower = self._log_min + (index - 1) / self._scale
+        return 10 ** (lower + 0.5 / self._scale)
+
+    def record(self, value: float):
+        """记录一个样本"""
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct: float) -> float:
+        """分位数估计（pct 取 0-100），结果限制在 [min, max] 内"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        cumulative = 0
+        for index, bucket_count in enumerate(self._counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                if index == 0:
+                    return self.min
+                if index == len(self._counts) - 1:
+                    return self.max
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def reset(self):
+        """清空所有样本"""
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def get_stats(self) -> Dict:
+        """count/sum/avg/min/max 及 p50/p95/p99"""
+        if self.count == 0:
+            return {}
+        stats = {
+            'count': self.count,
+            'sum': self.sum,
+            'avg': self.sum / self.count,
+            'min': self.min,
+            'max': self.max,
+        }
+        for pct in QUANTILES:
+            stats[f'p{pct}'] = self.percentile(pct)
+        return stats
+
+
+class RateWindow:
+    """滑动窗口速率计数器（按秒分槽，内存固定）"""
+
+    def __init__(self, window_seconds: int = 60):
+        self.window = max(1, int(window_seconds))
+        self._counts = [0] * self.window
+        self._seconds = [0] * self.window
+
+    def add(self, n: int = 1, now: float = None):
+        second = int(time.time() if now is None else now)
+        slot = second % self.window
+        if self._seconds[slot] != second:
+            self._seconds[slot] = second
+            self._counts[slot] = 0
+        self._counts[slot] += n
+
+    def total(self, now: float = None) -> int:
+        """最近 window 秒内的计数"""
+        second = int(time.time() if now is None else now)
+        return sum(
+            count for count, stamp in zip(self._counts, self._seconds)
+            if 0 <= second - stamp < self.window
+        )
+
+    def rate(self, now: float = None) -> float:
+        """最近 window 秒的平均每秒次数"""
+        return self.total(now) / self.window
+
+
+class GcPauseTracker:
+    """记录垃圾回收停顿时长（毫秒）"""
+
+    def __init__(self):
+        self._pending = deque(maxlen=10000)
+        self._started: Dict[int, float] = {}
+        self._installed = False
+
+    def _callback(self, phase: str, info: Dict):
+        # gc 回调可能在任意线程、任意位置触发：只做原子操作，不加锁
+        if phase == "start":
+            self._started[threading.get_ident()] = time.perf_counter()
+        else:
+            start = self._started.pop(threading.get_ident(), None)
+            if start is not None:
+                self._pending.append((info.get("generation", 0), (time.perf_counter() - start) * 1000))
+
+    def install(self):
+        if not self._installed:
+            gc.callbacks.append(self._callback)
+            self._installed = True
+
+    def uninstall(self):
+        if self._installed:
+            gc.callbacks.remove(self._callback)
+            self._installed = False
+
+    def drain(self) -> List[Tuple[int, float]]:
+        """取出尚未汇总的 (代, 停顿毫秒)"""
+        pauses = []
+        while True:
+            try:
+                pauses.append(self._pending.popleft())
+            except IndexError:
+                return pauses
+
+
+def collect_process_gauges() -> Dict[str, float]:
+    """进程级指标：内存、GC、线程数"""
+    gauges: Dict[str, float] = {}
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        gauges['memory_rss_mb'] = info.rss / 1024 / 1024
+        gauges['memory_vms_mb'] = info.vms / 1024 / 1024
+    except ImportError:
+        import resource
+        gauges['memory_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    for generation, count in enumerate(gc.get_count()):
+        gauges[f'gc_pending_gen{generation}'] = count
+    for generation, stats in enumerate(gc.get_stats()):
+        gauges[f'gc_collections_gen{generation}'] = stats.get('collections', 0)
+        gauges[f'gc_collected_gen{generation}'] = stats.get('collected', 0)
+    gauges['threads'] = threading.active_count()
+    gauges['pid'] = os.getpid()
+    return gauges
+
+
+# ==================== Prometheus 文本格式 ====================
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items() if value is not None)
+
+
+def render_prometheus(snapshots: Iterable[Tuple[str, Optional[Dict]]], prefix: str = "trading_bot") -> str:
+    """
+    把 MetricsLogger.snapshot() 渲染为 Prometheus 文本格式
+
+    Args:
+        snapshots: [(进程名, 快照)]，快照为 None 的进程跳过
+        prefix: 指标名前缀
+    """
+    snapshots = [(process, snapshot) for process, snapshot in snapshots if snapshot]
+    lines: List[str] = []
+
+    lines.append(f"# HELP {prefix}_latency_ms Operation latency in milliseconds")
+    lines.append(f"# TYPE {prefix}_latency_ms summary")
+    for process, snapshot in snapshots:
+        for operation, stats in snapshot.get('operations', {}).items():
+            for pct in QUANTILES:
+                label = _labels(process=process, operation=operation, quantile=pct / 100)
+                lines.append(f"{prefix}_latency_ms{{{label}}} {stats[f'p{pct}']:.6g}")
+            label = _labels(process=process, operation=operation)
+            lines.append(f"{prefix}_latency_ms_sum{{{label}}} {stats['sum']:.6g}")
+            lines.append(f"{prefix}_latency_ms_count{{{label}}} {stats['count']}")
+
+    for name, key, help_text in (
+        ("latency_max_ms", "max", "Maximum observed latency in milliseconds"),
+        ("rate_per_second", "rate_per_sec", "Operations per second over the rate window"),
+    ):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        for process, snapshot in snapshots:
+            for operation, stats in snapshot.get('operations', {}).items():
+                label = _labels(process=process, operation=operation)
+                lines.append(f"{prefix}_{name}{{{label}}} {stats.get(key, 0):.6g}")
+
+    gauge_names = sorted({name for _, snapshot in snapshots for name in snapshot.get('gauges', {})})
+    for name in gauge_names:
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        for process, snapshot in snapshots:
+            value = snapshot.get('gauges', {}).get(name)
+            if value is not None:
+                lines.append(f"{prefix}_{name}{{{_labels(process=process)}}} {value:.6g}")
+
+    lines.append(f"# TYPE {prefix}_snapshot_age_seconds gauge")
+    now = time.time()
+    for process, snapshot in snapshots:
+        age = now - snapshot.get('timestamp', now)
+        lines.append(f"{prefix}_snapshot_age_seconds{{{_labels(process=process)}}} {age:.3f}")
+    return "\n".join(lines) + "\n"
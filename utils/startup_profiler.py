@@ -0,0 +1,114 @@
+"""
+启动耗时分析
+
+- 导入耗时：包装 builtins.__import__，记录每个首次导入模块的自身/累计耗时（类似 python -X importtime）
+- 阶段耗时：phase() 记录配置验证、创建 TradingBot 等阶段，mark() 记录首次决策等里程碑
+
+本模块只依赖标准库，main.py 在导入其他模块之前安装导入钩子。
+"""
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+class StartupProfiler:
+    """启动阶段与模块导入耗时统计"""
+
+    def __init__(self, t0: float = None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.report_enabled = False
+        self.phases: List[Tuple[str, float]] = []
+        self.marks: Dict[str, float] = {}
+        # (模块名, 自身耗时, 累计耗时, 嵌套深度)
+        self.imports: List[Tuple[str, float, float, int]] = []
+        self._stack: List[float] = []
+        self._original_import = None
+
+    # ==================== 导入钩子 ====================
+
+    def install_import_hook(self):
+        if self._original_import is not None:
+            return
+        original = builtins.__import__
+        self._original_import = original
+        modules = sys.modules
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in modules:
+                return original(name, globals, locals, fromlist, level)
+            depth = len(self._stack)
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+                self.imports.append((name, elapsed - children, elapsed, depth))
+
+        builtins.__import__ = timed_import
+
+    def uninstall_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    # ==================== 阶段与里程碑 ====================
+
+    @contextmanager
+    def phase(self, name: str):
+        """记录一个启动阶段的耗时"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def mark(self, name: str) -> Optional[float]:
+        """
+        记录里程碑（距进程启动的秒数），同名里程碑只记录第一次
+
+        Returns:
+            首次记录时返回耗时，之后返回 None
+        """
+        if name in self.marks:
+            return None
+        elapsed = time.perf_counter() - self.t0
+        self.marks[name] = elapsed
+        return elapsed
+
+    def report(self, top: int = 15) -> str:
+        """生成启动耗时报告"""
+        lines = ["=" * 60, "启动耗时报告", "=" * 60]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<36} {seconds * 1000:>10.1f} ms")
+        for name, seconds in self.marks.items():
+            lines.append(f"  [里程碑] {name:<30} {seconds * 1000:>10.1f} ms（距进程启动）")
+
+        if self.imports:
+            top_level = [entry for entry in self.imports if entry[3] == 0]
+            total = sum(entry[2] for entry in top_level)
+            lines.append("-" * 60)
+            lines.append(f"模块导入: {len(self.imports)} 个，顶层累计 {total * 1000:.1f} ms")
+            lines.append(f"  {'累计(ms)':>10} {'自身(ms)':>10}  模块")
+            for name, self_time, cumulative, depth in sorted(
+                self.imports, key=lambda entry: entry[2], reverse=True
+            )[:top]:
+                lines.append(f"  {cumulative * 1000:>10.1f} {self_time * 1000:>10.1f}  {'  ' * min(depth, 6)}{name}")
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """获取进程级启动耗时统计（首次调用时开始计时）"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+    return _profiler